@@ -1,14 +1,69 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from sqlmodel import Session
 from backend.database import get_session
-from backend.services.flipping import FlippingService, FlipOpportunity
+from backend.services.flipping import FlipOpportunity
+from backend.services.flip_engine import flip_engine
+from backend.services.flip_stream import StreamFilter, flip_stream
+from backend.services.metrics import metrics
+from backend.services.portfolio import allocate_portfolio
+from backend.services.response_cache import ResponseCache, etag_matches
 from backend.app.middleware import limiter
 from backend.config import settings
 from backend.api.v1.validators import BudgetQuery, ROIQuery, VolumeQuery
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
 router = APIRouter(prefix="/flips", tags=["Flipping"])
 
+# Serialized /opportunities pages, one per filter set and price generation
+opportunities_cache = ResponseCache(
+    "flips.opportunities.cache", max_entries=settings.flip_response_cache_size
+)
+_OPPORTUNITIES = TypeAdapter(List[FlipOpportunity])
+
+
+class PortfolioRequest(BaseModel):
+    """Request model for a portfolio allocation."""
+
+    budget: int = Field(..., gt=0, le=100_000_000_000, description="GP to invest")
+    min_roi: float = Field(1.0, ge=0, le=1000, description="Minimum ROI percentage")
+    min_volume: int = Field(0, ge=0, description="Minimum combined high/low volume")
+    exclude_members: bool = Field(False, description="Exclude members-only items")
+    fill_ratio: float = Field(
+        0.1, gt=0, le=1, description="Share of an item's traded volume expected to fill"
+    )
+
+
+class PortfolioAllocation(BaseModel):
+    """Response model for the units bought of one item."""
+
+    item_id: int
+    item_name: str
+    quantity: int
+    max_quantity: int
+    buy_price: int
+    sell_price: int
+    margin: int
+    roi: float
+    cost: int
+    expected_profit: int
+
+
+class PortfolioResponse(BaseModel):
+    """Response model for a portfolio allocation."""
+
+    budget: int
+    invested: int
+    uninvested: int
+    expected_profit: int
+    upper_bound: int
+    candidates: int
+    generation: int
+    allocations: List[PortfolioAllocation]
+
+
 # Legacy router for backward compatibility with old tests
 flipping_router = APIRouter(prefix="/flipping", tags=["Flipping"])
 
@@ -17,7 +72,7 @@ flipping_router = APIRouter(prefix="/flipping", tags=["Flipping"])
     "/opportunities",
     response_model=List[FlipOpportunity],
     summary="Get flip opportunities",
-    description="Find profitable Grand Exchange flip opportunities based on budget, ROI, and volume filters. Results are sorted by potential profit.",
+    description="Find profitable Grand Exchange flip opportunities based on budget, ROI, and volume filters. Results are sorted by margin x volume (or `sort`) and paginated with `cursor`.",
     responses={
         200: {
             "description": "List of flip opportunities",
@@ -59,11 +114,28 @@ def get_flips(
     max_budget: Optional[int] = BudgetQuery(None),
     min_roi: float = ROIQuery(0.0),
     min_volume: int = VolumeQuery(0),
+    exclude_members: bool = Query(False, description="Exclude members-only items"),
+    sort: Literal["margin_x_volume", "margin", "roi", "potential_profit"] = Query(
+        "margin_x_volume", description="Ranking, descending (ties broken by item ID)"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Results per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     session: Session = Depends(get_session),
 ):
     """
     Get flip opportunities with validated parameters.
 
+    Served from the in-memory flip table, which is rebuilt once per price sync.
+
+    Results are paginated by keyset: when more results follow, the response
+    carries an opaque ``X-Next-Cursor`` header (and a ``Link: rel="next"``
+    URL). Passing it back as ``cursor`` resumes after the last row, so deep
+    pages cost the same as the first one.
+
+    Pages are cached per filter set until the next price sync. Every
+    response carries an ``ETag``; repeating it in ``If-None-Match`` returns
+    ``304 Not Modified`` while the results are unchanged.
+
     **Rate Limit**: 100 requests per minute per IP
 
     **Example Request**:
@@ -76,18 +148,144 @@ def get_flips(
         max_budget: Maximum budget in GP (0 to 2,147,483,647). Filters out items where buy_price * limit exceeds this value.
         min_roi: Minimum ROI percentage (0 to 10000). Filters out opportunities below this ROI.
         min_volume: Minimum volume (0 to 2,147,483,647). Filters out items with trade volume below this threshold.
-        session: Database session
+        exclude_members: If True, exclude members-only items
+        sort: Ranking key (margin_x_volume also orders by potential profit within ties)
+        limit: Results per page (1 to 500)
+        cursor: Cursor of the previous page, for the same sort
+        session: Database session (used to rebuild the flip table after a price sync)
 
     Returns:
-        List of flip opportunities sorted by potential profit (descending)
+        One page of flip opportunities sorted by ``sort`` (descending)
 
     Raises:
-        HTTPException: 429 if rate limit exceeded
+        HTTPException: 400 if the cursor is invalid for this sort, 429 if rate limit exceeded
+    """
+    key = (max_budget, float(min_roi), min_volume, exclude_members, sort, limit, cursor)
+
+    def build() -> Tuple[bytes, Dict[str, str], int]:
+        try:
+            page = flip_engine.page(
+                session,
+                max_budget=max_budget,
+                min_roi=min_roi,
+                min_volume=min_volume,
+                exclude_members=exclude_members,
+                limit=limit,
+                sort=sort,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        headers = {}
+        if page.next_cursor is not None:
+            next_url = request.url.include_query_params(cursor=page.next_cursor)
+            headers["X-Next-Cursor"] = page.next_cursor
+            headers["Link"] = f'<{next_url.path}?{next_url.query}>; rel="next"'
+        body = _OPPORTUNITIES.dump_json(_OPPORTUNITIES.validate_python(page.rows))
+        return body, headers, page.generation
+
+    cached = opportunities_cache.get_or_build(key, build)
+    headers = {**cached.headers, "ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        metrics.inc(f"{opportunities_cache.name}.not_modified")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/stream",
+    summary="Stream flip opportunity changes",
+    description=(
+        "Server-sent events: a `snapshot` of the filtered top-N, then after every price "
+        "sync a `delta` with the items that entered, left or changed in it."
+    ),
+    response_class=StreamingResponse,
+)
+@limiter.limit(settings.default_rate_limit)
+async def stream_flips(
+    request: Request,
+    max_budget: Optional[int] = BudgetQuery(None),
+    min_roi: float = ROIQuery(0.0),
+    min_volume: int = VolumeQuery(0),
+    exclude_members: bool = Query(False, description="Exclude members-only items"),
+    limit: int = Query(50, ge=1, le=200, description="Size of the watched top-N"),
+    session: Session = Depends(get_session),
+) -> StreamingResponse:
+    """
+    Stream changes to the flip opportunities matching the filters.
+
+    Events (``data`` is JSON; ``id`` is the price generation):
+
+    - ``snapshot``: ``{"generation", "rows"}``, the current top-N, sent once
+    - ``delta``: ``{"generation", "entered", "changed", "left"}``; rows for
+      entered/changed items, item IDs for the ones that left
+
+    Rows have the ``/opportunities`` fields. Syncs that leave the top-N
+    untouched send nothing; idle connections get a comment line every 15s.
+    A client that falls too far behind is disconnected and should reconnect.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        max_budget: Maximum buy price in GP
+        min_roi: Minimum ROI percentage
+        min_volume: Minimum combined high/low volume
+        exclude_members: If True, exclude members-only items
+        limit: Number of top opportunities watched
+        session: Database session (used for the snapshot)
+
+    Returns:
+        text/event-stream response
+    """
+    filters = StreamFilter(max_budget, min_roi, min_volume, exclude_members, limit)
+    table = await run_in_threadpool(flip_engine.table, session)
+    subscription = flip_stream.subscribe(filters, table)
+    return StreamingResponse(
+        flip_stream.events(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/portfolio",
+    response_model=PortfolioResponse,
+    summary="Allocate a budget across flips",
+    description=(
+        "Spread one budget over many items to maximize expected profit, buying at most "
+        "each item's GE limit and its expected fill within one buy-limit window."
+    ),
+)
+@limiter.limit(settings.default_rate_limit)
+def allocate_flip_portfolio(
+    request: Request,
+    portfolio_request: PortfolioRequest,
+    session: Session = Depends(get_session),
+) -> PortfolioResponse:
+    """
+    Allocate a budget across the current flip opportunities.
+
+    Items are bought best ROI first; the budget left after the first item
+    that does not fit in full is spent on it and on the following items.
+    ``upper_bound`` is the expected profit if fractional units could be
+    bought, which no allocation can beat.
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        portfolio_request: Budget and filters
+        session: Database session
+
+    Returns:
+        Allocations, best ROI first, with totals
     """
-    service = FlippingService(session)
-    return service.get_flip_opportunities(
-        max_budget=max_budget, min_roi=min_roi, min_volume=min_volume
+    portfolio = allocate_portfolio(
+        flip_engine.table(session),
+        portfolio_request.budget,
+        min_roi=portfolio_request.min_roi,
+        fill_ratio=portfolio_request.fill_ratio,
+        min_volume=portfolio_request.min_volume,
+        exclude_members=portfolio_request.exclude_members,
     )
+    return PortfolioResponse.model_validate(portfolio.to_dict())
 
 
 # Legacy scanner endpoint for backward compatibility with old tests
@@ -108,13 +306,12 @@ def get_scanner_flips(
 ):
     """
     Legacy scanner endpoint - redirects to get_flips logic.
-    
+
     Args:
         budget: Maximum budget (legacy parameter name for max_budget) - REQUIRED
         min_roi: Minimum ROI - REQUIRED
         min_volume: Minimum volume - REQUIRED
     """
-    service = FlippingService(session)
-    return service.get_flip_opportunities(
-        max_budget=budget, min_roi=min_roi, min_volume=min_volume
+    return flip_engine.opportunities(
+        session, max_budget=budget, min_roi=min_roi, min_volume=min_volume
     )
@@ -4,10 +4,12 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, text
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from backend.db.session import get_session
 from backend.config import settings
+from backend.services.metrics import metrics
+from backend.services.wiki.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -61,19 +63,17 @@ async def health_check(session: Session = Depends(get_session)) -> HealthCheckRe
 
     # Check external API (OSRS Wiki) availability
     try:
-        import httpx
-
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            # Try a lightweight endpoint
-            response = await client.get(
-                f"{settings.wiki_api_base}/latest",
-                headers={"User-Agent": settings.user_agent},
-            )
-            if response.status_code == 200:
-                external_api_status = "ok"
-            else:
-                external_api_status = "degraded"
-                # Don't mark as unhealthy, external API issues are non-critical
+        # Reuse the pooled wiki client so health probes share keep-alive connections
+        response = await get_http_client().get(
+            f"{settings.wiki_api_base}/latest",
+            headers={"User-Agent": settings.user_agent},
+            timeout=settings.wiki_timeout_health,
+        )
+        if response.status_code == 200:
+            external_api_status = "ok"
+        else:
+            external_api_status = "degraded"
+            # Don't mark as unhealthy, external API issues are non-critical
     except Exception as e:
         logger.warning(f"External API health check failed: {e}")
         external_api_status = "unavailable"
@@ -92,3 +92,17 @@ async def health_check(session: Session = Depends(get_session)) -> HealthCheckRe
         external_api=external_api_status,
         version="1.0.0",
     )
+
+
+@router.get("/metrics")
+def health_metrics() -> Dict[str, Any]:
+    """
+    In-process metrics for background jobs.
+
+    Exposes counters, gauges and timings recorded since the process started,
+    e.g. per-endpoint wiki fetch durations and time saved by concurrent fetches.
+
+    Returns:
+        Dict with "counters", "gauges" and "timings" sections
+    """
+    return metrics.snapshot()
@@ -0,0 +1,113 @@
+"""Price history endpoints."""
+
+import time
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+
+from backend.app.middleware import limiter
+from backend.config import settings
+from backend.database import get_session
+from backend.models import Item
+from backend.services.price_series import price_series
+
+router = APIRouter(prefix="/prices", tags=["Prices"])
+
+# Default range when "from" is omitted
+DEFAULT_HISTORY_SECONDS = 7 * 86400
+
+
+class PriceHistoryResponse(BaseModel):
+    """Columnar price history: the n-th entry of every array is one point."""
+
+    item_id: int
+    item_name: str
+    resolution: str = Field(..., description="raw, 1h or 1d")
+    start: int = Field(..., description="Range start (unix seconds)")
+    end: int = Field(..., description="Range end, exclusive (unix seconds)")
+    current_high: Optional[int] = Field(None, description="Latest instant-buy price")
+    current_low: Optional[int] = Field(None, description="Latest instant-sell price")
+    ts: List[int]
+    high: List[Optional[int]]
+    low: List[Optional[int]]
+    volume: List[Optional[int]]
+
+
+@router.get(
+    "/{item_id}/history",
+    response_model=PriceHistoryResponse,
+    summary="Get an item's price history",
+    description=(
+        "Price history over a time range as parallel arrays. The coarsest resolution "
+        "(1d, 1h or raw) that still yields the requested number of points is used."
+    ),
+)
+@limiter.limit(settings.default_rate_limit)
+def get_price_history(
+    request: Request,
+    item_id: int,
+    from_: Optional[int] = Query(None, alias="from", ge=0, description="Range start (unix s)"),
+    to: Optional[int] = Query(None, ge=0, description="Range end (unix s, default now)"),
+    points: int = Query(200, ge=1, le=2000, description="Desired number of points"),
+    resolution: Optional[Literal["raw", "1h", "1d"]] = Query(
+        None, description="Force a resolution instead of choosing one"
+    ),
+    session: Session = Depends(get_session),
+) -> PriceHistoryResponse:
+    """
+    Get price history for one item.
+
+    **Rate Limit**: 100 requests per minute per IP
+
+    **Example Request**:
+    ```
+    GET /api/v1/prices/4151/history?from=1760000000&to=1760600000&points=100
+    ```
+
+    Args:
+        request: FastAPI request object (for rate limiting)
+        item_id: OSRS item ID
+        from_: Range start (default: 7 days before ``to``; clamped to the history
+            retention before ``to``)
+        to: Range end (default: now)
+        points: Desired number of points; decides the resolution
+        resolution: Optional fixed resolution
+        session: Database session
+
+    Returns:
+        Columnar price history
+
+    Raises:
+        HTTPException: 404 if the item does not exist, 400 if the range is empty
+    """
+    item = session.get(Item, item_id)
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Item {item_id} not found"
+        )
+
+    end = int(time.time()) if to is None else to
+    start = end - DEFAULT_HISTORY_SECONDS if from_ is None else from_
+    # Nothing older than the retention window is kept; don't scan for it
+    start = max(start, end - settings.price_history_retention_days * 86400)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must be before 'to'"
+        )
+
+    series = price_series(session, item_id, start, end, points, resolution=resolution)
+    return PriceHistoryResponse(
+        item_id=item_id,
+        item_name=item.name,
+        resolution=series.resolution,
+        start=start,
+        end=end,
+        current_high=item.high_price,
+        current_low=item.low_price,
+        ts=series.ts,
+        high=series.high,
+        low=series.low,
+        volume=series.volume,
+    )
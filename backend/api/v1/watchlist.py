@@ -49,6 +49,10 @@ class WatchlistItemResponse(BaseModel):
     is_active: bool
     created_at: str
     last_triggered_at: Optional[str] = None
+    # Last hour of trading, from the /5m price buckets (None if nothing traded)
+    volume_1h: Optional[int] = None
+    avg_high_price_1h: Optional[int] = None
+    avg_low_price_1h: Optional[int] = None
 
     class Config:
         """Pydantic config."""
@@ -139,22 +143,29 @@ def get_watchlist(
         session: Database session
 
     Returns:
-        List of watchlist items
+        List of watchlist items with their last hour of trading
     """
     service = WatchlistService(session)
     watchlist_items = service.get_watchlist(user_id=user_id, include_inactive=include_inactive)
-    return [
-        WatchlistItemResponse.model_validate(
-            {
-                **item.model_dump(),
-                "created_at": item.created_at.isoformat() if item.created_at else None,
-                "last_triggered_at": (
-                    item.last_triggered_at.isoformat() if item.last_triggered_at else None
-                ),
-            }
+    recent = service.get_recent_activity({item.item_id for item in watchlist_items})
+    responses = []
+    for item in watchlist_items:
+        stats = recent.get(item.item_id)
+        responses.append(
+            WatchlistItemResponse.model_validate(
+                {
+                    **item.model_dump(),
+                    "created_at": item.created_at.isoformat() if item.created_at else None,
+                    "last_triggered_at": (
+                        item.last_triggered_at.isoformat() if item.last_triggered_at else None
+                    ),
+                    "volume_1h": stats.volume if stats else None,
+                    "avg_high_price_1h": stats.avg_high_price if stats else None,
+                    "avg_low_price_1h": stats.avg_low_price if stats else None,
+                }
+            )
         )
-        for item in watchlist_items
-    ]
+    return responses
 
 
 @router.delete("/{watchlist_item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -32,6 +32,8 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Pagination cursors of /flips/opportunities
+        expose_headers=["X-Next-Cursor", "Link"],
     )
 
     # Rate limiting middleware (if enabled)
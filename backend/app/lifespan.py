@@ -8,8 +8,11 @@ from sqlmodel import Session, select, func
 
 from backend.db.engine import engine
 from backend.db.migrations import migrate_tables
+from backend.db.writer import shutdown_writer
 from backend.models import Item, SlayerTask, Monster
-from backend.services.wiki_client import WikiAPIClient
+from backend.services.wiki import WikiAPIClient
+from backend.services.wiki.pipeline import IngestionPipeline
+from backend.services.wiki.http import close_http_client, open_http_client
 from backend.app.scheduler import setup_scheduler
 from backend.app.logging_config import setup_logging
 from backend.seeds.slayer import seed_slayer_data
@@ -29,6 +32,27 @@ def create_db_and_tables() -> None:
     migrate_tables()
 
 
+async def populate_equipment_stats(session: Session) -> None:
+    """
+    Populate item equipment stats, preferring the bundled snapshot.
+
+    Falls back to streaming the OSRSBox dump only when no usable snapshot
+    is bundled.
+
+    Args:
+        session: Database session
+    """
+    from backend.services.equipment_snapshot import load_equipment_snapshot
+
+    if load_equipment_snapshot(session) is not None:
+        return
+
+    from backend.services.item_stats import import_item_stats
+
+    logger.info("No equipment stats snapshot bundled, downloading from OSRSBox...")
+    await import_item_stats(session, stream=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """
@@ -36,6 +60,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     Handles startup and shutdown tasks:
     - Database initialization
+    - Shared wiki HTTP client
+    - Database writer thread
     - Scheduler setup
     - Initial data sync
     """
@@ -43,52 +69,57 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Starting up...")
     create_db_and_tables()
 
+    # One pooled HTTP client is reused by every wiki call in this process
+    await open_http_client()
+
+    # One pipeline drives the startup sync and every scheduled tick
+    pipeline = IngestionPipeline(WikiAPIClient())
+
     # Initialize scheduler
-    scheduler = setup_scheduler()
+    scheduler = setup_scheduler(pipeline)
     scheduler.start()
 
-    wiki_client = WikiAPIClient()
-
     # Run initial item sync
     with Session(engine) as session:
         # Check if DB is empty
         item_count = session.exec(select(Item)).first()
         logger.info(f"Current item count in DB: {item_count}")
+        stats_populated = False
         if not item_count:
             logger.info("Database is empty, starting initial sync...")
-            await wiki_client.sync_items_to_db(session)
-            logger.info("Items synced, now importing equipment stats from OSRSBox...")
+        else:
+            logger.info("Database already has items, skipping initial item sync")
+
+        # Always sync prices on startup to ensure we have current data. On an
+        # empty database mapping, latest and 24h are downloaded concurrently.
+        logger.info("Running initial price sync...")
+        await pipeline.run(session, include_mapping=not item_count)
+
+        if not item_count:
+            logger.info("Items synced, now importing equipment stats...")
             # After syncing items, import their stats
             try:
-                from backend.services.item_stats import import_item_stats
-
-                await import_item_stats(session)
+                await populate_equipment_stats(session)
+                stats_populated = True
                 logger.info("✅ Item stats imported successfully")
             except Exception as e:
                 logger.error(f"Failed to import item stats: {e}")
                 logger.warning(
                     "Items may be missing equipment stats. Run POST /api/v1/admin/sync-stats manually."
                 )
-        else:
-            logger.info("Database already has items, skipping initial sync")
 
-        # Always sync prices on startup to ensure we have current data
-        logger.info("Running initial price sync...")
-        await wiki_client.sync_prices_to_db(session)
-
-        # Check if items need stats populated
+        # Check if items need stats populated. Most items are not equipable and
+        # keep slot NULL, so skip this if stats were just imported above.
         items_without_stats_count = session.exec(
             select(func.count()).select_from(Item).where(Item.slot.is_(None))  # type: ignore[union-attr]
         ).one()
 
-        if items_without_stats_count > 0:
+        if items_without_stats_count > 0 and not stats_populated:
             logger.info(
-                f"Found {items_without_stats_count} items without equipment stats, importing from OSRSBox..."
+                f"Found {items_without_stats_count} items without equipment stats, importing..."
             )
             try:
-                from backend.services.item_stats import import_item_stats
-
-                await import_item_stats(session)
+                await populate_equipment_stats(session)
                 logger.info("✅ Item stats imported successfully")
             except Exception as e:
                 logger.error(f"Failed to import item stats: {e}")
@@ -122,3 +153,6 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Shutdown logic
     scheduler.shutdown()
+    await close_http_client()
+    # Let any in-flight sync finish its write before the process exits
+    shutdown_writer()
@@ -3,6 +3,7 @@
 from fastapi import FastAPI, APIRouter
 from backend.api.v1.health import router as health_router
 from backend.api.v1.flips import router as flips_router, flipping_router
+from backend.api.v1.prices import router as prices_router
 from backend.api.v1.trades import router as trades_router
 from backend.api.v1.watchlist import router as watchlist_router
 from backend.api.v1.slayer import router as slayer_router
@@ -23,6 +24,7 @@ api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(health_router)
 api_router.include_router(flips_router)
 api_router.include_router(flipping_router)  # Legacy scanner endpoint for backward compatibility
+api_router.include_router(prices_router)
 api_router.include_router(trades_router)
 api_router.include_router(watchlist_router)
 api_router.include_router(slayer_router)
@@ -1,31 +1,43 @@
 """APScheduler configuration and job definitions."""
 
 import logging
+from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlmodel import Session
 
+from backend.config import settings
 from backend.db.engine import engine
-from backend.services.wiki_client import WikiAPIClient
+from backend.db.writer import run_in_writer
+from backend.services.price_history import drop_expired_shards
+from backend.services.price_rollup import run_rollups
+from backend.services.wiki import WikiAPIClient
+from backend.services.wiki.pipeline import IngestionPipeline
 from backend.services.watchlist import WatchlistService
 
 logger = logging.getLogger(__name__)
 
 
-def setup_scheduler() -> AsyncIOScheduler:
+def setup_scheduler(pipeline: Optional[IngestionPipeline] = None) -> AsyncIOScheduler:
     """
     Set up and configure the APScheduler.
 
+    Args:
+        pipeline: Ingestion pipeline run by the price job. Pass the one used
+            for the startup sync so its last-seen table and fetch cache carry
+            over; a new pipeline is created if omitted.
+
     Returns:
         Configured scheduler instance
     """
     scheduler = AsyncIOScheduler()
-    wiki_client = WikiAPIClient()
+    if pipeline is None:
+        pipeline = IngestionPipeline(WikiAPIClient())
 
     # Define job to run every 5 minutes (300 seconds)
     async def update_prices_job() -> None:
         try:
             with Session(engine) as session:
-                await wiki_client.sync_prices_to_db(session)
+                await pipeline.sync_prices(session)
         except Exception as e:
             logger.error(f"Price update failed: {e}")
 
@@ -40,7 +52,38 @@ def setup_scheduler() -> AsyncIOScheduler:
         except Exception as e:
             logger.error(f"Watchlist alert evaluation failed: {e}")
 
+    # Define job to store the latest /5m and /1h buckets and fill any gaps
+    async def update_price_buckets_job() -> None:
+        for interval in ("5m", "1h"):
+            try:
+                with Session(engine) as session:
+                    await pipeline.sync_buckets(session, interval)
+                    await pipeline.backfill_buckets(session, interval)
+            except Exception as e:
+                logger.error(f"Price bucket update for /{interval} failed: {e}")
+
+    # Define job to drop price history shards past retention every hour
+    async def prune_price_history_job() -> None:
+        try:
+            with Session(engine) as session:
+                await run_in_writer(
+                    drop_expired_shards, session, settings.price_history_retention_days
+                )
+        except Exception as e:
+            logger.error(f"Price history retention failed: {e}")
+
+    # Define job to fold newly closed hours and days into OHLC bars
+    async def rollup_prices_job() -> None:
+        try:
+            with Session(engine) as session:
+                await run_in_writer(run_rollups, session)
+        except Exception as e:
+            logger.error(f"Price rollup failed: {e}")
+
     scheduler.add_job(update_prices_job, "interval", seconds=300)
     scheduler.add_job(evaluate_watchlist_alerts_job, "interval", seconds=300)
+    scheduler.add_job(update_price_buckets_job, "interval", seconds=300)
+    scheduler.add_job(prune_price_history_job, "interval", seconds=3600)
+    scheduler.add_job(rollup_prices_job, "interval", seconds=900)
 
     return scheduler
@@ -12,6 +12,46 @@ class Settings(BaseSettings):
     # Format: ProjectName/Version (Contact)
     user_agent: str = "OSRSToolHub/1.0 (https://github.com/IBMaxin/osrs-tool-hub)"
 
+    # Wiki HTTP client (one pooled client is shared by every wiki call)
+    wiki_http_max_connections: int = 10
+    wiki_http_max_keepalive_connections: int = 5
+    wiki_http_keepalive_expiry: float = 120.0  # Seconds an idle connection is kept open
+    wiki_http2: bool = True  # Used only if the optional 'h2' package is installed
+
+    # Wiki request timeouts in seconds, per endpoint
+    wiki_timeout_connect: float = 5.0
+    wiki_timeout_default: float = 10.0
+    wiki_timeout_mapping: float = 30.0
+    wiki_timeout_latest: float = 10.0
+    wiki_timeout_24h: float = 30.0
+    wiki_timeout_health: float = 5.0
+
+    # Overall deadline per endpoint when downloads run concurrently (seconds)
+    wiki_deadline_mapping: float = 60.0
+    wiki_deadline_latest: float = 15.0
+    wiki_deadline_24h: float = 45.0
+
+    # Wiki request resilience
+    wiki_retry_attempts: int = 2  # Retries after the first attempt
+    wiki_retry_backoff_base: float = 0.25  # Seconds before the first retry, doubled per retry
+    wiki_retry_backoff_max: float = 4.0
+    wiki_retry_budget_ratio: float = 0.2  # Retries allowed per request, on average
+    wiki_breaker_failure_threshold: int = 5  # Consecutive failures before the breaker opens
+    wiki_breaker_reset_seconds: float = 60.0  # How long the breaker rejects requests
+    wiki_hedge_enabled: bool = False  # Send a second request past the endpoint's p95 latency
+    wiki_hedge_min_samples: int = 20  # Latencies observed before hedging starts
+
+    # How long /5m and /1h price buckets are kept before pruning
+    wiki_bucket_retention_5m_hours: int = 24
+    wiki_bucket_retention_1h_days: int = 30
+
+    # Append-only price history (one table per UTC day)
+    price_history_enabled: bool = True
+    price_history_retention_days: int = 90
+
+    # Cached /flips/opportunities responses (evicted least recently used first)
+    flip_response_cache_size: int = 512
+
     # Rate limiting settings
     rate_limit_enabled: bool = True
     default_rate_limit: str = "100/minute"  # Default: 100 requests per minute per IP
@@ -5,6 +5,12 @@ from sqlalchemy import inspect, text
 
 from backend.db.engine import engine
 
+# Single-column indexes replaced by composite indexes declared on the models
+SUPERSEDED_INDEXES = {
+    "trade": ("ix_trade_user_id",),
+    "watchlistitem": ("ix_watchlistitem_user_id",),
+}
+
 
 def migrate_tables() -> None:
     """Run table migrations."""
@@ -75,6 +81,32 @@ def migrate_tables() -> None:
                             print(f"✓ Added column: pricesnapshot.{col}")
                         except Exception as e:
                             print(f"⚠ Could not add column pricesnapshot.{col}: {e}")
+
+                # Bulk price upserts rely on ON CONFLICT(item_id), which needs a
+                # unique index. Older databases may hold duplicate rows per item,
+                # so keep only the newest snapshot before creating it.
+                existing_indexes = [idx["name"] for idx in inspector.get_indexes("pricesnapshot")]
+                if "ix_pricesnapshot_item_id" not in existing_indexes:
+                    try:
+                        conn.execute(
+                            text(
+                                """
+                            DELETE FROM pricesnapshot
+                            WHERE id NOT IN (
+                                SELECT MAX(id) FROM pricesnapshot GROUP BY item_id
+                            )
+                        """
+                            )
+                        )
+                        conn.execute(
+                            text(
+                                "CREATE UNIQUE INDEX IF NOT EXISTS ix_pricesnapshot_item_id "
+                                "ON pricesnapshot (item_id)"
+                            )
+                        )
+                        print("✓ Added unique index: pricesnapshot.item_id")
+                    except Exception as e:
+                        print(f"⚠ Could not add unique index on pricesnapshot.item_id: {e}")
         else:
             print("✓ PriceSnapshot table will be created by SQLModel")
 
@@ -104,6 +136,27 @@ def migrate_tables() -> None:
         # manual migrations if we were modifying existing tables.
         # For new tables (Monster, SlayerTask), create_all is sufficient.
 
+        # 6. Model indexes. create_all only builds indexes for the tables it
+        # creates, so indexes declared later are added to existing tables here.
+        with engine.begin() as conn:
+            for table in SQLModel.metadata.sorted_tables:
+                if table.name not in table_names:
+                    continue
+                # Inspect afresh: earlier steps may have added indexes already
+                index_names = {idx["name"] for idx in inspect(conn).get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name in index_names:
+                        continue
+                    try:
+                        index.create(bind=conn)
+                        print(f"✓ Added index: {index.name}")
+                    except Exception as e:
+                        print(f"⚠ Could not add index {index.name}: {e}")
+                for name in SUPERSEDED_INDEXES.get(table.name, ()):
+                    if name in index_names:
+                        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                        print(f"✓ Dropped superseded index: {name}")
+
     except Exception as e:
         print(f"⚠ Migration check failed: {e}")
 
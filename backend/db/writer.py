@@ -0,0 +1,77 @@
+"""Dedicated database writer thread.
+
+Background syncs do thousands of blocking SQLAlchemy calls per run. Running
+them on the asyncio loop would stall every request Uvicorn serves from that
+same loop, so the write phase is handed to a single worker thread and the
+loop only awaits its completion. One thread also serializes writers, which
+matches SQLite's single-writer model.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from backend.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_writer_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide writer executor, creating it if needed.
+
+    Returns:
+        Single-thread executor used for database writes
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+    return _executor
+
+
+async def run_in_writer(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database function on the writer thread.
+
+    The session passed to ``fn`` must not be used by the caller until this
+    returns; sessions are not safe for concurrent use across threads.
+
+    Args:
+        fn: Blocking function to run
+        args: Positional arguments for ``fn``
+        kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        The return value of ``fn``
+    """
+    queued = time.perf_counter()
+
+    def timed() -> T:
+        started = time.perf_counter()
+        metrics.observe("db.writer.queue_seconds", started - queued)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            metrics.observe("db.writer.seconds", time.perf_counter() - started)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_writer_executor(), timed)
+
+
+def shutdown_writer(wait: bool = True) -> None:
+    """
+    Stop the writer thread at application shutdown.
+
+    Args:
+        wait: Block until queued writes finish
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -8,13 +8,13 @@ This module re-exports all models and enums for backward compatibility.
 from backend.models.enums import SlayerMaster, AttackStyle
 
 # Re-export item models
-from backend.models.items import Item, PriceSnapshot
+from backend.models.items import Item, PriceBucket, PriceRollup, PriceSnapshot, RollupWatermark
 
 # Re-export gear models
 from backend.models.gear import GearSet
 
 # Re-export flipping models
-from backend.models.flipping import Flip
+from backend.models.flipping import Flip, FlipMetric
 
 # Re-export trade models
 from backend.models.trade import Trade
@@ -32,10 +32,14 @@ __all__ = [
     # Items
     "Item",
     "PriceSnapshot",
+    "PriceBucket",
+    "PriceRollup",
+    "RollupWatermark",
     # Gear
     "GearSet",
     # Flipping
     "Flip",
+    "FlipMetric",
     # Trade
     "Trade",
     # Watchlist
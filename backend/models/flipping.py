@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -19,3 +20,35 @@ class Flip(SQLModel, table=True):
     volume: Optional[int] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class FlipMetric(SQLModel, table=True):
+    """Post-tax flip metrics of one priced item, materialized per price sync.
+
+    Rows are derived from the denormalized ``Item`` prices and the item's
+    ``PriceSnapshot`` volumes by ``backend.services.flip_metrics``; only items
+    with a positive high and low price have one. Volumes fall back to the
+    instant volumes when no 24h volume is known, like the flip queries do.
+    """
+
+    __tablename__ = "flip_metrics"
+    # The scanner walks this index backwards and stops at its LIMIT
+    __table_args__ = (
+        Index("ix_flip_metrics_margin_x_volume", "margin_x_volume", "potential_profit"),
+        Index("ix_flip_metrics_roi", "roi"),
+    )
+
+    item_id: int = Field(primary_key=True, foreign_key="item.id")
+    members: bool = True
+    buy_price: int  # Item.low_price
+    sell_price: int  # Item.high_price
+    margin_post_tax: int
+    roi: float  # margin_post_tax / sell_price * 100
+    volume: int  # high_volume + low_volume
+    buy_volume_24h: int
+    sell_volume_24h: int
+    total_volume_24h: int
+    margin_x_volume: int  # margin_post_tax * total_volume_24h
+    buy_limit: int
+    flippable_quantity: int  # min(buy_limit, volume)
+    potential_profit: int  # margin_post_tax * flippable_quantity
@@ -3,12 +3,16 @@
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Item(SQLModel, table=True):
     """Item model for OSRS items."""
 
+    # Every loadout query filters one slot, most by defence requirement too
+    __table_args__ = (Index("ix_item_slot_defence_req", "slot", "defence_req"),)
+
     id: int = Field(primary_key=True)
     name: str
     members: bool = True
@@ -78,7 +82,8 @@ class PriceSnapshot(SQLModel, table=True):
     """
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    item_id: int = Field(foreign_key="item.id")
+    # One current snapshot per item; the unique index backs the bulk upsert
+    item_id: int = Field(foreign_key="item.id", unique=True, index=True)
 
     high_price: Optional[int] = None
     low_price: Optional[int] = None
@@ -119,3 +124,54 @@ class PriceSnapshot(SQLModel, table=True):
     def has_volume_data(self) -> bool:
         """Return True if any 24h volume data is available."""
         return self.buy_volume_24h is not None or self.sell_volume_24h is not None
+
+
+class PriceBucket(SQLModel, table=True):
+    """Pre-aggregated trades for one item over a /5m or /1h Wiki bucket.
+
+    One row per (item, interval, bucket start). Averages are None when no
+    trade happened on that side during the bucket.
+    """
+
+    __table_args__ = (Index("ix_pricebucket_interval_timestamp", "interval", "timestamp"),)
+
+    item_id: int = Field(primary_key=True)
+    interval: int = Field(primary_key=True)  # Bucket width in seconds (300 or 3600)
+    timestamp: int = Field(primary_key=True)  # Unix timestamp of the bucket start
+
+    avg_high_price: Optional[int] = None
+    high_price_volume: int = 0
+    avg_low_price: Optional[int] = None
+    low_price_volume: int = 0
+
+
+class PriceRollup(SQLModel, table=True):
+    """Hourly or daily OHLC bar for one item, folded from the price history.
+
+    Prices are the mid price ``(high + low) / 2`` (or the only side known).
+    Bars only exist for buckets in which the price changed or items traded;
+    a missing bar means the price stayed at the previous bar's close.
+    """
+
+    __table_args__ = (
+        Index("ix_pricerollup_resolution_bucket_start", "resolution", "bucket_start"),
+    )
+
+    item_id: int = Field(primary_key=True)
+    resolution: int = Field(primary_key=True)  # Bucket width in seconds (3600 or 86400)
+    bucket_start: int = Field(primary_key=True)  # Unix timestamp of the bucket start
+
+    open: Optional[int] = None
+    high: Optional[int] = None
+    low: Optional[int] = None
+    close: Optional[int] = None
+    avg_price: Optional[int] = None
+    volume: int = 0  # Units traded, from the /5m and /1h buckets
+    samples: int = 0  # Price observations folded into the bar
+
+
+class RollupWatermark(SQLModel, table=True):
+    """End of the last bucket a rollup has fully processed."""
+
+    name: str = Field(primary_key=True)
+    watermark: int  # Unix timestamp; buckets starting before it are final
@@ -3,14 +3,18 @@
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Trade(SQLModel, table=True):
     """Trade model for tracking user buy/sell transactions."""
 
+    # History is listed per user, newest first
+    __table_args__ = (Index("ix_trade_user_id_created_at", "user_id", "created_at"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: str = Field(index=True, description="User identifier (UUID from localStorage)")
+    user_id: str = Field(description="User identifier (UUID from localStorage)")
     item_id: int = Field(index=True, description="OSRS item ID")
     item_name: str = Field(description="Item name for display")
     buy_price: int = Field(description="Price per item when bought")
@@ -0,0 +1,75 @@
+"""Audit the query plans of the hot service queries.
+
+Runs every hot query in ``backend.services.query_audit`` against a scratch
+in-memory database, runs EXPLAIN QUERY PLAN on the SQL it issues and flags
+full table scans and temp B-tree sorts. With ``--database`` the plans are
+explained against the application database instead, so its statistics and
+indexes decide the plan; nothing is executed there. Exits with status 1 if
+any query has an unexpected finding.
+
+Usage:
+    python -m backend.scripts.audit_query_plans
+    python -m backend.scripts.audit_query_plans --database --verbose
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.engine import Engine
+
+from backend.services.query_audit import (
+    QueryAudit,
+    audit_engine,
+    audit_hot_queries,
+    format_audit,
+    summarize,
+)
+
+
+def run_audit(explain_engine: Optional[Engine] = None, verbose: bool = False) -> List[QueryAudit]:
+    """
+    Audit the hot queries and print the report.
+
+    Args:
+        explain_engine: Engine to explain on (the scratch database if None)
+        verbose: Print every statement's plan
+
+    Returns:
+        One audit per hot query
+    """
+    engine = audit_engine()
+    try:
+        results = audit_hot_queries(engine, explain_engine=explain_engine)
+    finally:
+        engine.dispose()
+    print(format_audit(results, verbose=verbose))
+    counts = summarize(results)
+    print(
+        f"\n{len(results)} queries: {counts['clean']} clean, "
+        f"{counts['accepted']} with accepted findings, {counts['failing']} failing"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--database", action="store_true", help="Explain against the application database"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    target = None
+    if args.database:
+        from backend.database import engine as target
+
+    results = run_audit(target, verbose=args.verbose)
+    sys.exit(1 if any(audit.unexpected for audit in results) else 0)
@@ -0,0 +1,119 @@
+"""Backtest flip-ranking strategies against the stored price history.
+
+Replays a price archive (exported from the database first unless
+``--archive`` points at one written by ``export_price_archive``) with every
+combination of the swept parameters, one strategy per worker process, and
+prints a profit and loss table.
+
+Usage:
+    python -m backend.scripts.backtest_flips --days 30 --min-roi 1 2 3 --ranking roi margin_x_volume
+    python -m backend.scripts.backtest_flips --archive data/price_archive --top-n 5 10 --workers 4
+    python -m backend.scripts.backtest_flips --days 7 --limit-fraction 0.5 1 --json report.json
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from backend.database import engine as default_engine
+from backend.services.backtest import (
+    RANKINGS,
+    StrategyParams,
+    StrategyReport,
+    format_report,
+    load_buy_limits,
+    parameter_grid,
+    run_sweep,
+)
+from backend.services.price_archive import PriceArchive, export_price_archive
+
+
+def run_backtest(
+    options: Dict[str, Sequence[Any]],
+    base: StrategyParams,
+    archive: Optional[Path] = None,
+    days: int = 30,
+    step: int = 300,
+    workers: Optional[int] = None,
+    engine: Optional[Engine] = None,
+    now: Optional[int] = None,
+) -> List[StrategyReport]:
+    """
+    Backtest every combination of ``options`` applied to ``base``.
+
+    Args:
+        options: Values to sweep per StrategyParams field
+        base: Strategy supplying the parameters not swept
+        archive: Existing archive to replay (exported to a temp dir if None)
+        days: Days of history to export when no archive is given
+        step: Grid slot width of the exported archive
+        workers: Worker processes (CPU count if None)
+        engine: Database engine (the application's if None)
+        now: Current unix timestamp (wall clock if None)
+
+    Returns:
+        One report per strategy
+    """
+    engine = engine or default_engine
+    strategies = parameter_grid(base, **options)
+    with tempfile.TemporaryDirectory() as tmp:
+        with Session(engine) as session:
+            if archive is None:
+                now = int(time.time()) if now is None else now
+                archive = Path(tmp) / "archive"
+                export_price_archive(session, archive, now - days * 86400, now, step=step)
+            limits = load_buy_limits(session, PriceArchive(archive).item_ids)
+        return run_sweep(archive, limits, strategies, workers=workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", type=Path, help="Replay an existing archive")
+    parser.add_argument("--days", type=int, default=30, help="Days of history to export")
+    parser.add_argument("--step", type=int, default=300, help="Archive slot width in seconds")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", type=Path, help="Also write the reports as JSON")
+    parser.add_argument("--min-roi", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--min-volume", type=int, nargs="+", default=[0])
+    parser.add_argument("--max-price", type=int, nargs="+", default=[None])
+    parser.add_argument("--ranking", choices=RANKINGS, nargs="+", default=["margin_x_volume"])
+    parser.add_argument("--top-n", type=int, nargs="+", default=[10])
+    parser.add_argument("--limit-fraction", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--capital", type=int, default=StrategyParams.capital)
+    parser.add_argument("--fill-ratio", type=float, default=StrategyParams.fill_ratio)
+    parser.add_argument("--interval", type=int, default=StrategyParams.interval)
+    parser.add_argument("--hold", type=int, default=StrategyParams.hold)
+    args = parser.parse_args()
+
+    swept = ("min_roi", "min_volume", "max_price", "ranking", "top_n", "limit_fraction")
+    reports = run_backtest(
+        # Only parameters given more than one value show up in strategy names
+        {name: getattr(args, name) for name in swept if len(getattr(args, name)) > 1},
+        StrategyParams(
+            **{name: getattr(args, name)[0] for name in swept},
+            capital=args.capital,
+            fill_ratio=args.fill_ratio,
+            interval=args.interval,
+            hold=args.hold,
+        ),
+        archive=args.archive,
+        days=args.days,
+        step=args.step,
+        workers=args.workers,
+    )
+    print(format_report(reports))
+    if args.json:
+        args.json.write_text(json.dumps([report.to_dict() for report in reports], indent=2))
@@ -0,0 +1,272 @@
+"""End-to-end ingestion benchmark against the local Wiki stand-in.
+
+Drives the real ``WikiAPIClient`` and ``IngestionPipeline`` over HTTP against
+``backend.scripts.wiki_standin`` (in-process through an ASGI transport by
+default, or a running stand-in with ``--url``) and a throwaway SQLite file
+database. Each item count runs a cold sync (mapping + prices), a number of
+steady-state price ticks and one /5m and /1h bucket sync, and reports per
+phase:
+
+- items/s: normalized rows per second of wall time
+- write (s): time spent in the pipeline's write stages
+- peak (MiB): peak Python heap allocation (tracemalloc; off with --no-memory)
+- blocked (ms): total and worst event-loop stall seen by a lag monitor
+
+Usage:
+    python -m backend.scripts.benchmark_ingestion --items 4000 100000 --ticks 3
+    python -m backend.scripts.benchmark_ingestion --latency 0.05 --error-rate 0.02
+    python -m backend.scripts.benchmark_ingestion --url http://127.0.0.1:8800/api/v1/osrs
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.scripts.wiki_standin import API_PREFIX, StandinConfig, SyntheticWiki, create_app
+from backend.services.wiki.client import WikiAPIClient
+from backend.services.wiki.pipeline import IngestionPipeline, PipelineRun
+
+# Base URL used for the in-process stand-in; the host is never resolved
+STANDIN_BASE_URL = f"http://wiki-standin{API_PREFIX}"
+
+
+class LoopLagMonitor:
+    """Measures how long the event loop is blocked while a phase runs.
+
+    A background task sleeps for ``interval`` seconds at a time; any extra
+    delay before it wakes up is time the loop spent running something else
+    without yielding.
+    """
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.002) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.worst = 0.0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            if lag > self.threshold:
+                self.blocked += lag
+                self.worst = max(self.worst, lag)
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+@dataclass
+class PhaseResult:
+    """Measurements for one benchmark phase."""
+
+    items: int
+    phase: str
+    rows: int
+    seconds: float
+    write_seconds: float
+    peak_bytes: Optional[int]
+    blocked_seconds: float
+    worst_block_seconds: float
+    errors: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        """Rows ingested per second of wall time."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+async def _measure(
+    item_count: int,
+    phase: str,
+    runs: Callable[[], Awaitable[List[PipelineRun]]],
+    trace_memory: bool,
+) -> PhaseResult:
+    """Run one phase under the lag monitor and (optionally) tracemalloc."""
+    errors = 0
+    completed: List[PipelineRun] = []
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    async with LoopLagMonitor() as monitor:
+        start = time.perf_counter()
+        try:
+            completed = await runs()
+        except Exception as e:
+            errors += 1
+            print(f"  {phase} failed: {e}")
+        seconds = time.perf_counter() - start
+
+    write_seconds = sum(run.stages["write"].seconds for run in completed if "write" in run.stages)
+    return PhaseResult(
+        items=item_count,
+        phase=phase,
+        rows=sum(run.rows for run in completed),
+        seconds=seconds,
+        write_seconds=write_seconds,
+        peak_bytes=tracemalloc.get_traced_memory()[1] if trace_memory else None,
+        blocked_seconds=monitor.blocked,
+        worst_block_seconds=monitor.worst,
+        errors=errors,
+    )
+
+
+async def run_benchmark(
+    item_count: int,
+    ticks: int = 3,
+    config: Optional[StandinConfig] = None,
+    url: Optional[str] = None,
+    trace_memory: bool = True,
+) -> List[PhaseResult]:
+    """
+    Benchmark cold, steady-state and bucket ingestion for one item count.
+
+    Args:
+        item_count: Synthetic items served by the in-process stand-in
+        ticks: Steady-state price ticks to run after the cold sync
+        config: Stand-in behaviour (item_count is overridden)
+        url: Base URL of a running stand-in instead of an in-process one
+        trace_memory: Record per-phase peak allocations with tracemalloc
+
+    Returns:
+        One result per phase
+    """
+    config = config or StandinConfig()
+    config.item_count = item_count
+    wiki = SyntheticWiki(config)
+
+    if url is None:
+        wiki.render()
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(wiki)))
+        base_url = STANDIN_BASE_URL
+    else:
+        http = httpx.AsyncClient()
+        base_url = url.rstrip("/")
+
+    async def advance() -> None:
+        if url is None:
+            wiki.advance()
+            # Encode outside the measured window so the server's work is not counted
+            wiki.render()
+        else:
+            (await http.post(f"{base_url}/_standin/advance")).raise_for_status()
+
+    client = WikiAPIClient(http_client=http)
+    client.base_url = base_url
+    pipeline = IngestionPipeline(client)
+    results: List[PhaseResult] = []
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            SQLModel.metadata.create_all(engine)
+
+            with Session(engine) as session:
+
+                async def cold() -> List[PipelineRun]:
+                    return [await pipeline.run(session, include_mapping=True)]
+
+                async def steady() -> List[PipelineRun]:
+                    return [await pipeline.sync_prices(session)]
+
+                async def buckets() -> List[PipelineRun]:
+                    return [
+                        await pipeline.sync_buckets(session, "5m"),
+                        await pipeline.sync_buckets(session, "1h"),
+                    ]
+
+                results.append(await _measure(item_count, "cold", cold, trace_memory))
+                for tick in range(1, ticks + 1):
+                    await advance()
+                    results.append(await _measure(item_count, f"tick {tick}", steady, trace_memory))
+                results.append(await _measure(item_count, "buckets", buckets, trace_memory))
+
+            engine.dispose()
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        await http.aclose()
+    return results
+
+
+def format_results(results: List[PhaseResult]) -> str:
+    """
+    Render benchmark results as a fixed-width table.
+
+    Args:
+        results: Phase results from run_benchmark
+
+    Returns:
+        Table text including a header row
+    """
+    lines = [
+        f"{'items':>7} {'phase':<8} {'rows':>7} {'wall (s)':>9} {'items/s':>9} "
+        f"{'write (s)':>9} {'peak (MiB)':>10} {'blocked (ms)':>12} {'worst (ms)':>10} "
+        f"{'errors':>6}"
+    ]
+    for result in results:
+        peak = f"{result.peak_bytes / 2**20:.1f}" if result.peak_bytes is not None else "-"
+        lines.append(
+            f"{result.items:>7} {result.phase:<8} {result.rows:>7} {result.seconds:>9.3f} "
+            f"{result.items_per_second:>9.0f} {result.write_seconds:>9.3f} {peak:>10} "
+            f"{result.blocked_seconds * 1000:>12.1f} {result.worst_block_seconds * 1000:>10.1f} "
+            f"{result.errors:>6}"
+        )
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> None:
+    for item_count in args.items:
+        config = StandinConfig(
+            latency=args.latency,
+            error_rate=args.error_rate,
+            change_ratio=args.change_ratio,
+            seed=args.seed,
+        )
+        results = await run_benchmark(
+            item_count, args.ticks, config, url=args.url, trace_memory=not args.no_memory
+        )
+        print(format_results(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[4000, 20000, 100000])
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--change-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="Base URL of a running stand-in")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc")
+    asyncio.run(main(parser.parse_args()))
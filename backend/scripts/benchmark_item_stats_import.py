@@ -0,0 +1,157 @@
+"""Benchmark the OSRSBox item stats import in buffered and streaming modes.
+
+Generates a synthetic ``items-complete.json`` shaped like the OSRSBox dump
+(N entries with base64 icons, ~20% equipable), serves it in 64 KiB chunks
+through an in-process transport and times ``import_item_stats`` against a
+throwaway SQLite file database. Time is measured on an untraced run; peak
+memory is the tracemalloc high-water mark of Python allocations during a
+second, traced run.
+
+Usage:
+    python -m backend.scripts.benchmark_item_stats_import --entries 25000 --db-items 4000
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.models import Item
+from backend.services.item_stats import import_item_stats
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _entry(item_id: int, rng: random.Random) -> dict[str, Any]:
+    equipable = rng.random() < 0.2
+    entry: dict[str, Any] = {
+        "id": item_id,
+        "name": f"Item {item_id}",
+        "last_updated": "2021-09-01",
+        "members": rng.random() < 0.5,
+        "tradeable_on_ge": True,
+        "equipable": equipable,
+        "equipable_by_player": equipable,
+        "cost": rng.randint(1, 100000),
+        "weight": 1.0,
+        "examine": "A synthetic item used for benchmarking the stats import.",
+        "icon": base64.b64encode(rng.randbytes(900)).decode(),
+        "wiki_url": f"https://oldschool.runescape.wiki/w/Item_{item_id}",
+        "equipment": None,
+        "weapon": None,
+    }
+    if equipable:
+        entry["equipment"] = {
+            "slot": rng.choice(["head", "body", "legs", "weapon", "shield"]),
+            "attack_stab": rng.randint(0, 90),
+            "attack_slash": rng.randint(0, 90),
+            "melee_strength": rng.randint(0, 90),
+            "defence_stab": rng.randint(0, 90),
+            "requirements": None,
+        }
+        entry["requirements"] = {"attack": rng.randint(1, 99)}
+        entry["weapon"] = {"weapon_speed": 4, "weapon_type": "slash_sword", "stances": []}
+    return entry
+
+
+def build_document(entry_count: int, seed: int = 0) -> bytes:
+    """
+    Build a synthetic items-complete.json document.
+
+    Args:
+        entry_count: Number of item entries
+        seed: Random seed
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    rng = random.Random(seed)
+    return json.dumps(
+        {str(item_id): _entry(item_id, rng) for item_id in range(1, entry_count + 1)}
+    ).encode()
+
+
+def make_client(document: bytes) -> httpx.AsyncClient:
+    """Return an AsyncClient that serves ``document`` in fixed-size chunks."""
+
+    async def body() -> AsyncIterator[bytes]:
+        view = memoryview(document)
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield bytes(view[start : start + CHUNK_SIZE])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def run_benchmark(document: bytes, db_items: int, stream: bool) -> dict[str, float]:
+    """
+    Time one import of ``document`` into a fresh database.
+
+    Args:
+        document: Serialized items-complete.json
+        db_items: Number of Item rows seeded before the import
+        stream: Use the streaming import mode
+
+    Returns:
+        Elapsed seconds and tracemalloc peak in MiB
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            session.execute(
+                insert(Item.__table__),  # type: ignore[attr-defined]
+                [{"id": i, "name": f"Item {i}"} for i in range(1, db_items + 1)],
+            )
+            session.commit()
+
+            async with make_client(document) as client:
+                start = time.perf_counter()
+                await import_item_stats(session, stream=stream, client=client)
+                elapsed = time.perf_counter() - start
+
+                tracemalloc.start()
+                await import_item_stats(session, stream=stream, client=client)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        engine.dispose()
+    return {"seconds": elapsed, "peak_mib": peak / (1024 * 1024)}
+
+
+async def main(entry_count: int, db_items: int) -> None:
+    document = build_document(entry_count)
+    print(f"Document: {entry_count} entries, {len(document) / (1024 * 1024):.1f} MiB")
+    print(f"{'mode':>10} {'time (s)':>10} {'peak (MiB)':>12}")
+    for stream in (False, True):
+        result = await run_benchmark(document, db_items, stream)
+        mode = "streaming" if stream else "buffered"
+        print(f"{mode:>10} {result['seconds']:>10.2f} {result['peak_mib']:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=25000)
+    parser.add_argument("--db-items", type=int, default=4000)
+    args = parser.parse_args()
+    asyncio.run(main(args.entries, args.db_items))
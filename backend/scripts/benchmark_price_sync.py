@@ -0,0 +1,132 @@
+"""Benchmark the 5-minute price sync against a synthetic item universe.
+
+Seeds a throwaway SQLite file database with N items, then times
+the ingestion pipeline's price sync three times: against empty snapshots (insert pass),
+with every item changed (update pass) and with only a fraction of items
+changed (delta pass, the steady state every tick).
+
+Usage:
+    python -m backend.scripts.benchmark_price_sync --items 4000 40000 --change-rate 0.1
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.models import Item
+from backend.services.wiki.delta import PriceDeltaTracker
+from backend.services.wiki.pipeline import PIPELINE_COLUMNS, IngestionPipeline
+
+
+class SyntheticWikiClient:
+    """Stand-in for WikiAPIClient that serves generated /latest and /24h payloads."""
+
+    def __init__(self, item_count: int, seed: int = 0, changed_items: int | None = None) -> None:
+        self.item_count = item_count
+        self.seed = seed
+        # Items above this id keep the previous seed's values
+        self.changed_items = item_count if changed_items is None else changed_items
+
+    async def fetch_latest_prices(self, skip_unchanged: bool = False) -> dict[str, Any]:
+        """Return a /latest-shaped payload covering every synthetic item."""
+        data = {}
+        for item_id in range(1, self.item_count + 1):
+            seed = self.seed if item_id <= self.changed_items else self.seed - 1
+            now = 1_700_000_000 + seed
+            data[str(item_id)] = {
+                "high": 1000 + item_id + seed,
+                "low": 900 + item_id + seed,
+                "highTime": now,
+                "lowTime": now,
+            }
+        return {"data": data}
+
+    async def fetch_24h_prices(self, skip_unchanged: bool = False) -> dict[str, Any]:
+        """Return a /24h-shaped payload with volumes for every synthetic item."""
+        return {
+            "data": {
+                str(item_id): {"highPriceVolume": item_id * 10, "lowPriceVolume": item_id * 8}
+                for item_id in range(1, self.item_count + 1)
+            }
+        }
+
+    def invalidate(self, *endpoints: str) -> None:
+        """No cached validators to forget; every fetch is a full payload."""
+
+
+def _seed_items(session: Session, item_count: int) -> None:
+    session.execute(
+        insert(Item.__table__),  # type: ignore[attr-defined]
+        [
+            {"id": item_id, "name": f"Item {item_id}", "members": True, "limit": 100, "value": 1}
+            for item_id in range(1, item_count + 1)
+        ],
+    )
+    session.commit()
+
+
+async def run_benchmark(item_count: int, change_rate: float = 0.1) -> dict[str, float]:
+    """
+    Time insert, full update and delta passes of the price sync.
+
+    Args:
+        item_count: Number of synthetic items to sync
+        change_rate: Fraction of items changed in the delta pass
+
+    Returns:
+        Wall time in seconds for each pass
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+
+        timings: dict[str, float] = {}
+        tracker = PriceDeltaTracker(PIPELINE_COLUMNS)
+        passes = (
+            ("insert", 0, item_count),
+            ("update", 1, item_count),
+            ("delta", 2, int(item_count * change_rate)),
+        )
+        with Session(engine) as session:
+            _seed_items(session, item_count)
+
+            for label, seed, changed_items in passes:
+                client = SyntheticWikiClient(item_count, seed=seed, changed_items=changed_items)
+                start = time.perf_counter()
+                await IngestionPipeline(client, tracker).sync_prices(session)
+                timings[label] = time.perf_counter() - start
+
+        engine.dispose()
+    return timings
+
+
+async def main(item_counts: list[int], change_rate: float) -> None:
+    print(f"{'items':>8} {'insert (s)':>12} {'update (s)':>12} {'delta (s)':>12} {'items/s':>10}")
+    for item_count in item_counts:
+        timings = await run_benchmark(item_count, change_rate)
+        rate = item_count / timings["update"] if timings["update"] else 0.0
+        print(
+            f"{item_count:>8} {timings['insert']:>12.3f} {timings['update']:>12.3f} "
+            f"{timings['delta']:>12.3f} {rate:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[4000, 40000])
+    parser.add_argument("--change-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.change_rate))
@@ -0,0 +1,68 @@
+"""Export the price history to a memory-mapped columnar archive.
+
+Writes the last ``--days`` of price history on a fixed ``--step`` grid to
+``--out`` as NumPy ``.npy`` arrays (see ``backend.services.price_archive``)
+for offline analysis with ``PriceArchive`` or plain ``np.load(mmap_mode="r")``.
+
+Usage:
+    python -m backend.scripts.export_price_archive --out data/price_archive --days 30
+    python -m backend.scripts.export_price_archive --out /tmp/archive --days 7 --step 3600
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from backend.database import engine as default_engine
+from backend.services.price_archive import ArchiveInfo, export_price_archive
+
+
+def export_archive(
+    out: Path,
+    days: int,
+    step: int = 300,
+    now: Optional[int] = None,
+    engine: Optional[Engine] = None,
+) -> ArchiveInfo:
+    """
+    Export the last ``days`` of price history.
+
+    Args:
+        out: Archive directory
+        days: Days of history to export, ending now
+        step: Grid slot width in seconds
+        now: Current unix timestamp (wall clock if None)
+        engine: Database engine (the application's if None)
+
+    Returns:
+        Shape of the written archive
+    """
+    now = int(time.time()) if now is None else now
+    with Session(engine or default_engine) as session:
+        info = export_price_archive(session, out, now - days * 86400, now, step=step)
+    size = sum(path.stat().st_size for path in out.glob("*.npy"))
+    print(
+        f"Wrote {info.n_items} items x {info.n_times} slots ({info.rows} history rows) "
+        f"to {out} ({size / 1024 / 1024:.1f} MiB)"
+    )
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, required=True, help="Archive directory")
+    parser.add_argument("--days", type=int, default=30, help="Days of history to export")
+    parser.add_argument("--step", type=int, default=300, help="Grid slot width in seconds")
+    args = parser.parse_args()
+    export_archive(args.out, args.days, args.step)
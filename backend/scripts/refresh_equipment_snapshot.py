@@ -0,0 +1,74 @@
+"""Regenerate the bundled equipment-stats snapshot from a local OSRSBox dump.
+
+Reads a local copy of ``items-complete.json`` incrementally, keeps the
+entries equipable by the player and writes ``backend/data/equipment_stats.bin``,
+which startup applies instead of downloading the dump.
+
+Usage:
+    curl -LO https://raw.githubusercontent.com/osrsbox/osrsbox-db/master/docs/items-complete.json
+    python -m backend.scripts.refresh_equipment_snapshot --source items-complete.json
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import asyncio
+import hashlib
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.equipment_snapshot import (
+    SNAPSHOT_PATH,
+    build_snapshot,
+    write_snapshot,
+)
+from backend.services.item_stats import iter_json_object_items
+
+READ_SIZE = 64 * 1024
+
+
+async def _read_text(path: Path) -> AsyncIterator[str]:
+    with path.open("r", encoding="utf-8") as source:
+        while chunk := source.read(READ_SIZE):
+            yield chunk
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as source:
+        while chunk := source.read(READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def refresh_snapshot(source: Path, output: Path = SNAPSHOT_PATH) -> int:
+    """
+    Build the snapshot from ``source`` and write it to ``output``.
+
+    Args:
+        source: Local items-complete.json
+        output: Snapshot file to write
+
+    Returns:
+        Number of items in the snapshot
+    """
+    snapshot = await build_snapshot(
+        iter_json_object_items(_read_text(source)),
+        source=f"{source.name} sha256:{_sha256(source)}",
+    )
+    size = write_snapshot(snapshot, output)
+    print(f"Wrote {len(snapshot)} equipable items to {output} ({size / 1024:.1f} KiB)")
+    return len(snapshot)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, required=True, help="Local items-complete.json")
+    parser.add_argument("--output", type=Path, default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+    asyncio.run(refresh_snapshot(args.source, args.output))
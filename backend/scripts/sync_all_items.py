@@ -13,7 +13,8 @@ sys.path.insert(0, str(project_root))
 from sqlmodel import Session, select, func
 from backend.db.engine import engine
 from backend.models import Item
-from backend.services.wiki_client import WikiAPIClient
+from backend.services.wiki import WikiAPIClient
+from backend.services.wiki.pipeline import IngestionPipeline
 from backend.services.item_stats import import_item_stats
 
 
@@ -23,7 +24,7 @@ async def sync_all():
     print("Syncing Items and Equipment Stats")
     print("=" * 60)
 
-    wiki_client = WikiAPIClient()
+    pipeline = IngestionPipeline(WikiAPIClient())
 
     with Session(engine) as session:
         # Check current state
@@ -37,10 +38,10 @@ async def sync_all():
 
         # Sync items if needed
         if item_count == 0:
-            print("\n📥 Syncing items from Wiki API...")
-            await wiki_client.sync_items_to_db(session)
+            print("\n📥 Syncing items and prices from Wiki API...")
+            run = await pipeline.run(session, include_mapping=True)
             item_count = len(list(session.exec(select(Item)).all()))
-            print(f"✅ Synced {item_count} items")
+            print(f"✅ Synced {item_count} items ({run.summary()})")
         else:
             print(f"\n✓ Items already in database ({item_count} items)")
 
@@ -52,7 +53,7 @@ async def sync_all():
         if items_without_stats_count > 0:
             print("\n📊 Importing equipment stats from OSRSBox...")
             print(f"   (This may take 10-20 seconds for {items_without_stats_count} items)")
-            await import_item_stats(session)
+            await import_item_stats(session, stream=True)
 
             # Verify
             items_with_stats_after = len(
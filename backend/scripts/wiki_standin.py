@@ -0,0 +1,284 @@
+"""Local stand-in for the OSRS Wiki real-time prices API.
+
+Serves ``/mapping``, ``/latest``, ``/24h``, ``/5m`` and ``/1h`` under the same
+``/api/v1/osrs`` prefix as prices.runescape.wiki, so ingestion can be measured
+and load-tested without touching the real service. Payloads are generated for
+a synthetic item universe, or replayed verbatim from recorded JSON files.
+
+Each "tick" moves the prices of a configurable fraction of items, like the
+real /latest between two scheduler runs. Ticks advance on ``POST
+/api/v1/osrs/_standin/advance`` or, with ``--advance-on-latest``, on every
+/latest request after the first. Responses carry an ETag and honour
+If-None-Match, and latency and 503 errors can be injected.
+
+Usage:
+    python -m backend.scripts.wiki_standin --items 100000 --latency 0.05 --error-rate 0.01
+    WIKI_API_BASE=http://127.0.0.1:8800/api/v1/osrs uvicorn backend.main:app
+"""
+
+# ruff: noqa: E402
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI, HTTPException, Request, Response
+
+API_PREFIX = "/api/v1/osrs"
+
+STANDIN_ENDPOINTS = ("mapping", "latest", "24h", "5m", "1h")
+
+# Bucket width in seconds of the timeseries endpoints
+_BUCKET_WIDTHS = {"24h": 86400, "5m": 300, "1h": 3600}
+
+
+@dataclass
+class StandinConfig:
+    """Shape and behaviour of the stand-in API."""
+
+    item_count: int = 4000
+    latency: float = 0.0  # Seconds added before every response
+    error_rate: float = 0.0  # Fraction of requests answered with 503
+    change_ratio: float = 0.1  # Fraction of items whose prices move per tick
+    advance_on_latest: bool = False  # Start a new tick on every /latest after the first
+    seed: int = 0
+    replay_dir: Optional[Path] = None  # Directory of recorded <endpoint>.json payloads
+
+
+class SyntheticWiki:
+    """Generates Wiki payloads for a synthetic item universe.
+
+    Rendered bodies are cached per tick, so repeated requests for the same
+    endpoint cost one dict lookup and large universes only pay for JSON
+    encoding once per tick.
+    """
+
+    def __init__(self, config: StandinConfig) -> None:
+        self.config = config
+        self.tick = 0
+        self.requests: Counter[str] = Counter()
+        self._rng = random.Random(config.seed)
+        self._started = int(time.time())
+        self._high = [1000 + item_id * 7 for item_id in self.item_ids]
+        self._low = [price - 10 - price % 50 for price in self._high]
+        self._times = [self._started] * config.item_count
+        self._bodies: Dict[str, bytes] = {}
+        self._recorded = self._load_recordings(config.replay_dir)
+
+    @property
+    def item_ids(self) -> range:
+        """Ids of the synthetic items."""
+        return range(1, self.config.item_count + 1)
+
+    @staticmethod
+    def _load_recordings(replay_dir: Optional[Path]) -> Dict[str, bytes]:
+        if replay_dir is None:
+            return {}
+        return {
+            endpoint: (replay_dir / f"{endpoint}.json").read_bytes()
+            for endpoint in STANDIN_ENDPOINTS
+            if (replay_dir / f"{endpoint}.json").exists()
+        }
+
+    def advance(self) -> List[int]:
+        """
+        Start a new tick, moving the prices of ``change_ratio`` of the items.
+
+        Returns:
+            Ids of the items whose prices changed
+        """
+        count = min(int(self.config.item_count * self.config.change_ratio), self.config.item_count)
+        indexes = self._rng.sample(range(self.config.item_count), count)
+        now = int(time.time())
+        for index in indexes:
+            step = self._rng.choice((-1, 1)) * self._rng.randint(1, 20)
+            self._high[index] = max(2, self._high[index] + step)
+            self._low[index] = max(1, min(self._high[index] - 1, self._low[index] + step))
+            self._times[index] = now
+
+        self.tick += 1
+        self._bodies.clear()
+        return [index + 1 for index in indexes]
+
+    def body(self, endpoint: str, timestamp: Optional[int] = None) -> bytes:
+        """
+        Return the encoded payload for an endpoint at the current tick.
+
+        Args:
+            endpoint: One of STANDIN_ENDPOINTS
+            timestamp: Bucket start for /5m and /1h (latest completed bucket if None)
+
+        Returns:
+            JSON response body
+        """
+        if endpoint in self._recorded:
+            return self._recorded[endpoint]
+        if timestamp is None and endpoint in self._bodies:
+            return self._bodies[endpoint]
+
+        body = json.dumps(self.payload(endpoint, timestamp), separators=(",", ":")).encode()
+        if timestamp is None:
+            self._bodies[endpoint] = body
+        return body
+
+    def render(self) -> None:
+        """Encode every endpoint for the current tick ahead of the first request."""
+        for endpoint in STANDIN_ENDPOINTS:
+            self.body(endpoint)
+
+    def payload(self, endpoint: str, timestamp: Optional[int] = None) -> Any:
+        """
+        Build the decoded payload for an endpoint at the current tick.
+
+        Args:
+            endpoint: One of STANDIN_ENDPOINTS
+            timestamp: Bucket start for /5m and /1h (latest completed bucket if None)
+
+        Returns:
+            Payload in the shape the real API returns
+        """
+        if endpoint == "mapping":
+            return [
+                {
+                    "id": item_id,
+                    "name": f"Item {item_id}",
+                    "members": item_id % 2 == 0,
+                    "limit": 100 + item_id % 1000,
+                    "value": self._high[item_id - 1],
+                    "highalch": self._high[item_id - 1] * 3 // 5,
+                    "lowalch": self._high[item_id - 1] * 2 // 5,
+                    "examine": "A synthetic item.",
+                    "icon": f"Item {item_id}.png",
+                }
+                for item_id in self.item_ids
+            ]
+        if endpoint == "latest":
+            return {
+                "data": {
+                    str(item_id): {
+                        "high": self._high[item_id - 1],
+                        "highTime": self._times[item_id - 1],
+                        "low": self._low[item_id - 1],
+                        "lowTime": self._times[item_id - 1],
+                    }
+                    for item_id in self.item_ids
+                }
+            }
+        if endpoint in _BUCKET_WIDTHS:
+            return self._bucket_payload(endpoint, timestamp)
+        raise KeyError(endpoint)
+
+    def _bucket_payload(self, endpoint: str, timestamp: Optional[int]) -> Dict[str, Any]:
+        width = _BUCKET_WIDTHS[endpoint]
+        if timestamp is None:
+            timestamp = (int(time.time()) // width - 1) * width
+        bucket = timestamp // width
+
+        data = {}
+        for item_id in self.item_ids:
+            # Deterministic per item and bucket; roughly a third of items trade per bucket
+            traded = (item_id * 31 + bucket * 17) % 3 == 0 or endpoint == "24h"
+            if not traded:
+                continue
+            high_volume = (item_id * 13 + bucket) % 50 + 1
+            low_volume = (item_id * 7 + bucket) % 50 + 1
+            data[str(item_id)] = {
+                "avgHighPrice": self._high[item_id - 1],
+                "highPriceVolume": high_volume * (width // 300),
+                "avgLowPrice": self._low[item_id - 1],
+                "lowPriceVolume": low_volume * (width // 300),
+            }
+        return {"data": data, "timestamp": timestamp}
+
+
+def create_app(wiki: SyntheticWiki) -> FastAPI:
+    """
+    Build the stand-in ASGI application.
+
+    Args:
+        wiki: Payload source shared by every request
+
+    Returns:
+        FastAPI application serving the Wiki routes under API_PREFIX
+    """
+    app = FastAPI(title="OSRS Wiki prices stand-in")
+    app.state.wiki = wiki
+    errors = random.Random(wiki.config.seed + 1)
+
+    @app.post(f"{API_PREFIX}/_standin/advance")
+    async def advance() -> Dict[str, int]:
+        changed = wiki.advance()
+        return {"tick": wiki.tick, "changed": len(changed)}
+
+    @app.get(f"{API_PREFIX}/_standin/stats")
+    async def stats() -> Dict[str, Any]:
+        return {"tick": wiki.tick, "requests": dict(wiki.requests)}
+
+    @app.get(f"{API_PREFIX}/{{endpoint}}")
+    async def serve(endpoint: str, request: Request, timestamp: Optional[int] = None) -> Response:
+        if endpoint not in STANDIN_ENDPOINTS:
+            raise HTTPException(status_code=404, detail=f"Unknown endpoint: {endpoint}")
+
+        wiki.requests[endpoint] += 1
+        if wiki.config.latency:
+            await asyncio.sleep(wiki.config.latency)
+        if errors.random() < wiki.config.error_rate:
+            return Response(status_code=503)
+        if endpoint == "latest" and wiki.config.advance_on_latest and wiki.requests[endpoint] > 1:
+            wiki.advance()
+
+        body = wiki.body(endpoint, timestamp)
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if timestamp is None and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+
+    return app
+
+
+def main() -> None:
+    """Run the stand-in under uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--items", type=int, default=4000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--change-ratio", type=float, default=0.1)
+    parser.add_argument("--advance-on-latest", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", type=Path, default=None, help="Directory of <endpoint>.json")
+    args = parser.parse_args()
+
+    wiki = SyntheticWiki(
+        StandinConfig(
+            item_count=args.items,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            change_ratio=args.change_ratio,
+            advance_on_latest=args.advance_on_latest,
+            seed=args.seed,
+            replay_dir=args.replay,
+        )
+    )
+    wiki.render()
+    print(f"Serving {args.items} synthetic items at http://{args.host}:{args.port}{API_PREFIX}")
+    uvicorn.run(create_app(wiki), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Vectorized backtests of flip-ranking strategies over the price archive.
+
+Replays a ``PriceArchive`` (see ``backend.services.price_archive``) and
+simulates the flips a ranking strategy would have made. Every ``interval``
+the strategy scores all items at once with NumPy, the way
+``FlippingService.find_best_flips`` scores the current prices:
+
+- buy at the instant-sell price (low), sell at the instant-buy price (high)
+- margin is the post-tax spread, using the same tax as ``calculate_tax``
+- ROI is margin / sell price, volume is units traded over the trailing 24h
+
+It then buys the ``top_n`` best items and sells them ``hold`` seconds later
+at the high price of that time. Quantities are capped by the item's buy
+limit (times ``limit_fraction``), by a share of the units actually traded
+while the position was open (``fill_ratio``) and by the capital assigned to
+the position.
+
+Decisions at slot ``t`` only use data up to the end of that slot: the
+archive's prices at ``t`` are the last ones recorded in or before it, and
+fills are drawn from the volume of the following slots.
+
+Parameter sweeps run one strategy per worker process. Workers map the same
+archive files read-only, so the price grids are shared through the page
+cache rather than copied into each process.
+"""
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from itertools import product, repeat
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlmodel import Session, select
+
+from backend.models import Item
+from backend.services.flipping import BUY_LIMIT_WINDOW, VOLUME_WINDOW, calculate_tax_array
+from backend.services.price_archive import PriceArchive
+
+logger = logging.getLogger(__name__)
+
+RANKINGS = ("margin_x_volume", "roi", "potential_profit")
+
+# Items listed per strategy in the report
+TOP_ITEMS = 5
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    """One flip strategy to backtest.
+
+    ``min_roi``, ``min_volume`` and ``max_price`` mirror the filters of
+    ``find_best_flips`` (``max_price`` is its ``budget``); ``ranking`` picks
+    the score the top items are chosen by.
+    """
+
+    name: str = "default"
+    min_roi: float = 1.0  # Percent of the sell price
+    min_volume: int = 0  # Units traded over the trailing 24h
+    max_price: Optional[int] = None  # Skip items whose buy price exceeds this
+    ranking: str = "margin_x_volume"
+    top_n: int = 10
+    capital: int = 10_000_000  # GP split evenly across the top_n positions
+    limit_fraction: float = 1.0  # Share of the buy limit used per window
+    fill_ratio: float = 0.1  # Share of the traded units a position can get
+    interval: int = BUY_LIMIT_WINDOW  # Seconds between decisions
+    hold: int = 3600  # Seconds between buying and selling
+
+    def validate(self) -> None:
+        """
+        Check the parameters are consistent.
+
+        Raises:
+            ValueError: If a parameter is out of range
+        """
+        if self.ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {self.ranking!r}; expected one of {RANKINGS}")
+        if self.top_n < 1 or self.capital <= 0:
+            raise ValueError("top_n and capital must be positive")
+        if not 0 < self.limit_fraction <= 1 or not 0 < self.fill_ratio <= 1:
+            raise ValueError("limit_fraction and fill_ratio must be in (0, 1]")
+        if not 0 < self.hold <= self.interval:
+            # Overlapping positions would spend the same capital twice
+            raise ValueError("hold must be positive and no longer than interval")
+
+
+@dataclass
+class StrategyReport:
+    """Profit and loss of one backtested strategy."""
+
+    params: StrategyParams
+    start: int
+    end: int
+    steps: int = 0
+    trades: int = 0
+    wins: int = 0
+    invested: int = 0  # GP spent on buys over the whole run
+    profit: int = 0  # Post-tax GP
+    max_drawdown: int = 0  # Largest drop of cumulative profit from its peak
+    top_items: List[Tuple[int, int]] = field(default_factory=list)  # (item_id, profit)
+    seconds: float = 0.0
+
+    @property
+    def days(self) -> float:
+        """Length of the replayed range in days."""
+        return (self.end - self.start) / 86400
+
+    @property
+    def roi(self) -> float:
+        """Profit as a percentage of the GP invested."""
+        return self.profit * 100 / self.invested if self.invested else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Share of trades that made a profit, in percent."""
+        return self.wins * 100 / self.trades if self.trades else 0.0
+
+    @property
+    def profit_per_day(self) -> float:
+        """Average profit per replayed day."""
+        return self.profit / self.days if self.days else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as JSON-serializable values."""
+        data = asdict(self)
+        data.update(
+            days=round(self.days, 2),
+            roi=round(self.roi, 2),
+            win_rate=round(self.win_rate, 2),
+            profit_per_day=round(self.profit_per_day),
+        )
+        return data
+
+
+def load_buy_limits(session: Session, item_ids: Sequence[int]) -> np.ndarray:
+    """
+    Return the buy limit of each archived item, 0 where it is unknown.
+
+    Args:
+        session: Database session
+        item_ids: Item ids in archive order
+
+    Returns:
+        int64 array aligned with ``item_ids``
+    """
+    known = dict(session.exec(select(Item.id, Item.limit)).all())
+    return np.array([known.get(int(item_id)) or 0 for item_id in item_ids], dtype=np.int64)
+
+
+def _top(scores: np.ndarray, candidates: np.ndarray, n: int) -> np.ndarray:
+    """Return the ``n`` candidates with the highest score, best first."""
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-scores[candidates], n - 1)[:n]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def backtest(
+    archive: PriceArchive,
+    limits: np.ndarray,
+    params: StrategyParams,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> StrategyReport:
+    """
+    Replay the archive with one strategy.
+
+    Args:
+        archive: Price archive to replay
+        limits: Buy limit per archived item (see ``load_buy_limits``);
+            items without a known limit are never bought
+        params: Strategy to simulate
+        since: First decision time (archive start if None)
+        until: Positions must be closed before this (archive end if None)
+
+    Returns:
+        Profit and loss of the strategy
+
+    Raises:
+        ValueError: If the parameters are invalid
+    """
+    params.validate()
+    started = time.perf_counter()
+    high, low, volume = (archive.field(name) for name in ("high", "low", "volume"))
+    step = archive.step
+    interval_slots = max(1, params.interval // step)
+    hold_slots = max(1, params.hold // step)
+    window_slots = max(1, VOLUME_WINDOW // step)
+    slots = archive.slot_range(since, until)
+    per_position = params.capital // params.top_n
+    capped_limits = np.floor(limits * params.limit_fraction).astype(np.int64)
+
+    report = StrategyReport(
+        params=params,
+        start=archive.start + slots.start * step,
+        end=archive.start + slots.stop * step,
+    )
+    item_profit = np.zeros(len(limits), dtype=np.int64)
+    equity = peak = 0
+
+    for t in range(slots.start, slots.stop - hold_slots, interval_slots):
+        buy = np.asarray(low[:, t], dtype=np.int64)
+        sell = np.asarray(high[:, t], dtype=np.int64)
+        traded_24h = volume[:, max(0, t + 1 - window_slots) : t + 1].sum(axis=1, dtype=np.int64)
+
+        valid = (buy > 0) & (sell > 0) & (capped_limits > 0)
+        margin = sell - calculate_tax_array(sell) - buy
+        roi = np.divide(margin * 100.0, sell, out=np.zeros(len(sell)), where=valid)
+        eligible = valid & (roi >= params.min_roi) & (traded_24h >= params.min_volume)
+        if params.max_price is not None:
+            eligible &= buy <= params.max_price
+
+        if params.ranking == "roi":
+            scores = roi
+        elif params.ranking == "potential_profit":
+            scores = margin * np.minimum(capped_limits, traded_24h)
+        else:
+            scores = margin * traded_24h
+        chosen = _top(scores.astype(np.float64), np.flatnonzero(eligible), params.top_n)
+        report.steps += 1
+        if not len(chosen):
+            continue
+
+        exit_price = np.asarray(high[chosen, t + hold_slots], dtype=np.int64)
+        fills = volume[chosen, t + 1 : t + 1 + hold_slots].sum(axis=1, dtype=np.int64)
+        quantity = np.minimum.reduce(
+            [
+                capped_limits[chosen],
+                np.floor(fills * params.fill_ratio).astype(np.int64),
+                per_position // buy[chosen],
+            ]
+        )
+        quantity[exit_price <= 0] = 0
+        pnl = quantity * (exit_price - calculate_tax_array(exit_price) - buy[chosen])
+
+        opened = quantity > 0
+        report.trades += int(opened.sum())
+        report.wins += int((pnl > 0).sum())
+        report.invested += int((quantity * buy[chosen]).sum())
+        item_profit[chosen] += pnl
+        equity += int(pnl.sum())
+        peak = max(peak, equity)
+        report.max_drawdown = max(report.max_drawdown, peak - equity)
+
+    report.profit = equity
+    ranked = _top(item_profit.astype(np.float64), np.flatnonzero(item_profit), TOP_ITEMS)
+    report.top_items = [(int(archive.item_ids[i]), int(item_profit[i])) for i in ranked]
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def parameter_grid(base: StrategyParams, **options: Sequence[Any]) -> List[StrategyParams]:
+    """
+    Expand a base strategy into every combination of the given values.
+
+    Example:
+        ``parameter_grid(base, min_roi=[1, 2], ranking=["roi", "margin_x_volume"])``
+        returns four strategies named like ``min_roi=1 ranking=roi``.
+
+    Args:
+        base: Strategy supplying every parameter not swept
+        **options: Values to try per StrategyParams field
+
+    Returns:
+        One strategy per combination
+    """
+    names = list(options)
+    strategies = []
+    for values in product(*(options[name] for name in names)):
+        changes = dict(zip(names, values))
+        label = " ".join(f"{name}={value}" for name, value in changes.items()) or base.name
+        strategies.append(replace(base, name=label, **changes))
+    return strategies
+
+
+# Per-process state of sweep workers, set by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(path: str, limits: np.ndarray) -> None:
+    _worker["archive"] = PriceArchive(Path(path))
+    _worker["limits"] = limits
+
+
+def _run_worker(
+    params: StrategyParams, since: Optional[int], until: Optional[int]
+) -> StrategyReport:
+    return backtest(_worker["archive"], _worker["limits"], params, since, until)
+
+
+def run_sweep(
+    path: Path,
+    limits: np.ndarray,
+    strategies: Sequence[StrategyParams],
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> List[StrategyReport]:
+    """
+    Backtest several strategies over one archive, in parallel processes.
+
+    Args:
+        path: Archive directory
+        limits: Buy limit per archived item
+        strategies: Strategies to simulate
+        since: First decision time
+        until: Positions must be closed before this
+        workers: Worker processes (CPU count if None); 1 runs in this process
+
+    Returns:
+        One report per strategy, in the order given
+
+    Raises:
+        ValueError: If any strategy is invalid
+    """
+    for params in strategies:
+        params.validate()
+    started = time.perf_counter()
+    if workers == 1 or len(strategies) <= 1:
+        archive = PriceArchive(path)
+        reports = [backtest(archive, limits, params, since, until) for params in strategies]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(str(path), limits)
+        ) as pool:
+            reports = list(pool.map(_run_worker, strategies, repeat(since), repeat(until)))
+    logger.info(f"Backtested {len(strategies)} strategies in {time.perf_counter() - started:.2f}s")
+    return reports
+
+
+def format_report(reports: Sequence[StrategyReport]) -> str:
+    """
+    Render reports as a text table, most profitable first.
+
+    Args:
+        reports: Strategy reports
+
+    Returns:
+        Table with one line per strategy plus its best items
+    """
+    header = (
+        f"{'strategy':<40} {'trades':>7} {'win %':>6} {'invested':>15} "
+        f"{'profit':>13} {'roi %':>6} {'gp/day':>12} {'max dd':>12}"
+    )
+    lines = [header, "-" * len(header)]
+    for report in sorted(reports, key=lambda r: r.profit, reverse=True):
+        lines.append(
+            f"{report.params.name[:40]:<40} {report.trades:>7} {report.win_rate:>6.1f} "
+            f"{report.invested:>15,} {report.profit:>13,} {report.roi:>6.2f} "
+            f"{report.profit_per_day:>12,.0f} {report.max_drawdown:>12,}"
+        )
+        if report.top_items:
+            best = ", ".join(f"{item_id} ({profit:+,})" for item_id, profit in report.top_items)
+            lines.append(f"{'':<4}best items: {best}")
+    return "\n".join(lines)
@@ -0,0 +1,254 @@
+"""Bundled equipment-stats snapshot.
+
+A compact, versioned copy of the OSRSBox equipment stats for equipable items,
+checked in under ``backend/data`` so startup can populate item stats without
+downloading ``items-complete.json``. Regenerate it with
+``python -m backend.scripts.refresh_equipment_snapshot``.
+
+File layout (all integers little-endian)::
+
+    b"OSRSEQ"                 magic
+    uint16                    format version
+    uint32 + bytes            JSON header (metadata, columns, string table)
+    zlib stream               packed column arrays, in header column order
+
+Integer columns are packed as int32 arrays, booleans as int8 arrays and string
+columns as int16 indexes into the header string table (-1 for None).
+"""
+
+import array
+import hashlib
+import json
+import logging
+import struct
+import sys
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterable, Dict, Iterator, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from backend.models import Item
+from backend.services.item_stats import apply_item_stats, item_stats_row
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / "data" / "equipment_stats.bin"
+SNAPSHOT_FORMAT_VERSION = 1
+
+_MAGIC = b"OSRSEQ"
+_STRING_COLUMNS = ("slot", "quest_req")
+_BOOL_COLUMNS = ("is_2h",)
+_TYPECODES = {"int": "i", "bool": "b", "str": "h"}
+
+
+def _column_kind(column: str) -> str:
+    if column in _STRING_COLUMNS:
+        return "str"
+    if column in _BOOL_COLUMNS:
+        return "bool"
+    return "int"
+
+
+@dataclass
+class EquipmentSnapshot:
+    """Equipment stats for equipable items, stored column by column."""
+
+    ids: List[int]
+    columns: Dict[str, List[Any]]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield one ``apply_item_stats`` row per item."""
+        names = list(self.columns)
+        for index, item_id in enumerate(self.ids):
+            row = {"id": item_id}
+            for name in names:
+                row[name] = self.columns[name][index]
+            yield row
+
+
+async def build_snapshot(
+    entries: AsyncIterable[Tuple[str, Any]], source: Optional[str] = None
+) -> EquipmentSnapshot:
+    """
+    Build a snapshot from OSRSBox ``(item id, entry)`` pairs.
+
+    Args:
+        entries: Members of items-complete.json, e.g. from iter_json_object_items
+        source: Description of the source document recorded in the metadata
+
+    Returns:
+        Snapshot of every entry equipable by the player, ordered by item id
+    """
+    rows = []
+    async for str_id, stats in entries:
+        if isinstance(stats, dict) and stats.get("equipable_by_player"):
+            rows.append(item_stats_row(int(str_id), stats))
+    rows.sort(key=lambda row: row["id"])
+
+    names = [name for name in (rows[0] if rows else item_stats_row(0, {})) if name != "id"]
+    return EquipmentSnapshot(
+        ids=[row["id"] for row in rows],
+        columns={name: [row[name] for row in rows] for name in names},
+        metadata={
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "source": source,
+        },
+    )
+
+
+def write_snapshot(snapshot: EquipmentSnapshot, path: Path = SNAPSHOT_PATH) -> int:
+    """
+    Serialize a snapshot to disk.
+
+    Args:
+        snapshot: Snapshot to write
+        path: Destination file
+
+    Returns:
+        Size of the written file in bytes
+    """
+    strings: List[str] = sorted(
+        {value for name in _STRING_COLUMNS for value in snapshot.columns.get(name, []) if value}
+    )
+    string_index = {value: index for index, value in enumerate(strings)}
+
+    arrays = [array.array("i", snapshot.ids)]
+    columns = []
+    for name, values in snapshot.columns.items():
+        kind = _column_kind(name)
+        if kind == "str":
+            values = [string_index[value] if value else -1 for value in values]
+        arrays.append(array.array(_TYPECODES[kind], [int(value or 0) for value in values]))
+        columns.append({"name": name, "kind": kind})
+
+    if sys.byteorder != "little":
+        for packed in arrays:
+            packed.byteswap()
+    body = b"".join(packed.tobytes() for packed in arrays)
+
+    header = json.dumps(
+        {
+            **snapshot.metadata,
+            "rows": len(snapshot),
+            "columns": columns,
+            "strings": strings,
+            "body_sha256": hashlib.sha256(body).hexdigest(),
+        },
+        sort_keys=True,
+    ).encode()
+
+    data = (
+        _MAGIC
+        + struct.pack("<HI", SNAPSHOT_FORMAT_VERSION, len(header))
+        + header
+        + zlib.compress(body, 9)
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return len(data)
+
+
+def read_snapshot(path: Path = SNAPSHOT_PATH) -> Optional[EquipmentSnapshot]:
+    """
+    Read a snapshot from disk.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        The snapshot, or None if the file is missing or in an unsupported format
+    """
+    if not path.exists():
+        return None
+
+    data = path.read_bytes()
+    prefix = len(_MAGIC) + struct.calcsize("<HI")
+    if not data.startswith(_MAGIC) or len(data) < prefix:
+        logger.warning(f"{path} is not an equipment stats snapshot, ignoring it")
+        return None
+
+    version, header_size = struct.unpack_from("<HI", data, len(_MAGIC))
+    if version != SNAPSHOT_FORMAT_VERSION:
+        logger.warning(
+            f"Equipment snapshot format v{version} is not supported "
+            f"(expected v{SNAPSHOT_FORMAT_VERSION}), ignoring it"
+        )
+        return None
+
+    try:
+        header = json.loads(data[prefix : prefix + header_size])
+        body = zlib.decompress(data[prefix + header_size :])
+    except (ValueError, zlib.error) as e:
+        logger.warning(f"Equipment snapshot {path} is corrupt ({e}), ignoring it")
+        return None
+    if hashlib.sha256(body).hexdigest() != header.get("body_sha256"):
+        logger.warning(f"Equipment snapshot {path} failed its checksum, ignoring it")
+        return None
+
+    rows = header["rows"]
+    offset = 0
+
+    def take(typecode: str) -> array.array:
+        nonlocal offset
+        packed = array.array(typecode)
+        size = packed.itemsize * rows
+        packed.frombytes(body[offset : offset + size])
+        if sys.byteorder != "little":
+            packed.byteswap()
+        offset += size
+        return packed
+
+    ids = take("i").tolist()
+    strings = header["strings"]
+    columns: Dict[str, List[Any]] = {}
+    for column in header["columns"]:
+        values = take(_TYPECODES[column["kind"]])
+        if column["kind"] == "str":
+            columns[column["name"]] = [strings[i] if i >= 0 else None for i in values]
+        elif column["kind"] == "bool":
+            columns[column["name"]] = [bool(value) for value in values]
+        else:
+            columns[column["name"]] = values.tolist()
+
+    metadata = {
+        key: value
+        for key, value in header.items()
+        if key not in ("rows", "columns", "strings", "body_sha256")
+    }
+    return EquipmentSnapshot(ids=ids, columns=columns, metadata=metadata)
+
+
+def load_equipment_snapshot(session: Session, path: Path = SNAPSHOT_PATH) -> Optional[int]:
+    """
+    Apply the bundled equipment stats to items in the database.
+
+    Rows for items not in the database are dropped before the bulk update.
+    Commits the session.
+
+    Args:
+        session: Database session
+        path: Snapshot file
+
+    Returns:
+        Number of items updated, or None if no usable snapshot is available
+    """
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return None
+
+    known_ids = set(session.exec(select(Item.id)).all())
+    rows = [row for row in snapshot.rows() if row["id"] in known_ids]
+    count = apply_item_stats(session, rows)
+    session.commit()
+    logger.info(
+        f"Applied equipment stats for {count} items from snapshot "
+        f"generated {snapshot.metadata.get('generated_at')}"
+    )
+    return count
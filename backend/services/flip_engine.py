@@ -0,0 +1,153 @@
+"""In-memory flip opportunity engine.
+
+``FlippingService.get_flip_opportunities`` scores every matching item into a
+``FlipTable`` of NumPy columns on each call. Prices only change once per
+price sync, so the engine keeps one unfiltered table per sync instead. A
+request is then a vectorized filter over the columns plus an
+``argpartition`` top-k, and only the returned rows are turned into dicts.
+
+The table is tagged with the ``price_updates`` generation it was built at.
+The first request after a sync rebuilds it from its own session; requests
+arriving during the rebuild keep being served from the previous table
+instead of waiting. Results match ``get_flip_opportunities`` field for field.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Session
+
+from backend.services.flipping import FlipTable, decode_cursor, encode_cursor
+from backend.services.metrics import metrics
+from backend.services.price_events import PriceUpdates, price_updates
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FlipPage:
+    """One page of opportunities."""
+
+    rows: List[Dict[str, Any]]
+    next_cursor: Optional[str]  # None on the last page
+    generation: int  # Price generation of the table the rows came from
+
+
+class FlipEngine:
+    """Serves flip opportunities from a FlipTable rebuilt once per price sync."""
+
+    def __init__(self, updates: PriceUpdates = price_updates) -> None:
+        self._updates = updates
+        self._table: Optional[FlipTable] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the table so the next request rebuilds it."""
+        self._table = None
+
+    def table(self, session: Session, wait: bool = False) -> FlipTable:
+        """
+        Return a table for the current price generation, rebuilding if stale.
+
+        Only one caller rebuilds at a time. While it does, other callers get
+        the previous table if there is one, and wait otherwise.
+
+        Args:
+            session: Database session used for a rebuild
+            wait: Wait for a running rebuild instead of taking the previous table
+
+        Returns:
+            The current (or, during a rebuild without ``wait``, previous) table
+        """
+        table = self._table
+        generation = self._updates.generation
+        if table is not None and table.generation == generation:
+            return table
+        if not self._lock.acquire(blocking=wait or table is None):
+            return table  # type: ignore[return-value]
+        try:
+            table = self._table
+            if table is None or table.generation != generation:
+                started = time.perf_counter()
+                table = self._table = FlipTable.build(session, generation)
+                metrics.observe("flip_engine.rebuild.seconds", time.perf_counter() - started)
+                metrics.set_gauge("flip_engine.items", len(table))
+                logger.debug(f"Rebuilt flip table for generation {generation}: {len(table)} items")
+            return table
+        finally:
+            self._lock.release()
+
+    def opportunities(
+        self,
+        session: Session,
+        max_budget: Optional[int] = None,
+        min_roi: float = 1.0,
+        min_volume: int = 10,
+        exclude_members: bool = False,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find profitable flips, like ``FlippingService.get_flip_opportunities``.
+
+        Args:
+            session: Database session (only used to rebuild a stale table)
+            max_budget: Highest buy price
+            min_roi: Lowest ROI percentage
+            min_volume: Lowest combined high/low volume (ignored when 0)
+            exclude_members: Drop members-only items
+            limit: Most results returned
+
+        Returns:
+            Opportunity dicts sorted by margin x volume, then potential profit
+        """
+        table = self.table(session)
+        indices = table.select(max_budget, min_roi, min_volume, exclude_members, limit)
+        return [table.row(int(index)) for index in indices]
+
+    def page(
+        self,
+        session: Session,
+        max_budget: Optional[int] = None,
+        min_roi: float = 1.0,
+        min_volume: int = 10,
+        exclude_members: bool = False,
+        limit: int = 50,
+        sort: str = "margin_x_volume",
+        cursor: Optional[str] = None,
+    ) -> FlipPage:
+        """
+        Return one page of opportunities and the cursor of the next page.
+
+        Args:
+            session: Database session (only used to rebuild a stale table)
+            max_budget: Highest buy price
+            min_roi: Lowest ROI percentage
+            min_volume: Lowest combined high/low volume (ignored when 0)
+            exclude_members: Drop members-only items
+            limit: Most results returned
+            sort: Key of ``SORT_KEYS``
+            cursor: Cursor returned with the previous page (first page if None)
+
+        Returns:
+            The page
+
+        Raises:
+            ValueError: If the cursor is malformed or belongs to another sort
+        """
+        after = decode_cursor(cursor, sort) if cursor is not None else None
+        table = self.table(session)
+        # One extra row tells whether another page follows
+        indices = table.select(
+            max_budget, min_roi, min_volume, exclude_members, limit + 1, sort, after
+        )
+        rows = [table.row(int(index)) for index in indices[:limit]]
+        next_cursor = None
+        if len(indices) > limit:
+            next_cursor = encode_cursor(sort, table.position(int(indices[limit - 1]), sort))
+        return FlipPage(rows, next_cursor, table.generation)
+
+
+flip_engine = FlipEngine()
@@ -0,0 +1,125 @@
+"""Materialized flip metrics.
+
+``FlippingService.find_best_flips`` ranks every priced item by post-tax
+margin x 24h volume. Computing that score in the query meant repeating the
+tax expression in the select list, the filters and the ORDER BY, and sorting
+the whole item table on every call. Prices only change once per sync, so the
+score is computed there instead: the write stage of a price sync refreshes
+the ``flip_metrics`` rows of the items it changed (in the same transaction),
+and a mapping sync rebuilds the table. Both are a single
+``INSERT ... SELECT`` per chunk; no rows pass through Python.
+
+The scanner then reads ``flip_metrics`` in ``ix_flip_metrics_margin_x_volume``
+order and stops after its ``LIMIT``.
+"""
+
+import logging
+from typing import Collection, Optional
+
+from sqlalchemy import bindparam, text
+from sqlmodel import Session
+
+from backend.services.metrics import metrics
+from backend.services.wiki.bulk import PRICE_UPSERT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Tax: 2% of the sell price, capped at 5M, exempt under 50gp (see calculate_tax).
+# "limit" is a reserved keyword, so it must be quoted.
+_METRICS_SELECT = """
+    SELECT
+        item_id, members, buy_price, sell_price, margin_post_tax,
+        margin_post_tax * 100.0 / sell_price,
+        volume, buy_volume_24h, sell_volume_24h,
+        buy_volume_24h + sell_volume_24h,
+        margin_post_tax * (buy_volume_24h + sell_volume_24h),
+        buy_limit,
+        CASE WHEN buy_limit < volume THEN buy_limit ELSE volume END,
+        margin_post_tax * CASE WHEN buy_limit < volume THEN buy_limit ELSE volume END
+    FROM (
+        SELECT
+            i.id AS item_id,
+            i.members AS members,
+            i.low_price AS buy_price,
+            i.high_price AS sell_price,
+            (i.high_price - CASE
+                WHEN i.high_price < 50 THEN 0
+                WHEN i.high_price * 0.02 > 5000000 THEN 5000000
+                ELSE CAST(i.high_price * 0.02 AS INTEGER)
+            END) - i.low_price AS margin_post_tax,
+            COALESCE(ps.high_volume, 0) + COALESCE(ps.low_volume, 0) AS volume,
+            COALESCE(ps.buy_volume_24h, ps.low_volume, 0) AS buy_volume_24h,
+            COALESCE(ps.sell_volume_24h, ps.high_volume, 0) AS sell_volume_24h,
+            COALESCE(i."limit", 0) AS buy_limit
+        FROM item i
+        LEFT JOIN pricesnapshot ps ON ps.item_id = i.id
+        WHERE i.high_price > 0 AND i.low_price > 0 {item_filter}
+    ) AS priced
+"""
+
+_METRICS_INSERT = """
+    INSERT INTO flip_metrics (
+        item_id, members, buy_price, sell_price, margin_post_tax, roi,
+        volume, buy_volume_24h, sell_volume_24h, total_volume_24h,
+        margin_x_volume, buy_limit, flippable_quantity, potential_profit
+    )
+"""
+
+
+def refresh_flip_metrics(session: Session, item_ids: Optional[Collection[int]] = None) -> None:
+    """
+    Recompute the flip metrics of some or all items.
+
+    Must run after ``refresh_item_prices`` so the denormalized Item prices
+    are current. Items that lost a price lose their row. The caller is
+    responsible for committing the session.
+
+    Args:
+        session: Database session
+        item_ids: Only refresh these items (rebuild the whole table if None)
+    """
+    if item_ids is None:
+        session.execute(text("DELETE FROM flip_metrics"))
+        session.execute(text(_METRICS_INSERT + _METRICS_SELECT.format(item_filter="")))
+        metrics.inc("flip_metrics.rebuilds")
+        logger.debug("Rebuilt flip_metrics")
+        return
+
+    delete = text("DELETE FROM flip_metrics WHERE item_id IN :item_ids").bindparams(
+        bindparam("item_ids", expanding=True)
+    )
+    insert = text(
+        _METRICS_INSERT + _METRICS_SELECT.format(item_filter="AND i.id IN :item_ids")
+    ).bindparams(bindparam("item_ids", expanding=True))
+    ids = sorted(item_ids)
+    for start in range(0, len(ids), PRICE_UPSERT_CHUNK_SIZE):
+        chunk = {"item_ids": ids[start : start + PRICE_UPSERT_CHUNK_SIZE]}
+        session.execute(delete, chunk)
+        session.execute(insert, chunk)
+    metrics.inc("flip_metrics.refreshed_items", len(ids))
+
+
+def ensure_flip_metrics(session: Session) -> bool:
+    """
+    Build ``flip_metrics`` if it is empty but priced items exist.
+
+    Covers databases priced before the table existed and rows written
+    outside the sync pipeline. Commits when it builds.
+
+    Args:
+        session: Database session
+
+    Returns:
+        True if the table was built
+    """
+    if session.execute(text("SELECT 1 FROM flip_metrics LIMIT 1")).first() is not None:
+        return False
+    priced = session.execute(
+        text("SELECT 1 FROM item WHERE high_price > 0 AND low_price > 0 LIMIT 1")
+    ).first()
+    if priced is None:
+        return False
+    refresh_flip_metrics(session)
+    session.commit()
+    logger.info("Built flip_metrics from the current item prices")
+    return True
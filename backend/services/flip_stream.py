@@ -0,0 +1,298 @@
+"""Server-sent-event fan-out of flip opportunity changes.
+
+Each ``/flips/stream`` connection subscribes with its filters and gets its
+current top-N once. After every price sync the hub does one shared
+computation for all connections:
+
+- the ``FlipEngine`` table is rebuilt once (not one query per subscriber)
+- each distinct filter set is selected from it once
+- subscribers with the same filters and the same previous generation share
+  one delta, serialized once
+
+Only the items that entered, left or changed within a subscriber's top-N are
+pushed. Each subscriber has a bounded queue; one that falls behind is closed
+so it reconnects and starts again from a fresh snapshot instead of holding
+memory for ever.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlmodel import Session
+
+from backend.db.engine import engine as db_engine
+from backend.services.flip_engine import FlipEngine, flip_engine
+from backend.services.flipping import FlipTable
+from backend.services.metrics import metrics
+from backend.services.price_events import PriceTick, PriceUpdates, price_updates
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is considered too slow
+SUBSCRIBER_QUEUE_SIZE = 16
+
+# Idle time after which a comment line is sent so proxies keep the connection
+KEEPALIVE_SECONDS = 15.0
+
+Rows = Dict[int, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class StreamFilter:
+    """Filters of one subscription; equal filters share their selection."""
+
+    max_budget: Optional[int] = None
+    min_roi: float = 1.0
+    min_volume: int = 10
+    exclude_members: bool = False
+    limit: int = 50
+
+    def top(self, table: FlipTable) -> Rows:
+        """
+        Select the filtered top-N from a table.
+
+        Args:
+            table: Flip table
+
+        Returns:
+            Opportunity dicts by item id
+        """
+        indices = table.select(
+            self.max_budget, self.min_roi, self.min_volume, self.exclude_members, self.limit
+        )
+        rows = (table.row(int(index)) for index in indices)
+        return {row["item_id"]: row for row in rows}
+
+
+def format_event(event: str, generation: int, data: Dict[str, Any]) -> str:
+    """
+    Serialize one server-sent event.
+
+    Args:
+        event: Event name
+        generation: Price generation, sent as the event id
+        data: JSON payload
+
+    Returns:
+        Event text including the blank line that ends it
+    """
+    payload = json.dumps({"generation": generation, **data}, separators=(",", ":"))
+    return f"id: {generation}\nevent: {event}\ndata: {payload}\n\n"
+
+
+def diff_rows(previous: Rows, current: Rows) -> Dict[str, List[Any]]:
+    """
+    Compare two top-N selections.
+
+    Args:
+        previous: Rows the subscriber has
+        current: Rows it should have now
+
+    Returns:
+        ``entered`` and ``changed`` rows and the ``left`` item ids
+    """
+    return {
+        "entered": [row for item_id, row in current.items() if item_id not in previous],
+        "changed": [
+            row
+            for item_id, row in current.items()
+            if item_id in previous and previous[item_id] != row
+        ],
+        "left": [item_id for item_id in previous if item_id not in current],
+    }
+
+
+@dataclass(eq=False)
+class FlipSubscription:
+    """One connected client."""
+
+    filters: StreamFilter
+    rows: Rows
+    generation: int
+    queue: "asyncio.Queue[Optional[str]]" = field(
+        default_factory=lambda: asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+    )
+
+    def push(self, event: Optional[str]) -> bool:
+        """
+        Queue an event without blocking.
+
+        Args:
+            event: Event text, or None to end the stream
+
+        Returns:
+            False if the queue was full and the stream was ended instead
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class FlipStreamHub:
+    """Computes flip deltas once per price sync and fans them out."""
+
+    def __init__(
+        self,
+        engine: FlipEngine = flip_engine,
+        updates: PriceUpdates = price_updates,
+        session_factory: Callable[[], Session] = lambda: Session(db_engine),
+    ) -> None:
+        self._engine = engine
+        self._updates = updates
+        self._session_factory = session_factory
+        self._subscribers: Set[FlipSubscription] = set()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._unlisten: Optional[Callable[[], None]] = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, filters: StreamFilter, table: FlipTable) -> FlipSubscription:
+        """
+        Register a client and queue its snapshot event.
+
+        Must be called on the event loop that serves the stream. The first
+        subscriber starts the hub's task on that loop.
+
+        Args:
+            filters: Client filters
+            table: Current flip table, used for the snapshot
+
+        Returns:
+            The subscription
+        """
+        rows = filters.top(table)
+        subscription = FlipSubscription(filters, rows, table.generation)
+        snapshot = format_event("snapshot", table.generation, {"rows": list(rows.values())})
+        subscription.push(snapshot)
+        self._subscribers.add(subscription)
+        if self._task is None:
+            loop = asyncio.get_running_loop()
+            wake = self._wake = asyncio.Event()
+
+            def wake_up(tick: PriceTick) -> None:
+                # Ticks are published on the writer thread
+                loop.call_soon_threadsafe(wake.set)
+
+            self._unlisten = self._updates.subscribe(wake_up)
+            self._task = loop.create_task(self._run())
+        metrics.set_gauge("flips.stream.subscribers", len(self._subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: FlipSubscription) -> None:
+        """
+        Remove a client; the last one stops the hub's task.
+
+        Args:
+            subscription: Subscription returned by ``subscribe``
+        """
+        self._subscribers.discard(subscription)
+        metrics.set_gauge("flips.stream.subscribers", len(self._subscribers))
+        if self._subscribers or self._task is None:
+            return
+        if self._unlisten is not None:
+            self._unlisten()
+        self._task.cancel()
+        self._task = self._wake = self._unlisten = None
+
+    async def events(
+        self, subscription: FlipSubscription, keepalive: float = KEEPALIVE_SECONDS
+    ) -> AsyncIterator[str]:
+        """
+        Yield a subscription's events until it ends; then unsubscribe it.
+
+        Args:
+            subscription: Subscription returned by ``subscribe``
+            keepalive: Idle seconds before a keep-alive comment is sent
+
+        Yields:
+            Server-sent event text
+        """
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    async def _run(self) -> None:
+        """Fan out a delta whenever a price sync is published."""
+        assert self._wake is not None
+        wake = self._wake
+        while True:
+            await wake.wait()
+            wake.clear()
+            try:
+                table = await asyncio.to_thread(self._current_table)
+                self.fan_out(table)
+            except Exception as e:
+                logger.error(f"Flip stream update failed: {e}")
+
+    def _current_table(self) -> FlipTable:
+        # Wait out a rebuild started by a request: the previous table has the
+        # subscribers' generation, so fanning it out would drop this sync
+        with self._session_factory() as session:
+            return self._engine.table(session, wait=True)
+
+    def fan_out(self, table: FlipTable) -> int:
+        """
+        Push the changes since each subscriber's last generation.
+
+        Args:
+            table: Flip table to compare against
+
+        Returns:
+            Number of delta events queued
+        """
+        started = time.perf_counter()
+        groups: Dict[Tuple[StreamFilter, int], List[FlipSubscription]] = defaultdict(list)
+        for subscription in self._subscribers:
+            if subscription.generation != table.generation:
+                groups[(subscription.filters, subscription.generation)].append(subscription)
+
+        selections: Dict[StreamFilter, Rows] = {}
+        sent = 0
+        for (filters, _), members in groups.items():
+            if filters not in selections:
+                selections[filters] = filters.top(table)
+            current = selections[filters]
+            # Members saw the same selection at the same generation
+            delta = diff_rows(members[0].rows, current)
+            event = format_event("delta", table.generation, delta) if any(delta.values()) else None
+            for subscription in members:
+                subscription.rows = current
+                subscription.generation = table.generation
+                if event is None:
+                    continue
+                if subscription.push(event):
+                    sent += 1
+                else:
+                    metrics.inc("flips.stream.dropped_subscribers")
+
+        metrics.inc("flips.stream.events", sent)
+        metrics.observe("flips.stream.fan_out.seconds", time.perf_counter() - started)
+        logger.debug(
+            f"Flip stream generation {table.generation}: {len(selections)} filter sets, "
+            f"{sent} events"
+        )
+        return sent
+
+
+flip_stream = FlipStreamHub()
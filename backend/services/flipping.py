@@ -1,14 +1,27 @@
 """Flipping service for calculating profit margins."""
 
-from typing import Dict, List, Optional
-from sqlmodel import Session, select, text
-from sqlalchemy import func
+import base64
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlmodel import Session, col, text
+from sqlalchemy import func, select
 from pydantic import BaseModel
 from backend.models import Item, PriceSnapshot
+from backend.services.flip_metrics import ensure_flip_metrics
+from backend.services.price_buckets import recent_window_stats
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Grand Exchange buy limits reset every four hours
+BUY_LIMIT_WINDOW = 4 * 3600
+
+# Trailing window of the 24h volumes, the volume filter and the margin x volume ranking
+VOLUME_WINDOW = 86400
+
 
 def calculate_tax(sell_price: int) -> int:
     """
@@ -25,6 +38,24 @@ def calculate_tax(sell_price: int) -> int:
     return min(tax, 5_000_000)
 
 
+def calculate_tax_array(sell_prices: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``calculate_tax`` over an array of sell prices.
+
+    Uses the same float product and truncation, so every element equals
+    ``calculate_tax`` of the corresponding price.
+
+    Args:
+        sell_prices: Integer sell prices
+
+    Returns:
+        int64 array of taxes
+    """
+    sell_prices = np.asarray(sell_prices, dtype=np.int64)
+    tax = np.minimum((sell_prices * 0.02).astype(np.int64), 5_000_000)
+    return np.where(sell_prices < 50, 0, tax)
+
+
 class FlipOpportunity(BaseModel):
     """Pydantic model for flip opportunity results."""
 
@@ -39,6 +70,7 @@ class FlipOpportunity(BaseModel):
     sell_volume_24h: Optional[int] = None
     total_volume_24h: Optional[int] = None
     margin_x_volume: Optional[float] = None
+    volume_1h: Optional[int] = None  # Units traded over the last hour, from /5m buckets
     potential_profit: Optional[float] = None
     limit: Optional[int] = None
     tax: Optional[int] = None
@@ -46,125 +78,343 @@ class FlipOpportunity(BaseModel):
     wiki_url: Optional[str] = None
 
 
-class FlippingService:
-    def __init__(self, session: Session):
-        self.session = session
+# Orderings of FlipTable.select: descending by these columns, then by item id
+SORT_KEYS: Dict[str, Tuple[str, ...]] = {
+    "margin_x_volume": ("margin_x_volume", "potential_profit"),
+    "margin": ("margin",),
+    "roi": ("roi",),
+    "potential_profit": ("potential_profit",),
+}
 
-    def get_flip_opportunities(
+
+def encode_cursor(sort: str, position: Sequence[Any]) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+
+    Args:
+        sort: Key of ``SORT_KEYS`` the position belongs to
+        position: ``FlipTable.position`` of the last returned row
+
+    Returns:
+        Cursor string
+    """
+    payload = json.dumps([sort, *position], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, ...]:
+    """
+    Decode a cursor made by ``encode_cursor`` for the same sort.
+
+    Args:
+        cursor: Cursor string
+        sort: Sort of the page being requested
+
+    Returns:
+        Keyset position
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(decoded, list) or not decoded or decoded[0] != sort:
+        raise ValueError(f"Cursor does not belong to sort {sort!r}")
+    position = tuple(decoded[1:])
+    numbers = all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) for value in position
+    )
+    if len(position) != len(SORT_KEYS[sort]) + 1 or not numbers:
+        raise ValueError("Malformed cursor")
+    if not isinstance(position[-1], int):
+        raise ValueError("Malformed cursor")
+    return position
+
+
+def _column(values: List[Optional[int]]) -> np.ndarray:
+    return np.array([value or 0 for value in values], dtype=np.int64)
+
+
+def _known(values: List[Optional[int]]) -> np.ndarray:
+    return np.array([value is not None for value in values], dtype=bool)
+
+
+@dataclass(frozen=True)
+class FlipTable:
+    """Flip metrics of priced items as NumPy columns, ordered by item id."""
+
+    generation: int
+    built_at: float
+    item_id: np.ndarray
+    name: List[str]
+    icon_url: List[Optional[str]]
+    buy_price: np.ndarray
+    sell_price: np.ndarray
+    tax: np.ndarray
+    margin: np.ndarray
+    roi: np.ndarray
+    volume: np.ndarray
+    high_volume: np.ndarray
+    low_volume: np.ndarray
+    buy_volume_24h: np.ndarray
+    sell_volume_24h: np.ndarray
+    has_buy_volume_24h: np.ndarray
+    has_sell_volume_24h: np.ndarray
+    margin_x_volume: np.ndarray  # 0 where no 24h volume is known
+    potential_profit: np.ndarray
+    limit: np.ndarray
+    members: np.ndarray
+    valid: np.ndarray  # Both prices positive
+
+    def __len__(self) -> int:
+        return len(self.item_id)
+
+    @classmethod
+    def build(
+        cls,
+        session: Session,
+        generation: int = 0,
+        max_budget: Optional[int] = None,
+        min_volume: int = 0,
+    ) -> "FlipTable":
+        """
+        Compute the metrics of every item with a current high and low price.
+
+        Reads the raw columns with one projection query; no ORM objects are
+        built. ``max_budget`` and ``min_volume`` prefilter in SQL with the
+        semantics of ``select``.
+
+        Args:
+            session: Database session
+            generation: Price generation the data belongs to
+            max_budget: Only items buyable for at most this much
+            min_volume: Only items with at least this combined high/low volume
+
+        Returns:
+            The table
+        """
+        # Eleven columns: more than sqlmodel's typed select overloads take
+        stmt = (
+            select(
+                col(Item.id),
+                col(Item.name),
+                col(Item.icon_url),
+                col(Item.limit),
+                col(Item.members),
+                col(PriceSnapshot.high_price),
+                col(PriceSnapshot.low_price),
+                col(PriceSnapshot.high_volume),
+                col(PriceSnapshot.low_volume),
+                col(PriceSnapshot.buy_volume_24h),
+                col(PriceSnapshot.sell_volume_24h),
+            )
+            .join(PriceSnapshot, col(Item.id) == col(PriceSnapshot.item_id))
+            .where(
+                col(PriceSnapshot.high_price).is_not(None),
+                col(PriceSnapshot.low_price).is_not(None),
+            )
+            .order_by(col(Item.id))
+        )
+        if max_budget is not None:
+            stmt = stmt.where(col(PriceSnapshot.low_price) <= max_budget)
+        if min_volume > 0:
+            total_volume = func.coalesce(col(PriceSnapshot.high_volume), 0) + func.coalesce(
+                col(PriceSnapshot.low_volume), 0
+            )
+            stmt = stmt.where(total_volume >= min_volume)
+        rows = session.execute(stmt).all()
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in range(11)]
+        ids, names, icons, limits, members, high, low = columns[:7]
+        high_vol, low_vol, buy_24h, sell_24h = columns[7:]
+
+        buy_price = _column(low)
+        sell_price = _column(high)
+        tax = calculate_tax_array(sell_price)
+        margin = sell_price - tax - buy_price
+        valid = (buy_price > 0) & (sell_price > 0)
+        roi = np.divide(margin, buy_price, out=np.zeros(len(margin)), where=buy_price > 0) * 100
+        high_volume, low_volume = _column(high_vol), _column(low_vol)
+        volume = high_volume + low_volume
+        has_buy, has_sell = _known(buy_24h), _known(sell_24h)
+        total_24h = _column(buy_24h) + _column(sell_24h)
+        limit = _column(limits)
+        quantity = np.where((limit > 0) & (volume > 0), np.minimum(limit, volume), 0)
+
+        return cls(
+            generation=generation,
+            built_at=time.time(),
+            item_id=np.array(ids, dtype=np.int64),
+            name=names,
+            icon_url=icons,
+            buy_price=buy_price,
+            sell_price=sell_price,
+            tax=tax,
+            margin=margin,
+            roi=roi,
+            volume=volume,
+            high_volume=high_volume,
+            low_volume=low_volume,
+            buy_volume_24h=_column(buy_24h),
+            sell_volume_24h=_column(sell_24h),
+            has_buy_volume_24h=has_buy,
+            has_sell_volume_24h=has_sell,
+            margin_x_volume=np.where(has_buy | has_sell, margin * total_24h, 0),
+            potential_profit=margin * quantity,
+            limit=limit,
+            members=np.array(members, dtype=bool),
+            valid=valid,
+        )
+
+    def select(
         self,
         max_budget: Optional[int] = None,
         min_roi: float = 1.0,
         min_volume: int = 10,
+        exclude_members: bool = False,
         limit: int = 50,
-    ) -> List[Dict]:
+        sort: str = "margin_x_volume",
+        after: Optional[Sequence[Any]] = None,
+    ) -> np.ndarray:
         """
-        Find profitable flips based on filters.
-        Optimized to perform heavy filtering in SQL where possible.
-        """
-        # Start query
-        query = select(Item, PriceSnapshot).join(
-            PriceSnapshot,
-            Item.id == PriceSnapshot.item_id,  # type: ignore[arg-type]
-        )
+        Return the row indices of the best opportunities, best first.
 
-        # Filter: Must have valid prices
-        query = query.where(PriceSnapshot.high_price.is_not(None))  # type: ignore[union-attr]
-        query = query.where(PriceSnapshot.low_price.is_not(None))  # type: ignore[union-attr]
+        Filters are those of ``get_flip_opportunities``. Rows are ordered by
+        the ``SORT_KEYS`` columns of ``sort``, descending, then by item id.
+        ``after`` resumes behind a row by comparing keys (keyset
+        pagination), so a deep page costs the same as the first one.
 
-        # Filter: Max Budget (using low_price as buy price)
-        if max_budget is not None:
-            query = query.where(PriceSnapshot.low_price <= max_budget)  # type: ignore[operator]
+        Args:
+            max_budget: Highest buy price
+            min_roi: Lowest ROI percentage
+            min_volume: Lowest combined high/low volume (ignored when 0)
+            exclude_members: Drop members-only items
+            limit: Most rows returned
+            sort: Key of ``SORT_KEYS``
+            after: ``position`` of the last row already returned
 
-        # Filter: Volume (sum of high/low volume)
-        # Only apply volume filter if min_volume > 0 and volume data exists
-        # Since volume data may not be available, we skip this filter if min_volume is 0
+        Returns:
+            Row indices into the table's columns
+        """
+        keys = [getattr(self, name) for name in SORT_KEYS[sort]]
+        mask = self.valid & (self.roi >= min_roi)
+        if max_budget is not None:
+            mask &= self.buy_price <= max_budget
         if min_volume > 0:
-            total_volume = func.coalesce(PriceSnapshot.high_volume, 0) + func.coalesce(
-                PriceSnapshot.low_volume, 0
-            )  # type: ignore[operator]
-            query = query.where(total_volume >= min_volume)  # type: ignore
+            mask &= self.volume >= min_volume
+        if exclude_members:
+            mask &= ~self.members
+        if after is not None:
+            *values, last_id = after
+            later = self.item_id > last_id
+            for column, value in reversed(list(zip(keys, values))):
+                later = (column < value) | ((column == value) & later)
+            mask &= later
+        candidates = np.flatnonzero(mask)
+        if limit <= 0 or not len(candidates):
+            return candidates[:0]
+
+        primary = keys[0][candidates]
+        if len(candidates) > limit:
+            # Keep everything tied with the k-th best so the later keys decide
+            kth = primary[np.argpartition(-primary, limit - 1)[:limit]].min()
+            candidates = candidates[primary >= kth]
+        order = np.lexsort(
+            (self.item_id[candidates], *(-column[candidates] for column in reversed(keys)))
+        )
+        return candidates[order][:limit]
 
-        results = self.session.exec(query).all()
-        opportunities = []
+    def position(self, index: int, sort: str = "margin_x_volume") -> Tuple[Any, ...]:
+        """
+        Return the keyset position of a row: its sort key values and item id.
 
-        for item, price in results:
-            buy_price = price.low_price
-            sell_price = price.high_price
+        Args:
+            index: Row index
+            sort: Key of ``SORT_KEYS``
 
-            # Skip invalid prices (e.g. 0 or negative)
-            if not buy_price or not sell_price or buy_price <= 0 or sell_price <= 0:
-                continue
+        Returns:
+            Values to pass as ``select(after=...)``
+        """
+        values = tuple(getattr(self, name)[index].item() for name in SORT_KEYS[sort])
+        return (*values, int(self.item_id[index]))
 
-            # Calculate Tax
-            tax = calculate_tax(sell_price)
-            post_tax_revenue = sell_price - tax
-            margin = post_tax_revenue - buy_price
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Return one row in the ``get_flip_opportunities`` format.
 
-            # Calculate ROI (Return on Investment: margin / buy_price * 100)
-            roi = margin / buy_price * 100 if buy_price > 0 else 0
+        Args:
+            index: Row index
 
-            if roi < min_roi:
-                continue
+        Returns:
+            Opportunity dict
+        """
+        has_buy = bool(self.has_buy_volume_24h[index])
+        has_sell = bool(self.has_sell_volume_24h[index])
+        buy_24h = int(self.buy_volume_24h[index]) if has_buy else None
+        sell_24h = int(self.sell_volume_24h[index]) if has_sell else None
+        known_24h = has_buy or has_sell
+        return {
+            "item_id": int(self.item_id[index]),
+            "item_name": self.name[index],
+            "icon_url": self.icon_url[index],
+            "buy_price": int(self.buy_price[index]),
+            "sell_price": int(self.sell_price[index]),
+            "limit": int(self.limit[index]),
+            "volume": int(self.volume[index]),
+            "buy_volume_24h": buy_24h,
+            "sell_volume_24h": sell_24h,
+            "total_volume_24h": (buy_24h or 0) + (sell_24h or 0) if known_24h else None,
+            "margin_x_volume": int(self.margin_x_volume[index]) if known_24h else None,
+            "margin": int(self.margin[index]),
+            "tax": int(self.tax[index]),
+            "roi": round(float(self.roi[index]), 2),
+            "potential_profit": int(self.potential_profit[index]),
+        }
 
-            # Volume calculations
-            buy_vol_24h = price.buy_volume_24h
-            sell_vol_24h = price.sell_volume_24h
-            total_vol_24h = (
-                (buy_vol_24h or 0) + (sell_vol_24h or 0)
-                if (buy_vol_24h is not None or sell_vol_24h is not None)
-                else None
-            )
 
-            # Margin x Volume (GE Tracker style)
-            margin_x_volume = margin * (total_vol_24h or 0) if total_vol_24h is not None else None
+class FlippingService:
+    def __init__(self, session: Session):
+        self.session = session
 
-            # Potential Profit - use MIN(limit, volume) since you can't flip more than available volume
-            item_limit = item.limit or 0
-            available_volume = (price.high_volume or 0) + (price.low_volume or 0)
-            flippable_quantity = (
-                min(item_limit, available_volume) if item_limit > 0 and available_volume > 0 else 0
-            )
-            potential_profit = margin * flippable_quantity
+    def get_flip_opportunities(
+        self,
+        max_budget: Optional[int] = None,
+        min_roi: float = 1.0,
+        min_volume: int = 10,
+        limit: int = 50,
+    ) -> List[Dict]:
+        """
+        Find profitable flips based on filters.
 
-            opportunities.append(
-                {
-                    "item_id": item.id,
-                    "item_name": item.name,
-                    "icon_url": item.icon_url,
-                    "buy_price": buy_price,
-                    "sell_price": sell_price,
-                    "limit": item_limit,
-                    "volume": (price.high_volume or 0) + (price.low_volume or 0),
-                    "buy_volume_24h": buy_vol_24h,
-                    "sell_volume_24h": sell_vol_24h,
-                    "total_volume_24h": total_vol_24h,
-                    "margin_x_volume": margin_x_volume,
-                    "margin": margin,
-                    "tax": tax,
-                    "roi": round(roi, 2),
-                    "potential_profit": potential_profit,
-                }
-            )
+        Budget and volume filter in SQL; tax, margin, ROI, margin x volume
+        and potential profit are computed over NumPy columns and the top
+        ``limit`` rows are picked with ``argpartition``. Only those rows are
+        turned into dicts.
 
-        # Sort by Margin x Volume descending (GE Tracker style), then by potential_profit
-        opportunities.sort(
-            key=lambda x: (
-                x["margin_x_volume"] if x["margin_x_volume"] is not None else 0,
-                x["potential_profit"] or 0,
-            ),
-            reverse=True,
-        )
+        Args:
+            max_budget: Highest buy price
+            min_roi: Lowest ROI percentage (margin / buy price)
+            min_volume: Lowest combined high/low volume (ignored when 0)
+            limit: Most results returned
 
-        return opportunities[:limit]
+        Returns:
+            Opportunity dicts sorted by margin x volume, then potential profit
+        """
+        table = FlipTable.build(self.session, max_budget=max_budget, min_volume=min_volume)
+        indices = table.select(max_budget, min_roi, min_volume, limit=limit)
+        return [table.row(int(index)) for index in indices]
 
     def find_best_flips(
         self, budget: int, min_roi: float, min_volume: int, exclude_members: bool = False
     ) -> List[FlipOpportunity]:
         """
-        Find best flip opportunities using optimized SQL query.
+        Find best flip opportunities from the materialized ``flip_metrics`` table.
 
-        This method performs all calculations in the database layer for maximum performance.
-        No Python loops - all filtering and calculations happen in SQL.
+        Margins, ROI and volumes are computed once per price sync (see
+        ``backend.services.flip_metrics``), so this is a walk down the
+        margin x volume index that stops after 100 matching rows.
 
         Args:
             budget: Maximum budget in GP
@@ -175,87 +425,46 @@ class FlippingService:
         Returns:
             List of FlipOpportunity models sorted by margin x volume
         """
-        # Build optimized SQL query that does all calculations in the database
-        # Using raw SQL for maximum performance and to avoid Python loops
-
-        # Calculate margin_post_tax: (high_price - tax) - low_price
-        # Tax is 2% of sell price, capped at 5,000,000 gp, exempt for items under 50gp
-        # Formula: high_price - MIN(high_price * 0.02, 5000000) - low_price
-        # For items under 50gp, tax is 0
+        ensure_flip_metrics(self.session)
 
         # Build WHERE clause conditions
         where_conditions = [
-            "i.high_price IS NOT NULL",
-            "i.low_price IS NOT NULL",
-            "i.low_price > 0",
-            "i.high_price > 0",
-            "i.low_price <= :budget",
+            "fm.buy_price <= :budget",
+            "fm.total_volume_24h >= :min_volume",
+            "fm.roi >= :min_roi",
         ]
 
         # Add members filter if needed
         if exclude_members:
-            where_conditions.append("i.members = 0")
+            where_conditions.append("fm.members = 0")
 
         where_clause = " AND ".join(where_conditions)
 
-        # Use MIN instead of LEAST for SQLite compatibility
-        # Note: "limit" is a reserved keyword in SQLite, so we need to escape it with quotes
-        # Tax calculation: 2% of sell price, capped at 5M, exempt for items under 50gp
         # ROI calculation: margin / sell_price * 100 (GE Tracker style)
         # Margin x Volume: margin * (buy_volume_24h + sell_volume_24h)
         sql_query = text(
             f"""
             SELECT
-                i.id as item_id,
+                fm.item_id,
                 i.name,
-                i.low_price as buy_price,
-                i.high_price as sell_price,
-                (i.high_price - CASE
-                    WHEN i.high_price < 50 THEN 0
-                    WHEN i.high_price * 0.02 > 5000000 THEN 5000000
-                    ELSE CAST(i.high_price * 0.02 AS INTEGER)
-                END) - i.low_price as margin_post_tax,
-                ((i.high_price - CASE
-                    WHEN i.high_price < 50 THEN 0
-                    WHEN i.high_price * 0.02 > 5000000 THEN 5000000
-                    ELSE CAST(i.high_price * 0.02 AS INTEGER)
-                END) - i.low_price) * 100.0 / NULLIF(i.high_price, 0) as roi,
-                COALESCE(ps.high_volume, 0) + COALESCE(ps.low_volume, 0) as volume,
-                COALESCE(ps.buy_volume_24h, ps.low_volume, 0) as buy_volume_24h,
-                COALESCE(ps.sell_volume_24h, ps.high_volume, 0) as sell_volume_24h,
-                COALESCE(ps.buy_volume_24h, ps.low_volume, 0) + COALESCE(ps.sell_volume_24h, ps.high_volume, 0) as total_volume_24h,
-                COALESCE(i."limit", 0) as buy_limit,
+                fm.buy_price,
+                fm.sell_price,
+                fm.margin_post_tax,
+                fm.roi,
+                fm.volume,
+                fm.buy_volume_24h,
+                fm.sell_volume_24h,
+                fm.total_volume_24h,
+                fm.buy_limit,
                 CASE
                     WHEN i.name IS NOT NULL THEN
                         'https://oldschool.runescape.wiki/w/' || REPLACE(i.name, ' ', '_')
                     ELSE NULL
                 END as wiki_url
-            FROM item i
-            LEFT JOIN pricesnapshot ps ON i.id = ps.item_id
+            FROM flip_metrics fm
+            JOIN item i ON i.id = fm.item_id
             WHERE {where_clause}
-                AND (COALESCE(ps.buy_volume_24h, ps.low_volume, 0) + COALESCE(ps.sell_volume_24h, ps.high_volume, 0)) >= :min_volume
-                AND ((i.high_price - CASE
-                    WHEN i.high_price < 50 THEN 0
-                    WHEN i.high_price * 0.02 > 5000000 THEN 5000000
-                    ELSE CAST(i.high_price * 0.02 AS INTEGER)
-                END) - i.low_price) * 100.0 / NULLIF(i.high_price, 0) >= :min_roi
-            ORDER BY
-                ((i.high_price - CASE
-                    WHEN i.high_price < 50 THEN 0
-                    WHEN i.high_price * 0.02 > 5000000 THEN 5000000
-                    ELSE CAST(i.high_price * 0.02 AS INTEGER)
-                END) - i.low_price) *
-                (COALESCE(ps.buy_volume_24h, ps.low_volume, 0) + COALESCE(ps.sell_volume_24h, ps.high_volume, 0)) DESC,
-                ((i.high_price - CASE
-                    WHEN i.high_price < 50 THEN 0
-                    WHEN i.high_price * 0.02 > 5000000 THEN 5000000
-                    ELSE CAST(i.high_price * 0.02 AS INTEGER)
-                END) - i.low_price) *
-                CASE
-                    WHEN COALESCE(i."limit", 0) < (COALESCE(ps.high_volume, 0) + COALESCE(ps.low_volume, 0))
-                    THEN COALESCE(i."limit", 0)
-                    ELSE (COALESCE(ps.high_volume, 0) + COALESCE(ps.low_volume, 0))
-                END DESC
+            ORDER BY fm.margin_x_volume DESC, fm.potential_profit DESC
             LIMIT 100
         """
         )
@@ -266,8 +475,12 @@ class FlippingService:
             {"budget": budget, "min_roi": min_roi, "min_volume": min_volume},
         )
 
+        rows = list(result.mappings())
+        # Intraday volume from pre-aggregated /5m buckets, one grouped query
+        recent = recent_window_stats(self.session, 3600, [int(row["item_id"]) for row in rows])
+
         opportunities = []
-        for row in result.mappings():
+        for row in rows:
             margin_post_tax = float(row["margin_post_tax"] or 0.0)
             roi = float(row["roi"] or 0.0)
             volume = int(row["volume"] or 0)
@@ -291,6 +504,7 @@ class FlippingService:
                     sell_volume_24h=sell_vol_24h,
                     total_volume_24h=total_vol_24h,
                     margin_x_volume=margin_x_volume,
+                    volume_1h=(recent[row["item_id"]].volume if row["item_id"] in recent else None),
                     wiki_url=str(row["wiki_url"]) if row["wiki_url"] else None,
                 )
             )
@@ -1,101 +1,295 @@
 """Item stats importer from OSRSBox."""
 
+import contextlib
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Set, Tuple
+
 import httpx
+from sqlalchemy import bindparam, func
 from sqlmodel import Session, select
+from backend.db.writer import run_in_writer
 from backend.models import Item
 import logging
 
 logger = logging.getLogger(__name__)
 
+OSRSBOX_ITEMS_URL = (
+    "https://raw.githubusercontent.com/osrsbox/osrsbox-db/master/docs/items-complete.json"
+)
 
-async def import_item_stats(session: Session) -> None:
-    """Fetch item stats from OSRSBox and update DB."""
-    url = "https://raw.githubusercontent.com/osrsbox/osrsbox-db/master/docs/items-complete.json"
+# Rows per executemany batch when writing stat columns
+STATS_UPDATE_CHUNK_SIZE = 500
 
-    logger.info("Fetching item stats from OSRSBox...")
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=60.0)
-            response.raise_for_status()
-            data = response.json()
-    except Exception as e:
-        logger.error(f"Failed to download stats: {e}")
-        return
+TWO_HANDED_WEAPON_TYPES = frozenset(["2h_sword", "2h_axe", "bow", "crossbow", "staff", "polearm"])
 
-    logger.info(f"Loaded {len(data)} items from JSON. Updating DB...")
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
 
-    updated_count = 0
-    skipped_not_equipable = 0
-    skipped_not_in_data = 0
 
-    # Iterate through all items in our DB
-    db_items = session.exec(select(Item)).all()
-    logger.info(f"Found {len(db_items)} items in database to check")
+def item_stats_row(item_id: int, stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map an OSRSBox item entry onto the Item stat columns.
+
+    Args:
+        item_id: Item ID
+        stats: OSRSBox item entry (must be equipable by player)
+
+    Returns:
+        Column values keyed by column name, including ``id``
+    """
+    equipment = stats.get("equipment") or {}
+    requirements = stats.get("requirements") or {}
+    weapon = stats.get("weapon") or {}
+
+    return {
+        "id": item_id,
+        "slot": equipment.get("slot"),
+        # Requirements
+        "attack_req": requirements.get("attack", 1),
+        "defence_req": requirements.get("defence", 1),
+        "strength_req": requirements.get("strength", 1),
+        "ranged_req": requirements.get("ranged", 1),
+        "magic_req": requirements.get("magic", 1),
+        "prayer_req": requirements.get("prayer", 1),
+        "slayer_req": requirements.get("slayer", 0),
+        # Quest/Achievement requirements (None keeps the existing value)
+        "quest_req": stats.get("quest") or None,
+        # Equipment metadata
+        "is_2h": weapon.get("weapon_type", "") in TWO_HANDED_WEAPON_TYPES,
+        "attack_speed": weapon.get("weapon_speed", 4),  # Default to 4 ticks
+        # Offensive Stats
+        "attack_stab": equipment.get("attack_stab", 0),
+        "attack_slash": equipment.get("attack_slash", 0),
+        "attack_crush": equipment.get("attack_crush", 0),
+        "attack_magic": equipment.get("attack_magic", 0),
+        "attack_ranged": equipment.get("attack_ranged", 0),
+        # Strength Bonuses
+        "melee_strength": equipment.get("melee_strength", 0),
+        "ranged_strength": equipment.get("ranged_strength", 0),
+        "magic_damage": equipment.get("magic_damage", 0),
+        "prayer_bonus": equipment.get("prayer", 0),
+        # Defensive Stats
+        "defence_stab": equipment.get("defence_stab", 0),
+        "defence_slash": equipment.get("defence_slash", 0),
+        "defence_crush": equipment.get("defence_crush", 0),
+        "defence_magic": equipment.get("defence_magic", 0),
+        "defence_ranged": equipment.get("defence_ranged", 0),
+    }
+
+
+def apply_item_stats(session: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Write stat columns onto existing Item rows with one executemany UPDATE.
+
+    A ``quest_req`` of None leaves the stored value untouched. The caller is
+    responsible for committing the session.
+
+    Args:
+        session: Database session
+        rows: Rows produced by ``item_stats_row``
+
+    Returns:
+        Number of rows submitted
+    """
+    if not rows:
+        return 0
+
+    table = Item.__table__  # type: ignore[attr-defined]
+    columns = [col for col in rows[0] if col not in ("id", "quest_req")]
+    stmt = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            {
+                **{col: bindparam(f"b_{col}") for col in columns},
+                "quest_req": func.coalesce(bindparam("b_quest_req"), table.c.quest_req),
+            }
+        )
+    )
+    session.connection().execute(
+        stmt, [{f"b_{col}": value for col, value in row.items()} for row in rows]
+    )
+    return len(rows)
+
+
+async def iter_json_object_items(chunks: AsyncIterable[str]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a top-level JSON object into (key, value) pairs.
+
+    Only the unparsed tail of the document is buffered, so memory stays
+    bounded by the chunk size plus the largest single value rather than the
+    whole document.
+
+    Args:
+        chunks: Text chunks of a JSON document whose root is an object
+
+    Yields:
+        Each member of the root object in document order
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON object
+    """
+    buffer = ""
+    pos = 0
+    started = False
+    expect_key = True
+    key: Optional[str] = None
+    iterator = chunks.__aiter__()
+    eof = False
+
+    async def fill() -> bool:
+        nonlocal buffer, pos, eof
+        try:
+            chunk = await iterator.__anext__()
+        except StopAsyncIteration:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
 
-    for item in db_items:
-        str_id = str(item.id)
-        if str_id not in data:
-            skipped_not_in_data += 1
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buffer):
+            if not await fill():
+                raise ValueError("Unexpected end of JSON document")
             continue
 
-        stats = data[str_id]
-        equipment = stats.get("equipment") or {}
-        requirements = stats.get("requirements") or {}
-        weapon = stats.get("weapon") or {}
+        char = buffer[pos]
+        if not started:
+            if char != "{":
+                raise ValueError("JSON document root is not an object")
+            started = True
+            pos += 1
+            continue
+
+        if expect_key:
+            if char == "}":
+                return
+            if char == ",":
+                pos += 1
+                continue
+            try:
+                key, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or not await fill():
+                    raise ValueError("Truncated or invalid key in JSON document")
+                continue
+            pos = end
+            expect_key = False
+            continue
+
+        if char == ":":
+            pos += 1
+            continue
+
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof or not await fill():
+                raise ValueError(f"Truncated or invalid value for key {key!r}")
+            continue
+        # A scalar running to the end of the buffer may continue in the next chunk
+        if end == len(buffer) and not eof and await fill():
+            continue
+
+        pos = end
+        expect_key = True
+        yield key, value  # type: ignore[misc]
+
+
+async def _iter_dict_items(data: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    for key, value in data.items():
+        yield key, value
+
+
+def _known_item_ids(session: Session) -> Set[int]:
+    return set(session.exec(select(Item.id)).all())
+
+
+async def _apply_entries(
+    session: Session, entries: AsyncIterable[Tuple[str, Any]], known_ids: Set[int]
+) -> Tuple[int, int, int]:
+    """Write equipable entries for known items in batches; return counts."""
+    updated_count = 0
+    skipped_not_equipable = 0
+    matched = 0
+    batch: List[Dict[str, Any]] = []
+
+    async for str_id, stats in entries:
+        try:
+            item_id = int(str_id)
+        except ValueError:
+            continue
+        if item_id not in known_ids:
+            continue
+        matched += 1
 
         # Skip if not equipable
-        if not stats.get("equipable_by_player"):
+        if not isinstance(stats, dict) or not stats.get("equipable_by_player"):
             skipped_not_equipable += 1
             continue
 
-        # Update fields
-        item.slot = equipment.get("slot")
+        batch.append(item_stats_row(item_id, stats))
+        if len(batch) >= STATS_UPDATE_CHUNK_SIZE:
+            updated_count += await run_in_writer(apply_item_stats, session, batch)
+            batch = []
 
-        # Requirements
-        item.attack_req = requirements.get("attack", 1)
-        item.defence_req = requirements.get("defence", 1)
-        item.strength_req = requirements.get("strength", 1)
-        item.ranged_req = requirements.get("ranged", 1)
-        item.magic_req = requirements.get("magic", 1)
-        item.prayer_req = requirements.get("prayer", 1)
-        item.slayer_req = requirements.get("slayer", 0)
-
-        # Quest/Achievement requirements (from OSRSBox quest field if available)
-        quest_req = stats.get("quest", None)
-        if quest_req:
-            item.quest_req = quest_req
+    updated_count += await run_in_writer(apply_item_stats, session, batch)
+    return updated_count, skipped_not_equipable, matched
 
-        # Equipment metadata
-        weapon_type = weapon.get("weapon_type", "") if weapon else ""
-        item.is_2h = weapon_type in ["2h_sword", "2h_axe", "bow", "crossbow", "staff", "polearm"]
-        item.attack_speed = weapon.get("weapon_speed", 4) if weapon else 4  # Default to 4 ticks
 
-        # Offensive Stats
-        item.attack_stab = equipment.get("attack_stab", 0)
-        item.attack_slash = equipment.get("attack_slash", 0)
-        item.attack_crush = equipment.get("attack_crush", 0)
-        item.attack_magic = equipment.get("attack_magic", 0)
-        item.attack_ranged = equipment.get("attack_ranged", 0)
+async def import_item_stats(
+    session: Session, stream: bool = False, client: Optional[httpx.AsyncClient] = None
+) -> None:
+    """
+    Fetch item stats from OSRSBox and update DB.
 
-        # Strength Bonuses
-        item.melee_strength = equipment.get("melee_strength", 0)
-        item.ranged_strength = equipment.get("ranged_strength", 0)
-        item.magic_damage = equipment.get("magic_damage", 0)
-        item.prayer_bonus = equipment.get("prayer", 0)
+    In streaming mode the document is parsed incrementally as it downloads
+    and only equipable entries for items in the DB are kept, so peak memory
+    does not grow with the size of ``items-complete.json``. Database writes
+    run on the writer thread so the event loop keeps serving requests.
 
-        # Defensive Stats
-        item.defence_stab = equipment.get("defence_stab", 0)
-        item.defence_slash = equipment.get("defence_slash", 0)
-        item.defence_crush = equipment.get("defence_crush", 0)
-        item.defence_magic = equipment.get("defence_magic", 0)
-        item.defence_ranged = equipment.get("defence_ranged", 0)
+    Args:
+        session: Database session
+        stream: Parse the download incrementally instead of buffering it
+        client: AsyncClient to use (a temporary client if omitted)
+    """
+    logger.info("Fetching item stats from OSRSBox...")
+    known_ids = await run_in_writer(_known_item_ids, session)
+    logger.info(f"Found {len(known_ids)} items in database to check")
+
+    # Borrowed clients are left open for their owner
+    client_context = contextlib.nullcontext(client) if client else httpx.AsyncClient()
+    async with client_context as http:
+        if stream:
+            try:
+                async with http.stream("GET", OSRSBOX_ITEMS_URL, timeout=60.0) as response:
+                    response.raise_for_status()
+                    counts = await _apply_entries(
+                        session, iter_json_object_items(response.aiter_text()), known_ids
+                    )
+            except (httpx.HTTPError, ValueError) as e:
+                await run_in_writer(session.rollback)
+                logger.error(f"Failed to download stats: {e}")
+                return
+        else:
+            try:
+                response = await http.get(OSRSBOX_ITEMS_URL, timeout=60.0)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                logger.error(f"Failed to download stats: {e}")
+                return
 
-        session.add(item)
-        updated_count += 1
+            logger.info(f"Loaded {len(data)} items from JSON. Updating DB...")
+            counts = await _apply_entries(session, _iter_dict_items(data), known_ids)
 
-    session.commit()
+    updated_count, skipped_not_equipable, matched = counts
+    await run_in_writer(session.commit)
     logger.info(
         f"Updated stats for {updated_count} items. "
         f"Skipped {skipped_not_equipable} non-equipable items. "
-        f"Skipped {skipped_not_in_data} items not in OSRSBox data."
+        f"Skipped {len(known_ids) - matched} items not in OSRSBox data."
     )
@@ -0,0 +1,96 @@
+"""Lightweight in-process metrics registry.
+
+Counters, gauges and timings recorded by background jobs (price sync, wiki
+fetches, caches) and exposed through ``GET /api/v1/health/metrics``. Values are
+per process and reset on restart.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass
+class TimingStats:
+    """Aggregate of observed durations for one metric."""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds."""
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the aggregate as a JSON-serializable dict."""
+        return {
+            "count": self.count,
+            "last": round(self.last, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store of named counters, gauges and timings."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Any] = {}
+        self._timings: Dict[str, TimingStats] = {}
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in seconds."""
+        with self._lock:
+            self._timings.setdefault(name, TimingStats()).observe(seconds)
+
+    def counter(self, name: str) -> int:
+        """Return the current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def gauge(self, name: str) -> Any:
+        """Return the current value of a gauge (None if never set)."""
+        with self._lock:
+            return self._gauges.get(name)
+
+    def timing(self, name: str) -> TimingStats:
+        """Return a copy of the aggregate for a timing metric."""
+        with self._lock:
+            stats = self._timings.get(name, TimingStats())
+            return TimingStats(stats.count, stats.total, stats.last, stats.max)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items())),
+                "timings": {name: stats.as_dict() for name, stats in sorted(self._timings.items())},
+            }
+
+    def reset(self) -> None:
+        """Clear every metric (used by tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = MetricsRegistry()
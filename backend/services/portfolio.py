@@ -0,0 +1,184 @@
+"""Budget-constrained flip portfolio allocation.
+
+``find_best_flips`` ranks items one by one; a player has one budget to
+spread across them. Each item ``i`` can be bought ``q_i`` times at its buy
+price ``c_i`` for a post-tax margin ``m_i`` per unit, where ``q_i`` is the
+smaller of its GE buy limit and the units it can expect to fill in one
+buy-limit window (a ``fill_ratio`` share of the window's part of the smaller
+24h buy/sell volume; like ``flip_metrics``, the latest low/high volume stands
+in where the 24h volume is not synced yet). Maximizing ``sum(m_i * x_i)``
+with ``0 <= x_i <= q_i`` and ``sum(c_i * x_i) <= budget`` is a bounded
+knapsack.
+
+The allocator solves it greedily by ROI (profit per gp), which is optimal
+for the relaxation with fractional units:
+
+1. items sorted by ROI; the longest prefix that fits is bought in full,
+   found with one cumulative sum
+2. repair: the budget left over after the first item that did not fit is
+   spent unit by unit on that item and then on the following ones
+
+The result is at most one unit's margin of the first unfitted item below
+the optimum; ``upper_bound`` reports the fractional optimum so callers can
+see the gap. Everything is computed on the shared ``FlipTable``, so no
+query runs per call.
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from backend.services.flipping import BUY_LIMIT_WINDOW, VOLUME_WINDOW, FlipTable
+from backend.services.metrics import metrics
+
+
+@dataclass
+class Allocation:
+    """Units of one item bought by the portfolio."""
+
+    item_id: int
+    item_name: str
+    quantity: int
+    max_quantity: int  # min(buy limit, expected fill)
+    buy_price: int
+    sell_price: int
+    margin: int
+    roi: float
+    cost: int
+    expected_profit: int
+
+
+@dataclass
+class Portfolio:
+    """Result of one allocation."""
+
+    budget: int
+    invested: int = 0
+    expected_profit: int = 0
+    upper_bound: int = 0  # Expected profit of the fractional optimum
+    candidates: int = 0  # Items that passed the filters
+    generation: int = 0  # Price generation of the table used
+    allocations: List[Allocation] = field(default_factory=list)
+
+    @property
+    def uninvested(self) -> int:
+        """Budget left over."""
+        return self.budget - self.invested
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the portfolio as JSON-serializable values."""
+        return {**asdict(self), "uninvested": self.uninvested}
+
+
+def fill_quantities(table: FlipTable, fill_ratio: float) -> np.ndarray:
+    """
+    Return the units of each item expected to fill within one buy-limit window.
+
+    Args:
+        table: Flip table
+        fill_ratio: Share of the traded units a flipper can expect to get
+
+    Returns:
+        int64 array aligned with the table
+    """
+    # Fall back to the latest volumes until the /24h volumes are synced
+    bought = np.where(table.has_buy_volume_24h, table.buy_volume_24h, table.low_volume)
+    sold = np.where(table.has_sell_volume_24h, table.sell_volume_24h, table.high_volume)
+    traded = np.minimum(bought, sold)
+    fills: np.ndarray = np.floor(traded * (BUY_LIMIT_WINDOW / VOLUME_WINDOW) * fill_ratio)
+    return fills.astype(np.int64)
+
+
+def allocate_portfolio(
+    table: FlipTable,
+    budget: int,
+    min_roi: float = 0.0,
+    fill_ratio: float = 0.1,
+    min_volume: int = 0,
+    exclude_members: bool = False,
+) -> Portfolio:
+    """
+    Spread a budget over the flips with the best expected profit.
+
+    Args:
+        table: Flip table to allocate from
+        budget: GP to invest
+        min_roi: Lowest ROI percentage of an item considered
+        fill_ratio: Share of the traded units a flipper can expect to get
+        min_volume: Lowest combined high/low volume of an item considered
+        exclude_members: Drop members-only items
+
+    Returns:
+        The allocation, best ROI first
+
+    Raises:
+        ValueError: If the budget is negative or fill_ratio is not in (0, 1]
+    """
+    if budget < 0:
+        raise ValueError("budget must be non-negative")
+    if not 0 < fill_ratio <= 1:
+        raise ValueError("fill_ratio must be in (0, 1]")
+
+    started = time.perf_counter()
+    caps = np.minimum(table.limit, fill_quantities(table, fill_ratio))
+    mask = table.valid & (table.margin > 0) & (caps > 0) & (table.roi >= min_roi)
+    mask &= (table.buy_price <= budget) & (table.volume >= min_volume)
+    if exclude_members:
+        mask &= ~table.members
+    candidates = np.flatnonzero(mask)
+    portfolio = Portfolio(budget=budget, candidates=len(candidates), generation=table.generation)
+
+    # Best ROI first; larger margins, then lower ids break ties
+    order = candidates[
+        np.lexsort(
+            (
+                table.item_id[candidates],
+                -table.margin[candidates],
+                -table.roi[candidates],
+            )
+        )
+    ]
+    price, margin, cap = table.buy_price[order], table.margin[order], caps[order]
+    spent = np.cumsum(price * cap)
+    full = int(np.searchsorted(spent, budget, side="right"))
+    quantity = np.zeros(len(order), dtype=np.int64)
+    quantity[:full] = cap[:full]
+    remaining = budget - (int(spent[full - 1]) if full else 0)
+
+    upper_bound = float((margin[:full] * cap[:full]).sum())
+    if full < len(order):
+        upper_bound += remaining / price[full] * margin[full]
+        # Cheapest price among the items not yet considered; stop once nothing fits
+        cheapest_after = np.minimum.accumulate(price[::-1])[::-1]
+        for position in range(full, len(order)):
+            if remaining < cheapest_after[position]:
+                break
+            units = min(int(cap[position]), remaining // int(price[position]))
+            quantity[position] = units
+            remaining -= units * int(price[position])
+
+    for bought in np.flatnonzero(quantity):
+        position = int(bought)
+        index = int(order[position])
+        units = int(quantity[position])
+        portfolio.allocations.append(
+            Allocation(
+                item_id=int(table.item_id[index]),
+                item_name=table.name[index],
+                quantity=units,
+                max_quantity=int(cap[position]),
+                buy_price=int(price[position]),
+                sell_price=int(table.sell_price[index]),
+                margin=int(margin[position]),
+                roi=round(float(table.roi[index]), 2),
+                cost=units * int(price[position]),
+                expected_profit=units * int(margin[position]),
+            )
+        )
+    portfolio.invested = budget - remaining
+    portfolio.expected_profit = sum(a.expected_profit for a in portfolio.allocations)
+    portfolio.upper_bound = int(upper_bound)
+    metrics.observe("flips.portfolio.seconds", time.perf_counter() - started)
+    return portfolio
@@ -0,0 +1,338 @@
+"""Memory-mapped columnar price archive for offline analytics.
+
+Reading months of history row by row through the ORM is far too slow for
+research and backtests, so the exporter writes it to a directory of
+fixed-width NumPy ``.npy`` arrays on a regular time grid::
+
+    meta.json       grid start/step, item count and fields (written last)
+    item_ids.npy    int32[n_items], sorted; row i of every field is item_ids[i]
+    ts.npy          int64[n_times], start of each grid slot
+    high.npy        int32[n_items, n_times], instant-buy price, forward-filled
+    low.npy         int32[n_items, n_times], instant-sell price, forward-filled
+    volume.npy      int32[n_items, n_times], units traded in the slot (/5m buckets)
+
+Prices hold the last known value at each slot (``MISSING`` before the first
+one). Arrays are item-major, so one item's series is a contiguous row and a
+time slice is a strided view; ``PriceArchive`` opens them with
+``mmap_mode="r"`` and returns views without copying or loading the file.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from itertools import islice
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlmodel import Session, col, select
+
+from backend.models import PriceBucket
+from backend.services.price_history import history_item_ids, iter_history, price_state_before
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+
+ARCHIVE_FIELDS = ("high", "low", "volume")
+
+# Value of a price slot before the item's first recorded price
+MISSING = -1
+
+PRICE_DTYPE = np.int32
+
+# History rows buffered before each vectorized scatter into the grid
+_SCATTER_BATCH = 100_000
+
+# Items forward-filled per pass; bounds the temporary index array
+_FILL_CHUNK_ITEMS = 256
+
+
+@dataclass
+class ArchiveInfo:
+    """Shape of an exported archive."""
+
+    path: Path
+    start: int
+    step: int
+    n_items: int
+    n_times: int
+    rows: int  # History rows folded into the grid
+
+
+def _forward_fill(grid: np.ndarray) -> None:
+    """Replace MISSING slots with the last earlier value in the same row, in place."""
+    n_times = grid.shape[1]
+    positions = np.arange(n_times)
+    for start in range(0, grid.shape[0], _FILL_CHUNK_ITEMS):
+        block = np.asarray(grid[start : start + _FILL_CHUNK_ITEMS])
+        last = np.where(block != MISSING, positions, 0)
+        np.maximum.accumulate(last, axis=1, out=last)
+        grid[start : start + _FILL_CHUNK_ITEMS] = np.take_along_axis(block, last, axis=1)
+
+
+def export_price_archive(
+    session: Session,
+    path: Path,
+    since: int,
+    until: int,
+    step: int = 300,
+) -> ArchiveInfo:
+    """
+    Export the price history in ``[since, until)`` to a columnar archive.
+
+    Args:
+        session: Database session
+        path: Archive directory (created; existing arrays are overwritten)
+        since: Grid start (unix timestamp, rounded down to ``step``)
+        until: Grid end (unix timestamp, exclusive)
+        step: Grid slot width in seconds
+
+    Returns:
+        Archive shape and the number of history rows exported
+    """
+    started = time.perf_counter()
+    since -= since % step
+    n_times = max(0, -(-(until - since) // step))
+    path.mkdir(parents=True, exist_ok=True)
+    meta_path = path / "meta.json"
+    if meta_path.exists():
+        # Readers must never see a half-written archive
+        meta_path.unlink()
+
+    state = price_state_before(session, since)
+    item_ids = np.array(
+        sorted(set(state).union(history_item_ids(session, since, until))), dtype=PRICE_DTYPE
+    )
+    n_items = len(item_ids)
+    exported = 0
+
+    np.save(path / "item_ids.npy", item_ids)
+    np.save(path / "ts.npy", since + step * np.arange(n_times, dtype=np.int64))
+    grids = {
+        name: np.lib.format.open_memmap(
+            path / f"{name}.npy", mode="w+", dtype=PRICE_DTYPE, shape=(n_items, n_times)
+        )
+        for name in ARCHIVE_FIELDS
+    }
+    grids["high"][:] = MISSING
+    grids["low"][:] = MISSING
+    grids["volume"][:] = 0
+
+    if n_items and n_times:
+        # Prices carried in from before the range seed the first slot
+        seed = [(item_id, since, high, low) for item_id, (high, low) in state.items()]
+        _scatter(grids, item_ids, since, step, seed)
+        rows = iter_history(session, since, until)
+        while batch := list(islice(rows, _SCATTER_BATCH)):
+            _scatter(grids, item_ids, since, step, batch)
+            exported += len(batch)
+        _forward_fill(grids["high"])
+        _forward_fill(grids["low"])
+        _fill_volume(session, grids["volume"], item_ids, since, until, step)
+
+    for grid in grids.values():
+        grid.flush()
+    del grids
+
+    meta = {
+        "version": ARCHIVE_VERSION,
+        "start": since,
+        "step": step,
+        "n_items": n_items,
+        "n_times": n_times,
+        "fields": {name: np.dtype(PRICE_DTYPE).str for name in ARCHIVE_FIELDS},
+        "missing": MISSING,
+        "exported_at": int(time.time()),
+    }
+    tmp_path = path / "meta.json.tmp"
+    tmp_path.write_text(json.dumps(meta, indent=2))
+    os.replace(tmp_path, meta_path)
+
+    logger.info(
+        f"Exported {exported} history rows for {n_items} items x {n_times} slots "
+        f"to {path} in {time.perf_counter() - started:.2f}s"
+    )
+    return ArchiveInfo(path, since, step, n_items, n_times, exported)
+
+
+def _scatter(
+    grids: Mapping[str, np.ndarray],
+    item_ids: np.ndarray,
+    since: int,
+    step: int,
+    rows: Iterable[Tuple[int, int, Optional[int], Optional[int]]],
+) -> None:
+    """Write time-ordered (item_id, ts, high, low) rows into their grid slots.
+
+    When several rows fall into one slot the latest one wins.
+    """
+    data = np.array(
+        [
+            (item_id, ts, MISSING if high is None else high, MISSING if low is None else low)
+            for item_id, ts, high, low in rows
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 4)
+    n_times = grids["high"].shape[1]
+    flat = np.searchsorted(item_ids, data[:, 0]) * n_times + (data[:, 1] - since) // step
+    for name, column in (("high", data[:, 2]), ("low", data[:, 3])):
+        known = np.flatnonzero(column != MISSING)
+        # Fancy assignment does not define which duplicate wins, so keep the last explicitly
+        _, last = np.unique(flat[known][::-1], return_index=True)
+        keep = known[len(known) - 1 - last]
+        grids[name].reshape(-1)[flat[keep]] = column[keep]
+
+
+def _fill_volume(
+    session: Session,
+    grid: np.ndarray,
+    item_ids: np.ndarray,
+    since: int,
+    until: int,
+    step: int,
+) -> None:
+    """Sum /5m bucket volumes into the grid slots of archived items."""
+    buckets = session.exec(
+        select(
+            col(PriceBucket.item_id),
+            col(PriceBucket.timestamp),
+            col(PriceBucket.high_price_volume) + col(PriceBucket.low_price_volume),
+        ).where(
+            col(PriceBucket.interval) == 300,
+            col(PriceBucket.timestamp) >= since,
+            col(PriceBucket.timestamp) < until,
+        )
+    ).all()
+    if not buckets:
+        return
+    data = np.array(buckets, dtype=np.int64)
+    item_index = np.searchsorted(item_ids, data[:, 0])
+    archived = (item_index < len(item_ids)) & (
+        item_ids[np.minimum(item_index, len(item_ids) - 1)] == data[:, 0]
+    )
+    slots = (data[:, 1] - since) // step
+    np.add.at(grid, (item_index[archived], slots[archived]), data[archived, 2])
+
+
+class PriceArchive:
+    """Read-only, memory-mapped view of an exported archive.
+
+    Every accessor returns NumPy views onto the mapped files; nothing is read
+    from disk until the returned arrays are used.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open an archive.
+
+        Args:
+            path: Archive directory
+
+        Raises:
+            FileNotFoundError: If the archive is missing or was not fully written
+            ValueError: If the archive version is not supported
+        """
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta["version"] != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported price archive version: {meta['version']}")
+        self.meta = meta
+        self.start: int = meta["start"]
+        self.step: int = meta["step"]
+        self.item_ids: np.ndarray = np.load(self.path / "item_ids.npy", mmap_mode="r")
+        self.ts: np.ndarray = np.load(self.path / "ts.npy", mmap_mode="r")
+        self._fields: Dict[str, np.ndarray] = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode="r") for name in meta["fields"]
+        }
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(number of items, number of time slots)."""
+        return (int(self.meta["n_items"]), int(self.meta["n_times"]))
+
+    def field(self, name: str) -> np.ndarray:
+        """
+        Return one field for every item and slot.
+
+        Args:
+            name: "high", "low" or "volume"
+
+        Returns:
+            Read-only memory-mapped array of shape (n_items, n_times)
+        """
+        return self._fields[name]
+
+    def index_of(self, item_id: int) -> int:
+        """
+        Return the row of an item in every field.
+
+        Args:
+            item_id: Item ID
+
+        Returns:
+            Row index
+
+        Raises:
+            KeyError: If the item is not in the archive
+        """
+        index = int(np.searchsorted(self.item_ids, item_id))
+        if index >= len(self.item_ids) or self.item_ids[index] != item_id:
+            raise KeyError(item_id)
+        return index
+
+    def slot_range(self, since: Optional[int] = None, until: Optional[int] = None) -> slice:
+        """
+        Return the slice of slots whose start lies in ``[since, until)``.
+
+        Args:
+            since: Earliest slot start (archive start if None)
+            until: Only slots starting before this (archive end if None)
+
+        Returns:
+            Slice over the time axis
+        """
+        n_times = self.shape[1]
+        first = 0 if since is None else max(0, -(-(since - self.start) // self.step))
+        last = n_times if until is None else max(0, -(-(until - self.start) // self.step))
+        return slice(min(first, n_times), min(last, n_times))
+
+    def item(
+        self, item_id: int, since: Optional[int] = None, until: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return one item's series as views, keyed by field plus "ts".
+
+        Args:
+            item_id: Item ID
+            since: Earliest slot start
+            until: Only slots starting before this
+
+        Returns:
+            1-D views sharing memory with the mapped files
+        """
+        row = self.index_of(item_id)
+        slots = self.slot_range(since, until)
+        views = {name: grid[row, slots] for name, grid in self._fields.items()}
+        views["ts"] = self.ts[slots]
+        return views
+
+    def time_slice(
+        self, since: Optional[int] = None, until: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return every item over a time range as views, keyed by field plus "ts".
+
+        Args:
+            since: Earliest slot start
+            until: Only slots starting before this
+
+        Returns:
+            2-D (n_items, slots) views sharing memory with the mapped files
+        """
+        slots = self.slot_range(since, until)
+        views = {name: grid[:, slots] for name, grid in self._fields.items()}
+        views["ts"] = self.ts[slots]
+        return views
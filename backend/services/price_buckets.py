@@ -0,0 +1,185 @@
+"""Queries over the /5m and /1h price buckets.
+
+The Wiki timeseries endpoints already aggregate trades into fixed buckets, so
+recent-window volume and average prices are a cheap GROUP BY over a handful
+of bucket rows per item instead of a recomputation from raw trades.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, List, Optional, Set
+
+from sqlalchemy import case, func
+from sqlalchemy import select as core_select
+from sqlmodel import Session, col, select
+
+from backend.config import settings
+from backend.models import PriceBucket
+
+# Bucket width in seconds per Wiki timeseries endpoint
+BUCKET_INTERVALS = {"5m": 300, "1h": 3600}
+
+
+def bucket_retention_seconds(interval: str) -> int:
+    """
+    Return how long buckets of an interval are kept.
+
+    Args:
+        interval: "5m" or "1h"
+
+    Returns:
+        Retention in seconds
+    """
+    if interval == "5m":
+        return settings.wiki_bucket_retention_5m_hours * 3600
+    return settings.wiki_bucket_retention_1h_days * 86400
+
+
+def _weighted_average(price: Any, volume: Any) -> Any:
+    """SQL expression for the volume-weighted mean of ``price``, ignoring NULL prices."""
+    traded = func.sum(case((price.is_not(None), volume), else_=0))
+    return func.sum(func.coalesce(price, 0) * volume) * 1.0 / func.nullif(traded, 0)
+
+
+@dataclass
+class WindowStats:
+    """Trade volume and volume-weighted average prices over a recent window."""
+
+    item_id: int
+    high_price_volume: int
+    low_price_volume: int
+    avg_high_price: Optional[int]
+    avg_low_price: Optional[int]
+    buckets: int
+
+    @property
+    def volume(self) -> int:
+        """Total units traded in the window."""
+        return self.high_price_volume + self.low_price_volume
+
+
+def recent_window_stats(
+    session: Session,
+    window_seconds: int,
+    item_ids: Optional[Collection[int]] = None,
+    interval: str = "5m",
+    now: Optional[int] = None,
+) -> Dict[int, WindowStats]:
+    """
+    Aggregate the buckets that started within the last ``window_seconds``.
+
+    Averages are weighted by the volume traded in each bucket, and are None
+    when nothing traded on that side during the window.
+
+    Args:
+        session: Database session
+        window_seconds: Window length in seconds
+        item_ids: Only these items (all items with buckets if None)
+        interval: Bucket series to read ("5m" or "1h")
+        now: Window end as a unix timestamp (current time if None)
+
+    Returns:
+        Stats keyed by item id; items without buckets in the window are absent
+    """
+    table = PriceBucket.__table__  # type: ignore[attr-defined]
+    since = (int(time.time()) if now is None else now) - window_seconds
+
+    stmt = (
+        core_select(
+            table.c.item_id,
+            func.sum(table.c.high_price_volume),
+            func.sum(table.c.low_price_volume),
+            _weighted_average(table.c.avg_high_price, table.c.high_price_volume),
+            _weighted_average(table.c.avg_low_price, table.c.low_price_volume),
+            func.count(),
+        )
+        .where(table.c.interval == BUCKET_INTERVALS[interval], table.c.timestamp >= since)
+        .group_by(table.c.item_id)
+    )
+    if item_ids is not None:
+        stmt = stmt.where(table.c.item_id.in_(list(item_ids)))
+
+    return {
+        item_id: WindowStats(
+            item_id=item_id,
+            high_price_volume=int(high_volume or 0),
+            low_price_volume=int(low_volume or 0),
+            avg_high_price=int(avg_high) if avg_high is not None else None,
+            avg_low_price=int(avg_low) if avg_low is not None else None,
+            buckets=buckets,
+        )
+        for item_id, high_volume, low_volume, avg_high, avg_low, buckets in session.execute(stmt)
+    }
+
+
+def item_buckets(
+    session: Session,
+    item_id: int,
+    interval: str = "5m",
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> List[PriceBucket]:
+    """
+    Return one item's buckets in time order.
+
+    Args:
+        session: Database session
+        item_id: Item ID
+        interval: Bucket series to read ("5m" or "1h")
+        since: Earliest bucket start to include
+        until: Only buckets starting before this timestamp
+
+    Returns:
+        Buckets ordered by timestamp
+    """
+    stmt = select(PriceBucket).where(
+        col(PriceBucket.item_id) == item_id,
+        col(PriceBucket.interval) == BUCKET_INTERVALS[interval],
+    )
+    if since is not None:
+        stmt = stmt.where(col(PriceBucket.timestamp) >= since)
+    if until is not None:
+        stmt = stmt.where(col(PriceBucket.timestamp) < until)
+    return list(session.exec(stmt.order_by(col(PriceBucket.timestamp))).all())
+
+
+def latest_bucket_timestamp(session: Session, interval: str = "5m") -> Optional[int]:
+    """
+    Return the start of the newest stored bucket.
+
+    Args:
+        session: Database session
+        interval: Bucket series to read ("5m" or "1h")
+
+    Returns:
+        Unix timestamp, or None if no buckets are stored
+    """
+    return session.exec(
+        select(func.max(col(PriceBucket.timestamp))).where(
+            col(PriceBucket.interval) == BUCKET_INTERVALS[interval]
+        )
+    ).one()
+
+
+def stored_bucket_timestamps(session: Session, interval: str, since: int) -> Set[int]:
+    """
+    Return the start of every stored bucket at or after ``since``.
+
+    Args:
+        session: Database session
+        interval: Bucket series to read ("5m" or "1h")
+        since: Earliest bucket start to include
+
+    Returns:
+        Bucket start timestamps
+    """
+    return set(
+        session.exec(
+            select(col(PriceBucket.timestamp))
+            .where(
+                col(PriceBucket.interval) == BUCKET_INTERVALS[interval],
+                col(PriceBucket.timestamp) >= since,
+            )
+            .distinct()
+        ).all()
+    )
@@ -0,0 +1,99 @@
+"""Publication of per-tick price changes.
+
+After each price sync writes to the database, the set of item ids whose
+snapshot changed is published here with a monotonically increasing
+generation number. Components that derive data from prices (caches, ranking
+engines, streams) can subscribe to be told what changed, or compare
+generations to know whether their view is stale.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PriceTick:
+    """Item ids changed by one price sync."""
+
+    generation: int
+    changed_ids: FrozenSet[int] = field(default_factory=frozenset)
+    published_at: float = 0.0
+
+
+PriceListener = Callable[[PriceTick], None]
+
+
+class PriceUpdates:
+    """Publish/subscribe hub for price ticks."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listeners: List[PriceListener] = []
+        self._latest = PriceTick(generation=0)
+
+    @property
+    def latest(self) -> PriceTick:
+        """Most recently published tick (generation 0 before the first sync)."""
+        return self._latest
+
+    @property
+    def generation(self) -> int:
+        """Generation of the most recently published tick."""
+        return self._latest.generation
+
+    def subscribe(self, listener: PriceListener) -> Callable[[], None]:
+        """
+        Register a listener called with every published tick.
+
+        Listeners run synchronously on the publishing thread and should be
+        quick; exceptions are logged and do not affect other listeners.
+
+        Args:
+            listener: Callable receiving the PriceTick
+
+        Returns:
+            Function that removes the listener
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def publish(self, changed_ids: Iterable[int]) -> PriceTick:
+        """
+        Publish the item ids changed by a sync.
+
+        Args:
+            changed_ids: Ids of items whose snapshot was written
+
+        Returns:
+            The published tick
+        """
+        with self._lock:
+            tick = PriceTick(
+                generation=self._latest.generation + 1,
+                changed_ids=frozenset(changed_ids),
+                published_at=time.time(),
+            )
+            self._latest = tick
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(tick)
+            except Exception as e:
+                logger.error(f"Price update listener failed: {e}")
+        return tick
+
+
+price_updates = PriceUpdates()
@@ -0,0 +1,340 @@
+"""Append-only price history, sharded into one table per UTC day.
+
+``PriceSnapshot`` keeps only the current price of each item. Every price sync
+also appends the rows that changed to ``pricehistory_YYYYMMDD`` for the day of
+the sync, so the price of an item at any time is its last history row at or
+before that time. The first write into a new day's shard stores every item,
+so each shard is self-contained and older shards can be dropped freely.
+
+Shards are ``WITHOUT ROWID`` tables clustered on ``(item_id, ts)`` with only
+integer columns; trade times are stored as small ages relative to ``ts``,
+which SQLite packs into one or two bytes. Retention drops whole shard tables
+instead of deleting rows, so the cost of expiring a day does not depend on how
+many rows it holds and never touches the shard being written.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, Table, func, inspect, select
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TABLE_PREFIX = "pricehistory_"
+
+SHARD_SECONDS = 86400
+
+# Value columns of a history row, in storage order
+HISTORY_COLUMNS = (
+    "high_price",
+    "low_price",
+    "high_age",
+    "low_age",
+    "high_volume",
+    "low_volume",
+)
+
+_metadata = MetaData()
+_metadata_lock = threading.Lock()
+
+
+def shard_name(ts: int) -> str:
+    """
+    Return the name of the shard table holding a timestamp.
+
+    Args:
+        ts: Unix timestamp
+
+    Returns:
+        Table name such as ``pricehistory_20261017``
+    """
+    day = datetime.fromtimestamp(ts - ts % SHARD_SECONDS, tz=timezone.utc)
+    return f"{HISTORY_TABLE_PREFIX}{day:%Y%m%d}"
+
+
+def shard_start(name: str) -> int:
+    """
+    Return the first timestamp covered by a shard table.
+
+    Args:
+        name: Shard table name
+
+    Returns:
+        Unix timestamp of the shard's UTC midnight
+    """
+    day = datetime.strptime(name[len(HISTORY_TABLE_PREFIX) :], "%Y%m%d")
+    return int(day.replace(tzinfo=timezone.utc).timestamp())
+
+
+def history_table(name: str) -> Table:
+    """
+    Return the Table object for a shard, defining it on first use.
+
+    Args:
+        name: Shard table name
+
+    Returns:
+        SQLAlchemy Table (not necessarily created in the database yet)
+    """
+    with _metadata_lock:
+        table = _metadata.tables.get(name)
+        if table is None:
+            table = Table(
+                name,
+                _metadata,
+                Column("item_id", Integer, primary_key=True, autoincrement=False),
+                Column("ts", Integer, primary_key=True, autoincrement=False),
+                Column("high_price", Integer),
+                Column("low_price", Integer),
+                # Seconds between ts and the last trade; NULL if never traded
+                Column("high_age", Integer),
+                Column("low_age", Integer),
+                # 24h volumes from /24h, NULL when it was unavailable
+                Column("high_volume", Integer),
+                Column("low_volume", Integer),
+                sqlite_with_rowid=False,
+            )
+        return table
+
+
+def ensure_shard(session: Session, ts: int) -> Tuple[Table, bool]:
+    """
+    Create the shard for a timestamp if it does not exist yet.
+
+    Runs on the session's connection, so the table is created inside the
+    caller's transaction.
+
+    Args:
+        session: Database session
+        ts: Unix timestamp to be written
+
+    Returns:
+        The shard table and whether it was created by this call
+    """
+    table = history_table(shard_name(ts))
+    connection = session.connection()
+    if inspect(connection).has_table(table.name):
+        return table, False
+    table.create(bind=connection)
+    logger.info(f"Created price history shard {table.name}")
+    return table, True
+
+
+def list_shards(session: Session) -> List[str]:
+    """
+    Return the names of every history shard in the database, oldest first.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Shard table names
+    """
+    names = inspect(session.connection()).get_table_names()
+    return sorted(name for name in names if name.startswith(HISTORY_TABLE_PREFIX))
+
+
+def history_row(row: Dict[str, Any], ts: int) -> Dict[str, Any]:
+    """
+    Convert a normalized price row into a compact history row.
+
+    Args:
+        row: Row produced by the price pipeline's normalize stage
+        ts: Sync timestamp the row is recorded at
+
+    Returns:
+        Values keyed by history column
+    """
+    high_time = row.get("high_time")
+    low_time = row.get("low_time")
+    return {
+        "item_id": row["item_id"],
+        "ts": ts,
+        "high_price": row.get("high_price"),
+        "low_price": row.get("low_price"),
+        "high_age": ts - high_time if high_time else None,
+        "low_age": ts - low_time if low_time else None,
+        "high_volume": row.get("high_volume"),
+        "low_volume": row.get("low_volume"),
+    }
+
+
+def drop_expired_shards(
+    session: Session, retention_days: int, now: Optional[int] = None
+) -> List[str]:
+    """
+    Drop every shard whose whole day is older than the retention window.
+
+    Args:
+        session: Database session
+        retention_days: Days of history to keep
+        now: Current unix timestamp (wall clock if None)
+
+    Returns:
+        Names of the dropped shards
+    """
+    now = int(time.time()) if now is None else now
+    cutoff = now - retention_days * SHARD_SECONDS
+    expired = [name for name in list_shards(session) if shard_start(name) + SHARD_SECONDS <= cutoff]
+    connection = session.connection()
+    for name in expired:
+        history_table(name).drop(bind=connection)
+    session.commit()
+    if expired:
+        logger.info(f"Dropped {len(expired)} expired price history shards")
+    return expired
+
+
+def item_price_history(
+    session: Session,
+    item_id: int,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Return one item's history rows in time order, across shards.
+
+    Trade ages are converted back to ``high_time``/``low_time`` timestamps.
+
+    Args:
+        session: Database session
+        item_id: Item ID
+        since: Earliest ``ts`` to include
+        until: Only rows with ``ts`` before this timestamp
+
+    Returns:
+        Rows with ts, prices, trade times and 24h volumes
+    """
+    rows: List[Dict[str, Any]] = []
+    for name in list_shards(session):
+        start = shard_start(name)
+        if (since is not None and start + SHARD_SECONDS <= since) or (
+            until is not None and start >= until
+        ):
+            continue
+        table = history_table(name)
+        stmt = select(table).where(table.c.item_id == item_id)
+        if since is not None:
+            stmt = stmt.where(table.c.ts >= since)
+        if until is not None:
+            stmt = stmt.where(table.c.ts < until)
+        for row in session.execute(stmt.order_by(table.c.ts)).mappings():
+            ts = row["ts"]
+            rows.append(
+                {
+                    "ts": ts,
+                    "high_price": row["high_price"],
+                    "low_price": row["low_price"],
+                    "high_time": ts - row["high_age"] if row["high_age"] is not None else None,
+                    "low_time": ts - row["low_age"] if row["low_age"] is not None else None,
+                    "high_volume": row["high_volume"],
+                    "low_volume": row["low_volume"],
+                }
+            )
+    return rows
+
+
+def oldest_history_ts(session: Session) -> Optional[int]:
+    """
+    Return the earliest timestamp recorded in the history.
+
+    Args:
+        session: Database session
+
+    Returns:
+        Unix timestamp, or None if there is no history
+    """
+    for name in list_shards(session):
+        oldest = session.execute(select(func.min(history_table(name).c.ts))).scalar()
+        if oldest is not None:
+            return int(oldest)
+    return None
+
+
+def price_state_before(session: Session, ts: int) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """
+    Return every item's last recorded high/low price before a timestamp.
+
+    Each shard starts with a full baseline, so the newest shard holding rows
+    before ``ts`` knows every item recorded by then; older shards are only
+    read when that shard has no such rows.
+
+    Args:
+        session: Database session
+        ts: Unix timestamp
+
+    Returns:
+        (high_price, low_price) keyed by item id
+    """
+    for name in reversed(list_shards(session)):
+        if shard_start(name) >= ts:
+            continue
+        table = history_table(name)
+        last = (
+            select(table.c.item_id, func.max(table.c.ts).label("ts"))
+            .where(table.c.ts < ts)
+            .group_by(table.c.item_id)
+            .subquery()
+        )
+        stmt = select(table.c.item_id, table.c.high_price, table.c.low_price).join(
+            last, (table.c.item_id == last.c.item_id) & (table.c.ts == last.c.ts)
+        )
+        state = {item_id: (high, low) for item_id, high, low in session.execute(stmt)}
+        if state:
+            return state
+    return {}
+
+
+def iter_history(
+    session: Session, since: int, until: int
+) -> Iterator[Tuple[int, int, Optional[int], Optional[int]]]:
+    """
+    Yield every history row with ``since <= ts < until`` in time order.
+
+    Args:
+        session: Database session
+        since: Earliest timestamp to include
+        until: Only rows before this timestamp
+
+    Yields:
+        (item_id, ts, high_price, low_price) tuples
+    """
+    for name in list_shards(session):
+        start = shard_start(name)
+        if start + SHARD_SECONDS <= since or start >= until:
+            continue
+        table = history_table(name)
+        stmt = (
+            select(table.c.item_id, table.c.ts, table.c.high_price, table.c.low_price)
+            .where(table.c.ts >= since, table.c.ts < until)
+            .order_by(table.c.ts)
+        )
+        for row in session.execute(stmt):
+            yield row.item_id, row.ts, row.high_price, row.low_price
+
+
+def history_item_ids(session: Session, since: int, until: int) -> List[int]:
+    """
+    Return the ids of every item with a history row in ``[since, until)``.
+
+    Args:
+        session: Database session
+        since: Earliest timestamp to include
+        until: Only rows before this timestamp
+
+    Returns:
+        Sorted item ids
+    """
+    item_ids: Set[int] = set()
+    for name in list_shards(session):
+        start = shard_start(name)
+        if start + SHARD_SECONDS <= since or start >= until:
+            continue
+        table = history_table(name)
+        stmt = select(table.c.item_id).where(table.c.ts >= since, table.c.ts < until).distinct()
+        item_ids.update(session.execute(stmt).scalars())
+    return sorted(item_ids)
@@ -0,0 +1,401 @@
+"""Incremental OHLC rollups of the price history: raw -> 1h -> 1d.
+
+Charting weeks of prices from the raw history would scan millions of rows, so
+a scheduled job folds the history into hourly bars and the hourly bars into
+daily bars in the ``pricerollup`` table. Prices are mid prices; volume is the
+units traded according to the /1h bucket for the hour, or the sum of its /5m
+buckets when the /1h bucket was not stored.
+
+Each resolution keeps a watermark in ``rollupwatermark``: the end of the last
+bucket it has folded. A run only processes buckets that have closed since the
+watermark and advances it in the same transaction as the bars it wrote, so a
+restart resumes where the previous run stopped without recomputing anything.
+"""
+
+import logging
+import time
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlmodel import Session, col, select
+
+from backend.models import PriceBucket, PriceRollup, RollupWatermark
+from backend.services.metrics import metrics
+from backend.services.price_history import iter_history, oldest_history_ts, price_state_before
+from backend.services.wiki.bulk import upsert_price_rollups
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 86400
+
+# Bar width in seconds per rollup resolution
+ROLLUP_RESOLUTIONS = {"1h": HOUR, "1d": DAY}
+
+HOURLY_WATERMARK = "ohlc_1h"
+DAILY_WATERMARK = "ohlc_1d"
+
+# Hours folded per transaction, and most hours/days a single run catches up on
+ROLLUP_CHUNK_HOURS = 6
+MAX_HOURS_PER_RUN = 168
+MAX_DAYS_PER_RUN = 30
+
+
+def mid_price(high: Optional[int], low: Optional[int]) -> Optional[int]:
+    """
+    Return the midpoint of the high and low price, or whichever side is known.
+
+    Args:
+        high: Instant-buy price
+        low: Instant-sell price
+
+    Returns:
+        Mid price, or None if neither side is known
+    """
+    if high is not None and low is not None:
+        return (high + low) // 2
+    return high if high is not None else low
+
+
+def get_watermark(session: Session, name: str) -> Optional[int]:
+    """
+    Return the end of the last bucket a rollup has processed.
+
+    Args:
+        session: Database session
+        name: Watermark name (HOURLY_WATERMARK or DAILY_WATERMARK)
+
+    Returns:
+        Unix timestamp, or None if the rollup has never run
+    """
+    row = session.get(RollupWatermark, name)
+    return row.watermark if row is not None else None
+
+
+def _set_watermark(session: Session, name: str, watermark: int) -> None:
+    session.merge(RollupWatermark(name=name, watermark=watermark))
+
+
+class _Bar:
+    """Running OHLC state of one item over one bucket."""
+
+    __slots__ = ("open", "high", "low", "close", "total", "samples")
+
+    def __init__(self, open_price: int) -> None:
+        self.open = self.high = self.low = self.close = open_price
+        self.total = 0
+        self.samples = 0
+
+    def add(self, price: int) -> None:
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.close = price
+        self.total += price
+        self.samples += 1
+
+
+def hourly_volumes(session: Session, since: int, until: int) -> Dict[int, Dict[int, int]]:
+    """
+    Return units traded per item and hour from the stored price buckets.
+
+    Args:
+        session: Database session
+        since: First hour start to include
+        until: Only hours starting before this timestamp
+
+    Returns:
+        Volume keyed by hour start, then item id
+    """
+    volume = col(PriceBucket.high_price_volume) + col(PriceBucket.low_price_volume)
+    volumes: Dict[int, Dict[int, int]] = {}
+
+    timestamp = col(PriceBucket.timestamp)
+    five_minute_hour = timestamp - timestamp % HOUR
+    for item_id, hour, traded in session.exec(
+        select(col(PriceBucket.item_id), five_minute_hour, func.sum(volume))
+        .where(
+            col(PriceBucket.interval) == 300,
+            timestamp >= since,
+            timestamp < until,
+        )
+        .group_by(col(PriceBucket.item_id), five_minute_hour)
+    ):
+        volumes.setdefault(hour, {})[item_id] = int(traded or 0)
+
+    # Whole-hour buckets are authoritative when present
+    for item_id, hour, traded in session.exec(
+        select(col(PriceBucket.item_id), timestamp, volume).where(
+            col(PriceBucket.interval) == HOUR,
+            timestamp >= since,
+            timestamp < until,
+        )
+    ):
+        volumes.setdefault(hour, {})[item_id] = int(traded or 0)
+    return volumes
+
+
+def fold_hours(session: Session, since: int, until: int) -> List[Dict[str, Any]]:
+    """
+    Build hourly bars for every hour in ``[since, until)``.
+
+    A bar opens at the price carried in from before the hour and folds every
+    history row of the hour. Items that traded without a price change get a
+    flat bar at their carried price.
+
+    Args:
+        session: Database session
+        since: First hour start (aligned to the hour)
+        until: End of the last hour (aligned to the hour)
+
+    Returns:
+        PriceRollup rows keyed by column
+    """
+    state = {
+        item_id: mid_price(high, low)
+        for item_id, (high, low) in price_state_before(session, since).items()
+    }
+    volumes = hourly_volumes(session, since, until)
+    groups = groupby(iter_history(session, since, until), key=lambda row: row[1] - row[1] % HOUR)
+    current = next(groups, None)
+
+    rows: List[Dict[str, Any]] = []
+    for hour in range(since, until, HOUR):
+        bars: Dict[int, _Bar] = {}
+        if current is not None and current[0] == hour:
+            for item_id, _ts, high, low in current[1]:
+                price = mid_price(high, low)
+                if price is None:
+                    continue
+                bar = bars.get(item_id)
+                if bar is None:
+                    carried = state.get(item_id)
+                    bar = bars[item_id] = _Bar(price if carried is None else carried)
+                bar.add(price)
+            current = next(groups, None)
+
+        traded = volumes.get(hour, {})
+        for item_id, bar in bars.items():
+            rows.append(
+                {
+                    "item_id": item_id,
+                    "resolution": HOUR,
+                    "bucket_start": hour,
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "avg_price": bar.total // bar.samples,
+                    "volume": traded.get(item_id, 0),
+                    "samples": bar.samples,
+                }
+            )
+            state[item_id] = bar.close
+        for item_id, volume in traded.items():
+            if item_id in bars:
+                continue
+            price = state.get(item_id)
+            rows.append(
+                {
+                    "item_id": item_id,
+                    "resolution": HOUR,
+                    "bucket_start": hour,
+                    "open": price,
+                    "high": price,
+                    "low": price,
+                    "close": price,
+                    "avg_price": price,
+                    "volume": volume,
+                    "samples": 0,
+                }
+            )
+    return rows
+
+
+def fold_days(session: Session, since: int, until: int) -> List[Dict[str, Any]]:
+    """
+    Build daily bars from the hourly bars in ``[since, until)``.
+
+    Args:
+        session: Database session
+        since: First day start (aligned to UTC midnight)
+        until: End of the last day (aligned to UTC midnight)
+
+    Returns:
+        PriceRollup rows keyed by column
+    """
+    stmt = (
+        select(PriceRollup)
+        .where(
+            col(PriceRollup.resolution) == HOUR,
+            col(PriceRollup.bucket_start) >= since,
+            col(PriceRollup.bucket_start) < until,
+        )
+        .order_by(col(PriceRollup.item_id), col(PriceRollup.bucket_start))
+    )
+    days: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for bar in session.exec(stmt):
+        day = bar.bucket_start - bar.bucket_start % DAY
+        row = days.get((bar.item_id, day))
+        if row is None:
+            row = days[(bar.item_id, day)] = {
+                "item_id": bar.item_id,
+                "resolution": DAY,
+                "bucket_start": day,
+                "open": None,
+                "high": None,
+                "low": None,
+                "close": None,
+                "avg_price": None,
+                "volume": 0,
+                "samples": 0,
+                "_total": 0,
+            }
+        if bar.open is not None:
+            if row["open"] is None:
+                row["open"] = bar.open
+            row["high"] = bar.high if row["high"] is None else max(row["high"], bar.high)
+            row["low"] = bar.low if row["low"] is None else min(row["low"], bar.low)
+            row["close"] = bar.close
+            if bar.samples and bar.avg_price is not None:
+                row["_total"] += bar.avg_price * bar.samples
+        row["volume"] += bar.volume
+        row["samples"] += bar.samples
+
+    for row in days.values():
+        total = row.pop("_total")
+        row["avg_price"] = total // row["samples"] if row["samples"] else row["close"]
+    return list(days.values())
+
+
+def rollup_hours(
+    session: Session,
+    now: Optional[int] = None,
+    max_hours: int = MAX_HOURS_PER_RUN,
+    chunk_hours: int = ROLLUP_CHUNK_HOURS,
+) -> int:
+    """
+    Fold closed hours past the hourly watermark into hourly bars.
+
+    Starts at the oldest history row on the first run. Commits every
+    ``chunk_hours`` together with the advanced watermark.
+
+    Args:
+        session: Database session
+        now: Current unix timestamp (wall clock if None)
+        max_hours: Most hours processed by this call
+        chunk_hours: Hours folded per transaction
+
+    Returns:
+        Number of hours processed
+    """
+    now = int(time.time()) if now is None else now
+    closed = now - now % HOUR
+    start = get_watermark(session, HOURLY_WATERMARK)
+    if start is None:
+        oldest = oldest_history_ts(session)
+        if oldest is None:
+            return 0
+        start = oldest - oldest % HOUR
+    end = min(closed, start + max_hours * HOUR)
+
+    processed = 0
+    while start < end:
+        chunk_end = min(end, start + chunk_hours * HOUR)
+        rows = fold_hours(session, start, chunk_end)
+        upsert_price_rollups(session, rows)
+        _set_watermark(session, HOURLY_WATERMARK, chunk_end)
+        session.commit()
+        processed += (chunk_end - start) // HOUR
+        start = chunk_end
+    return processed
+
+
+def rollup_days(session: Session, max_days: int = MAX_DAYS_PER_RUN) -> int:
+    """
+    Fold days fully covered by the hourly rollup into daily bars.
+
+    Args:
+        session: Database session
+        max_days: Most days processed by this call
+
+    Returns:
+        Number of days processed
+    """
+    hourly = get_watermark(session, HOURLY_WATERMARK)
+    if hourly is None:
+        return 0
+    start = get_watermark(session, DAILY_WATERMARK)
+    if start is None:
+        first = session.exec(
+            select(func.min(col(PriceRollup.bucket_start))).where(
+                col(PriceRollup.resolution) == HOUR
+            )
+        ).one()
+        if first is None:
+            return 0
+        start = first - first % DAY
+    end = min(hourly - hourly % DAY, start + max_days * DAY)
+
+    processed = 0
+    while start < end:
+        upsert_price_rollups(session, fold_days(session, start, start + DAY))
+        _set_watermark(session, DAILY_WATERMARK, start + DAY)
+        session.commit()
+        processed += 1
+        start += DAY
+    return processed
+
+
+def run_rollups(session: Session, now: Optional[int] = None) -> Dict[str, int]:
+    """
+    Run the hourly then the daily rollup.
+
+    Blocking; async callers run it on the writer thread.
+
+    Args:
+        session: Database session
+        now: Current unix timestamp (wall clock if None)
+
+    Returns:
+        Buckets processed per resolution
+    """
+    start = time.perf_counter()
+    processed = {"1h": rollup_hours(session, now), "1d": rollup_days(session)}
+    metrics.observe("rollup.seconds", time.perf_counter() - start)
+    for resolution, count in processed.items():
+        metrics.inc(f"rollup.{resolution}.buckets", count)
+    if any(processed.values()):
+        logger.info(f"Rolled up {processed['1h']} hours and {processed['1d']} days of prices")
+    return processed
+
+
+def item_rollups(
+    session: Session,
+    item_id: int,
+    resolution: str = "1h",
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> List[PriceRollup]:
+    """
+    Return one item's bars at a resolution in time order.
+
+    Args:
+        session: Database session
+        item_id: Item ID
+        resolution: "1h" or "1d"
+        since: Earliest bar start to include
+        until: Only bars starting before this timestamp
+
+    Returns:
+        Bars ordered by bucket start
+    """
+    stmt = select(PriceRollup).where(
+        col(PriceRollup.item_id) == item_id,
+        col(PriceRollup.resolution) == ROLLUP_RESOLUTIONS[resolution],
+    )
+    if since is not None:
+        stmt = stmt.where(col(PriceRollup.bucket_start) >= since)
+    if until is not None:
+        stmt = stmt.where(col(PriceRollup.bucket_start) < until)
+    return list(session.exec(stmt.order_by(col(PriceRollup.bucket_start))).all())
@@ -0,0 +1,156 @@
+"""Price series for charts, served from the coarsest sufficient resolution.
+
+A request names a time range and roughly how many points it wants. The
+series is read from the coarsest source that still yields that many points
+over the range (daily bars, hourly bars, or the raw price history), so the
+number of rows read and returned stays flat no matter how long the range is.
+Values are returned as parallel columns rather than one object per point.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+from sqlmodel import Session
+
+from backend.services.price_buckets import item_buckets
+from backend.services.price_history import item_price_history
+from backend.services.price_rollup import item_rollups
+
+# Typical spacing of points per resolution, coarsest first. Raw history is
+# written once per 5-minute price sync.
+SERIES_RESOLUTIONS = {"1d": 86400, "1h": 3600, "raw": 300}
+
+
+@dataclass
+class PriceSeries:
+    """Columnar price series for one item.
+
+    At ``raw`` resolution ``high``/``low`` are the instant-buy and
+    instant-sell prices recorded by each sync and ``volume`` is the /5m
+    bucket volume. When the range holds more syncs than the requested points,
+    raw rows are merged into that many evenly spaced bins, each with its
+    first sync time, highest high, lowest low and summed bucket volume. For
+    ``1h``/``1d`` they are each bar's highest and lowest mid price and its
+    traded volume.
+    """
+
+    item_id: int
+    resolution: str
+    ts: List[int] = field(default_factory=list)
+    high: List[Optional[int]] = field(default_factory=list)
+    low: List[Optional[int]] = field(default_factory=list)
+    volume: List[Optional[int]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+def choose_resolution(span_seconds: int, points: int) -> str:
+    """
+    Pick the coarsest resolution yielding at least ``points`` over a span.
+
+    Args:
+        span_seconds: Length of the requested range
+        points: Desired number of points
+
+    Returns:
+        "1d", "1h" or "raw" (raw if no rollup is fine enough)
+    """
+    for resolution, width in SERIES_RESOLUTIONS.items():
+        if span_seconds // width >= points:
+            return resolution
+    return "raw"
+
+
+def _raw_series(session: Session, item_id: int, since: int, until: int, points: int) -> PriceSeries:
+    series = PriceSeries(item_id=item_id, resolution="raw")
+    volumes = {
+        bucket.timestamp: bucket.high_price_volume + bucket.low_price_volume
+        for bucket in item_buckets(session, item_id, "5m", since - since % 300, until)
+    }
+    rows = item_price_history(session, item_id, since, until)
+    if len(rows) <= points:
+        for row in rows:
+            ts = row["ts"]
+            series.ts.append(ts)
+            series.high.append(row["high_price"])
+            series.low.append(row["low_price"])
+            series.volume.append(volumes.get(ts - ts % 300))
+        return series
+
+    # More syncs than points: merge them into evenly spaced bins like a bar
+    span = until - since
+    current = -1
+    seen: Set[int] = set()
+    for row in rows:
+        ts = row["ts"]
+        bin_index = (ts - since) * points // span
+        if bin_index != current:
+            current = bin_index
+            seen = set()
+            series.ts.append(ts)
+            series.high.append(None)
+            series.low.append(None)
+            series.volume.append(None)
+        high, low = row["high_price"], row["low_price"]
+        if high is not None:
+            series.high[-1] = max(high, series.high[-1] or high)
+        if low is not None:
+            series.low[-1] = min(low, series.low[-1] or low)
+        bucket = ts - ts % 300
+        volume = volumes.get(bucket)
+        if volume is not None and bucket not in seen:
+            seen.add(bucket)
+            series.volume[-1] = (series.volume[-1] or 0) + volume
+    return series
+
+
+def _rollup_series(
+    session: Session, item_id: int, resolution: str, since: int, until: int
+) -> PriceSeries:
+    series = PriceSeries(item_id=item_id, resolution=resolution)
+    for bar in item_rollups(session, item_id, resolution, since, until):
+        series.ts.append(bar.bucket_start)
+        series.high.append(bar.high)
+        series.low.append(bar.low)
+        series.volume.append(bar.volume)
+    return series
+
+
+def price_series(
+    session: Session,
+    item_id: int,
+    since: int,
+    until: int,
+    points: int,
+    resolution: Optional[str] = None,
+) -> PriceSeries:
+    """
+    Return an item's price series over ``[since, until)``.
+
+    Starts at the resolution chosen for ``points`` and falls back to finer
+    resolutions when the rollup has no data for the range yet (for example
+    right after the history started being recorded). The raw series is
+    binned down to at most ``points`` points, so a long range that falls
+    back to it stays as small as one served from a rollup.
+
+    Args:
+        session: Database session
+        item_id: Item ID
+        since: Range start (unix timestamp)
+        until: Range end (unix timestamp, exclusive)
+        points: Desired number of points
+        resolution: Force a resolution instead of choosing one
+
+    Returns:
+        Columnar series; empty if nothing is recorded for the range
+    """
+    chosen = resolution or choose_resolution(until - since, points)
+    candidates = list(SERIES_RESOLUTIONS)
+    for candidate in candidates[candidates.index(chosen) :]:
+        if candidate == "raw":
+            return _raw_series(session, item_id, since, until, points)
+        series = _rollup_series(session, item_id, candidate, since, until)
+        if series or resolution is not None:
+            return series
+    return PriceSeries(item_id=item_id, resolution=chosen)
@@ -0,0 +1,364 @@
+"""EXPLAIN QUERY PLAN audit of the hot queries in the services layer.
+
+Each hot query is a small callable that exercises a real service function.
+The audit runs it against a database, captures every SELECT it issues
+through a SQLAlchemy cursor event, and runs ``EXPLAIN QUERY PLAN`` on each
+statement with its bound parameters. Two plan steps are flagged:
+
+- ``SCAN <table>`` without an index: a full table scan
+- ``USE TEMP B-TREE FOR ...``: a sort or grouping the index order cannot serve
+
+Some queries inherently touch every row (ranking all priced items), so each
+hot query lists the findings it is allowed to have and why. Anything else is
+reported as unexpected; the test suite runs the audit and fails on it, so a
+query that loses its index is caught before it ships.
+
+Statements are captured on one engine and can be explained on another
+(``explain_engine``): EXPLAIN does not execute the statement, so plans can
+be checked against a production database without touching its data.
+"""
+
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.models import (
+    Item,
+    PriceBucket,
+    PriceRollup,
+    PriceSnapshot,
+    Trade,
+    WatchlistAlert,
+    WatchlistItem,
+)
+from backend.services.flip_metrics import refresh_flip_metrics
+from backend.services.flipping import FlippingService
+from backend.services.gear.loadouts.alternatives import get_alternatives
+from backend.services.gear.loadouts.optimization import get_best_loadout
+from backend.services.gear.loadouts.suggestions import suggest_gear
+from backend.services.gear.loadouts.upgrade_path import get_upgrade_path
+from backend.services.gear.pricing import get_item_cost, get_item_price
+from backend.services.price_buckets import item_buckets, recent_window_stats
+from backend.services.price_rollup import item_rollups
+from backend.services.trade import TradeService
+from backend.services.watchlist import WatchlistService
+from backend.services.wiki.bulk import refresh_item_prices
+
+# Fixture values the hot queries look up; seed_audit_data inserts matching rows
+AUDIT_USER = "audit-user"
+AUDIT_ITEM = 4151
+AUDIT_TIME = 1_760_659_200
+
+MAXED_STATS = {
+    skill: 99 for skill in ("attack", "strength", "defence", "ranged", "magic", "prayer")
+}
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\S+)(.*)$")
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A hot service query and the plan findings accepted for it."""
+
+    name: str
+    run: Callable[[Session], Any]
+    allowed: FrozenSet[str] = frozenset()
+    reason: str = ""
+
+
+@dataclass
+class StatementPlan:
+    """EXPLAIN QUERY PLAN output of one captured statement."""
+
+    sql: str
+    plan: List[str]
+    findings: List[str]
+
+
+@dataclass
+class QueryAudit:
+    """Audit result of one hot query."""
+
+    query: HotQuery
+    statements: List[StatementPlan] = field(default_factory=list)
+
+    @property
+    def findings(self) -> List[str]:
+        """Distinct findings over every statement, in order of appearance."""
+        return list(dict.fromkeys(f for plan in self.statements for f in plan.findings))
+
+    @property
+    def unexpected(self) -> List[str]:
+        """Findings the query is not allowed to have."""
+        return [finding for finding in self.findings if finding not in self.query.allowed]
+
+
+def plan_findings(plan: Iterable[str]) -> List[str]:
+    """
+    Return the flagged steps of a query plan.
+
+    Args:
+        plan: ``detail`` column of EXPLAIN QUERY PLAN rows
+
+    Returns:
+        ``SCAN <table>`` for full table scans and the ``USE TEMP B-TREE``
+        steps, in plan order
+    """
+    findings = []
+    for detail in plan:
+        scan = _SCAN.match(detail)
+        if scan:
+            table, access = scan.groups()
+            # Subqueries and constant rows are built in memory, not read from a table
+            if not table.startswith("(") and table != "CONSTANT" and "INDEX" not in access:
+                findings.append(f"SCAN {table}")
+        elif detail.startswith("USE TEMP B-TREE"):
+            findings.append(detail)
+    return findings
+
+
+@contextmanager
+def capture_selects(engine: Engine) -> Iterator[List[Tuple[str, Any]]]:
+    """
+    Record every SELECT sent to the database while the block runs.
+
+    Args:
+        engine: Engine to listen on
+
+    Yields:
+        List filled with (statement, DBAPI parameters) tuples
+    """
+    captured: List[Tuple[str, Any]] = []
+
+    def _record(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def explain(engine: Engine, statement: str, parameters: Any = ()) -> List[str]:
+    """
+    Return the EXPLAIN QUERY PLAN details of a statement.
+
+    Args:
+        engine: Engine to explain on
+        statement: SQL as sent to the DBAPI
+        parameters: DBAPI parameters captured with it
+
+    Returns:
+        Plan step details in plan order
+    """
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def audit_hot_queries(
+    engine: Engine,
+    queries: Optional[Sequence[HotQuery]] = None,
+    explain_engine: Optional[Engine] = None,
+) -> List[QueryAudit]:
+    """
+    Run each hot query and explain the statements it issues.
+
+    Args:
+        engine: Engine the queries run on (seeded with ``seed_audit_data``)
+        queries: Queries to audit (HOT_QUERIES if None)
+        explain_engine: Engine to explain on (``engine`` if None)
+
+    Returns:
+        One audit per query
+    """
+    results = []
+    for query in HOT_QUERIES if queries is None else queries:
+        with capture_selects(engine) as captured, Session(engine) as session:
+            query.run(session)
+            session.rollback()
+        audit = QueryAudit(query=query)
+        for statement in dict.fromkeys(sql for sql, _ in captured):
+            parameters = next(params for sql, params in captured if sql == statement)
+            plan = explain(explain_engine or engine, statement, parameters)
+            audit.statements.append(StatementPlan(statement, plan, plan_findings(plan)))
+        results.append(audit)
+    return results
+
+
+def seed_audit_data(session: Session) -> None:
+    """
+    Insert the rows the hot queries look up.
+
+    Args:
+        session: Session on an empty database
+    """
+    session.add(Item(id=AUDIT_ITEM, name="Abyssal whip", slot="weapon", limit=70, value=120_001))
+    session.add(Item(id=AUDIT_ITEM + 1, name="Dragon scimitar", slot="weapon", value=100_000))
+    session.add(
+        PriceSnapshot(
+            item_id=AUDIT_ITEM, high_price=1_500_000, low_price=1_450_000, high_volume=900
+        )
+    )
+    watched = WatchlistItem(
+        user_id=AUDIT_USER,
+        item_id=AUDIT_ITEM,
+        item_name="Abyssal whip",
+        alert_type="price_below",
+        threshold=1,
+    )
+    session.add(watched)
+    session.flush()
+    session.add(
+        WatchlistAlert(
+            watchlist_item_id=watched.id, current_value=1, threshold_value=1, message="seed"
+        )
+    )
+    session.add(
+        Trade(
+            user_id=AUDIT_USER,
+            item_id=AUDIT_ITEM,
+            item_name="Abyssal whip",
+            buy_price=1_450_000,
+            quantity=1,
+        )
+    )
+    session.add(PriceBucket(item_id=AUDIT_ITEM, interval=300, timestamp=AUDIT_TIME))
+    session.add(PriceRollup(item_id=AUDIT_ITEM, resolution=3600, bucket_start=AUDIT_TIME))
+    session.flush()
+    # What the write stage of a price sync derives from the snapshots
+    refresh_item_prices(session)
+    refresh_flip_metrics(session)
+    session.commit()
+
+
+def audit_engine() -> Engine:
+    """
+    Return an in-memory database with the current schema and audit rows.
+
+    Returns:
+        Engine holding a single shared connection
+    """
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed_audit_data(session)
+    return engine
+
+
+def _item(session: Session) -> Item:
+    item = session.get(Item, AUDIT_ITEM)
+    assert item is not None, "seed_audit_data was not run"
+    return item
+
+
+# Reasons shared by the queries that rank every priced item
+_RANKS_ALL_ITEMS = "ranks every priced item, so it reads them all"
+
+HOT_QUERIES: Tuple[HotQuery, ...] = (
+    HotQuery("get_item_price", lambda s: get_item_price(s, _item(s))),
+    HotQuery("get_item_cost", lambda s: get_item_cost(s, _item(s))),
+    HotQuery("evaluate_alerts", lambda s: WatchlistService(s).evaluate_alerts()),
+    HotQuery("get_watchlist", lambda s: WatchlistService(s).get_watchlist(AUDIT_USER)),
+    HotQuery(
+        "get_alerts",
+        lambda s: WatchlistService(s).get_alerts(AUDIT_USER),
+        allowed=frozenset({"USE TEMP B-TREE FOR ORDER BY"}),
+        reason="merges the alerts of every watchlist item of one user; bounded by the user",
+    ),
+    HotQuery("get_trade_history", lambda s: TradeService(s).get_trade_history(AUDIT_USER)),
+    HotQuery("get_trade_stats", lambda s: TradeService(s).get_trade_stats(AUDIT_USER, days=7)),
+    HotQuery(
+        "find_best_flips",
+        lambda s: FlippingService(s).find_best_flips(budget=10**9, min_roi=1, min_volume=0),
+    ),
+    HotQuery(
+        "get_flip_opportunities",
+        lambda s: FlippingService(s).get_flip_opportunities(),
+        allowed=frozenset({"SCAN item"}),
+        reason=f"{_RANKS_ALL_ITEMS}; the ranking happens in NumPy",
+    ),
+    HotQuery("suggest_gear", lambda s: suggest_gear(s, "weapon")),
+    HotQuery(
+        "get_alternatives",
+        lambda s: get_alternatives(s, "weapon", "melee", stats=MAXED_STATS),
+    ),
+    HotQuery("get_best_loadout", lambda s: get_best_loadout(s, "melee", 10**9, MAXED_STATS)),
+    HotQuery(
+        "get_upgrade_path",
+        lambda s: get_upgrade_path(s, {"weapon": AUDIT_ITEM + 1}, "melee", 10**9, MAXED_STATS),
+    ),
+    HotQuery("recent_window_stats", lambda s: recent_window_stats(s, 3600, [AUDIT_ITEM])),
+    HotQuery("item_buckets", lambda s: item_buckets(s, AUDIT_ITEM, "5m", AUDIT_TIME)),
+    HotQuery("item_rollups", lambda s: item_rollups(s, AUDIT_ITEM, "1h", AUDIT_TIME)),
+)
+
+
+def format_audit(results: Sequence[QueryAudit], verbose: bool = False) -> str:
+    """
+    Render audit results as text.
+
+    Args:
+        results: Audit results
+        verbose: Include every statement's full plan
+
+    Returns:
+        One line per query plus details of flagged or verbose queries
+    """
+    lines = []
+    for audit in results:
+        unexpected = audit.unexpected
+        status = "FAIL" if unexpected else ("ok*" if audit.findings else "ok")
+        lines.append(f"{status:<5} {audit.query.name}")
+        for finding in unexpected:
+            lines.append(f"      unexpected: {finding}")
+        if audit.findings and not unexpected:
+            lines.append(f"      accepted: {', '.join(audit.findings)} ({audit.query.reason})")
+        if verbose or unexpected:
+            for statement in audit.statements:
+                lines.append(f"      {' '.join(statement.sql.split())[:120]}")
+                lines.extend(f"        {step}" for step in statement.plan)
+    return "\n".join(lines)
+
+
+def summarize(results: Sequence[QueryAudit]) -> Dict[str, int]:
+    """
+    Count queries by outcome.
+
+    Args:
+        results: Audit results
+
+    Returns:
+        Number of clean, accepted and failing queries
+    """
+    failing = sum(1 for audit in results if audit.unexpected)
+    accepted = sum(1 for audit in results if audit.findings and not audit.unexpected)
+    return {"clean": len(results) - failing - accepted, "accepted": accepted, "failing": failing}
@@ -0,0 +1,138 @@
+"""Generation-keyed cache of serialized API responses.
+
+Dashboards poll the flip endpoints every few seconds with the same filters,
+while the data behind them only changes when a price sync publishes a new
+``price_updates`` generation. Responses are therefore cached as serialized
+bytes under (normalized request key, generation): a sync makes every entry
+unreachable without any explicit invalidation, and the stale entries age out
+of the bounded LRU.
+
+Each entry carries an ``ETag`` derived from its body, so clients that send
+``If-None-Match`` get ``304 Not Modified`` instead of the body, also across
+a sync that did not change their results.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from backend.services.metrics import metrics
+from backend.services.price_events import PriceUpdates, price_updates
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Serialized body and headers of one response."""
+
+    body: bytes
+    etag: str
+    generation: int
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Return a strong ETag for a response body.
+
+    Args:
+        body: Serialized body
+
+    Returns:
+        Quoted entity tag
+    """
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Header value, possibly a comma-separated list or ``*``
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    """Bounded LRU of responses, valid for one price generation."""
+
+    def __init__(
+        self, name: str, max_entries: int = 512, updates: PriceUpdates = price_updates
+    ) -> None:
+        """
+        Create a cache.
+
+        Args:
+            name: Metrics prefix (``<name>.hits``, ``<name>.misses``, ...)
+            max_entries: Entries kept before the least recently used is evicted
+            updates: Source of the current price generation
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self._updates = updates
+        self._entries: "OrderedDict[Tuple[Hashable, int], CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+        metrics.set_gauge(f"{self.name}.entries", 0)
+
+    def get_or_build(
+        self, key: Hashable, build: Callable[[], Tuple[bytes, Dict[str, str], int]]
+    ) -> CachedResponse:
+        """
+        Return the response cached for ``key`` at the current generation.
+
+        On a miss ``build`` runs outside the lock; concurrent misses for the
+        same key may both build, and the last one is kept. The entry is
+        stored under the generation of the data ``build`` actually used, so
+        a response built from a stale view is never served as current.
+
+        Args:
+            key: Normalized request parameters
+            build: Returns the serialized body, extra headers and the price
+                generation of the data it was built from
+
+        Returns:
+            The cached or freshly built response
+        """
+        generation = self._updates.generation
+        with self._lock:
+            cached = self._entries.get((key, generation))
+            if cached is not None:
+                self._entries.move_to_end((key, generation))
+        if cached is not None:
+            metrics.inc(f"{self.name}.hits")
+            return cached
+
+        metrics.inc(f"{self.name}.misses")
+        body, headers, built_generation = build()
+        cached = CachedResponse(body, make_etag(body), built_generation, headers)
+        with self._lock:
+            self._entries[(key, built_generation)] = cached
+            self._entries.move_to_end((key, built_generation))
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+        if evicted:
+            metrics.inc(f"{self.name}.evictions", evicted)
+        metrics.set_gauge(f"{self.name}.entries", size)
+        return cached
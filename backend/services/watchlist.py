@@ -1,12 +1,13 @@
 """Watchlist service for managing item watchlists and price alerts."""
 
 from datetime import datetime
-from typing import List
+from typing import Collection, Dict, List
 
 from sqlmodel import Session, select
 
 from backend.models import WatchlistItem, WatchlistAlert, Item, PriceSnapshot
 from backend.services.flipping import calculate_tax
+from backend.services.price_buckets import WindowStats, recent_window_stats
 
 
 class WatchlistService:
@@ -114,6 +115,25 @@ class WatchlistService:
         watchlist_items = self.session.exec(query).all()
         return list(watchlist_items)
 
+    def get_recent_activity(
+        self, item_ids: Collection[int], window_seconds: int = 3600
+    ) -> Dict[int, WindowStats]:
+        """
+        Get recent trade volume and average prices of watched items.
+
+        Read from the pre-aggregated /5m price buckets in one grouped query.
+
+        Args:
+            item_ids: Watched item IDs
+            window_seconds: Window length in seconds
+
+        Returns:
+            Stats keyed by item ID; items that did not trade in the window are absent
+        """
+        if not item_ids:
+            return {}
+        return recent_window_stats(self.session, window_seconds, item_ids)
+
     def remove_from_watchlist(self, watchlist_item_id: int, user_id: str) -> bool:
         """
         Remove an item from the watchlist (deactivate it).
@@ -0,0 +1,317 @@
+"""Set-based bulk writes for Wiki price data.
+
+The price sync touches every tradeable item (~4k rows) every 5 minutes, so the
+write path avoids per-row ORM round trips: snapshots are upserted with one
+``INSERT ... ON CONFLICT(item_id) DO UPDATE`` executemany call per chunk and the
+denormalized ``Item`` price columns are refreshed with a single joined UPDATE.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Collection, Iterable, Optional, Sequence, cast
+
+from sqlalchemy import CursorResult, bindparam, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from backend.models import PriceBucket, PriceRollup, PriceSnapshot
+from backend.services.price_history import ensure_shard, history_row
+
+# Rows per executemany batch. Bounds the size of each parameter list handed to
+# the driver while keeping the number of round trips per sync small.
+PRICE_UPSERT_CHUNK_SIZE = 1000
+
+# Columns overwritten when a snapshot for the item already exists
+SNAPSHOT_PRICE_COLUMNS = (
+    "high_price",
+    "low_price",
+    "high_volume",
+    "low_volume",
+    "high_time",
+    "low_time",
+)
+
+# 24h buy/sell volume columns, written alongside the price columns when /24h is available
+SNAPSHOT_VOLUME_24H_COLUMNS = (
+    "buy_volume_24h",
+    "sell_volume_24h",
+)
+
+# Columns overwritten when a bucket row is fetched again (e.g. a late revision)
+PRICE_BUCKET_COLUMNS = (
+    "avg_high_price",
+    "high_price_volume",
+    "avg_low_price",
+    "low_price_volume",
+)
+
+
+def _chunks(rows: Sequence[dict[str, Any]], size: int) -> Iterable[Sequence[dict[str, Any]]]:
+    """Yield consecutive slices of ``rows`` with at most ``size`` entries."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _dialect_insert(session: Session) -> Any:
+    """Return the dialect-specific ``insert`` construct supporting ON CONFLICT."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def upsert_price_snapshots(
+    session: Session,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int = PRICE_UPSERT_CHUNK_SIZE,
+    update_columns: Sequence[str] = SNAPSHOT_PRICE_COLUMNS,
+) -> int:
+    """
+    Insert or update one PriceSnapshot row per item.
+
+    Relies on the unique index on ``pricesnapshot.item_id``. Every row must
+    have the same keys: ``item_id`` plus the snapshot columns to write. The
+    caller is responsible for committing the session.
+
+    Args:
+        session: Database session
+        rows: Snapshot column values keyed by column name
+        chunk_size: Maximum number of rows per executemany batch
+        update_columns: Columns overwritten when the item already has a snapshot
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    insert = _dialect_insert(session)
+    table = PriceSnapshot.__table__  # type: ignore[attr-defined]
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.item_id],
+        set_={col: stmt.excluded[col] for col in update_columns},
+    )
+    created_at = datetime.now(timezone.utc)
+
+    # The statement is compiled once and each chunk is sent as a single
+    # executemany call, so the driver reuses one prepared statement.
+    for chunk in _chunks(rows, chunk_size):
+        session.execute(stmt, [{**row, "created_at": created_at} for row in chunk])
+
+    return len(rows)
+
+
+def update_snapshot_volumes(session: Session, rows: Sequence[dict[str, Any]]) -> int:
+    """
+    Write 24h buy/sell volume onto existing PriceSnapshot rows.
+
+    Issues a single executemany UPDATE keyed on ``item_id``. Items without a
+    snapshot are left untouched. The caller is responsible for committing.
+
+    Args:
+        session: Database session
+        rows: Dicts with ``item_id``, ``buy_volume_24h`` and ``sell_volume_24h``
+
+    Returns:
+        Number of rows submitted
+    """
+    if not rows:
+        return 0
+
+    table = PriceSnapshot.__table__  # type: ignore[attr-defined]
+    stmt = (
+        table.update()
+        .where(table.c.item_id == bindparam("b_item_id"))
+        .values(
+            buy_volume_24h=bindparam("b_buy_volume_24h"),
+            sell_volume_24h=bindparam("b_sell_volume_24h"),
+        )
+    )
+    session.connection().execute(
+        stmt,
+        [
+            {
+                "b_item_id": row["item_id"],
+                "b_buy_volume_24h": row["buy_volume_24h"],
+                "b_sell_volume_24h": row["sell_volume_24h"],
+            }
+            for row in rows
+        ],
+    )
+    return len(rows)
+
+
+def upsert_price_buckets(
+    session: Session,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int = PRICE_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Insert or update /5m and /1h bucket rows.
+
+    Keyed on ``(item_id, interval, timestamp)``, so re-fetching a bucket
+    overwrites it in place. The caller is responsible for committing.
+
+    Args:
+        session: Database session
+        rows: Bucket column values keyed by column name
+        chunk_size: Maximum number of rows per executemany batch
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    insert = _dialect_insert(session)
+    table = PriceBucket.__table__  # type: ignore[attr-defined]
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.item_id, table.c.interval, table.c.timestamp],
+        set_={col: stmt.excluded[col] for col in PRICE_BUCKET_COLUMNS},
+    )
+    for chunk in _chunks(rows, chunk_size):
+        session.execute(stmt, list(chunk))
+    return len(rows)
+
+
+# Columns overwritten when a rollup bar is recomputed
+PRICE_ROLLUP_COLUMNS = ("open", "high", "low", "close", "avg_price", "volume", "samples")
+
+
+def upsert_price_rollups(
+    session: Session,
+    rows: Sequence[dict[str, Any]],
+    chunk_size: int = PRICE_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Insert or update OHLC rollup bars.
+
+    Keyed on ``(item_id, resolution, bucket_start)``. The caller is
+    responsible for committing.
+
+    Args:
+        session: Database session
+        rows: Rollup column values keyed by column name
+        chunk_size: Maximum number of rows per executemany batch
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    insert = _dialect_insert(session)
+    table = PriceRollup.__table__  # type: ignore[attr-defined]
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.item_id, table.c.resolution, table.c.bucket_start],
+        set_={col: stmt.excluded[col] for col in PRICE_ROLLUP_COLUMNS},
+    )
+    for chunk in _chunks(rows, chunk_size):
+        session.execute(stmt, list(chunk))
+    return len(rows)
+
+
+def prune_price_buckets(session: Session, interval: int, before: int) -> int:
+    """
+    Delete buckets of one interval that start before a cutoff.
+
+    The caller is responsible for committing.
+
+    Args:
+        session: Database session
+        interval: Bucket width in seconds
+        before: Unix timestamp; older buckets are deleted
+
+    Returns:
+        Number of rows deleted
+    """
+    table = PriceBucket.__table__  # type: ignore[attr-defined]
+    # DML statements return a CursorResult, which carries the rowcount
+    result = cast(
+        CursorResult[Any],
+        session.execute(
+            table.delete().where(table.c.interval == interval, table.c.timestamp < before)
+        ),
+    )
+    return result.rowcount or 0
+
+
+def append_price_history(
+    session: Session,
+    rows: Sequence[dict[str, Any]],
+    baseline: Optional[Sequence[dict[str, Any]]] = None,
+    ts: Optional[int] = None,
+    chunk_size: int = PRICE_UPSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Append price rows to the history shard for ``ts``.
+
+    When this creates the day's shard, ``baseline`` (every item's current
+    row) is written instead of ``rows`` so the shard is self-contained. Rows
+    already recorded at the same ``ts`` are kept. The caller is responsible
+    for committing.
+
+    Args:
+        session: Database session
+        rows: Normalized price rows that changed this tick
+        baseline: All normalized price rows of this tick
+        ts: Timestamp to record the rows at (current time if None)
+        chunk_size: Maximum number of rows per executemany batch
+
+    Returns:
+        Number of rows submitted
+    """
+    ts = int(time.time()) if ts is None else ts
+    table, created = ensure_shard(session, ts)
+    source = baseline if created and baseline is not None else rows
+    if not source:
+        return 0
+
+    stmt = _dialect_insert(session)(table).on_conflict_do_nothing(
+        index_elements=[table.c.item_id, table.c.ts]
+    )
+    history = [history_row(row, ts) for row in source]
+    for chunk in _chunks(history, chunk_size):
+        session.execute(stmt, list(chunk))
+    return len(history)
+
+
+_REFRESH_ITEM_PRICES_SQL = """
+    UPDATE item
+    SET
+        high_price = ps.high_price,
+        low_price = ps.low_price,
+        high_time = ps.high_time,
+        low_time = ps.low_time,
+        buy_limit = item."limit"
+    FROM pricesnapshot AS ps
+    WHERE ps.item_id = item.id
+"""
+
+
+def refresh_item_prices(session: Session, item_ids: Optional[Collection[int]] = None) -> None:
+    """
+    Copy snapshot prices onto the denormalized ``Item`` price columns.
+
+    Runs a single ``UPDATE ... FROM`` join instead of one ``session.get(Item)``
+    per snapshot. ``buy_limit`` is kept in sync with ``limit``. The caller is
+    responsible for committing the session.
+
+    Args:
+        session: Database session
+        item_ids: Only refresh these items (all items if None)
+    """
+    # Note: "limit" is a reserved keyword, so it must be quoted
+    if item_ids is None:
+        session.execute(text(_REFRESH_ITEM_PRICES_SQL))
+        return
+
+    stmt = text(_REFRESH_ITEM_PRICES_SQL + " AND item.id IN :item_ids").bindparams(
+        bindparam("item_ids", expanding=True)
+    )
+    ids = sorted(item_ids)
+    for start in range(0, len(ids), PRICE_UPSERT_CHUNK_SIZE):
+        session.execute(stmt, {"item_ids": ids[start : start + PRICE_UPSERT_CHUNK_SIZE]})
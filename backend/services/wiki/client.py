@@ -1,77 +1,446 @@
 """OSRS Wiki API HTTP client."""
 
+import asyncio
+import functools
+import hashlib
 import httpx
 import logging
-from typing import Any
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
 
 from backend.config import settings
+from backend.services.metrics import metrics
+from backend.services.wiki.fetch import FetchStageResult, PayloadUnchanged, run_fetch_stage
+from backend.services.wiki.http import get_http_client
+from backend.services.wiki.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyWindow,
+    RetryBudget,
+    RetryPolicy,
+    hedged,
+    is_retryable,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def endpoint_timeout(endpoint: str) -> float:
+    """
+    Return the configured request timeout for a wiki endpoint.
+
+    Args:
+        endpoint: Endpoint name without leading slash (e.g. "latest")
+
+    Returns:
+        Timeout in seconds
+    """
+    timeouts = {
+        "mapping": settings.wiki_timeout_mapping,
+        "latest": settings.wiki_timeout_latest,
+        "24h": settings.wiki_timeout_24h,
+    }
+    return timeouts.get(endpoint, settings.wiki_timeout_default)
+
+
+def endpoint_deadline(endpoint: str) -> float:
+    """
+    Return the overall deadline for a wiki endpoint within a fetch stage.
+
+    Args:
+        endpoint: Endpoint name without leading slash (e.g. "latest")
+
+    Returns:
+        Deadline in seconds
+    """
+    deadlines = {
+        "mapping": settings.wiki_deadline_mapping,
+        "latest": settings.wiki_deadline_latest,
+        "24h": settings.wiki_deadline_24h,
+    }
+    return deadlines.get(endpoint, endpoint_timeout(endpoint))
+
+
+# WikiAPIClient method that downloads each endpoint
+ENDPOINT_FETCHERS = {
+    "mapping": "fetch_mapping",
+    "latest": "fetch_latest_prices",
+    "24h": "fetch_24h_prices",
+    "5m": "fetch_5m_prices",
+    "1h": "fetch_1h_prices",
+}
+
+
+@dataclass
+class EndpointCache:
+    """Validators and fingerprint of the last payload fetched from an endpoint."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    digest: Optional[str] = None
+    payload: Any = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return If-None-Match/If-Modified-Since headers for the next request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
 class WikiAPIClient:
     """Client for interacting with the OSRS Wiki API."""
 
-    def __init__(self) -> None:
-        """Initialize the Wiki API client."""
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None) -> None:
+        """
+        Initialize the Wiki API client.
+
+        Args:
+            http_client: AsyncClient to use. Defaults to the shared process-wide
+                client so connections are pooled across all wiki calls.
+        """
         self.base_url = settings.wiki_api_base
         self.headers = {"User-Agent": settings.user_agent, "Accept": "application/json"}
+        self._http_client = http_client
+        self._cache: Dict[str, EndpointCache] = {}
+        self.retry_policy = RetryPolicy.from_settings()
+        self.retry_budget = RetryBudget(ratio=settings.wiki_retry_budget_ratio)
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.wiki_breaker_failure_threshold,
+            reset_seconds=settings.wiki_breaker_reset_seconds,
+        )
+        self.latency = LatencyWindow(min_samples=settings.wiki_hedge_min_samples)
+        self.hedging = settings.wiki_hedge_enabled
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """AsyncClient used for requests (injected or shared)."""
+        return self._http_client or get_http_client()
 
-    async def fetch_mapping(self) -> list[dict[str, Any]]:
+    async def _get(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
         """
-        Fetch item mapping (ID, name, limit, value) from Wiki.
+        Issue a GET against a wiki endpoint on the pooled client.
+
+        Transport errors, 429 and 5xx responses are retried with jittered
+        backoff while the retry budget allows. Consecutive failures open the
+        circuit breaker, after which requests fail immediately until the
+        breaker lets a trial request through.
+
+        Args:
+            endpoint: Endpoint name without leading slash
+            headers: Request headers (defaults to the client headers)
+            params: Query string parameters
 
         Returns:
-            List of item mapping dictionaries
+            Successful or 304 Not Modified response
 
         Raises:
+            CircuitOpenError: If the circuit breaker is open
             httpx.HTTPStatusError: If the API request fails
         """
-        url = f"{self.base_url}/mapping"
-        async with httpx.AsyncClient() as client:
+        self.retry_budget.deposit()
+        retry = 0
+        while True:
+            if not self.breaker.allow():
+                metrics.inc(f"wiki.fetch.{endpoint}.short_circuited")
+                raise CircuitOpenError(endpoint, self.breaker.retry_in())
             try:
-                response = await client.get(url, headers=self.headers, timeout=30.0)
-                response.raise_for_status()
-                data = response.json()
-                return data if isinstance(data, list) else []
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 403:
-                    logger.error("403 Forbidden: Invalid User-Agent header")
+                response = await self._send(endpoint, headers or self.headers, params)
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except asyncio.CancelledError:
+                # Cancelled by the fetch stage deadline: the wiki is too slow
+                self.breaker.record_failure()
                 raise
             except Exception as e:
-                logger.error(f"Mapping fetch failed: {e}")
-                raise
+                if isinstance(e, httpx.HTTPStatusError) and not is_retryable(e):
+                    # The server answered; a 4xx is not an outage
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if not is_retryable(e):
+                    raise
+                if retry >= self.retry_policy.attempts:
+                    raise
+                if not self.retry_budget.withdraw():
+                    metrics.inc("wiki.fetch.retry_budget_exhausted")
+                    raise
+                retry += 1
+                metrics.inc(f"wiki.fetch.{endpoint}.retries")
+                delay = self.retry_policy.delay(retry)
+                logger.info(f"Retrying /{endpoint} in {delay:.2f}s after error: {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return response
+
+    async def _send(
+        self, endpoint: str, headers: Dict[str, str], params: Optional[Dict[str, Any]]
+    ) -> httpx.Response:
+        """Send one request, hedged past the endpoint's p95 latency when enabled."""
+        call = functools.partial(
+            self.http.get,
+            f"{self.base_url}/{endpoint}",
+            headers=headers,
+            params=params,
+            timeout=endpoint_timeout(endpoint),
+        )
+        delay = self.latency.p95(endpoint) if self.hedging else None
+
+        start = time.perf_counter()
+        if delay is None:
+            response = await call()
+        else:
+            response = await hedged(
+                call, delay, on_hedge=lambda: metrics.inc(f"wiki.fetch.{endpoint}.hedged")
+            )
+        self.latency.observe(endpoint, time.perf_counter() - start)
+        return response
+
+    async def _get_json(
+        self,
+        endpoint: str,
+        skip_unchanged: bool = False,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Fetch and decode an endpoint, optionally skipping unchanged payloads.
+
+        In skip_unchanged mode the request carries the ETag/Last-Modified
+        validators from the previous fetch, and the response body is hashed
+        before decoding. A 304 or a byte-identical body raises PayloadUnchanged
+        without decoding the JSON again. Requests with query parameters
+        address a fixed point in time and are never conditional.
+
+        Args:
+            endpoint: Endpoint name without leading slash
+            skip_unchanged: Send a conditional request and fingerprint the body
+            params: Query string parameters
+
+        Returns:
+            Decoded JSON payload
+
+        Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
+            httpx.HTTPStatusError: If the API request fails
+        """
+        if params or not skip_unchanged:
+            return (await self._get(endpoint, params=params)).json()
+
+        cache = self._cache.get(endpoint, EndpointCache())
+        headers = self.headers
+        if cache.payload is not None:
+            headers = {**self.headers, **cache.conditional_headers()}
+
+        response = await self._get(endpoint, headers=headers)
+        if response.status_code == 304 and cache.payload is not None:
+            metrics.inc(f"wiki.fetch.{endpoint}.not_modified")
+            raise PayloadUnchanged(endpoint, cache.payload)
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        if digest == cache.digest and cache.payload is not None:
+            metrics.inc(f"wiki.fetch.{endpoint}.unchanged")
+            raise PayloadUnchanged(endpoint, cache.payload)
+
+        payload = response.json()
+        self._cache[endpoint] = EndpointCache(
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            digest=digest,
+            payload=payload,
+        )
+        return payload
+
+    def invalidate(self, *endpoints: str) -> None:
+        """
+        Forget cached validators so the next conditional fetch downloads in full.
+
+        Call this when applying a fetched payload fails, so the same payload is
+        not skipped as unchanged on the next tick.
+
+        Args:
+            endpoints: Endpoint names to forget (all endpoints if omitted)
+        """
+        if not endpoints:
+            self._cache.clear()
+        for endpoint in endpoints:
+            self._cache.pop(endpoint, None)
+
+    async def fetch_mapping(self, skip_unchanged: bool = False) -> list[dict[str, Any]]:
+        """
+        Fetch item mapping (ID, name, limit, value) from Wiki.
+
+        Args:
+            skip_unchanged: Raise PayloadUnchanged if the mapping has not changed
 
-    async def fetch_latest_prices(self) -> dict[str, Any]:
+        Returns:
+            List of item mapping dictionaries
+
+        Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
+            httpx.HTTPStatusError: If the API request fails
+        """
+        try:
+            data = await self._get_json("mapping", skip_unchanged)
+            return data if isinstance(data, list) else []
+        except PayloadUnchanged:
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 403:
+                logger.error("403 Forbidden: Invalid User-Agent header")
+            raise
+        except Exception as e:
+            logger.error(f"Mapping fetch failed: {e}")
+            raise
+
+    async def fetch_latest_prices(self, skip_unchanged: bool = False) -> dict[str, Any]:
         """
         Fetch latest high/low prices from Wiki.
 
+        Args:
+            skip_unchanged: Raise PayloadUnchanged if the prices have not changed
+
         Returns:
             Dictionary with price data
 
         Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
             httpx.HTTPStatusError: If the API request fails
         """
-        url = f"{self.base_url}/latest"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            return data if isinstance(data, dict) else {}
+        data = await self._get_json("latest", skip_unchanged)
+        return data if isinstance(data, dict) else {}
 
-    async def fetch_24h_volume(self) -> dict[str, Any]:
+    async def fetch_24h_prices(self, skip_unchanged: bool = False) -> dict[str, Any]:
+        """
+        Fetch 24-hour average prices and volume from Wiki.
+
+        Args:
+            skip_unchanged: Raise PayloadUnchanged if the data has not changed
+
+        Returns:
+            Dictionary with 24h price and volume data for each item
+
+        Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
+            httpx.HTTPStatusError: If the API request fails
+        """
+        data = await self._get_json("24h", skip_unchanged)
+        return data if isinstance(data, dict) else {}
+
+    async def fetch_24h_volume(self, skip_unchanged: bool = False) -> dict[str, Any]:
         """
         Fetch 24-hour volume data from Wiki timeseries API.
 
+        Args:
+            skip_unchanged: Raise PayloadUnchanged if the data has not changed
+
         Returns:
             Dictionary with 24h volume data for each item
 
         Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
             httpx.HTTPStatusError: If the API request fails
         """
-        url = f"{self.base_url}/24h"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            return data if isinstance(data, dict) else {}
+        return await self.fetch_24h_prices(skip_unchanged=skip_unchanged)
+
+    async def fetch_5m_prices(
+        self, timestamp: Optional[int] = None, skip_unchanged: bool = False
+    ) -> dict[str, Any]:
+        """
+        Fetch 5-minute average prices and volumes from Wiki.
+
+        Args:
+            timestamp: Unix start of the bucket to fetch (latest completed bucket if None)
+            skip_unchanged: Raise PayloadUnchanged if the latest bucket has not changed
+
+        Returns:
+            Dictionary with per-item bucket data and the bucket ``timestamp``
+
+        Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
+            httpx.HTTPStatusError: If the API request fails
+        """
+        return await self._fetch_bucket("5m", timestamp, skip_unchanged)
+
+    async def fetch_1h_prices(
+        self, timestamp: Optional[int] = None, skip_unchanged: bool = False
+    ) -> dict[str, Any]:
+        """
+        Fetch 1-hour average prices and volumes from Wiki.
+
+        Args:
+            timestamp: Unix start of the bucket to fetch (latest completed bucket if None)
+            skip_unchanged: Raise PayloadUnchanged if the latest bucket has not changed
+
+        Returns:
+            Dictionary with per-item bucket data and the bucket ``timestamp``
+
+        Raises:
+            PayloadUnchanged: If skip_unchanged and the payload has not changed
+            httpx.HTTPStatusError: If the API request fails
+        """
+        return await self._fetch_bucket("1h", timestamp, skip_unchanged)
+
+    async def _fetch_bucket(
+        self, endpoint: str, timestamp: Optional[int], skip_unchanged: bool
+    ) -> dict[str, Any]:
+        params = {"timestamp": timestamp} if timestamp is not None else None
+        data = await self._get_json(endpoint, skip_unchanged, params=params)
+        return data if isinstance(data, dict) else {}
+
+    async def fetch_many(
+        self, endpoints: Sequence[str], skip_unchanged: bool = False
+    ) -> FetchStageResult:
+        """
+        Download several endpoints concurrently, each under its own deadline.
+
+        A failed or timed-out endpoint is recorded on the result instead of
+        cancelling the others, so callers can still apply partial data.
+
+        Args:
+            endpoints: Endpoint names ("mapping", "latest", "24h", "5m", "1h")
+            skip_unchanged: Use conditional fetches; unchanged endpoints are
+                flagged on the result and carry their previous payload
+
+        Returns:
+            Per-endpoint results and timings
+        """
+        return await fetch_endpoints(self, endpoints, skip_unchanged=skip_unchanged)
+
+
+async def fetch_endpoints(
+    client: Any, endpoints: Sequence[str], skip_unchanged: bool = False
+) -> FetchStageResult:
+    """
+    Run a concurrent fetch stage through a client's per-endpoint fetch methods.
+
+    Works with any object exposing ``fetch_mapping``, ``fetch_latest_prices``
+    and ``fetch_24h_prices``, so stand-in clients can drive the same stage.
+
+    Args:
+        client: WikiAPIClient or compatible object
+        endpoints: Endpoint names ("mapping", "latest", "24h")
+        skip_unchanged: Forwarded to each fetch method
+
+    Returns:
+        Per-endpoint results and timings
+    """
+    fetchers: Dict[str, Callable[..., Awaitable[Any]]] = {
+        endpoint: getattr(client, ENDPOINT_FETCHERS[endpoint]) for endpoint in endpoints
+    }
+    return await run_fetch_stage(
+        {
+            endpoint: functools.partial(fetch, skip_unchanged=skip_unchanged)
+            for endpoint, fetch in fetchers.items()
+        },
+        {endpoint: endpoint_deadline(endpoint) for endpoint in endpoints},
+    )
@@ -0,0 +1,102 @@
+"""Change detection for Wiki price payloads.
+
+Each ``/latest`` tick typically moves only a few hundred of ~4k items, so the
+price sync diffs every incoming row against an in-memory last-seen table and
+hands only the rows that actually changed to the bulk writer. The table is
+primed from ``pricesnapshot`` on first use, so a restart does not rewrite
+every row on its first tick.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from backend.models import PriceSnapshot
+from backend.services.wiki.bulk import SNAPSHOT_PRICE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class PriceDeltaTracker:
+    """Last-seen snapshot values keyed by item_id."""
+
+    def __init__(self, columns: Sequence[str] = SNAPSHOT_PRICE_COLUMNS) -> None:
+        """
+        Initialize an empty tracker.
+
+        Args:
+            columns: Snapshot columns compared when diffing rows
+        """
+        self.columns = tuple(columns)
+        self._last_seen: Dict[int, Dict[str, Any]] = {}
+        self._primed = False
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def prime(self, session: Session) -> None:
+        """
+        Load the current snapshot values from the database.
+
+        Called automatically by ``diff`` the first time it runs; later calls
+        are no-ops until ``reset``.
+
+        Args:
+            session: Database session
+        """
+        if self._primed:
+            return
+
+        table = PriceSnapshot.__table__  # type: ignore[attr-defined]
+        result = session.execute(select(table.c.item_id, *(table.c[col] for col in self.columns)))
+        for item_id, *values in result:
+            self._last_seen[item_id] = dict(zip(self.columns, values))
+        self._primed = True
+        logger.debug(f"Primed price delta tracker with {len(self._last_seen)} snapshots")
+
+    def diff(self, session: Session, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Return the rows whose values differ from the last-seen table.
+
+        Only the tracked columns present on a row are compared, so rows that
+        omit some columns (e.g. volumes when /24h is unavailable) are not
+        reported as changed for those columns. The table is not updated until
+        ``commit`` is called with the written rows.
+
+        Args:
+            session: Database session (used to prime the table on first use)
+            rows: Snapshot rows keyed by column name, each with ``item_id``
+
+        Returns:
+            Rows for new items or items with at least one changed column
+        """
+        self.prime(session)
+
+        changed = []
+        for row in rows:
+            previous = self._last_seen.get(row["item_id"])
+            if previous is None or any(
+                row[col] != previous.get(col) for col in self.columns if col in row
+            ):
+                changed.append(row)
+        return changed
+
+    def commit(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Record rows as written so later ticks diff against them.
+
+        Call only after the rows have been committed to the database.
+
+        Args:
+            rows: Snapshot rows that were written
+        """
+        for row in rows:
+            seen = self._last_seen.setdefault(row["item_id"], {})
+            seen.update((col, row[col]) for col in self.columns if col in row)
+
+    def reset(self) -> None:
+        """Forget all last-seen values; the next ``diff`` re-primes from the database."""
+        self._last_seen.clear()
+        self._primed = False
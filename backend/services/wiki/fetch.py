@@ -0,0 +1,159 @@
+"""Concurrent fetch stage for Wiki API downloads.
+
+Runs several endpoint downloads at once, each under its own deadline, and
+collects per-endpoint outcomes instead of failing the whole stage when one
+download errors or times out. Callers decide which endpoints are required.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from backend.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadUnchanged(Exception):
+    """Raised by a conditional fetch when the endpoint payload has not changed.
+
+    Carries the payload decoded on the last fetch that did change, so callers
+    that still need the data can use it without downloading or decoding again.
+    """
+
+    def __init__(self, endpoint: str, payload: Any) -> None:
+        super().__init__(f"/{endpoint} unchanged since last fetch")
+        self.endpoint = endpoint
+        self.payload = payload
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single endpoint download."""
+
+    endpoint: str
+    data: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+    unchanged: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if the download completed without error."""
+        return self.error is None
+
+
+@dataclass
+class FetchStageResult:
+    """Outcome of a concurrent fetch stage."""
+
+    results: Dict[str, FetchResult] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    @property
+    def sequential_time(self) -> float:
+        """Time the downloads would have taken if awaited one after another."""
+        return sum(result.elapsed for result in self.results.values())
+
+    @property
+    def saved_time(self) -> float:
+        """Wall time saved by running the downloads concurrently."""
+        return max(self.sequential_time - self.wall_time, 0.0)
+
+    def ok(self, endpoint: str) -> bool:
+        """True if the endpoint was fetched and succeeded."""
+        result = self.results.get(endpoint)
+        return result is not None and result.ok
+
+    def unchanged(self, endpoint: str) -> bool:
+        """True if the endpoint payload is identical to the previous fetch."""
+        result = self.results.get(endpoint)
+        return result is not None and result.unchanged
+
+    @property
+    def all_unchanged(self) -> bool:
+        """True if every fetched endpoint returned the same payload as last time."""
+        return bool(self.results) and all(result.unchanged for result in self.results.values())
+
+    def get(self, endpoint: str, default: Any = None) -> Any:
+        """Return the endpoint payload, or ``default`` if it failed or was not fetched."""
+        return self.results[endpoint].data if self.ok(endpoint) else default
+
+    def require(self, endpoint: str) -> Any:
+        """
+        Return the endpoint payload, re-raising its error if the download failed.
+
+        Raises:
+            KeyError: If the endpoint was not part of the stage
+            Exception: The original download error
+        """
+        result = self.results[endpoint]
+        if result.error is not None:
+            raise result.error
+        return result.data
+
+
+async def _timed_fetch(
+    endpoint: str, fetch: Callable[[], Awaitable[Any]], deadline: float
+) -> FetchResult:
+    start = time.perf_counter()
+    try:
+        data = await asyncio.wait_for(fetch(), timeout=deadline)
+        result = FetchResult(endpoint=endpoint, data=data)
+    except PayloadUnchanged as e:
+        result = FetchResult(endpoint=endpoint, data=e.payload, unchanged=True)
+    except asyncio.TimeoutError as e:
+        logger.warning(f"Fetch of /{endpoint} exceeded its {deadline:.1f}s deadline")
+        metrics.inc(f"wiki.fetch.{endpoint}.timeouts")
+        result = FetchResult(endpoint=endpoint, error=e)
+    except Exception as e:
+        logger.warning(f"Fetch of /{endpoint} failed: {e}")
+        metrics.inc(f"wiki.fetch.{endpoint}.errors")
+        result = FetchResult(endpoint=endpoint, error=e)
+
+    result.elapsed = time.perf_counter() - start
+    metrics.observe(f"wiki.fetch.{endpoint}.seconds", result.elapsed)
+    return result
+
+
+async def run_fetch_stage(
+    fetchers: Mapping[str, Callable[[], Awaitable[Any]]],
+    deadlines: Mapping[str, float],
+) -> FetchStageResult:
+    """
+    Download several endpoints concurrently.
+
+    Each endpoint gets its own deadline; a timeout or error is recorded on its
+    FetchResult and does not cancel the other downloads.
+
+    Args:
+        fetchers: Zero-argument coroutine factories keyed by endpoint name
+        deadlines: Maximum seconds allowed per endpoint
+
+    Returns:
+        Per-endpoint results plus stage wall time
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            _timed_fetch(endpoint, fetch, deadlines[endpoint])
+            for endpoint, fetch in fetchers.items()
+        )
+    )
+    stage = FetchStageResult(
+        results={result.endpoint: result for result in results},
+        wall_time=time.perf_counter() - start,
+    )
+
+    metrics.observe("wiki.fetch.stage.seconds", stage.wall_time)
+    metrics.observe("wiki.fetch.stage.saved_seconds", stage.saved_time)
+    per_endpoint = ", ".join(
+        f"/{name}={result.elapsed:.2f}s" for name, result in stage.results.items()
+    )
+    logger.info(
+        f"Fetched {per_endpoint} in {stage.wall_time:.2f}s "
+        f"(sequential {stage.sequential_time:.2f}s, saved {stage.saved_time:.2f}s)"
+    )
+    return stage
@@ -0,0 +1,86 @@
+"""Shared, long-lived HTTP client for OSRS Wiki API calls.
+
+A single ``httpx.AsyncClient`` is kept per process so every wiki request reuses
+pooled keep-alive connections instead of paying a fresh TCP+TLS handshake per
+call. The application lifespan opens and closes it; scripts that never run the
+lifespan get one lazily on first use.
+"""
+
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_available() -> bool:
+    """Return True if the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def use_http2() -> bool:
+    """Return True if HTTP/2 is requested in settings and supported by the install."""
+    return settings.wiki_http2 and http2_available()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build an AsyncClient configured from settings.
+
+    Connection limits, keep-alive expiry and HTTP/2 are configurable. HTTP/2
+    is only enabled when requested and the ``h2`` package is importable.
+
+    Returns:
+        New AsyncClient instance (caller owns its lifecycle)
+    """
+    if settings.wiki_http2 and not http2_available():
+        logger.debug("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=use_http2(),
+        limits=httpx.Limits(
+            max_connections=settings.wiki_http_max_connections,
+            max_keepalive_connections=settings.wiki_http_max_keepalive_connections,
+            keepalive_expiry=settings.wiki_http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.wiki_timeout_default, connect=settings.wiki_timeout_connect),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide wiki HTTP client, creating it if needed.
+
+    Returns:
+        Shared AsyncClient instance
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """
+    Create the shared client at application startup.
+
+    Returns:
+        Shared AsyncClient instance
+    """
+    client = get_http_client()
+    logger.info(f"Wiki HTTP client ready (http2={use_http2()})")
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client at application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,579 @@
+"""Staged ingestion pipeline for Wiki item and price data.
+
+Every sync — the scheduled tick, application startup and the maintenance
+scripts — runs the same engine::
+
+    fetch -> decode -> normalize -> diff -> write -> publish
+
+``fetch`` downloads the endpoints concurrently (conditional requests, so an
+unchanged tick stops here). ``decode`` turns the string-keyed ``data``
+members into int-keyed dicts, ``normalize`` builds one snapshot row per item,
+``diff`` drops rows identical to the last-seen table, ``write`` upserts the
+remaining snapshots, their denormalized Item prices and flip metrics
+(``backend.services.flip_metrics``) and the append-only price history
+(``backend.services.price_history``) in one transaction and
+``publish`` announces the changed ids on ``price_updates``. The last three
+stages run on the writer thread. Each stage records its wall time and the
+number of rows it handled under ``wiki.pipeline.<run>.<stage>.*``.
+
+/5m and /1h buckets go through the same fetch, decode, normalize and write
+stages; they are immutable once complete, so there is nothing to diff or
+publish.
+
+Volumes come only from /24h. ``highPriceVolume``/``lowPriceVolume`` are
+stored as ``high_volume``/``low_volume`` and mirrored into
+``sell_volume_24h``/``buy_volume_24h``: units sold at the low price are what
+a flipper can buy, units bought at the high price what they can sell, the
+same pairing the flip queries fall back to.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlmodel import Session
+
+from backend.config import settings
+from backend.db.writer import run_in_writer
+from backend.models import Item
+from backend.services.flip_metrics import refresh_flip_metrics
+from backend.services.metrics import metrics
+from backend.services.price_events import price_updates
+from backend.services.price_buckets import (
+    BUCKET_INTERVALS,
+    bucket_retention_seconds,
+    stored_bucket_timestamps,
+)
+from backend.services.wiki.bulk import (
+    PRICE_UPSERT_CHUNK_SIZE,
+    SNAPSHOT_PRICE_COLUMNS,
+    SNAPSHOT_VOLUME_24H_COLUMNS,
+    append_price_history,
+    prune_price_buckets,
+    refresh_item_prices,
+    upsert_price_buckets,
+    upsert_price_snapshots,
+)
+from backend.services.wiki.client import ENDPOINT_FETCHERS, fetch_endpoints
+from backend.services.wiki.delta import PriceDeltaTracker
+from backend.services.wiki.fetch import FetchStageResult, PayloadUnchanged
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = ("fetch", "decode", "normalize", "diff", "write", "publish")
+
+# Snapshot columns written by the pipeline, and the subset kept when /24h is unavailable
+PIPELINE_COLUMNS = SNAPSHOT_PRICE_COLUMNS + SNAPSHOT_VOLUME_24H_COLUMNS
+PRICE_ONLY_COLUMNS = tuple(col for col in PIPELINE_COLUMNS if "volume" not in col)
+
+# Most missing buckets fetched by one backfill call, to stay polite to the Wiki API
+MAX_BACKFILL_BUCKETS = 12
+
+
+@dataclass
+class StageStats:
+    """Wall time and batch size of one pipeline stage."""
+
+    seconds: float = 0.0
+    batch_size: int = 0
+
+
+@dataclass
+class PipelineRun:
+    """Outcome of one pass through the pipeline."""
+
+    name: str = "prices"
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    changed_ids: Set[int] = field(default_factory=set)
+    rows: int = 0
+    skipped: bool = False
+
+    def record(self, name: str, seconds: float, batch_size: int) -> None:
+        """
+        Record a finished stage and export its metrics.
+
+        Args:
+            name: Stage name
+            seconds: Stage wall time
+            batch_size: Number of rows (or endpoints, for fetch) the stage handled
+        """
+        self.stages[name] = StageStats(seconds=seconds, batch_size=batch_size)
+        metrics.observe(f"wiki.pipeline.{self.name}.{name}.seconds", seconds)
+        metrics.set_gauge(f"wiki.pipeline.{self.name}.{name}.batch_size", batch_size)
+
+    @contextmanager
+    def stage(self, name: str, batch_size: int = 0) -> Iterator[StageStats]:
+        """
+        Time a stage; the yielded stats' batch size may be set inside the block.
+
+        Args:
+            name: Stage name
+            batch_size: Initial batch size
+        """
+        stats = StageStats(batch_size=batch_size)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            self.record(name, time.perf_counter() - start, stats.batch_size)
+
+    def summary(self) -> str:
+        """One-line per-stage timing summary for logs."""
+        return ", ".join(
+            f"{name}={stats.seconds:.3f}s/{stats.batch_size}" for name, stats in self.stages.items()
+        )
+
+
+def skip_unchanged_sync(name: str) -> None:
+    """
+    Record a sync whose write phase was skipped because its payload was unchanged.
+
+    Args:
+        name: Sync name used in the log line and per-sync counter
+    """
+    logger.info(f"Wiki payload unchanged, skipping {name} sync")
+    metrics.inc("wiki.sync.skipped_unchanged")
+    metrics.inc(f"wiki.sync.{name}.skipped_unchanged")
+
+
+def decode_item_data(payload: Any, endpoint: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Key the ``data`` member of a Wiki price payload by integer item id.
+
+    Entries with a non-numeric id or a non-object value are dropped.
+
+    Args:
+        payload: Decoded endpoint payload
+        endpoint: Endpoint name used in warnings
+
+    Returns:
+        Per-item entries keyed by item id
+    """
+    data = payload.get("data", {}) if isinstance(payload, dict) else {}
+    decoded = {}
+    for item_id_str, info in data.items():
+        try:
+            item_id = int(item_id_str)
+        except ValueError:
+            logger.warning(f"Skipping invalid /{endpoint} entry for item {item_id_str!r}")
+            continue
+        if isinstance(info, dict):
+            decoded[item_id] = info
+    return decoded
+
+
+def normalize_price_rows(
+    latest: Dict[int, Dict[str, Any]], daily: Optional[Dict[int, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Build one snapshot row per item in /latest.
+
+    Args:
+        latest: Decoded /latest entries
+        daily: Decoded /24h entries, or None to leave stored volumes untouched
+
+    Returns:
+        Rows keyed by snapshot column; volume columns only when ``daily`` is given
+    """
+    rows = []
+    for item_id, price_info in latest.items():
+        row = {
+            "item_id": item_id,
+            "high_price": price_info.get("high"),
+            "low_price": price_info.get("low"),
+            "high_time": price_info.get("highTime"),
+            "low_time": price_info.get("lowTime"),
+        }
+        if daily is not None:
+            daily_info = daily.get(item_id, {})
+            high_volume = daily_info.get("highPriceVolume", 0)
+            low_volume = daily_info.get("lowPriceVolume", 0)
+            row["high_volume"] = high_volume
+            row["low_volume"] = low_volume
+            row["buy_volume_24h"] = low_volume
+            row["sell_volume_24h"] = high_volume
+        rows.append(row)
+    return rows
+
+
+def normalize_bucket_rows(
+    data: Dict[int, Dict[str, Any]], interval: str, timestamp: int
+) -> List[Dict[str, Any]]:
+    """
+    Build one PriceBucket row per item in a /5m or /1h payload.
+
+    Args:
+        data: Decoded bucket entries
+        interval: "5m" or "1h"
+        timestamp: Unix start of the bucket
+
+    Returns:
+        Rows keyed by PriceBucket column
+    """
+    width = BUCKET_INTERVALS[interval]
+    return [
+        {
+            "item_id": item_id,
+            "interval": width,
+            "timestamp": timestamp,
+            "avg_high_price": info.get("avgHighPrice"),
+            "high_price_volume": info.get("highPriceVolume") or 0,
+            "avg_low_price": info.get("avgLowPrice"),
+            "low_price_volume": info.get("lowPriceVolume") or 0,
+        }
+        for item_id, info in data.items()
+    ]
+
+
+def write_buckets(
+    session: Session, rows: Sequence[Dict[str, Any]], interval: str, chunk_size: int
+) -> int:
+    """
+    Upsert bucket rows, prune buckets past retention and commit.
+
+    Blocking; async callers run it on the writer thread.
+
+    Args:
+        session: Database session
+        rows: Rows produced by ``normalize_bucket_rows``
+        interval: "5m" or "1h"
+        chunk_size: Rows per executemany batch
+
+    Returns:
+        Number of rows written
+    """
+    count = upsert_price_buckets(session, rows, chunk_size=chunk_size)
+    cutoff = int(time.time()) - bucket_retention_seconds(interval)
+    pruned = prune_price_buckets(session, BUCKET_INTERVALS[interval], cutoff)
+    session.commit()
+    if pruned:
+        logger.debug(f"Pruned {pruned} /{interval} buckets older than {cutoff}")
+    return count
+
+
+def write_items(session: Session, mapping: Sequence[Dict[str, Any]]) -> int:
+    """
+    Merge mapping entries into the Item table and commit.
+
+    Blocking; async callers run it on the writer thread.
+
+    Args:
+        session: Database session
+        mapping: /mapping payload
+
+    Returns:
+        Number of items written
+    """
+    count = 0
+    for data in mapping:
+        # Generate icon URL (replace spaces with underscores)
+        safe_name = data.get("name", "").replace(" ", "_")
+        icon_url = f"https://oldschool.runescape.wiki/images/{safe_name}_detail.png?0"
+
+        item = Item(
+            id=data["id"],
+            name=data.get("name", "Unknown"),
+            members=data.get("members", True),
+            limit=data.get("limit"),
+            value=data.get("value", 0),
+            icon_url=icon_url,
+        )
+        session.merge(item)
+        count += 1
+
+    # Merging fresh Item rows clears their denormalized prices; restore them
+    # because per-tick price refreshes only touch changed items.
+    session.flush()
+    refresh_item_prices(session)
+    # Buy limits and members status feed the flip metrics too
+    refresh_flip_metrics(session)
+    session.commit()
+    return count
+
+
+class IngestionPipeline:
+    """Fetches Wiki data and applies it to the database in explicit stages.
+
+    One instance should live as long as its client: it owns the last-seen
+    table used by the diff stage and relies on the client's conditional-fetch
+    cache to skip unchanged ticks.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        tracker: Optional[PriceDeltaTracker] = None,
+        write_batch_size: int = PRICE_UPSERT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            client: WikiAPIClient (or compatible object) used by the fetch stage
+            tracker: Last-seen table for the diff stage; primed from the
+                database on first use if omitted
+            write_batch_size: Rows per executemany batch in the write stage
+        """
+        self.client = client
+        self.tracker = tracker or PriceDeltaTracker(PIPELINE_COLUMNS)
+        self.write_batch_size = write_batch_size
+
+    async def fetch(
+        self, include_mapping: bool = False, skip_unchanged: bool = False
+    ) -> FetchStageResult:
+        """
+        Download /latest and /24h (and optionally /mapping) concurrently.
+
+        Args:
+            include_mapping: Also fetch the item mapping
+            skip_unchanged: Use conditional fetches and flag unchanged payloads
+
+        Returns:
+            Per-endpoint results to pass to ``sync_prices``
+        """
+        endpoints = ["latest", "24h"]
+        if include_mapping:
+            endpoints.insert(0, "mapping")
+        return await fetch_endpoints(self.client, endpoints, skip_unchanged=skip_unchanged)
+
+    async def run(self, session: Session, include_mapping: bool = False) -> PipelineRun:
+        """
+        Run a full sync: items (optionally) then prices, from one concurrent fetch.
+
+        Args:
+            session: Database session
+            include_mapping: Also fetch and apply the item mapping
+
+        Returns:
+            The price pipeline run
+
+        Raises:
+            Exception: If /latest or a requested /mapping could not be fetched
+        """
+        fetched = await self.fetch(include_mapping=include_mapping, skip_unchanged=True)
+        if include_mapping:
+            if fetched.unchanged("mapping"):
+                skip_unchanged_sync("items")
+            else:
+                await self.sync_items(session, mapping=fetched.require("mapping"))
+        return await self.sync_prices(session, fetched=fetched)
+
+    async def sync_items(
+        self, session: Session, mapping: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> int:
+        """
+        Populate or update the Item table from the mapping.
+
+        When the mapping is fetched here, the sync is skipped if it is
+        unchanged since the client's previous fetch.
+
+        Args:
+            session: Database session
+            mapping: Already-fetched mapping payload; fetched if omitted
+
+        Returns:
+            Number of items written
+        """
+        logger.info("Syncing items from Wiki...")
+        if mapping is None:
+            try:
+                mapping = await self.client.fetch_mapping(skip_unchanged=True)
+            except PayloadUnchanged:
+                skip_unchanged_sync("items")
+                return 0
+
+        try:
+            count = await run_in_writer(write_items, session, mapping)
+        except Exception:
+            # Make sure the next sync re-applies this payload instead of skipping it
+            self.client.invalidate("mapping")
+            raise
+        logger.info(f"Synced {count} items")
+        return count
+
+    async def sync_prices(
+        self, session: Session, fetched: Optional[FetchStageResult] = None
+    ) -> PipelineRun:
+        """
+        Apply /latest prices and /24h volumes to PriceSnapshot and Item.
+
+        If /24h failed, /latest is still applied and stored volumes are left
+        untouched. When the data is fetched here, requests are conditional and
+        the remaining stages are skipped if both payloads are unchanged.
+
+        Args:
+            session: Database session
+            fetched: Result of ``fetch()``; fetched if omitted
+
+        Returns:
+            Per-stage timings and the ids of the items written
+
+        Raises:
+            Exception: If /latest could not be fetched
+        """
+        logger.info("Syncing prices from Wiki...")
+        run = PipelineRun()
+
+        if fetched is None:
+            fetched = await self.fetch(skip_unchanged=True)
+        run.record("fetch", fetched.wall_time, len(fetched.results))
+        if fetched.all_unchanged:
+            skip_unchanged_sync("prices")
+            run.skipped = True
+            return run
+
+        # Nothing to apply without real-time prices
+        latest_payload = fetched.require("latest")
+        with run.stage("decode") as stats:
+            latest = decode_item_data(latest_payload, "latest")
+            daily = decode_item_data(fetched.get("24h"), "24h") if fetched.ok("24h") else None
+            stats.batch_size = len(latest)
+        if daily is None:
+            logger.warning("24h volume unavailable, applying latest prices only")
+
+        with run.stage("normalize", len(latest)):
+            rows = normalize_price_rows(latest, daily)
+        run.rows = len(rows)
+
+        update_columns = PIPELINE_COLUMNS if daily is not None else PRICE_ONLY_COLUMNS
+        try:
+            run.changed_ids = await run_in_writer(
+                self._apply_prices, session, rows, update_columns, run
+            )
+        except Exception:
+            # Make sure the next tick re-applies these payloads instead of skipping them
+            self.client.invalidate("latest", "24h")
+            raise
+
+        logger.info(
+            f"Synced {len(run.changed_ids)} of {len(rows)} price snapshots ({run.summary()})"
+        )
+        return run
+
+    async def sync_buckets(
+        self, session: Session, interval: str = "5m", timestamp: Optional[int] = None
+    ) -> PipelineRun:
+        """
+        Store one /5m or /1h bucket for every item that traded in it.
+
+        Without a timestamp the latest completed bucket is fetched
+        conditionally and skipped if unchanged since the previous fetch.
+
+        Args:
+            session: Database session
+            interval: "5m" or "1h"
+            timestamp: Unix start of the bucket to fetch (latest if None)
+
+        Returns:
+            Per-stage timings; ``rows`` is the number of bucket rows written
+        """
+        run = PipelineRun(name=f"buckets_{interval}")
+        fetch = getattr(self.client, ENDPOINT_FETCHERS[interval])
+        try:
+            with run.stage("fetch", 1):
+                payload = await fetch(timestamp=timestamp, skip_unchanged=timestamp is None)
+        except PayloadUnchanged:
+            skip_unchanged_sync(run.name)
+            run.skipped = True
+            return run
+
+        bucket_start = payload.get("timestamp", timestamp)
+        if bucket_start is None:
+            logger.warning(f"/{interval} payload has no bucket timestamp, skipping it")
+            run.skipped = True
+            return run
+
+        with run.stage("decode") as stats:
+            data = decode_item_data(payload, interval)
+            stats.batch_size = len(data)
+        with run.stage("normalize", len(data)):
+            rows = normalize_bucket_rows(data, interval, int(bucket_start))
+        run.rows = len(rows)
+
+        try:
+            with run.stage("write", len(rows)):
+                await run_in_writer(write_buckets, session, rows, interval, self.write_batch_size)
+        except Exception:
+            if timestamp is None:
+                self.client.invalidate(interval)
+            raise
+
+        logger.info(f"Synced /{interval} bucket {bucket_start} for {len(rows)} items")
+        return run
+
+    async def backfill_buckets(
+        self,
+        session: Session,
+        interval: str = "5m",
+        since: Optional[int] = None,
+        max_buckets: int = MAX_BACKFILL_BUCKETS,
+    ) -> List[int]:
+        """
+        Fetch completed buckets missing from the database, newest first.
+
+        Uses the ``timestamp=`` parameter to address each missing bucket, e.g.
+        after the application was down for a while.
+
+        Args:
+            session: Database session
+            interval: "5m" or "1h"
+            since: Earliest bucket start to consider (retention window if None)
+            max_buckets: Most buckets fetched by this call
+
+        Returns:
+            Start timestamps of the buckets fetched
+        """
+        width = BUCKET_INTERVALS[interval]
+        now = int(time.time())
+        newest = (now // width - 1) * width
+        if since is None:
+            since = now - bucket_retention_seconds(interval)
+        first = -(-since // width) * width
+
+        stored = await run_in_writer(stored_bucket_timestamps, session, interval, first)
+        missing = [ts for ts in range(newest, first - 1, -width) if ts not in stored]
+        fetched = []
+        for bucket_start in missing[:max_buckets]:
+            await self.sync_buckets(session, interval, timestamp=bucket_start)
+            fetched.append(bucket_start)
+        return fetched
+
+    def _apply_prices(
+        self,
+        session: Session,
+        rows: List[Dict[str, Any]],
+        update_columns: Tuple[str, ...],
+        run: PipelineRun,
+    ) -> Set[int]:
+        """Diff, write and publish normalized rows; runs on the writer thread."""
+        with run.stage("diff", len(rows)):
+            changed_rows = self.tracker.diff(session, rows)
+        changed_ids = {row["item_id"] for row in changed_rows}
+
+        metrics.set_gauge("wiki.sync.prices.changed_rows", len(changed_rows))
+        metrics.set_gauge("wiki.sync.prices.unchanged_rows", len(rows) - len(changed_rows))
+        if not changed_rows:
+            return changed_ids
+
+        with run.stage("write", len(changed_rows)):
+            upsert_price_snapshots(
+                session,
+                changed_rows,
+                chunk_size=self.write_batch_size,
+                update_columns=update_columns,
+            )
+            # Also update denormalized price fields on Item for performance
+            refresh_item_prices(session, changed_ids)
+            refresh_flip_metrics(session, changed_ids)
+            if settings.price_history_enabled:
+                append_price_history(
+                    session, changed_rows, baseline=rows, chunk_size=self.write_batch_size
+                )
+            session.commit()
+
+        with run.stage("publish", len(changed_ids)):
+            self.tracker.commit(changed_rows)
+            price_updates.publish(changed_ids)
+        return changed_ids
@@ -0,0 +1,286 @@
+"""Retry, circuit-breaker and request-hedging primitives for Wiki API calls.
+
+A slow or failing wiki should cost a scheduler tick a few seconds, not its
+full timeout on every request. ``WikiAPIClient`` combines these pieces:
+
+- ``RetryPolicy`` retries transport errors, 429 and 5xx responses with
+  exponential backoff and full jitter.
+- ``RetryBudget`` caps retries to a fraction of requests so retrying cannot
+  multiply the load on a struggling server.
+- ``CircuitBreaker`` opens after consecutive failures and rejects requests
+  immediately until a trial request succeeds.
+- ``LatencyWindow`` and ``hedged`` send a second copy of a request that has
+  outlived the endpoint's recent p95 latency and take whichever returns first.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import httpx
+
+from backend.config import settings
+from backend.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(f"Wiki circuit open, /{endpoint} not requested (retry in {retry_in:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Return True for errors worth retrying: transport failures, 429 and 5xx.
+
+    Args:
+        error: Exception raised by a request
+
+    Returns:
+        Whether the request may succeed if sent again
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """How many times and how long to wait before retrying a request."""
+
+    attempts: int = 2  # Retries after the first attempt
+    backoff_base: float = 0.25  # Seconds before the first retry, doubled per retry
+    backoff_max: float = 4.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the policy from application settings."""
+        return cls(
+            attempts=settings.wiki_retry_attempts,
+            backoff_base=settings.wiki_retry_backoff_base,
+            backoff_max=settings.wiki_retry_backoff_max,
+        )
+
+    def delay(self, retry: int) -> float:
+        """
+        Return a jittered backoff before a retry.
+
+        Uses "full jitter": a uniform draw between zero and the exponential
+        backoff, so clients that failed together do not retry together.
+
+        Args:
+            retry: 1 for the first retry, 2 for the second, ...
+
+        Returns:
+            Seconds to sleep
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """Token bucket that allows retries for only a fraction of requests.
+
+    Every request deposits ``ratio`` tokens and every retry spends one, so
+    over time at most ``ratio`` retries are sent per request. ``initial``
+    tokens let a quiet client retry a few times straight away.
+    """
+
+    def __init__(self, ratio: float = 0.2, initial: float = 3.0, cap: float = 10.0) -> None:
+        self.ratio = ratio
+        self.cap = cap
+        self.tokens = min(initial, cap)
+
+    def deposit(self) -> None:
+        """Credit the budget for one request."""
+        self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spend one retry if the budget allows it.
+
+        Returns:
+            True if the retry may be sent
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed: requests flow and failures are counted. After
+    ``failure_threshold`` consecutive failures the breaker opens and rejects
+    requests for ``reset_seconds``. Then it is half-open: one trial request
+    is let through, closing the breaker on success or re-opening it on failure.
+    """
+
+    def __init__(
+        self,
+        name: str = "wiki",
+        failure_threshold: int = 5,
+        reset_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._publish(BREAKER_CLOSED)
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return BREAKER_CLOSED
+        if self._clock() - self._opened_at < self.reset_seconds:
+            return BREAKER_OPEN
+        return BREAKER_HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the open breaker lets a trial request through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """
+        Decide whether a request may be sent now.
+
+        Returns:
+            False while open, or while a half-open trial request is in flight
+        """
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return True
+        if state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            self._publish(BREAKER_HALF_OPEN)
+            return True
+        metrics.inc(f"wiki.breaker.{self.name}.rejected")
+        return False
+
+    def record_success(self) -> None:
+        """Reset the failure count and close the breaker."""
+        if self._opened_at is not None:
+            logger.info(f"Wiki circuit breaker '{self.name}' closed")
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._publish(BREAKER_CLOSED)
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold or after a failed trial."""
+        self.failures += 1
+        if self._trial_in_flight or (
+            self._opened_at is None and self.failures >= self.failure_threshold
+        ):
+            self._opened_at = self._clock()
+            self._trial_in_flight = False
+            metrics.inc(f"wiki.breaker.{self.name}.opened")
+            logger.warning(
+                f"Wiki circuit breaker '{self.name}' opened after {self.failures} failures; "
+                f"rejecting requests for {self.reset_seconds:.0f}s"
+            )
+            self._publish(BREAKER_OPEN)
+
+    def _publish(self, state: str) -> None:
+        metrics.set_gauge(f"wiki.breaker.{self.name}.state", state)
+
+
+class LatencyWindow:
+    """Rolling window of recent request latencies per endpoint."""
+
+    def __init__(self, size: int = 100, min_samples: int = 20) -> None:
+        self.size = size
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        self._samples.setdefault(endpoint, deque(maxlen=self.size)).append(seconds)
+
+    def p95(self, endpoint: str) -> Optional[float]:
+        """
+        Return the endpoint's 95th percentile latency.
+
+        Args:
+            endpoint: Endpoint name
+
+        Returns:
+            Seconds, or None until ``min_samples`` requests have been observed
+        """
+        samples = self._samples.get(endpoint)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    delay: float,
+    on_hedge: Optional[Callable[[], Any]] = None,
+) -> T:
+    """
+    Await ``call``, sending a second copy if the first takes longer than ``delay``.
+
+    The first copy to succeed wins and the other is cancelled. If both fail,
+    the last error is raised. A first attempt that fails before ``delay`` is
+    not hedged; its error is raised so the retry policy can handle it.
+
+    Args:
+        call: Zero-argument coroutine factory issuing the request
+        delay: Seconds to wait before hedging
+        on_hedge: Called when the second copy is sent
+
+    Returns:
+        Result of the first successful copy
+    """
+    first = asyncio.ensure_future(call())
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return first.result()
+
+        if on_hedge is not None:
+            on_hedge()
+        tasks.add(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,101 @@
+"""Latency of the flips API while a price sync is writing.
+
+The price sync runs on the same event loop that serves requests. Its write
+phase must run on the writer thread so requests keep being answered while it
+is in progress.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.app.middleware import limiter
+from backend.db.session import get_session
+from backend.main import app
+from backend.models import Item
+from backend.services.wiki import bulk
+from backend.services.wiki.client import WikiAPIClient
+from backend.services.wiki.sync import sync_prices_to_db
+
+ITEM_COUNT = 500
+# Extra time spent inside the write phase, blocking whichever thread runs it
+WRITE_STALL_SECONDS = 0.5
+
+
+def _p99(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """File-backed SQLite so the API and the writer use separate connections."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'latency.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(
+            insert(Item.__table__),  # type: ignore[attr-defined]
+            [{"id": i, "name": f"Item {i}", "limit": 100} for i in range(1, ITEM_COUNT + 1)],
+        )
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_opportunities_p99_stays_flat_during_price_sync(file_engine):
+    """Test that p99 latency of /flips/opportunities does not absorb the sync write phase."""
+
+    def session_override():
+        with Session(file_engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+
+    wiki_client = MagicMock(spec=WikiAPIClient)
+    wiki_client.fetch_latest_prices = AsyncMock(
+        return_value={
+            "data": {
+                str(i): {"high": 1000 + i, "low": 900 + i, "highTime": 1, "lowTime": 1}
+                for i in range(1, ITEM_COUNT + 1)
+            }
+        }
+    )
+    wiki_client.fetch_24h_prices = AsyncMock(return_value={"data": {}})
+    real_upsert = bulk.upsert_price_snapshots
+
+    def slow_upsert(*args, **kwargs):
+        time.sleep(WRITE_STALL_SECONDS)
+        return real_upsert(*args, **kwargs)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def timed_request() -> float:
+            start = time.perf_counter()
+            response = await client.get("/api/v1/flips/opportunities")
+            assert response.status_code == 200
+            return time.perf_counter() - start
+
+        with (
+            patch.object(limiter, "enabled", False),
+            patch("backend.services.wiki.pipeline.upsert_price_snapshots", slow_upsert),
+        ):
+            baseline = [await timed_request() for _ in range(20)]
+
+            with Session(file_engine) as sync_session:
+                sync_task = asyncio.create_task(sync_prices_to_db(wiki_client, sync_session))
+                during = []
+                while not sync_task.done():
+                    during.append(await timed_request())
+                await sync_task
+
+    assert len(during) >= 5, "requests should keep completing while the sync writes"
+    assert _p99(during) < _p99(baseline) + WRITE_STALL_SECONDS / 2
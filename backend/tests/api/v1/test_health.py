@@ -23,9 +23,9 @@ class TestHealthCheckUnit:
         mock_session = MagicMock(spec=Session)
         mock_session.exec.return_value.one.return_value = 1
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.api.v1.health.get_http_client") as mock_get_client:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_client.get = AsyncMock(return_value=mock_response)
@@ -56,9 +56,9 @@ class TestHealthCheckUnit:
         mock_session = MagicMock(spec=Session)
         mock_session.exec.return_value.one.return_value = 1
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.api.v1.health.get_http_client") as mock_get_client:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_client.get = AsyncMock(side_effect=Exception("Connection timeout"))
 
             result = await health_check(mock_session)
@@ -73,9 +73,9 @@ class TestHealthCheckUnit:
         mock_session = MagicMock(spec=Session)
         mock_session.exec.return_value.one.return_value = 1
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.api.v1.health.get_http_client") as mock_get_client:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_response = MagicMock()
             mock_response.status_code = 500
             mock_client.get = AsyncMock(return_value=mock_response)
@@ -91,12 +91,12 @@ class TestHealthCheckUnit:
 class TestHealthCheckIntegration:
     """Integration tests for health check endpoint."""
 
-    @patch("httpx.AsyncClient")
-    def test_health_endpoint_success(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_health_endpoint_success(self, mock_get_client, client: TestClient, session: Session):
         """Test /api/v1/health endpoint returns correct structure."""
         # Mock external API call to avoid network dependency in tests
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_client.get = AsyncMock(return_value=mock_response)
@@ -115,12 +115,12 @@ class TestHealthCheckIntegration:
         assert data["database"] in ("ok", "error")
         assert data["version"] == "1.0.0"
 
-    @patch("httpx.AsyncClient")
-    def test_health_endpoint_database_check(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_health_endpoint_database_check(self, mock_get_client, client: TestClient, session: Session):
         """Test health endpoint checks database connectivity."""
         # Mock external API call
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_client.get = AsyncMock(return_value=mock_response)
@@ -133,12 +133,12 @@ class TestHealthCheckIntegration:
         # Database should be ok if test database is working
         assert data["database"] == "ok"
 
-    @patch("httpx.AsyncClient")
-    def test_health_endpoint_external_api_check(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_health_endpoint_external_api_check(self, mock_get_client, client: TestClient, session: Session):
         """Test health endpoint checks external API availability."""
         # Mock external API call to return unavailable
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_client.get = AsyncMock(side_effect=Exception("Connection timeout"))
 
         response = client.get("/api/v1/health")
@@ -154,12 +154,12 @@ class TestHealthCheckIntegration:
 class TestHealthCheckE2E:
     """E2E tests for health check endpoint."""
 
-    @patch("httpx.AsyncClient")
-    def test_api_v1_health_endpoint(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_api_v1_health_endpoint(self, mock_get_client, client: TestClient, session: Session):
         """Test /api/v1/health endpoint returns correct response."""
         # Mock external API call to prevent hangs/timeouts
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_client.get = AsyncMock(return_value=mock_response)
@@ -181,12 +181,12 @@ class TestHealthCheckE2E:
         assert isinstance(data["version"], str)
         assert data["version"] == "1.0.0"
 
-    @patch("httpx.AsyncClient")
-    def test_health_endpoint_monitoring_ready(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_health_endpoint_monitoring_ready(self, mock_get_client, client: TestClient, session: Session):
         """Test health endpoint is suitable for monitoring/load balancers."""
         # Mock external API call to prevent hangs/timeouts
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_client.get = AsyncMock(return_value=mock_response)
@@ -201,3 +201,18 @@ class TestHealthCheckE2E:
         assert data["database"] in ("ok", "error")
 
         # If database is error, should return 503 (tested in unit tests)
+
+
+@pytest.mark.integration
+def test_health_metrics_endpoint(client: TestClient):
+    """Test /api/v1/health/metrics exposes the in-process metrics snapshot."""
+    from backend.services.metrics import metrics
+
+    metrics.inc("test.counter")
+    response = client.get("/api/v1/health/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"counters", "gauges", "timings"}
+    assert data["counters"]["test.counter"] >= 1
+
@@ -0,0 +1,99 @@
+"""Tests for price history API endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.config import settings
+from backend.models import Item, PriceRollup
+from backend.services.price_history import history_table, list_shards
+from backend.services.wiki.bulk import append_price_history
+
+DAY0 = 1_760_659_200  # 2025-10-17 00:00 UTC
+
+
+@pytest.fixture(autouse=True)
+def drop_history_shards(session: Session):
+    """Drop history shards, which live outside the SQLModel metadata."""
+    yield
+    for name in list_shards(session):
+        history_table(name).drop(bind=session.connection())
+    session.commit()
+
+
+@pytest.fixture
+def whip(session: Session) -> Item:
+    """Create an item with current prices."""
+    item = Item(id=4151, name="Abyssal whip", high_price=1500000, low_price=1400000)
+    session.add(item)
+    session.commit()
+    return item
+
+
+class TestPriceHistoryEndpoint:
+    """Test GET /api/v1/prices/{item_id}/history."""
+
+    def test_returns_columnar_raw_history(self, client: TestClient, session: Session, whip):
+        """Test that a short range is served from the raw history as arrays."""
+        for offset, high in ((0, 1500000), (300, 1510000)):
+            rows = [{"item_id": 4151, "high_price": high, "low_price": high - 100000}]
+            append_price_history(session, rows, ts=DAY0 + offset)
+        session.commit()
+
+        response = client.get(
+            "/api/v1/prices/4151/history", params={"from": DAY0, "to": DAY0 + 3600, "points": 5}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item_name"] == "Abyssal whip"
+        assert data["resolution"] == "raw"
+        assert data["ts"] == [DAY0, DAY0 + 300]
+        assert data["high"] == [1500000, 1510000]
+        assert data["low"] == [1400000, 1410000]
+        assert data["volume"] == [None, None]
+        assert data["current_high"] == 1500000
+
+    def test_long_range_uses_daily_bars(self, client: TestClient, session: Session, whip):
+        """Test that a long range with few points is served from daily bars."""
+        for day in range(30):
+            session.add(
+                PriceRollup(
+                    item_id=4151,
+                    resolution=86400,
+                    bucket_start=DAY0 + day * 86400,
+                    high=1500000,
+                    low=1400000,
+                    volume=10,
+                )
+            )
+        session.commit()
+
+        response = client.get(
+            "/api/v1/prices/4151/history",
+            params={"from": DAY0, "to": DAY0 + 30 * 86400, "points": 20},
+        )
+
+        data = response.json()
+        assert data["resolution"] == "1d"
+        assert len(data["ts"]) == len(data["volume"]) == 30
+
+    def test_unknown_item_returns_404(self, client: TestClient):
+        """Test that a missing item is a 404."""
+        response = client.get("/api/v1/prices/999999/history")
+
+        assert response.status_code == 404
+
+    def test_empty_range_returns_400(self, client: TestClient, whip):
+        """Test that from >= to is rejected."""
+        response = client.get("/api/v1/prices/4151/history", params={"from": 10, "to": 10})
+
+        assert response.status_code == 400
+
+    def test_range_is_clamped_to_history_retention(self, client: TestClient, whip):
+        """Test that a range reaching past the retention window starts at its edge."""
+        end = DAY0 + 3600
+        response = client.get("/api/v1/prices/4151/history", params={"from": 0, "to": end})
+
+        assert response.status_code == 200
+        assert response.json()["start"] == end - settings.price_history_retention_days * 86400
@@ -1,9 +1,11 @@
 """Tests for watchlist API endpoints."""
 
+import time
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
-from backend.models import WatchlistItem, WatchlistAlert, Item
+from backend.models import PriceBucket, WatchlistItem, WatchlistAlert, Item
 
 
 class TestWatchlistEndpoints:
@@ -86,6 +88,45 @@ class TestWatchlistEndpoints:
         assert len(data) == 1
         assert data[0]["user_id"] == "test_user_1"
 
+    def test_get_watchlist_includes_last_hour_activity(self, client: TestClient, session: Session):
+        """Test watched items carry volume and average prices from the /5m buckets."""
+        session.add(Item(id=4151, name="Abyssal whip"))
+        session.add(Item(id=11802, name="Armadyl godsword"))
+        for item_id in (4151, 11802):
+            session.add(
+                WatchlistItem(
+                    user_id="test_user_1",
+                    item_id=item_id,
+                    item_name=f"Item {item_id}",
+                    alert_type="price_below",
+                    threshold=1,
+                )
+            )
+        now = int(time.time())
+        bucket = now - now % 300
+        for start, high, low in ((bucket, 1_600_000, 1_500_000), (bucket - 300, 1_700_000, None)):
+            session.add(
+                PriceBucket(
+                    item_id=4151,
+                    interval=300,
+                    timestamp=start,
+                    avg_high_price=high,
+                    high_price_volume=10,
+                    avg_low_price=low,
+                    low_price_volume=5 if low else 0,
+                )
+            )
+        session.commit()
+
+        response = client.get("/api/v1/watchlist", params={"user_id": "test_user_1"})
+
+        assert response.status_code == 200
+        rows = {row["item_id"]: row for row in response.json()}
+        assert rows[4151]["volume_1h"] == 25
+        assert rows[4151]["avg_high_price_1h"] == 1_650_000
+        assert rows[4151]["avg_low_price_1h"] == 1_500_000
+        assert rows[11802]["volume_1h"] is None
+
     def test_get_watchlist_include_inactive(self, client: TestClient, session: Session):
         """Test getting watchlist including inactive items."""
         item = Item(id=4151, name="Abyssal whip", members=True, value=2000000)
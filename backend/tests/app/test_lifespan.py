@@ -52,9 +52,8 @@ async def test_create_db_and_tables(test_engine):
 @pytest.mark.asyncio
 async def test_lifespan_startup_empty_db(mock_app, test_engine):
     """Test lifespan startup with empty database."""
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_items_to_db = AsyncMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
 
     mock_scheduler = MagicMock()
     mock_scheduler.start = MagicMock()
@@ -63,7 +62,7 @@ async def test_lifespan_startup_empty_db(mock_app, test_engine):
     with (
         patch("backend.app.lifespan.engine", test_engine),
         patch("backend.app.lifespan.setup_scheduler", return_value=mock_scheduler),
-        patch("backend.app.lifespan.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.lifespan.seed_slayer_data") as mock_seed,
     ):
 
@@ -72,9 +71,9 @@ async def test_lifespan_startup_empty_db(mock_app, test_engine):
             # Verify scheduler started
             mock_scheduler.start.assert_called_once()
 
-            # Verify initial sync was called (empty DB)
-            mock_wiki_client.sync_items_to_db.assert_called_once()
-            mock_wiki_client.sync_prices_to_db.assert_called_once()
+            # Verify one pipeline run synced items and prices (empty DB)
+            mock_pipeline.run.assert_awaited_once()
+            assert mock_pipeline.run.call_args.kwargs == {"include_mapping": True}
 
             # Verify slayer seed was called
             mock_seed.assert_called_once()
@@ -93,9 +92,8 @@ async def test_lifespan_startup_with_existing_data(mock_app, test_engine):
         session.add(item)
         session.commit()
 
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_items_to_db = AsyncMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
 
     mock_scheduler = MagicMock()
     mock_scheduler.start = MagicMock()
@@ -104,7 +102,7 @@ async def test_lifespan_startup_with_existing_data(mock_app, test_engine):
     with (
         patch("backend.app.lifespan.engine", test_engine),
         patch("backend.app.lifespan.setup_scheduler", return_value=mock_scheduler),
-        patch("backend.app.lifespan.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.lifespan.seed_slayer_data") as mock_seed,
     ):
 
@@ -112,11 +110,9 @@ async def test_lifespan_startup_with_existing_data(mock_app, test_engine):
             # Verify scheduler started
             mock_scheduler.start.assert_called_once()
 
-            # Verify item sync was NOT called (DB has items)
-            mock_wiki_client.sync_items_to_db.assert_not_called()
-
-            # Verify price sync was still called
-            mock_wiki_client.sync_prices_to_db.assert_called_once()
+            # Verify the price sync ran without the mapping (DB has items)
+            mock_pipeline.run.assert_awaited_once()
+            assert mock_pipeline.run.call_args.kwargs == {"include_mapping": False}
 
             # Verify slayer seed was called
             mock_seed.assert_called_once()
@@ -130,8 +126,8 @@ async def test_lifespan_handles_seed_failure(mock_app, test_engine):
     """Test that lifespan handles slayer seed failures gracefully."""
     SQLModel.metadata.create_all(test_engine)
 
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
 
     mock_scheduler = MagicMock()
     mock_scheduler.start = MagicMock()
@@ -140,7 +136,7 @@ async def test_lifespan_handles_seed_failure(mock_app, test_engine):
     with (
         patch("backend.app.lifespan.engine", test_engine),
         patch("backend.app.lifespan.setup_scheduler", return_value=mock_scheduler),
-        patch("backend.app.lifespan.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.lifespan.seed_slayer_data", side_effect=Exception("Seed failed")),
     ):
 
@@ -179,9 +175,8 @@ async def test_lifespan_seed_success_with_verification(mock_app, test_engine):
         session.add(task)
         session.commit()
 
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_items_to_db = AsyncMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
 
     mock_scheduler = MagicMock()
     mock_scheduler.start = MagicMock()
@@ -190,7 +185,7 @@ async def test_lifespan_seed_success_with_verification(mock_app, test_engine):
     with (
         patch("backend.app.lifespan.engine", test_engine),
         patch("backend.app.lifespan.setup_scheduler", return_value=mock_scheduler),
-        patch("backend.app.lifespan.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.lifespan.seed_slayer_data") as mock_seed,
         patch("backend.app.lifespan.logger") as mock_logger,
     ):
@@ -213,8 +208,8 @@ async def test_lifespan_seed_failure_no_existing_data(mock_app, test_engine):
         session.add(item)
         session.commit()
 
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
 
     mock_scheduler = MagicMock()
     mock_scheduler.start = MagicMock()
@@ -223,7 +218,7 @@ async def test_lifespan_seed_failure_no_existing_data(mock_app, test_engine):
     with (
         patch("backend.app.lifespan.engine", test_engine),
         patch("backend.app.lifespan.setup_scheduler", return_value=mock_scheduler),
-        patch("backend.app.lifespan.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.lifespan.seed_slayer_data", side_effect=Exception("Seed failed")),
         patch("backend.app.lifespan.logger") as mock_logger,
     ):
@@ -264,8 +259,8 @@ async def test_lifespan_seed_failure_with_existing_data(mock_app, test_engine):
         session.add(task)
         session.commit()
 
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
 
     mock_scheduler = MagicMock()
     mock_scheduler.start = MagicMock()
@@ -274,7 +269,7 @@ async def test_lifespan_seed_failure_with_existing_data(mock_app, test_engine):
     with (
         patch("backend.app.lifespan.engine", test_engine),
         patch("backend.app.lifespan.setup_scheduler", return_value=mock_scheduler),
-        patch("backend.app.lifespan.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.lifespan.seed_slayer_data", side_effect=Exception("Seed failed")),
         patch("backend.app.lifespan.logger") as mock_logger,
     ):
@@ -289,3 +284,61 @@ async def test_lifespan_seed_failure_with_existing_data(mock_app, test_engine):
                 if "existing slayer data" in str(call).lower()
             ]
             assert len(info_calls) > 0
+
+
+@pytest.mark.asyncio
+async def test_lifespan_opens_and_closes_shared_http_client(mock_app, test_engine):
+    """Test that the shared wiki HTTP client lives for the duration of the app."""
+    SQLModel.metadata.create_all(test_engine)
+    with Session(test_engine) as session:
+        session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+        session.commit()
+
+    mock_pipeline = MagicMock()
+    mock_pipeline.run = AsyncMock()
+
+    with (
+        patch("backend.app.lifespan.engine", test_engine),
+        patch("backend.app.lifespan.setup_scheduler", return_value=MagicMock()),
+        patch("backend.app.lifespan.IngestionPipeline", return_value=mock_pipeline),
+        patch("backend.app.lifespan.seed_slayer_data"),
+        patch("backend.app.lifespan.open_http_client", new_callable=AsyncMock) as mock_open,
+        patch("backend.app.lifespan.close_http_client", new_callable=AsyncMock) as mock_close,
+    ):
+        async with lifespan(mock_app):
+            mock_open.assert_awaited_once()
+            mock_close.assert_not_awaited()
+
+        mock_close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_populate_equipment_stats_prefers_snapshot(test_engine):
+    """Test that the bundled snapshot is used instead of downloading OSRSBox."""
+    from backend.app.lifespan import populate_equipment_stats
+
+    with (
+        patch(
+            "backend.services.equipment_snapshot.load_equipment_snapshot", return_value=12
+        ) as mock_load,
+        patch("backend.services.item_stats.import_item_stats", new_callable=AsyncMock) as mock_dl,
+    ):
+        await populate_equipment_stats(MagicMock())
+
+    mock_load.assert_called_once()
+    mock_dl.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_populate_equipment_stats_downloads_without_snapshot(test_engine):
+    """Test that startup streams OSRSBox stats when no snapshot is bundled."""
+    from backend.app.lifespan import populate_equipment_stats
+
+    session = MagicMock()
+    with (
+        patch("backend.services.equipment_snapshot.load_equipment_snapshot", return_value=None),
+        patch("backend.services.item_stats.import_item_stats", new_callable=AsyncMock) as mock_dl,
+    ):
+        await populate_equipment_stats(session)
+
+    mock_dl.assert_awaited_once_with(session, stream=True)
@@ -33,27 +33,30 @@ def test_setup_scheduler_adds_price_job():
     ):
         scheduler = setup_scheduler()
 
-        # Verify jobs were added (price update and watchlist alerts)
+        # Verify jobs were added (prices, watchlist alerts, buckets, retention, rollups)
         jobs = scheduler.get_jobs()
-        assert len(jobs) == 2
+        assert len(jobs) == 5
         assert jobs[0].id is not None
         assert jobs[0].trigger.interval.seconds == 300  # 5 minutes
         assert jobs[1].id is not None
         assert jobs[1].trigger.interval.seconds == 300  # 5 minutes
+        assert jobs[2].trigger.interval.seconds == 300  # 5 minutes
+        assert jobs[3].trigger.interval.seconds == 3600  # 1 hour
+        assert jobs[4].trigger.interval.seconds == 900  # 15 minutes
 
 
 @pytest.mark.asyncio
 async def test_price_update_job_executes():
     """Test that the price update job executes correctly."""
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.sync_prices = AsyncMock()
 
     mock_session = MagicMock()
     mock_session.__enter__ = MagicMock(return_value=mock_session)
     mock_session.__exit__ = MagicMock(return_value=None)
 
     with (
-        patch("backend.app.scheduler.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.scheduler.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.scheduler.engine"),
         patch("backend.app.scheduler.Session", return_value=mock_session),
         patch("backend.app.scheduler.WatchlistService"),
@@ -67,22 +70,22 @@ async def test_price_update_job_executes():
         # Execute the job
         await job_func()
 
-        # Verify sync was called
-        mock_wiki_client.sync_prices_to_db.assert_called_once_with(mock_session)
+        # Verify the pipeline's price sync was called
+        mock_pipeline.sync_prices.assert_called_once_with(mock_session)
 
 
 @pytest.mark.asyncio
 async def test_price_update_job_handles_errors():
     """Test that the price update job handles errors gracefully."""
-    mock_wiki_client = MagicMock()
-    mock_wiki_client.sync_prices_to_db = AsyncMock(side_effect=Exception("Sync failed"))
+    mock_pipeline = MagicMock()
+    mock_pipeline.sync_prices = AsyncMock(side_effect=Exception("Sync failed"))
 
     mock_session = MagicMock()
     mock_session.__enter__ = MagicMock(return_value=mock_session)
     mock_session.__exit__ = MagicMock(return_value=None)
 
     with (
-        patch("backend.app.scheduler.WikiAPIClient", return_value=mock_wiki_client),
+        patch("backend.app.scheduler.IngestionPipeline", return_value=mock_pipeline),
         patch("backend.app.scheduler.engine"),
         patch("backend.app.scheduler.Session", return_value=mock_session),
         patch("backend.app.scheduler.WatchlistService"),
@@ -193,3 +196,43 @@ async def test_watchlist_alerts_job_handles_errors():
 
         # Verify error was logged
         mock_logger.error.assert_called_once()
+
+
+def test_setup_scheduler_uses_given_pipeline():
+    """Test that the price job reuses the pipeline passed in by the caller."""
+    pipeline = MagicMock()
+
+    with (
+        patch("backend.app.scheduler.IngestionPipeline") as mock_pipeline_cls,
+        patch("backend.app.scheduler.engine"),
+        patch("backend.app.scheduler.WatchlistService"),
+    ):
+        setup_scheduler(pipeline)
+
+        mock_pipeline_cls.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_price_buckets_job_syncs_each_interval_independently():
+    """Test that a failing /5m bucket sync does not prevent the /1h sync."""
+    mock_pipeline = MagicMock()
+    mock_pipeline.sync_buckets = AsyncMock(side_effect=[Exception("5m down"), None])
+    mock_pipeline.backfill_buckets = AsyncMock()
+
+    mock_session = MagicMock()
+    mock_session.__enter__ = MagicMock(return_value=mock_session)
+    mock_session.__exit__ = MagicMock(return_value=None)
+
+    with (
+        patch("backend.app.scheduler.engine"),
+        patch("backend.app.scheduler.Session", return_value=mock_session),
+        patch("backend.app.scheduler.WatchlistService"),
+        patch("backend.app.scheduler.logger") as mock_logger,
+    ):
+        scheduler = setup_scheduler(mock_pipeline)
+
+        await scheduler.get_jobs()[2].func()
+
+        assert [call.args[1] for call in mock_pipeline.sync_buckets.call_args_list] == ["5m", "1h"]
+        mock_pipeline.backfill_buckets.assert_awaited_once_with(mock_session, "1h")
+        mock_logger.error.assert_called_once()
@@ -9,6 +9,8 @@ from typing import Generator
 from backend.main import app
 from backend.db.session import get_session
 from backend.models import Item, PriceSnapshot, Monster, SlayerTask, SlayerMaster
+from backend.api.v1.flips import opportunities_cache
+from backend.services.flip_engine import flip_engine
 
 
 # Create in-memory SQLite database for testing
@@ -34,7 +36,7 @@ def setup_test_db():
     2. Creates all tables
     3. Yields for test execution
     4. Drops all tables
-    5. Clears dependency overrides
+    5. Clears dependency overrides, the in-memory flip table and cached responses
     """
     # Override dependency BEFORE creating tables
     app.dependency_overrides[get_session] = get_test_session
@@ -47,6 +49,8 @@ def setup_test_db():
     # Cleanup
     SQLModel.metadata.drop_all(test_engine)
     app.dependency_overrides.clear()
+    flip_engine.invalidate()
+    opportunities_cache.clear()
     # Note: Don't dispose test_engine here as it's module-level and reused
 
 
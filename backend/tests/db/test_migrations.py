@@ -2,6 +2,9 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import create_engine
 
 from backend.db.migrations import migrate_tables, init_db
 
@@ -118,6 +121,62 @@ class TestMigrateTables:
         # Should not raise, errors are caught and printed
         migrate_tables()
 
+    def test_migrate_tables_dedupes_snapshots_and_adds_unique_index(self):
+        """Test legacy duplicate snapshots are collapsed before the unique index is added."""
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE pricesnapshot (id INTEGER PRIMARY KEY, item_id INTEGER, "
+                    "high_price INTEGER, buy_volume_24h INTEGER, sell_volume_24h INTEGER)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO pricesnapshot (id, item_id, high_price) "
+                    "VALUES (1, 4151, 100), (2, 4151, 200), (3, 314, 3)"
+                )
+            )
+
+        with patch("backend.db.migrations.engine", engine):
+            migrate_tables()
+
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT item_id, high_price FROM pricesnapshot ORDER BY item_id")
+            ).all()
+        assert rows == [(314, 3), (4151, 200)]
+
+        indexes = {idx["name"]: idx for idx in inspect(engine).get_indexes("pricesnapshot")}
+        assert indexes["ix_pricesnapshot_item_id"]["unique"]
+        engine.dispose()
+
+    def test_migrate_tables_adds_model_indexes_and_drops_superseded(self):
+        """Test indexes declared on the models reach tables created before them."""
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE trade (id INTEGER PRIMARY KEY, user_id VARCHAR, "
+                    "item_id INTEGER, created_at DATETIME)"
+                )
+            )
+            conn.execute(text("CREATE INDEX ix_trade_user_id ON trade (user_id)"))
+
+        with patch("backend.db.migrations.engine", engine):
+            migrate_tables()
+            # A second run finds nothing left to do
+            migrate_tables()
+
+        indexes = {idx["name"]: idx["column_names"] for idx in inspect(engine).get_indexes("trade")}
+        assert indexes["ix_trade_user_id_created_at"] == ["user_id", "created_at"]
+        assert "ix_trade_user_id" not in indexes
+        engine.dispose()
+
 
 class TestInitDb:
     """Test init_db function."""
@@ -0,0 +1,40 @@
+"""Tests for the dedicated database writer thread."""
+
+import threading
+
+import pytest
+
+from backend.db import writer
+from backend.services.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_writer():
+    """Start each test with a new writer executor."""
+    writer.shutdown_writer()
+    yield
+    writer.shutdown_writer()
+
+
+@pytest.mark.asyncio
+async def test_run_in_writer_runs_off_the_event_loop_thread():
+    """Test that work runs on the single writer thread, not the caller's thread."""
+    names = [await writer.run_in_writer(lambda: threading.current_thread().name) for _ in range(3)]
+
+    assert names[0] != threading.current_thread().name
+    assert names[0].startswith("db-writer")
+    assert len(set(names)) == 1
+
+
+@pytest.mark.asyncio
+async def test_run_in_writer_passes_arguments_and_propagates_errors():
+    """Test that results, arguments and exceptions round-trip through the writer."""
+    metrics.reset()
+    assert await writer.run_in_writer(lambda a, b=0: a + b, 2, b=3) == 5
+
+    def fail():
+        raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        await writer.run_in_writer(fail)
+    assert metrics.timing("db.writer.seconds").count == 2
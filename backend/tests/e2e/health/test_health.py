@@ -46,13 +46,13 @@ class TestHealthEndpoint(BaseE2ETest):
 class TestAPIHealthEndpoint(BaseE2ETest):
     """Test the /api/v1/health endpoint."""
 
-    @patch("httpx.AsyncClient")
-    def test_api_v1_health_endpoint(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_api_v1_health_endpoint(self, mock_get_client, client: TestClient, session: Session):
         """Test /api/v1/health endpoint returns correct structure."""
         # Mock external API call to avoid network dependency
         from unittest.mock import AsyncMock, MagicMock
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_client.get = AsyncMock(return_value=mock_response)
@@ -69,13 +69,13 @@ class TestAPIHealthEndpoint(BaseE2ETest):
         assert data["database"] in ("ok", "error")
         assert data["version"] == "1.0.0"
 
-    @patch("httpx.AsyncClient")
-    def test_api_v1_health_database_status(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_api_v1_health_database_status(self, mock_get_client, client: TestClient, session: Session):
         """Test /api/v1/health endpoint checks database connectivity."""
         # Mock external API call
         from unittest.mock import AsyncMock, MagicMock
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_client.get = AsyncMock(return_value=mock_response)
@@ -86,13 +86,13 @@ class TestAPIHealthEndpoint(BaseE2ETest):
         # Database should be ok if test database is working
         assert data["database"] == "ok"
 
-    @patch("httpx.AsyncClient")
-    def test_api_v1_health_external_api_status(self, mock_client_class, client: TestClient, session: Session):
+    @patch("backend.api.v1.health.get_http_client")
+    def test_api_v1_health_external_api_status(self, mock_get_client, client: TestClient, session: Session):
         """Test /api/v1/health endpoint checks external API."""
         # Mock external API call to return unavailable
         from unittest.mock import AsyncMock
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_client.get = AsyncMock(side_effect=Exception("Connection timeout"))
 
         response = client.get("/api/v1/health")
@@ -0,0 +1,14 @@
+"""Tests for audit_query_plans script."""
+
+from backend.scripts.audit_query_plans import run_audit
+
+
+def test_run_audit_reports_every_query(capsys):
+    """Test the audit prints one line per hot query and a clean summary."""
+    results = run_audit()
+
+    output = capsys.readouterr().out
+    assert not any(audit.unexpected for audit in results)
+    assert f"{len(results)} queries:" in output
+    assert "0 failing" in output
+    assert "find_best_flips" in output
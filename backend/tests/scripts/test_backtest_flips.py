@@ -0,0 +1,44 @@
+"""Tests for backtest_flips script."""
+
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import Item, PriceBucket
+from backend.scripts.backtest_flips import run_backtest
+from backend.services.backtest import StrategyParams
+from backend.services.wiki.bulk import append_price_history
+
+DAY0 = 1_760_659_200
+
+
+def test_run_backtest_exports_and_sweeps():
+    """Test the script exports recent history and reports each combination."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Item(id=4151, name="Abyssal whip", limit=70))
+        append_price_history(
+            session, [{"item_id": 4151, "high_price": 2000, "low_price": 1800}], ts=DAY0
+        )
+        for ts in range(DAY0, DAY0 + 86400, 3600):
+            session.add(PriceBucket(item_id=4151, interval=300, timestamp=ts, low_price_volume=500))
+        session.commit()
+
+    reports = run_backtest(
+        {"min_roi": [1, 50]},
+        StrategyParams(interval=3600, hold=3600),
+        days=1,
+        step=3600,
+        workers=1,
+        engine=engine,
+        now=DAY0 + 86400,
+    )
+    engine.dispose()
+
+    assert [report.params.name for report in reports] == ["min_roi=1", "min_roi=50"]
+    # 23 hourly decisions, 50 units each (10% of 500) x (2000 - 40 - 1800)
+    assert reports[0].trades == 23
+    assert reports[0].profit == 23 * 50 * 160
+    assert reports[1].trades == 0
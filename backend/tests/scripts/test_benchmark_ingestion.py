@@ -0,0 +1,30 @@
+"""Tests for benchmark_ingestion script."""
+
+import pytest
+
+from backend.scripts.benchmark_ingestion import format_results, run_benchmark
+from backend.scripts.wiki_standin import StandinConfig
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_reports_every_phase():
+    """Test that a small end-to-end run covers cold, tick and bucket phases."""
+    results = await run_benchmark(40, ticks=2, trace_memory=True)
+
+    assert [result.phase for result in results] == ["cold", "tick 1", "tick 2", "buckets"]
+    assert results[0].rows == 40
+    assert all(result.errors == 0 for result in results)
+    assert all(result.peak_bytes and result.peak_bytes > 0 for result in results)
+    assert results[1].write_seconds > 0
+    assert "items/s" in format_results(results).splitlines()[0]
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_counts_failed_phases():
+    """Test that injected server errors are reported instead of aborting the run."""
+    results = await run_benchmark(
+        10, ticks=1, config=StandinConfig(error_rate=1.0), trace_memory=False
+    )
+
+    assert all(result.errors == 1 for result in results)
+    assert results[0].peak_bytes is None
@@ -0,0 +1,25 @@
+"""Tests for benchmark_item_stats_import script."""
+
+import json
+
+import pytest
+
+from backend.scripts.benchmark_item_stats_import import build_document, run_benchmark
+
+
+def test_build_document_is_keyed_by_item_id():
+    """Test that the synthetic document mirrors the OSRSBox layout."""
+    data = json.loads(build_document(20))
+
+    assert list(data) == [str(i) for i in range(1, 21)]
+    assert any(entry["equipable_by_player"] for entry in data.values())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_run_benchmark_reports_time_and_peak(stream):
+    """Test that a small benchmark run reports elapsed time and peak memory."""
+    result = await run_benchmark(build_document(50), db_items=40, stream=stream)
+
+    assert result["seconds"] >= 0
+    assert result["peak_mib"] > 0
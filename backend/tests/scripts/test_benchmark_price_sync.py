@@ -0,0 +1,32 @@
+"""Tests for benchmark_price_sync script."""
+
+import pytest
+
+from backend.scripts.benchmark_price_sync import SyntheticWikiClient, run_benchmark
+
+
+@pytest.mark.asyncio
+async def test_synthetic_client_covers_every_item():
+    """Test that the synthetic payload includes one entry per item."""
+    payload = await SyntheticWikiClient(25, seed=1).fetch_latest_prices()
+
+    assert len(payload["data"]) == 25
+    assert payload["data"]["1"]["high"] == 1002
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_reports_insert_update_and_delta_timings():
+    """Test that a small benchmark run reports every pass."""
+    timings = await run_benchmark(50)
+
+    assert set(timings) == {"insert", "update", "delta"}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+@pytest.mark.asyncio
+async def test_synthetic_client_changes_only_requested_items():
+    """Test that items past changed_items keep the previous seed's prices."""
+    payload = await SyntheticWikiClient(10, seed=2, changed_items=3).fetch_latest_prices()
+
+    assert payload["data"]["3"]["high"] == 1005
+    assert payload["data"]["4"]["high"] == 1005
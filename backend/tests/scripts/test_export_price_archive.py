@@ -0,0 +1,30 @@
+"""Tests for export_price_archive script."""
+
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.scripts.export_price_archive import export_archive
+from backend.services.price_archive import PriceArchive
+from backend.services.wiki.bulk import append_price_history
+
+NOW = 1_760_659_200 + 7200
+
+
+def test_export_archive_covers_requested_days(tmp_path):
+    """Test the script exports the trailing window on the requested grid."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        append_price_history(
+            session, [{"item_id": 4151, "high_price": 10, "low_price": 8}], ts=NOW - 3600
+        )
+        session.commit()
+
+    info = export_archive(tmp_path / "archive", days=1, step=3600, now=NOW, engine=engine)
+    engine.dispose()
+
+    reader = PriceArchive(tmp_path / "archive")
+    assert info.n_times == 24
+    assert reader.item(4151)["high"][-1] == 10
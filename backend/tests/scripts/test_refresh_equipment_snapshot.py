@@ -0,0 +1,29 @@
+"""Tests for refresh_equipment_snapshot script."""
+
+import json
+
+import pytest
+
+from backend.scripts.refresh_equipment_snapshot import refresh_snapshot
+from backend.services.equipment_snapshot import read_snapshot
+
+
+@pytest.mark.asyncio
+async def test_refresh_snapshot_from_local_dump(tmp_path):
+    """Test that the refresh command writes a snapshot of equipable items."""
+    source = tmp_path / "items-complete.json"
+    source.write_text(
+        json.dumps(
+            {
+                "4151": {"equipable_by_player": True, "equipment": {"slot": "weapon"}},
+                "314": {"equipable_by_player": False},
+            }
+        )
+    )
+    output = tmp_path / "equipment_stats.bin"
+
+    assert await refresh_snapshot(source, output) == 1
+
+    snapshot = read_snapshot(output)
+    assert snapshot.ids == [4151]
+    assert snapshot.metadata["source"].startswith("items-complete.json sha256:")
@@ -0,0 +1,79 @@
+"""Tests for the wiki_standin script."""
+
+import httpx
+import pytest
+
+from backend.scripts.wiki_standin import API_PREFIX, StandinConfig, SyntheticWiki, create_app
+
+
+def _client(wiki: SyntheticWiki) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(wiki)), base_url="http://standin"
+    )
+
+
+def test_advance_changes_the_configured_fraction_of_items():
+    """Test that one tick moves change_ratio of the items and nothing else."""
+    wiki = SyntheticWiki(StandinConfig(item_count=100, change_ratio=0.25))
+    before = wiki.payload("latest")["data"]
+
+    changed = wiki.advance()
+
+    after = wiki.payload("latest")["data"]
+    moved = {int(item_id) for item_id in after if after[item_id] != before[item_id]}
+    assert len(changed) == 25
+    assert moved == set(changed)
+    assert wiki.tick == 1
+
+
+def test_bucket_payload_respects_timestamp():
+    """Test that /5m payloads report the requested bucket start."""
+    wiki = SyntheticWiki(StandinConfig(item_count=30))
+
+    payload = wiki.payload("5m", timestamp=1_700_000_100)
+
+    assert payload["timestamp"] == 1_700_000_100
+    assert 0 < len(payload["data"]) < 30
+    assert len(wiki.payload("mapping")) == 30
+
+
+def test_replay_dir_serves_recorded_payloads(tmp_path):
+    """Test that recorded endpoint files are returned verbatim."""
+    (tmp_path / "mapping.json").write_bytes(b'[{"id": 4151, "name": "Abyssal whip"}]')
+    wiki = SyntheticWiki(StandinConfig(item_count=5, replay_dir=tmp_path))
+
+    assert wiki.body("mapping") == b'[{"id": 4151, "name": "Abyssal whip"}]'
+    assert b'"1"' in wiki.body("latest")
+
+
+@pytest.mark.asyncio
+async def test_app_answers_304_for_matching_etag_and_advances():
+    """Test conditional requests and the advance endpoint over HTTP."""
+    wiki = SyntheticWiki(StandinConfig(item_count=10, change_ratio=0.5))
+
+    async with _client(wiki) as client:
+        first = await client.get(f"{API_PREFIX}/latest")
+        etag = first.headers["ETag"]
+        repeat = await client.get(f"{API_PREFIX}/latest", headers={"If-None-Match": etag})
+        advanced = await client.post(f"{API_PREFIX}/_standin/advance")
+        changed = await client.get(f"{API_PREFIX}/latest", headers={"If-None-Match": etag})
+        missing = await client.get(f"{API_PREFIX}/nope")
+
+    assert first.status_code == 200
+    assert len(first.json()["data"]) == 10
+    assert repeat.status_code == 304
+    assert advanced.json() == {"tick": 1, "changed": 5}
+    assert changed.status_code == 200
+    assert missing.status_code == 404
+    assert wiki.requests["latest"] == 3
+
+
+@pytest.mark.asyncio
+async def test_app_injects_errors():
+    """Test that error_rate=1 answers every request with 503."""
+    wiki = SyntheticWiki(StandinConfig(item_count=5, error_rate=1.0))
+
+    async with _client(wiki) as client:
+        response = await client.get(f"{API_PREFIX}/mapping")
+
+    assert response.status_code == 503
@@ -0,0 +1,161 @@
+"""Tests for the vectorized flip backtesting engine."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import Item, PriceBucket
+from backend.services.backtest import (
+    StrategyParams,
+    backtest,
+    format_report,
+    load_buy_limits,
+    parameter_grid,
+    run_sweep,
+)
+from backend.services.flipping import calculate_tax, calculate_tax_array
+from backend.services.price_archive import PriceArchive, export_price_archive
+from backend.services.wiki.bulk import append_price_history
+
+DAY0 = 1_760_659_200  # 2025-10-17 00:00 UTC
+HOUR = 3600
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def archive_path(test_session, tmp_path):
+    """Export four hours of two items.
+
+    Item 1 (limit 50) buys at 100, sells at 200 and trades 1,000 units per
+    5 minutes; item 2 (limit 1,000) buys at 1,000, sells at 1,100 and trades
+    4,000 until its high price drops to 900 at the start of the third hour.
+    """
+    test_session.add(Item(id=1, name="Small", limit=50))
+    test_session.add(Item(id=2, name="Large", limit=1000))
+    rows = [
+        {"item_id": 1, "high_price": 200, "low_price": 100},
+        {"item_id": 2, "high_price": 1100, "low_price": 1000},
+    ]
+    append_price_history(test_session, rows, ts=DAY0)
+    append_price_history(
+        test_session, [{"item_id": 2, "high_price": 900, "low_price": 1000}], ts=DAY0 + 2 * HOUR
+    )
+    for ts in range(DAY0, DAY0 + 4 * HOUR, 300):
+        for item_id, traded in ((1, 1000), (2, 4000)):
+            test_session.add(
+                PriceBucket(item_id=item_id, interval=300, timestamp=ts, high_price_volume=traded)
+            )
+    test_session.commit()
+    export_price_archive(test_session, tmp_path / "archive", DAY0, DAY0 + 4 * HOUR)
+    return tmp_path / "archive"
+
+
+def test_tax_array_matches_calculate_tax():
+    """Test the vectorized tax equals calculate_tax around every threshold."""
+    prices = np.concatenate([np.arange(0, 2000), [49, 50, 250_000_000, 2_147_483_647]])
+    expected = [calculate_tax(int(price)) for price in prices]
+    assert calculate_tax_array(prices).tolist() == expected
+
+
+def test_load_buy_limits_aligns_with_archive(test_session, archive_path):
+    """Test limits follow archive order and unknown items get 0."""
+    test_session.add(Item(id=3, name="No limit"))
+    test_session.commit()
+    assert load_buy_limits(test_session, [2, 1, 3, 99]).tolist() == [1000, 50, 0, 0]
+
+
+def test_backtest_caps_quantity_and_taxes_exits(test_session, archive_path):
+    """Test buy limits, capital and GE tax shape the profit of each flip."""
+    archive = PriceArchive(archive_path)
+    limits = load_buy_limits(test_session, archive.item_ids)
+    params = StrategyParams(
+        min_roi=0, ranking="roi", top_n=1, capital=1_000_000, interval=HOUR, hold=HOUR
+    )
+
+    report = backtest(archive, limits, params)
+
+    # Item 1 (ROI 48%) wins every hour; 50 units (its limit) x (200 - 4 - 100)
+    assert report.steps == 3
+    assert report.trades == 3
+    assert report.profit == 3 * 50 * 96
+    assert report.invested == 3 * 50 * 100
+    assert report.top_items == [(1, 3 * 50 * 96)]
+    assert report.win_rate == 100.0
+
+
+def test_ranking_changes_picks_and_records_losses(test_session, archive_path):
+    """Test margin x volume prefers the busier item and books its price drop."""
+    archive = PriceArchive(archive_path)
+    limits = load_buy_limits(test_session, archive.item_ids)
+    params = StrategyParams(
+        min_roi=0, top_n=1, capital=10_000_000, fill_ratio=0.05, interval=HOUR, hold=HOUR
+    )
+
+    report = backtest(archive, limits, params)
+
+    # Item 2 at its 1,000 limit sells at 1,100 - 22 tax, then at 900 - 18; once its
+    # ROI turns negative item 1 is bought at 5% of its 12,000 hourly units, capped at 50
+    assert report.trades == 3
+    assert report.profit == 1000 * 78 + 1000 * (900 - 18 - 1000) + 50 * 96
+    assert report.wins == 2
+    assert report.max_drawdown == 1000 * 118
+    assert report.top_items == [(1, 50 * 96), (2, -40_000)]
+
+
+def test_filters_exclude_items(test_session, archive_path):
+    """Test the ROI, volume and price filters."""
+    archive = PriceArchive(archive_path)
+    limits = load_buy_limits(test_session, archive.item_ids)
+    base = StrategyParams(interval=HOUR, hold=HOUR)
+
+    assert backtest(archive, limits, replace(base, min_roi=60)).trades == 0
+    assert backtest(archive, limits, replace(base, min_volume=10**9)).trades == 0
+    capped = backtest(archive, limits, replace(base, min_roi=0, max_price=500))
+    assert [item_id for item_id, _ in capped.top_items] == [1]
+
+
+def test_parameter_grid_names_combinations():
+    """Test the grid expands every combination and labels it."""
+    grid = parameter_grid(StrategyParams(), min_roi=[1, 2], ranking=["roi", "margin_x_volume"])
+    assert len(grid) == 4
+    assert grid[1].name == "min_roi=1 ranking=margin_x_volume"
+    assert (grid[2].min_roi, grid[2].ranking) == (2, "roi")
+
+
+def test_invalid_strategy_is_rejected(archive_path):
+    """Test inconsistent parameters raise before anything runs."""
+    with pytest.raises(ValueError):
+        run_sweep(archive_path, np.zeros(2), [StrategyParams(ranking="volume")])
+    with pytest.raises(ValueError):
+        StrategyParams(hold=2 * HOUR, interval=HOUR).validate()
+
+
+def test_sweep_in_processes_matches_inline(test_session, archive_path):
+    """Test a process-pool sweep returns the same reports as running inline."""
+    limits = load_buy_limits(test_session, PriceArchive(archive_path).item_ids)
+    strategies = parameter_grid(
+        StrategyParams(min_roi=0, interval=HOUR, hold=HOUR), ranking=["roi", "margin_x_volume"]
+    )
+
+    inline = run_sweep(archive_path, limits, strategies, workers=1)
+    pooled = run_sweep(archive_path, limits, strategies, workers=2)
+
+    assert [r.profit for r in pooled] == [r.profit for r in inline]
+    assert [r.params.name for r in pooled] == ["ranking=roi", "ranking=margin_x_volume"]
+    table = format_report(pooled)
+    assert table.splitlines()[2].startswith("ranking=roi")
+    assert pooled[0].to_dict()["roi"] == round(pooled[0].roi, 2)
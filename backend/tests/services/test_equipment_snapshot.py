@@ -0,0 +1,134 @@
+"""Tests for the bundled equipment-stats snapshot."""
+
+import asyncio
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import Item
+from backend.services.equipment_snapshot import (
+    SNAPSHOT_PATH,
+    build_snapshot,
+    load_equipment_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def test_engine():
+    """Create a test database engine."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def test_session(test_engine):
+    """Create a test database session."""
+    with Session(test_engine) as session:
+        yield session
+
+
+OSRSBOX_ENTRIES = {
+    "4151": {
+        "equipable_by_player": True,
+        "equipment": {"slot": "weapon", "attack_slash": 82, "melee_strength": 82},
+        "requirements": {"attack": 70},
+        "weapon": {"weapon_speed": 4, "weapon_type": "whip"},
+    },
+    "11802": {
+        "equipable_by_player": True,
+        "equipment": {"slot": "2h", "attack_slash": 132, "defence_magic": -4},
+        "requirements": {"attack": 75},
+        "weapon": {"weapon_speed": 6, "weapon_type": "2h_sword"},
+        "quest": "Troll Stronghold",
+    },
+    "314": {"equipable_by_player": False},
+}
+
+
+async def _entries():
+    for key, value in OSRSBOX_ENTRIES.items():
+        yield key, value
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Write a snapshot built from OSRSBOX_ENTRIES and return its path."""
+    path = tmp_path / "equipment_stats.bin"
+    write_snapshot(asyncio.run(build_snapshot(_entries(), source="test")), path)
+    return path
+
+
+def test_snapshot_round_trip(snapshot_path):
+    """Test that only equipable items are stored and values survive a round trip."""
+    snapshot = read_snapshot(snapshot_path)
+
+    assert snapshot.ids == [4151, 11802]
+    assert snapshot.metadata["source"] == "test"
+    rows = {row["id"]: row for row in snapshot.rows()}
+    assert rows[11802]["slot"] == "2h"
+    assert rows[11802]["is_2h"] is True
+    assert rows[11802]["defence_magic"] == -4
+    assert rows[11802]["quest_req"] == "Troll Stronghold"
+    assert rows[4151]["quest_req"] is None
+
+
+def test_load_applies_stats_to_known_items(test_session, snapshot_path):
+    """Test that loading updates items in the DB and ignores unknown ids."""
+    test_session.add(Item(id=4151, name="Abyssal whip"))
+    test_session.add(Item(id=314, name="Feather"))
+    test_session.commit()
+
+    assert load_equipment_snapshot(test_session, snapshot_path) == 1
+
+    whip = test_session.get(Item, 4151)
+    assert whip.slot == "weapon"
+    assert whip.attack_req == 70
+    assert whip.melee_strength == 82
+    assert test_session.get(Item, 314).slot is None
+
+
+def test_bundled_snapshot_loads(test_session):
+    """Test that the checked-in snapshot is readable and applies real stats."""
+    assert SNAPSHOT_PATH.exists()
+    snapshot = read_snapshot()
+
+    assert snapshot is not None
+    assert len(snapshot) > 3_000
+    assert snapshot.metadata["source"].startswith("items-complete.json sha256:")
+    assert snapshot.ids == sorted(snapshot.ids)
+
+    test_session.add(Item(id=4151, name="Abyssal whip"))
+    test_session.add(Item(id=1163, name="Rune full helm"))
+    test_session.commit()
+
+    assert load_equipment_snapshot(test_session) == 2
+    whip = test_session.get(Item, 4151)
+    assert (whip.slot, whip.attack_slash, whip.melee_strength) == ("weapon", 82, 82)
+    assert test_session.get(Item, 1163).slot == "head"
+
+
+def test_missing_snapshot_returns_none(test_session, tmp_path):
+    """Test that a missing snapshot signals the caller to fall back."""
+    assert load_equipment_snapshot(test_session, tmp_path / "missing.bin") is None
+
+
+def test_unsupported_or_corrupt_snapshot_is_ignored(snapshot_path):
+    """Test that snapshots from another format version or with bad data are ignored."""
+    data = bytearray(snapshot_path.read_bytes())
+
+    data[6] = 99  # format version
+    snapshot_path.write_bytes(bytes(data))
+    assert read_snapshot(snapshot_path) is None
+
+    data[6] = 1
+    data[-5:] = b"xxxxx"  # damage the compressed body
+    snapshot_path.write_bytes(bytes(data))
+    assert read_snapshot(snapshot_path) is None
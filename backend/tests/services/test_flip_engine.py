@@ -0,0 +1,241 @@
+"""Tests for the in-memory flip opportunity engine."""
+
+import random
+import threading
+
+import pytest
+from sqlmodel import Session, select
+
+from backend.models import Item, PriceSnapshot
+from backend.services.flip_engine import FlipEngine, FlipTable
+from backend.services.flipping import SORT_KEYS, FlippingService, decode_cursor, encode_cursor
+from backend.services.metrics import metrics
+from backend.services.price_events import PriceUpdates
+
+
+def _seed(session: Session, count: int = 300, seed: int = 7) -> None:
+    """Insert items with varied prices, volumes, limits and missing values."""
+    rng = random.Random(seed)
+    for item_id in range(1, count + 1):
+        low = rng.choice([None, 0, rng.randint(1, 60), rng.randint(100, 5_000_000)])
+        high = None if low is None else max(1, int(low * rng.uniform(0.9, 1.2)))
+        session.add(
+            Item(
+                id=item_id,
+                name=f"Item {item_id}",
+                members=rng.random() < 0.5,
+                limit=rng.choice([None, 0, 8, 100, 10_000]),
+            )
+        )
+        session.add(
+            PriceSnapshot(
+                item_id=item_id,
+                high_price=high,
+                low_price=low,
+                high_volume=rng.choice([None, 0, rng.randint(1, 500)]),
+                low_volume=rng.choice([None, rng.randint(1, 500)]),
+                buy_volume_24h=rng.choice([None, rng.randint(0, 10_000)]),
+                # Shared values create ties in margin x volume
+                sell_volume_24h=rng.choice([None, 0, 1_000]),
+            )
+        )
+    session.commit()
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"min_roi": 0.0, "min_volume": 0},
+        {"max_budget": 1_000_000, "min_roi": 2.5, "min_volume": 50},
+        {"max_budget": 0, "min_roi": 0.0, "min_volume": 0},
+        {"min_roi": 0.0, "min_volume": 0, "limit": 500},
+        {"min_roi": 0.0, "min_volume": 0, "limit": 3},
+    ],
+)
+def test_engine_matches_flipping_service(session, filters):
+    """Test the engine returns exactly what get_flip_opportunities returns."""
+    _seed(session)
+    expected = FlippingService(session).get_flip_opportunities(**filters)
+
+    assert FlipEngine(PriceUpdates()).opportunities(session, **filters) == expected
+
+
+def test_exclude_members(session):
+    """Test members-only items can be filtered out."""
+    _seed(session, count=50)
+    results = FlipEngine(PriceUpdates()).opportunities(
+        session, min_roi=0.0, min_volume=0, exclude_members=True, limit=100
+    )
+
+    assert results
+    members = set(session.exec(select(Item.id).where(Item.members.is_(True))))
+    assert not members & {row["item_id"] for row in results}
+
+
+def test_table_rebuilds_once_per_generation(session):
+    """Test the table is reused until a new price generation is published."""
+    _seed(session, count=10)
+    updates = PriceUpdates()
+    engine = FlipEngine(updates)
+
+    first = engine.table(session)
+    assert engine.table(session) is first
+
+    updates.publish([1])
+    second = engine.table(session)
+    assert second is not first
+    assert second.generation == 1
+
+    engine.invalidate()
+    assert engine.table(session) is not second
+
+
+def test_stale_table_served_during_rebuild(session):
+    """Test callers get the previous table instead of waiting for a rebuild."""
+    _seed(session, count=10)
+    updates = PriceUpdates()
+    engine = FlipEngine(updates)
+    previous = engine.table(session)
+    updates.publish([1])
+
+    # Another caller is rebuilding
+    engine._lock.acquire()
+    try:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(engine.table(session)))
+        reader.start()
+        reader.join(timeout=5)
+        assert result == [previous]
+    finally:
+        engine._lock.release()
+    assert engine.table(session).generation == 1
+
+
+def test_wait_blocks_until_rebuild_finishes(session):
+    """Test wait=True returns a table at the current generation, not the previous one."""
+    _seed(session, count=10)
+    updates = PriceUpdates()
+    engine = FlipEngine(updates)
+    engine.table(session)
+    updates.publish([1])
+
+    engine._lock.acquire()
+    result = []
+    reader = threading.Thread(target=lambda: result.append(engine.table(session, wait=True)))
+    reader.start()
+    reader.join(timeout=0.2)
+    assert result == []  # Still waiting
+    engine._lock.release()
+    reader.join(timeout=5)
+
+    assert [table.generation for table in result] == [1]
+
+
+def test_empty_database(session):
+    """Test an empty table builds and selects nothing."""
+    table = FlipTable.build(session, generation=0)
+
+    assert len(table) == 0
+    assert FlipEngine(PriceUpdates()).opportunities(session, min_roi=0, min_volume=0) == []
+
+
+def test_opportunities_endpoint_excludes_members(client, session):
+    """Test the API serves from the engine and applies the members filter."""
+    session.add(Item(id=1, name="F2P item", members=False, limit=100))
+    session.add(Item(id=2, name="P2P item", members=True, limit=100))
+    for item_id in (1, 2):
+        session.add(PriceSnapshot(item_id=item_id, high_price=1_200, low_price=1_000))
+    session.commit()
+
+    response = client.get("/api/v1/flips/opportunities", params={"exclude_members": True})
+
+    assert response.status_code == 200
+    assert [row["item_id"] for row in response.json()] == [1]
+
+
+@pytest.mark.parametrize("sort", list(SORT_KEYS))
+def test_pages_walk_the_full_ranking(session, sort):
+    """Test following cursors yields the single-request ranking, tied rows included."""
+    _seed(session)
+    engine = FlipEngine(PriceUpdates())
+    filters = {"min_roi": 0.0, "min_volume": 0}
+    table = engine.table(session)
+    expected = [int(table.item_id[i]) for i in table.select(**filters, limit=1000, sort=sort)]
+
+    seen, cursor = [], None
+    while True:
+        page = engine.page(session, **filters, limit=7, sort=sort, cursor=cursor)
+        seen.extend(row["item_id"] for row in page.rows)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(expected) > 50
+    assert seen == expected
+
+
+def test_page_cursor_is_tied_to_its_sort(session):
+    """Test cursors of another sort and tampered cursors are rejected."""
+    _seed(session, count=20)
+    engine = FlipEngine(PriceUpdates())
+    cursor = engine.page(session, min_roi=0.0, min_volume=0, limit=2, sort="roi").next_cursor
+
+    assert decode_cursor(cursor, "roi")
+    with pytest.raises(ValueError):
+        engine.page(session, limit=2, sort="margin", cursor=cursor)
+    for bad in ("not-a-cursor", encode_cursor("roi", ["x", 1]), encode_cursor("roi", [1.5])):
+        with pytest.raises(ValueError):
+            decode_cursor(bad, "roi")
+
+
+def test_opportunities_endpoint_paginates_with_cursor_header(client, session):
+    """Test the API returns X-Next-Cursor/Link headers until the last page."""
+    for item_id in range(1, 6):
+        session.add(Item(id=item_id, name=f"Item {item_id}", limit=100))
+        session.add(
+            PriceSnapshot(
+                item_id=item_id, high_price=1_000 + item_id * 100, low_price=1_000, high_volume=5
+            )
+        )
+    session.commit()
+    params = {"sort": "margin", "limit": 2}
+
+    first = client.get("/api/v1/flips/opportunities", params=params)
+    second = client.get(
+        "/api/v1/flips/opportunities",
+        params={**params, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    last = client.get(
+        "/api/v1/flips/opportunities",
+        params={**params, "cursor": second.headers["X-Next-Cursor"]},
+    )
+
+    assert 'rel="next"' in first.headers["Link"]
+    assert [row["item_id"] for row in first.json()] == [5, 4]
+    assert [row["item_id"] for row in second.json()] == [3, 2]
+    assert [row["item_id"] for row in last.json()] == [1]
+    assert "X-Next-Cursor" not in last.headers
+    bad = client.get("/api/v1/flips/opportunities", params={**params, "cursor": "garbage"})
+    assert bad.status_code == 400
+
+
+def test_opportunities_endpoint_answers_if_none_match_with_304(client, session):
+    """Test repeated polls are served from the cache and revalidate by ETag."""
+    metrics.reset()
+    session.add(Item(id=1, name="Item 1", limit=100))
+    session.add(PriceSnapshot(item_id=1, high_price=1_200, low_price=1_000, high_volume=5))
+    session.commit()
+
+    first = client.get("/api/v1/flips/opportunities")
+    etag = first.headers["ETag"]
+    repeat = client.get("/api/v1/flips/opportunities", headers={"If-None-Match": etag})
+    other = client.get("/api/v1/flips/opportunities", params={"sort": "roi"})
+
+    assert first.status_code == 200 and first.json()[0]["item_id"] == 1
+    assert repeat.status_code == 304 and repeat.headers["ETag"] == etag
+    assert repeat.content == b""
+    assert other.status_code == 200
+    assert metrics.counter("flips.opportunities.cache.hits") == 1
+    assert metrics.counter("flips.opportunities.cache.misses") == 2
+    assert metrics.counter("flips.opportunities.cache.not_modified") == 1
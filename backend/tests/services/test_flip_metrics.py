@@ -0,0 +1,169 @@
+"""Tests for the materialized flip_metrics table."""
+
+import random
+
+from sqlmodel import Session, select
+
+from backend.models import FlipMetric, Item, PriceSnapshot
+from backend.services.flip_metrics import ensure_flip_metrics, refresh_flip_metrics
+from backend.services.flipping import FlippingService, calculate_tax
+from backend.services.wiki.bulk import refresh_item_prices
+
+
+def _seed(session: Session, count: int = 200, seed: int = 11) -> None:
+    """Insert items with varied prices, volumes, limits and missing values."""
+    rng = random.Random(seed)
+    for item_id in range(1, count + 1):
+        low = rng.choice([None, 0, rng.randint(1, 60), rng.randint(100, 400_000_000)])
+        high = None if low is None else max(1, int(low * rng.uniform(0.9, 1.2)))
+        session.add(
+            Item(
+                id=item_id,
+                name=f"Item {item_id}",
+                members=rng.random() < 0.5,
+                limit=rng.choice([None, 8, 100, 10_000]),
+            )
+        )
+        if rng.random() < 0.9:
+            session.add(
+                PriceSnapshot(
+                    item_id=item_id,
+                    high_price=high,
+                    low_price=low,
+                    high_volume=rng.choice([None, rng.randint(0, 500)]),
+                    low_volume=rng.choice([None, rng.randint(0, 500)]),
+                    buy_volume_24h=rng.choice([None, rng.randint(0, 10_000)]),
+                    sell_volume_24h=rng.choice([None, rng.randint(0, 10_000)]),
+                )
+            )
+    session.commit()
+    refresh_item_prices(session)
+    session.commit()
+
+
+_FIELDS = (
+    "margin_post_tax",
+    "roi",
+    "total_volume_24h",
+    "margin_x_volume",
+    "flippable_quantity",
+    "potential_profit",
+)
+
+
+def _expected(session: Session) -> dict:
+    """Compute each priced item's metrics in Python."""
+    rows = session.exec(
+        select(Item, PriceSnapshot).join(
+            PriceSnapshot,
+            Item.id == PriceSnapshot.item_id,  # type: ignore[arg-type]
+            isouter=True,
+        )
+    ).all()
+    expected = {}
+    for item, snapshot in rows:
+        if not item.high_price or not item.low_price or item.high_price <= 0:
+            continue
+        snapshot = snapshot or PriceSnapshot(item_id=item.id)
+        margin = item.high_price - calculate_tax(item.high_price) - item.low_price
+        volume = (snapshot.high_volume or 0) + (snapshot.low_volume or 0)
+        buy_24h = next(
+            v for v in (snapshot.buy_volume_24h, snapshot.low_volume, 0) if v is not None
+        )
+        sell_24h = next(
+            v for v in (snapshot.sell_volume_24h, snapshot.high_volume, 0) if v is not None
+        )
+        quantity = min(item.limit or 0, volume)
+        expected[item.id] = {
+            "margin_post_tax": margin,
+            "roi": round(margin * 100 / item.high_price, 6),
+            "total_volume_24h": buy_24h + sell_24h,
+            "margin_x_volume": margin * (buy_24h + sell_24h),
+            "flippable_quantity": quantity,
+            "potential_profit": margin * quantity,
+        }
+    return expected
+
+
+def _metrics(session: Session) -> dict:
+    return {
+        metric.item_id: {
+            **{field: getattr(metric, field) for field in _FIELDS},
+            "roi": round(metric.roi, 6),
+        }
+        for metric in session.exec(select(FlipMetric)).all()
+    }
+
+
+def test_refresh_flip_metrics_matches_python_metrics(session: Session):
+    """Test that the rebuild computes calculate_tax margins and volume fallbacks."""
+    _seed(session)
+
+    refresh_flip_metrics(session)
+    session.commit()
+
+    expected = _expected(session)
+    assert len(expected) > 50
+    assert _metrics(session) == expected
+
+
+def test_refresh_flip_metrics_delta_updates_only_given_items(session: Session):
+    """Test that a delta refresh rewrites changed items and drops unpriced ones."""
+    _seed(session)
+    refresh_flip_metrics(session)
+    session.commit()
+    priced = sorted(_metrics(session))
+    repriced, unpriced, untouched = priced[:3]
+
+    for item_id, high, low in ((repriced, 2_000_000, 1_000_000), (unpriced, None, None)):
+        item = session.get(Item, item_id)
+        item.high_price, item.low_price = high, low
+        session.add(item)
+    session.get(Item, untouched).high_price = 10**9
+    session.commit()
+
+    refresh_flip_metrics(session, {repriced, unpriced})
+    session.commit()
+
+    rows = _metrics(session)
+    assert unpriced not in rows
+    assert rows[repriced]["margin_post_tax"] == 2_000_000 - 40_000 - 1_000_000
+    assert rows[untouched]["margin_post_tax"] != _expected(session)[untouched]["margin_post_tax"]
+
+
+def test_find_best_flips_ranks_from_flip_metrics(session: Session):
+    """Test that the scanner filters and orders by the materialized metrics."""
+    _seed(session, count=400)
+    refresh_flip_metrics(session)
+    session.commit()
+    expected = _expected(session)
+    members = {item.id: item.members for item in session.exec(select(Item)).all()}
+    budget, min_roi, min_volume = 100_000_000, 1.0, 500
+
+    results = FlippingService(session).find_best_flips(
+        budget, min_roi, min_volume, exclude_members=True
+    )
+
+    matching = [
+        (row["margin_x_volume"], row["potential_profit"])
+        for item_id, row in expected.items()
+        if session.get(Item, item_id).low_price <= budget
+        and row["roi"] >= min_roi
+        and row["total_volume_24h"] >= min_volume
+        and not members[item_id]
+    ]
+    assert 0 < len(results) <= 100
+    assert [
+        (expected[r.item_id]["margin_x_volume"], expected[r.item_id]["potential_profit"])
+        for r in results
+    ] == sorted(matching, reverse=True)[:100]
+
+
+def test_ensure_flip_metrics_builds_empty_table_once(session: Session):
+    """Test that an unpopulated table is built on first use only."""
+    assert ensure_flip_metrics(session) is False  # Nothing priced yet
+
+    _seed(session, count=20)
+    assert ensure_flip_metrics(session) is True
+    assert ensure_flip_metrics(session) is False
+    assert _metrics(session) == _expected(session)
@@ -0,0 +1,202 @@
+"""Tests for the server-sent-event stream of flip deltas."""
+
+import asyncio
+import json
+
+import pytest
+from sqlmodel import Session
+
+from backend.main import app
+from backend.models import Item, PriceSnapshot
+from backend.services.flip_engine import FlipEngine
+from backend.services.flip_stream import (
+    SUBSCRIBER_QUEUE_SIZE,
+    FlipStreamHub,
+    StreamFilter,
+    diff_rows,
+    flip_stream,
+)
+from backend.services.price_events import PriceUpdates
+from backend.tests.conftest import test_engine
+
+ALL = StreamFilter(min_roi=0.0, min_volume=0, limit=3)
+
+
+def _seed(session: Session) -> None:
+    """Four items whose margin x volume rank by id (4 first)."""
+    for item_id in range(1, 5):
+        session.add(Item(id=item_id, name=f"Item {item_id}", limit=100))
+        session.add(
+            PriceSnapshot(
+                item_id=item_id,
+                high_price=1_100,
+                low_price=1_000,
+                high_volume=5,
+                buy_volume_24h=item_id * 100,
+            )
+        )
+    session.commit()
+
+
+def _set_volume(session: Session, item_id: int, volume: int) -> None:
+    snapshot = session.get(PriceSnapshot, item_id)
+    snapshot.buy_volume_24h = volume
+    session.add(snapshot)
+    session.commit()
+
+
+def _parse(event: str) -> tuple:
+    fields = dict(line.split(": ", 1) for line in event.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def _hub(updates: PriceUpdates) -> FlipStreamHub:
+    return FlipStreamHub(FlipEngine(updates), updates, lambda: Session(test_engine))
+
+
+def test_diff_rows_reports_entered_changed_and_left():
+    """Test the delta between two selections."""
+    previous = {1: {"item_id": 1, "margin": 5}, 2: {"item_id": 2, "margin": 5}}
+    current = {2: {"item_id": 2, "margin": 6}, 3: {"item_id": 3, "margin": 1}}
+
+    assert diff_rows(previous, current) == {
+        "entered": [{"item_id": 3, "margin": 1}],
+        "changed": [{"item_id": 2, "margin": 6}],
+        "left": [1],
+    }
+    assert not any(diff_rows(current, current).values())
+
+
+@pytest.mark.asyncio
+async def test_price_sync_pushes_only_topn_changes(session):
+    """Test a publish sends entered/left items and nothing for unaffected filters."""
+    _seed(session)
+    updates = PriceUpdates()
+    hub = _hub(updates)
+    table = hub._engine.table(session)
+    watched = hub.subscribe(ALL, table)
+    untouched = hub.subscribe(StreamFilter(min_roi=0.0, min_volume=0, limit=1), table)
+    events = hub.events(watched, keepalive=5)
+
+    assert _parse(await anext(events)) == (
+        "snapshot",
+        {"generation": 0, "rows": [table.row(i) for i in (3, 2, 1)]},
+    )
+    _set_volume(session, 1, 250)  # Item 1 overtakes item 2 at the bottom of the top 3
+    updates.publish([1])
+    name, delta = _parse(await asyncio.wait_for(anext(events), 5))
+
+    assert name == "delta" and delta["generation"] == 1
+    assert [row["item_id"] for row in delta["entered"]] == [1]
+    assert delta["changed"] == [] and delta["left"] == [2]
+    assert untouched.queue.qsize() == 1  # Its snapshot only: item 4 still leads
+    await events.aclose()
+    hub.unsubscribe(untouched)
+    assert len(hub) == 0 and hub._task is None
+
+
+@pytest.mark.asyncio
+async def test_sync_during_request_rebuild_still_sends_delta(session):
+    """Test a publish while a request holds the rebuild lock is not skipped."""
+    _seed(session)
+    updates = PriceUpdates()
+    hub = _hub(updates)
+    watched = hub.subscribe(ALL, hub._engine.table(session))
+    events = hub.events(watched, keepalive=5)
+    await anext(events)  # Snapshot
+
+    _set_volume(session, 1, 250)
+    hub._engine._lock.acquire()  # A request is rebuilding the table
+    try:
+        updates.publish([1])
+        await asyncio.sleep(0.2)
+        assert watched.queue.empty()  # Waiting for the rebuild, not skipping the sync
+    finally:
+        hub._engine._lock.release()
+    name, delta = _parse(await asyncio.wait_for(anext(events), 5))
+
+    assert name == "delta" and delta["generation"] == 1
+    assert delta["left"] == [2]
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fan_out_selects_once_per_filter_set(session, monkeypatch):
+    """Test equal filters share one selection and one serialized event."""
+    _seed(session)
+    updates = PriceUpdates()
+    hub = _hub(updates)
+    first = hub.subscribe(ALL, hub._engine.table(session))
+    second = hub.subscribe(ALL, hub._engine.table(session))
+    for subscription in (first, second):
+        subscription.queue.get_nowait()
+    hub._task.cancel()  # Drive fan_out by hand
+
+    _set_volume(session, 4, 1)
+    updates.publish([4])
+    calls = []
+    top = StreamFilter.top
+    monkeypatch.setattr(StreamFilter, "top", lambda self, t: calls.append(self) or top(self, t))
+
+    assert hub.fan_out(hub._engine.table(session)) == 2
+    assert calls == [ALL]
+    assert first.queue.get_nowait() is second.queue.get_nowait()
+    hub.unsubscribe(first)
+    hub.unsubscribe(second)
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_disconnected(session):
+    """Test a full queue ends the stream instead of growing."""
+    _seed(session)
+    updates = PriceUpdates()
+    hub = _hub(updates)
+    table = hub._engine.table(session)
+    subscription = hub.subscribe(ALL, table)
+    for _ in range(SUBSCRIBER_QUEUE_SIZE - 1):
+        subscription.push("event")
+
+    assert subscription.push("one too many") is False
+    assert [event async for event in hub.events(subscription)] == []
+    assert len(hub) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_sends_snapshot_then_unsubscribes(session):
+    """Test GET /flips/stream answers with an event stream and cleans up on disconnect."""
+    _seed(session)
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if message["type"] == "http.response.body" and message.get("body"):
+            disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/flips/stream",
+        "raw_path": b"/api/v1/flips/stream",
+        "root_path": "",
+        "query_string": b"limit=2",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), 5)
+
+    start = messages[0]
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    name, snapshot = _parse(messages[1]["body"].decode())
+    assert name == "snapshot"
+    assert [row["item_id"] for row in snapshot["rows"]] == [4, 3]
+    assert len(flip_stream) == 0
@@ -405,3 +405,107 @@ class TestImportItemStats:
             assert updated_item.defence_crush == 0
             assert updated_item.defence_magic == 0
             assert updated_item.defence_ranged == 0
+
+
+def _chunked_client(document: bytes, chunk_size: int):
+    """Create an AsyncClient that serves a document in small chunks."""
+    import httpx
+
+    async def body():
+        for start in range(0, len(document), chunk_size):
+            yield document[start : start + chunk_size]
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+    )
+
+
+async def _collect(chunks):
+    from backend.services.item_stats import iter_json_object_items
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    return [pair async for pair in iter_json_object_items(source())]
+
+
+class TestIterJsonObjectItems:
+    """Test the incremental JSON object parser."""
+
+    @pytest.mark.asyncio
+    async def test_members_split_across_chunks(self):
+        """Test that keys, values and scalars split across chunks are reassembled."""
+        document = '{"1": {"a": [1, 2]}, "2": 12345, "3": "x"}'
+        for size in (1, 3, 7, len(document)):
+            chunks = [document[i : i + size] for i in range(0, len(document), size)]
+            assert await _collect(chunks) == [("1", {"a": [1, 2]}), ("2", 12345), ("3", "x")]
+
+    @pytest.mark.asyncio
+    async def test_empty_object(self):
+        """Test that an empty object yields nothing."""
+        assert await _collect([" { } "]) == []
+
+    @pytest.mark.asyncio
+    async def test_truncated_document_raises(self):
+        """Test that a truncated document raises ValueError."""
+        with pytest.raises(ValueError):
+            await _collect(['{"1": {"a": ', "1"])
+
+    @pytest.mark.asyncio
+    async def test_non_object_root_raises(self):
+        """Test that a non-object root raises ValueError."""
+        with pytest.raises(ValueError):
+            await _collect(["[1, 2]"])
+
+
+class TestStreamingImport:
+    """Test import_item_stats in streaming mode."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_import_matches_buffered_semantics(self, test_session):
+        """Test that streaming updates equipable items and skips the rest."""
+        import json
+
+        test_session.add(Item(id=4151, name="Abyssal whip", quest_req="Existing quest"))
+        test_session.add(Item(id=314, name="Feather"))
+        test_session.add(Item(id=1, name="Not in data"))
+        test_session.commit()
+
+        document = json.dumps(
+            {
+                "4151": {
+                    "equipable_by_player": True,
+                    "equipment": {"slot": "weapon", "attack_slash": 82},
+                    "requirements": {"attack": 70},
+                    "weapon": {"weapon_speed": 4, "weapon_type": "whip"},
+                },
+                "314": {"equipable_by_player": False},
+                "99999": {"equipable_by_player": True, "equipment": {"slot": "head"}},
+            }
+        ).encode()
+
+        async with _chunked_client(document, chunk_size=16) as client:
+            await import_item_stats(test_session, stream=True, client=client)
+
+        whip = test_session.get(Item, 4151)
+        assert whip.slot == "weapon"
+        assert whip.attack_slash == 82
+        assert whip.attack_req == 70
+        assert whip.quest_req == "Existing quest"
+        assert test_session.get(Item, 314).slot is None
+        assert test_session.get(Item, 99999) is None
+
+    @pytest.mark.asyncio
+    async def test_streaming_import_rolls_back_on_truncated_download(self, test_session):
+        """Test that a truncated download writes nothing."""
+        test_session.add(Item(id=4151, name="Abyssal whip"))
+        test_session.commit()
+
+        document = (
+            b'{"4151": {"equipable_by_player": true, "equipment": {"slot": "weapon"}}, "5": {'
+        )
+        async with _chunked_client(document, chunk_size=8) as client:
+            await import_item_stats(test_session, stream=True, client=client)
+
+        assert test_session.get(Item, 4151).slot is None
@@ -0,0 +1,44 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from backend.services.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    """Create an empty metrics registry."""
+    return MetricsRegistry()
+
+
+def test_counters_accumulate(registry):
+    """Test that counters start at zero and accumulate."""
+    assert registry.counter("syncs") == 0
+    registry.inc("syncs")
+    registry.inc("syncs", 2)
+    assert registry.counter("syncs") == 3
+
+
+def test_timings_aggregate(registry):
+    """Test that timings track count, last, average and max."""
+    registry.observe("fetch", 0.2)
+    registry.observe("fetch", 0.4)
+
+    stats = registry.timing("fetch")
+    assert stats.count == 2
+    assert stats.last == 0.4
+    assert stats.max == 0.4
+    assert registry.snapshot()["timings"]["fetch"]["avg"] == pytest.approx(0.3)
+
+
+def test_gauges_and_snapshot(registry):
+    """Test that gauges appear in the snapshot and reset clears everything."""
+    registry.set_gauge("breaker", "closed")
+    registry.inc("syncs")
+
+    snapshot = registry.snapshot()
+    assert snapshot["gauges"] == {"breaker": "closed"}
+    assert snapshot["counters"] == {"syncs": 1}
+
+    registry.reset()
+    assert registry.snapshot() == {"counters": {}, "gauges": {}, "timings": {}}
@@ -0,0 +1,182 @@
+"""Tests for the budget-constrained flip portfolio allocator."""
+
+import itertools
+import time
+
+import numpy as np
+import pytest
+from sqlmodel import Session
+
+from backend.models import Item, PriceSnapshot
+from backend.services.flipping import FlipTable, calculate_tax_array
+from backend.services.portfolio import allocate_portfolio, fill_quantities
+
+
+def _table(buy, sell, limit, volume_24h, members=None) -> FlipTable:
+    """Build a table from buy/sell prices, limits and 24h volumes (both sides)."""
+    buy, sell = np.array(buy, dtype=np.int64), np.array(sell, dtype=np.int64)
+    volume = np.array(volume_24h, dtype=np.int64)
+    tax = calculate_tax_array(sell)
+    margin = sell - tax - buy
+    count = len(buy)
+    return FlipTable(
+        generation=3,
+        built_at=0.0,
+        item_id=np.arange(1, count + 1, dtype=np.int64),
+        name=[f"Item {i}" for i in range(1, count + 1)],
+        icon_url=[None] * count,
+        buy_price=buy,
+        sell_price=sell,
+        tax=tax,
+        margin=margin,
+        roi=margin / buy * 100,
+        volume=volume,
+        high_volume=volume,
+        low_volume=volume,
+        buy_volume_24h=volume,
+        sell_volume_24h=volume,
+        has_buy_volume_24h=np.ones(count, dtype=bool),
+        has_sell_volume_24h=np.ones(count, dtype=bool),
+        margin_x_volume=margin * volume * 2,
+        potential_profit=margin * np.minimum(np.array(limit), volume),
+        limit=np.array(limit, dtype=np.int64),
+        members=np.zeros(count, dtype=bool) if members is None else np.array(members),
+        valid=(buy > 0) & (sell > 0),
+    )
+
+
+def _brute_force(table: FlipTable, caps: np.ndarray, budget: int) -> int:
+    """Best expected profit over every integer allocation."""
+    best = 0
+    for quantities in itertools.product(*(range(int(cap) + 1) for cap in caps)):
+        cost = sum(q * int(p) for q, p in zip(quantities, table.buy_price))
+        if cost <= budget:
+            best = max(best, sum(q * int(m) for q, m in zip(quantities, table.margin)))
+    return best
+
+
+def test_fill_quantities_use_one_buy_limit_window_of_volume():
+    """Test the expected fill is a fill_ratio share of 4h of the smaller 24h side."""
+    table = _table([100], [120], [1_000], [6_000])
+
+    assert fill_quantities(table, 0.1).tolist() == [100]  # 6000 / 6 * 0.1
+    assert fill_quantities(table, 1.0).tolist() == [1_000]
+
+
+def test_fill_quantities_fall_back_to_latest_volumes(session: Session):
+    """Test items without synced 24h volumes use their low/high volume like flip_metrics."""
+    session.add(Item(id=1, name="Item 1", limit=1_000))
+    session.add(
+        PriceSnapshot(item_id=1, high_price=120, low_price=100, high_volume=600, low_volume=1_200)
+    )
+    session.commit()
+    table = FlipTable.build(session)
+
+    assert fill_quantities(table, 1.0).tolist() == [100]  # min(1200, 600) / 6
+    assert allocate_portfolio(table, budget=100_000, fill_ratio=1.0).candidates == 1
+
+
+def test_allocation_respects_budget_limits_and_fills():
+    """Test quantities never exceed min(limit, fill) and cost stays within budget."""
+    # Item 1 is limit-capped, item 2 fill-capped, item 3 unprofitable
+    table = _table([100, 200, 50], [120, 260, 50], [5, 1_000, 100], [60_000, 600, 60_000])
+
+    portfolio = allocate_portfolio(table, budget=1_000_000)
+
+    assert [(a.item_id, a.quantity, a.max_quantity) for a in portfolio.allocations] == [
+        (2, 10, 10),
+        (1, 5, 5),
+    ]
+    assert portfolio.invested == 2_000 + 500
+    assert portfolio.uninvested == 1_000_000 - 2_500
+    assert portfolio.expected_profit == 10 * 55 + 5 * 18
+    assert portfolio.candidates == 2 and portfolio.generation == 3
+
+
+def test_repair_spends_leftover_budget_on_following_items():
+    """Test the budget left by an item that does not fit buys part of it and cheaper items."""
+    # ROI order: item 1 (~39%), item 2 (~17%), item 3 (~9%)
+    table = _table([1_000, 3_000, 100], [1_400, 3_600, 112], [3, 3, 50], [60_000] * 3)
+
+    portfolio = allocate_portfolio(table, budget=10_000, fill_ratio=1.0)
+
+    assert [(a.item_id, a.quantity) for a in portfolio.allocations] == [(1, 3), (2, 2), (3, 10)]
+    assert portfolio.invested == 10_000
+    assert portfolio.expected_profit <= portfolio.upper_bound
+
+
+def test_allocation_is_within_one_unit_of_the_optimum():
+    """Test random small cases against exhaustive search."""
+    rng = np.random.default_rng(5)
+    for _ in range(30):
+        buy = rng.integers(50, 2_000, 5)
+        sell = buy + rng.integers(-50, 400, 5)
+        table = _table(buy, sell, rng.integers(1, 5, 5), [60_000] * 5)
+        caps = np.minimum(table.limit, fill_quantities(table, 1.0))
+        budget = int(rng.integers(500, 8_000))
+
+        portfolio = allocate_portfolio(table, budget, fill_ratio=1.0)
+        optimum = _brute_force(table, np.where(table.margin > 0, caps, 0), budget)
+
+        assert portfolio.invested <= budget
+        assert portfolio.expected_profit <= optimum <= portfolio.upper_bound
+        assert optimum - portfolio.expected_profit <= max(int(table.margin.max()), 0)
+
+
+def test_filters_and_validation():
+    """Test members, ROI and volume filters and the argument checks."""
+    table = _table([100, 100], [150, 120], [10, 10], [60_000, 600], members=[True, False])
+
+    assert allocate_portfolio(table, 10_000, exclude_members=True).candidates == 1
+    assert allocate_portfolio(table, 10_000, min_roi=20).candidates == 1
+    assert allocate_portfolio(table, 10_000, min_volume=1_000).candidates == 1
+    assert allocate_portfolio(table, 99).allocations == []
+    with pytest.raises(ValueError):
+        allocate_portfolio(table, -1)
+    with pytest.raises(ValueError):
+        allocate_portfolio(table, 1_000, fill_ratio=0)
+
+
+def test_full_item_universe_allocates_within_50ms():
+    """Test a universe of 4,000 items allocates in under 50 ms."""
+    rng = np.random.default_rng(0)
+    count = 4_000
+    buy = rng.integers(1, 50_000_000, count)
+    sell = (buy * rng.uniform(0.95, 1.2, count)).astype(np.int64) + 1
+    table = _table(buy, sell, rng.integers(1, 20_000, count), rng.integers(0, 10**6, count))
+
+    allocate_portfolio(table, 1_000_000_000)  # Warm up
+    started = time.perf_counter()
+    portfolio = allocate_portfolio(table, 1_000_000_000)
+    elapsed = time.perf_counter() - started
+
+    assert portfolio.allocations and portfolio.invested <= 1_000_000_000
+    assert elapsed < 0.05
+
+
+def test_portfolio_endpoint(client, session: Session):
+    """Test POST /flips/portfolio allocates from the current prices."""
+    for item_id, (low, high) in enumerate(((1_000, 1_200), (5_000, 5_500), (900, 800)), 1):
+        session.add(Item(id=item_id, name=f"Item {item_id}", limit=50))
+        session.add(
+            PriceSnapshot(
+                item_id=item_id,
+                high_price=high,
+                low_price=low,
+                high_volume=100,
+                low_volume=100,
+                buy_volume_24h=6_000,
+                sell_volume_24h=6_000,
+            )
+        )
+    session.commit()
+
+    response = client.post("/api/v1/flips/portfolio", json={"budget": 100_000})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["item_id"] for a in data["allocations"]] == [1, 2]
+    assert data["allocations"][0]["quantity"] == 50
+    assert data["invested"] + data["uninvested"] == 100_000
+    assert data["expected_profit"] <= data["upper_bound"]
+    assert client.post("/api/v1/flips/portfolio", json={"budget": 0}).status_code == 422
@@ -0,0 +1,118 @@
+"""Tests for the memory-mapped columnar price archive."""
+
+import json
+
+import numpy as np
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import PriceBucket
+from backend.services.price_archive import MISSING, PriceArchive, export_price_archive
+from backend.services.wiki.bulk import append_price_history
+
+DAY0 = 1_760_659_200  # 2025-10-17 00:00 UTC
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _record(session, ts, *prices):
+    """Append (item_id, high, low) price rows at ts."""
+    rows = [{"item_id": i, "high_price": h, "low_price": low} for i, h, low in prices]
+    append_price_history(session, rows, ts=ts)
+    session.commit()
+
+
+@pytest.fixture
+def archive(test_session, tmp_path):
+    """Export two items over one hour of 5-minute slots."""
+    _record(test_session, DAY0 - 600, (1, 100, 90))
+    _record(test_session, DAY0 + 610, (1, 120, 95), (2, 50, 40))
+    _record(test_session, DAY0 + 700, (1, 125, 96))
+    _record(test_session, DAY0 + 1500, (2, 55, 45))
+    for item_id, ts, volume in ((1, DAY0 + 600, 7), (2, DAY0, 3), (3, DAY0, 1)):
+        test_session.add(
+            PriceBucket(item_id=item_id, interval=300, timestamp=ts, high_price_volume=volume)
+        )
+    test_session.commit()
+    info = export_price_archive(test_session, tmp_path / "archive", DAY0 + 30, DAY0 + 3600)
+    return info, PriceArchive(tmp_path / "archive")
+
+
+def test_export_builds_grid(archive):
+    """Test the grid shape, item index and time axis of an export."""
+    info, reader = archive
+    assert (info.start, info.n_items, info.n_times, info.rows) == (DAY0, 2, 12, 4)
+    assert reader.shape == (2, 12)
+    assert reader.item_ids.tolist() == [1, 2]
+    assert reader.ts[:3].tolist() == [DAY0, DAY0 + 300, DAY0 + 600]
+    assert json.loads((info.path / "meta.json").read_text())["step"] == 300
+
+
+def test_prices_are_carried_and_forward_filled(archive):
+    """Test carried-in prices, last-row-wins slots and forward fill."""
+    _, reader = archive
+    item = reader.item(1)
+    assert item["high"][:4].tolist() == [100, 100, 125, 125]
+    assert item["low"][-1] == 96
+
+    other = reader.item(2)
+    assert other["high"][:6].tolist() == [MISSING, MISSING, 50, 50, 50, 55]
+    assert other["low"][-1] == 45
+
+
+def test_volume_is_summed_per_slot(archive):
+    """Test /5m bucket volumes land in their slots and unknown items are ignored."""
+    _, reader = archive
+    assert reader.item(1)["volume"][2] == 7
+    assert reader.item(2)["volume"][0] == 3
+    assert int(reader.field("volume").sum()) == 10
+
+
+def test_reader_returns_zero_copy_views(archive):
+    """Test per-item and per-time accessors are views onto the mapped files."""
+    _, reader = archive
+    high = reader.field("high")
+    assert isinstance(high, np.memmap)
+    assert not high.flags.writeable
+
+    row = reader.item(1)["high"]
+    assert np.shares_memory(row, high)
+    window = reader.time_slice(DAY0 + 600, DAY0 + 1200)
+    assert window["high"].shape == (2, 2)
+    assert np.shares_memory(window["high"], high)
+    assert window["ts"].tolist() == [DAY0 + 600, DAY0 + 900]
+
+
+def test_item_time_range_and_unknown_item(archive):
+    """Test time ranges on one item and lookups of items not archived."""
+    _, reader = archive
+    assert reader.item(2, since=DAY0 + 1400, until=DAY0 + 1800)["high"].tolist() == [55]
+    assert reader.item(2, since=DAY0 + 10 * 3600)["high"].size == 0
+    with pytest.raises(KeyError):
+        reader.item(3)
+
+
+def test_export_without_history(test_session, tmp_path):
+    """Test an empty range still produces a readable archive."""
+    info = export_price_archive(test_session, tmp_path / "empty", DAY0, DAY0 + 600)
+    reader = PriceArchive(tmp_path / "empty")
+    assert info.n_items == 0
+    assert reader.time_slice()["high"].shape == (0, 2)
+
+
+def test_reader_rejects_incomplete_archive(tmp_path):
+    """Test an archive without metadata is not opened."""
+    (tmp_path / "partial").mkdir()
+    with pytest.raises(FileNotFoundError):
+        PriceArchive(tmp_path / "partial")
@@ -0,0 +1,93 @@
+"""Tests for price bucket queries."""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import PriceBucket
+from backend.services.price_buckets import (
+    item_buckets,
+    latest_bucket_timestamp,
+    recent_window_stats,
+)
+
+NOW = 1_700_003_600
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session with a few /5m and /1h buckets."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            [
+                PriceBucket(
+                    item_id=4151,
+                    interval=300,
+                    timestamp=NOW - 600,
+                    avg_high_price=100,
+                    high_price_volume=1,
+                    avg_low_price=90,
+                    low_price_volume=3,
+                ),
+                PriceBucket(
+                    item_id=4151,
+                    interval=300,
+                    timestamp=NOW - 300,
+                    avg_high_price=200,
+                    high_price_volume=3,
+                ),
+                # Outside a one-hour window
+                PriceBucket(
+                    item_id=4151,
+                    interval=300,
+                    timestamp=NOW - 7200,
+                    avg_high_price=1000,
+                    high_price_volume=50,
+                ),
+                PriceBucket(
+                    item_id=314,
+                    interval=3600,
+                    timestamp=NOW - 3600,
+                    avg_high_price=3,
+                    high_price_volume=500,
+                ),
+            ]
+        )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def test_recent_window_stats_weights_prices_by_volume(test_session):
+    """Test that window averages are volume-weighted and NULL prices are ignored."""
+    stats = recent_window_stats(test_session, 3600, now=NOW)
+
+    assert set(stats) == {4151}
+    whip = stats[4151]
+    assert whip.buckets == 2
+    assert whip.high_price_volume == 4
+    assert whip.avg_high_price == 175  # (100 * 1 + 200 * 3) / 4
+    assert whip.avg_low_price == 90
+    assert whip.volume == 7
+
+
+def test_recent_window_stats_filters_items_and_interval(test_session):
+    """Test that the item filter and the /1h series are honoured."""
+    assert recent_window_stats(test_session, 3600, item_ids=[314], now=NOW) == {}
+
+    hourly = recent_window_stats(test_session, 3600, interval="1h", now=NOW)
+    assert hourly[314].high_price_volume == 500
+    assert hourly[314].avg_low_price is None
+
+
+def test_item_buckets_and_latest_timestamp(test_session):
+    """Test per-item bucket listing and the newest stored bucket."""
+    buckets = item_buckets(test_session, 4151, since=NOW - 3600)
+
+    assert [bucket.timestamp for bucket in buckets] == [NOW - 600, NOW - 300]
+    assert latest_bucket_timestamp(test_session, "5m") == NOW - 300
+    assert latest_bucket_timestamp(test_session, "1h") == NOW - 3600
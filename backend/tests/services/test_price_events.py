@@ -0,0 +1,35 @@
+"""Tests for per-tick price change publication."""
+
+from backend.services.price_events import PriceUpdates
+
+
+def test_publish_increments_generation_and_notifies():
+    """Test that each publish bumps the generation and reaches subscribers."""
+    updates = PriceUpdates()
+    received = []
+    unsubscribe = updates.subscribe(received.append)
+
+    tick = updates.publish([4151, 314])
+    assert tick.generation == 1
+    assert tick.changed_ids == frozenset({4151, 314})
+    assert updates.latest is tick
+
+    unsubscribe()
+    updates.publish([1])
+    assert [t.generation for t in received] == [1]
+    assert updates.generation == 2
+
+
+def test_failing_listener_does_not_block_others():
+    """Test that an exception in one listener is isolated."""
+    updates = PriceUpdates()
+    received = []
+
+    def broken(tick):
+        raise RuntimeError("boom")
+
+    updates.subscribe(broken)
+    updates.subscribe(received.append)
+    updates.publish([1])
+
+    assert len(received) == 1
@@ -0,0 +1,95 @@
+"""Tests for the sharded append-only price history."""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.services.price_history import (
+    SHARD_SECONDS,
+    drop_expired_shards,
+    item_price_history,
+    list_shards,
+    shard_name,
+    shard_start,
+)
+from backend.services.wiki.bulk import append_price_history
+
+DAY = 1_760_659_200  # 2025-10-17 00:00 UTC
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _row(item_id, high, high_time=None):
+    return {"item_id": item_id, "high_price": high, "low_price": high - 1, "high_time": high_time}
+
+
+def test_shard_names_follow_the_utc_day():
+    """Test that every timestamp of a day maps to the same shard."""
+    assert shard_name(DAY) == "pricehistory_20251017"
+    assert shard_name(DAY + SHARD_SECONDS - 1) == "pricehistory_20251017"
+    assert shard_name(DAY + SHARD_SECONDS) == "pricehistory_20251018"
+    assert shard_start("pricehistory_20251017") == DAY
+
+
+def test_new_shard_starts_with_the_full_baseline(test_session):
+    """Test that the first write of a day stores every item, later writes only changes."""
+    baseline = [_row(1, 100), _row(2, 200)]
+
+    first = append_price_history(test_session, [_row(1, 100)], baseline=baseline, ts=DAY + 60)
+    second = append_price_history(
+        test_session, [_row(2, 210)], baseline=[_row(1, 100), _row(2, 210)], ts=DAY + 360
+    )
+    test_session.commit()
+
+    assert (first, second) == (2, 1)
+    assert [row["high_price"] for row in item_price_history(test_session, 2)] == [200, 210]
+    assert [row["ts"] for row in item_price_history(test_session, 1)] == [DAY + 60]
+
+
+def test_history_round_trips_trade_times_across_shards(test_session):
+    """Test that trade ages are converted back and shards are read in order."""
+    append_price_history(test_session, [_row(1, 100, high_time=DAY - 30)], ts=DAY - 10)
+    append_price_history(test_session, [_row(1, 120, high_time=DAY + 50)], ts=DAY + 60)
+    test_session.commit()
+
+    history = item_price_history(test_session, 1)
+
+    assert list_shards(test_session) == ["pricehistory_20251016", "pricehistory_20251017"]
+    assert [(row["high_price"], row["high_time"]) for row in history] == [
+        (100, DAY - 30),
+        (120, DAY + 50),
+    ]
+    assert history[0]["low_time"] is None
+    assert [row["ts"] for row in item_price_history(test_session, 1, since=DAY)] == [DAY + 60]
+
+
+def test_same_timestamp_is_not_written_twice(test_session):
+    """Test that re-appending a row at an existing ts keeps the first value."""
+    append_price_history(test_session, [_row(1, 100)], ts=DAY)
+    append_price_history(test_session, [_row(1, 999)], ts=DAY)
+    test_session.commit()
+
+    assert [row["high_price"] for row in item_price_history(test_session, 1)] == [100]
+
+
+def test_retention_drops_whole_expired_shards(test_session):
+    """Test that shards entirely past retention are dropped and newer ones kept."""
+    for day in range(3):
+        append_price_history(test_session, [_row(1, 100 + day)], ts=DAY + day * SHARD_SECONDS)
+    test_session.commit()
+
+    dropped = drop_expired_shards(test_session, retention_days=1, now=DAY + 2 * SHARD_SECONDS + 5)
+
+    assert dropped == ["pricehistory_20251017"]
+    assert list_shards(test_session) == ["pricehistory_20251018", "pricehistory_20251019"]
+    assert [row["high_price"] for row in item_price_history(test_session, 1)] == [101, 102]
@@ -0,0 +1,108 @@
+"""Tests for the incremental OHLC price rollups."""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlalchemy.pool import StaticPool
+
+from backend.models import PriceBucket, PriceRollup
+from backend.services.price_rollup import (
+    DAILY_WATERMARK,
+    DAY,
+    HOUR,
+    HOURLY_WATERMARK,
+    get_watermark,
+    item_rollups,
+    mid_price,
+    run_rollups,
+)
+from backend.services.wiki.bulk import append_price_history
+
+DAY0 = 1_760_659_200  # 2025-10-17 00:00 UTC
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _record(session, ts, *prices):
+    """Append (item_id, high, low) price rows at ts."""
+    rows = [{"item_id": i, "high_price": h, "low_price": low} for i, h, low in prices]
+    append_price_history(session, rows, ts=ts)
+    session.commit()
+
+
+def test_mid_price_uses_either_side():
+    """Test the mid price falls back to the only known side."""
+    assert mid_price(110, 90) == 100
+    assert mid_price(None, 90) == 90
+    assert mid_price(None, None) is None
+
+
+def test_hourly_bars_carry_open_and_fold_changes(test_session):
+    """Test OHLC, average and volume of hourly bars across two hours."""
+    _record(test_session, DAY0 + 60, (1, 110, 90))
+    _record(test_session, DAY0 + 1800, (1, 130, 110))
+    _record(test_session, DAY0 + HOUR + 600, (1, 90, 70))
+    test_session.add(PriceBucket(item_id=1, interval=300, timestamp=DAY0, high_price_volume=4))
+    test_session.add(PriceBucket(item_id=1, interval=300, timestamp=DAY0 + 300, low_price_volume=6))
+    test_session.add(PriceBucket(item_id=2, interval=HOUR, timestamp=DAY0, high_price_volume=9))
+    test_session.commit()
+
+    processed = run_rollups(test_session, now=DAY0 + 2 * HOUR + 5)
+
+    assert processed == {"1h": 2, "1d": 0}
+    first, second = item_rollups(test_session, 1)
+    assert (first.open, first.high, first.low, first.close) == (100, 120, 100, 120)
+    assert first.avg_price == 110
+    assert first.volume == 10
+    assert (second.open, second.low, second.close) == (120, 80, 80)
+    # Item 2 traded without any price on record
+    assert item_rollups(test_session, 2)[0].volume == 9
+    assert get_watermark(test_session, HOURLY_WATERMARK) == DAY0 + 2 * HOUR
+
+
+def test_rerun_processes_only_newly_closed_hours(test_session):
+    """Test that the watermark makes a second run resume instead of recomputing."""
+    _record(test_session, DAY0 + 60, (1, 110, 90))
+    run_rollups(test_session, now=DAY0 + HOUR + 5)
+
+    _record(test_session, DAY0 + HOUR + 60, (1, 210, 190))
+    assert run_rollups(test_session, now=DAY0 + HOUR + 600) == {"1h": 0, "1d": 0}
+    assert run_rollups(test_session, now=DAY0 + 2 * HOUR)["1h"] == 1
+
+    closes = [bar.close for bar in item_rollups(test_session, 1)]
+    assert closes == [100, 200]
+
+
+def test_daily_bars_fold_hourly_bars_once_the_day_closes(test_session):
+    """Test that a day is rolled up only after all of its hours are."""
+    _record(test_session, DAY0 + 60, (1, 110, 90))
+    _record(test_session, DAY0 + 5 * HOUR, (1, 310, 290))
+    _record(test_session, DAY0 + 20 * HOUR, (1, 60, 40))
+
+    run_rollups(test_session, now=DAY0 + 12 * HOUR)
+    assert get_watermark(test_session, DAILY_WATERMARK) is None
+
+    processed = run_rollups(test_session, now=DAY0 + DAY + 60)
+
+    assert processed == {"1h": 12, "1d": 1}
+    (day,) = item_rollups(test_session, 1, resolution="1d")
+    assert (day.open, day.high, day.low, day.close) == (100, 300, 50, 50)
+    assert day.samples == 3
+    assert day.avg_price == 150
+    daily = test_session.exec(select(PriceRollup).where(PriceRollup.resolution == DAY)).all()
+    assert len(daily) == 1
+
+
+def test_no_history_is_a_no_op(test_session):
+    """Test that rollups without any history leave no watermark."""
+    assert run_rollups(test_session, now=DAY0) == {"1h": 0, "1d": 0}
+    assert get_watermark(test_session, HOURLY_WATERMARK) is None
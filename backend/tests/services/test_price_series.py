@@ -0,0 +1,103 @@
+"""Tests for resolution selection and columnar price series."""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import PriceBucket, PriceRollup
+from backend.services.price_series import choose_resolution, price_series
+from backend.services.wiki.bulk import append_price_history
+
+DAY0 = 1_760_659_200  # 2025-10-17 00:00 UTC
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "span, points, expected",
+    [
+        (90 * 86400, 60, "1d"),
+        (7 * 86400, 100, "1h"),
+        (6 * 3600, 50, "raw"),
+        (3600, 500, "raw"),
+    ],
+)
+def test_choose_resolution_picks_the_coarsest_sufficient(span, points, expected):
+    """Test that the coarsest resolution with enough points is chosen."""
+    assert choose_resolution(span, points) == expected
+
+
+def test_raw_series_is_columnar_with_bucket_volume(test_session):
+    """Test that raw points come from the history with /5m bucket volumes."""
+    for offset, high in ((0, 100), (300, 110)):
+        rows = [{"item_id": 1, "high_price": high, "low_price": high - 5}]
+        append_price_history(test_session, rows, ts=DAY0 + offset)
+    test_session.add(PriceBucket(item_id=1, interval=300, timestamp=DAY0 + 300, low_price_volume=7))
+    test_session.commit()
+
+    series = price_series(test_session, 1, DAY0, DAY0 + 3600, points=10)
+
+    assert series.resolution == "raw"
+    assert series.ts == [DAY0, DAY0 + 300]
+    assert series.high == [100, 110]
+    assert series.low == [95, 105]
+    assert series.volume == [None, 7]
+
+
+def test_rollup_series_and_fallback_to_finer_resolution(test_session):
+    """Test hourly bars are used and an empty daily rollup falls back to them."""
+    for hour in range(3):
+        test_session.add(
+            PriceRollup(
+                item_id=1,
+                resolution=3600,
+                bucket_start=DAY0 + hour * 3600,
+                high=200 + hour,
+                low=100 + hour,
+                volume=hour,
+            )
+        )
+    test_session.commit()
+
+    hourly = price_series(test_session, 1, DAY0, DAY0 + 3 * 3600, points=3)
+    fallback = price_series(test_session, 1, DAY0, DAY0 + 5 * 86400, points=3)
+    forced = price_series(test_session, 1, DAY0, DAY0 + 5 * 86400, points=3, resolution="1d")
+
+    assert hourly.resolution == "1h"
+    assert hourly.high == [200, 201, 202]
+    assert hourly.volume == [0, 1, 2]
+    assert fallback.resolution == "1h"
+    assert len(fallback) == 3
+    assert forced.resolution == "1d"
+    assert len(forced) == 0
+
+
+def test_long_raw_fallback_is_binned_to_points(test_session):
+    """Test that a long range with empty rollups returns at most ``points`` bins."""
+    for sync in range(600):
+        rows = [{"item_id": 1, "high_price": 100 + sync, "low_price": 50 + sync}]
+        append_price_history(test_session, rows, ts=DAY0 + sync * 300)
+    test_session.add(PriceBucket(item_id=1, interval=300, timestamp=DAY0, low_price_volume=3))
+    test_session.add(PriceBucket(item_id=1, interval=300, timestamp=DAY0 + 300, low_price_volume=4))
+    test_session.commit()
+
+    series = price_series(test_session, 1, DAY0, DAY0 + 600 * 300, points=50)
+
+    assert series.resolution == "raw"
+    assert len(series) == 50
+    assert series.ts[0] == DAY0
+    assert series.ts[1] == DAY0 + 12 * 300
+    assert series.high[0] == 111
+    assert series.low[0] == 50
+    assert series.volume[:2] == [7, None]
+    assert series.high[-1] == 699
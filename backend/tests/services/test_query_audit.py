@@ -0,0 +1,77 @@
+"""Tests for the query-plan audit of hot service queries."""
+
+import pytest
+from sqlalchemy import text
+
+from backend.services.query_audit import (
+    HOT_QUERIES,
+    HotQuery,
+    audit_engine,
+    audit_hot_queries,
+    format_audit,
+    plan_findings,
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Create a scratch database seeded for the hot queries."""
+    engine = audit_engine()
+    yield engine
+    engine.dispose()
+
+
+def test_plan_findings_flags_scans_and_temp_sorts():
+    """Test full scans and temp B-trees are flagged but index access is not."""
+    plan = [
+        "SCAN i",
+        "SCAN TABLE trade",
+        "SCAN item USING INDEX ix_item_slot_defence_req",
+        "SEARCH ps USING INDEX ix_pricesnapshot_item_id (item_id=?)",
+        "SCAN CONSTANT ROW",
+        "SCAN (subquery-1)",
+        "USE TEMP B-TREE FOR ORDER BY",
+    ]
+    assert plan_findings(plan) == ["SCAN i", "SCAN trade", "USE TEMP B-TREE FOR ORDER BY"]
+
+
+def test_hot_queries_do_not_regress_to_scans(engine):
+    """Test no hot query scans a table or sorts in a temp B-tree unless accepted."""
+    results = audit_hot_queries(engine)
+
+    assert [audit.query.name for audit in results] == [query.name for query in HOT_QUERIES]
+    assert all(audit.statements for audit in results), "a hot query issued no SELECT"
+    failing = {audit.query.name: audit.unexpected for audit in results if audit.unexpected}
+    assert not failing, format_audit(results)
+
+
+def test_accepted_findings_have_reasons():
+    """Test every accepted finding is documented."""
+    assert all(query.reason for query in HOT_QUERIES if query.allowed)
+
+
+def test_dropped_index_is_reported():
+    """Test losing an index turns a search into an unexpected scan."""
+    engine = audit_engine()
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_item_slot_defence_req"))
+    query = next(query for query in HOT_QUERIES if query.name == "suggest_gear")
+
+    [audit] = audit_hot_queries(engine, [query])
+    engine.dispose()
+
+    assert audit.unexpected == ["SCAN item"]
+    assert "unexpected: SCAN item" in format_audit([audit])
+
+
+def test_plans_can_be_explained_on_another_engine(engine):
+    """Test statements captured on one database are explained on another."""
+    target = audit_engine()
+    with target.begin() as conn:
+        conn.execute(text("DROP INDEX ix_trade_user_id_created_at"))
+    query = HotQuery("trades", lambda s: s.execute(text("SELECT * FROM trade WHERE user_id = 'u'")))
+
+    [audit] = audit_hot_queries(engine, [query], explain_engine=target)
+    target.dispose()
+
+    assert audit.findings == ["SCAN trade"]
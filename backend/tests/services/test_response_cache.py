@@ -0,0 +1,75 @@
+"""Tests for the generation-keyed response cache."""
+
+from backend.services.metrics import metrics
+from backend.services.price_events import PriceUpdates
+from backend.services.response_cache import ResponseCache, etag_matches, make_etag
+
+
+def _builder(updates: PriceUpdates, calls: list):
+    def build():
+        calls.append(updates.generation)
+        return f"body-{len(calls)}".encode(), {"X-Page": "1"}, updates.generation
+
+    return build
+
+
+def test_entries_are_reused_until_the_generation_changes():
+    """Test hits within a generation and a rebuild after a publish."""
+    metrics.reset()
+    updates, calls = PriceUpdates(), []
+    cache = ResponseCache("test.cache", updates=updates)
+
+    first = cache.get_or_build(("a",), _builder(updates, calls))
+    assert cache.get_or_build(("a",), _builder(updates, calls)) is first
+    updates.publish([1])
+    second = cache.get_or_build(("a",), _builder(updates, calls))
+
+    assert calls == [0, 1]
+    assert second.body == b"body-2" and second.generation == 1
+    assert second.headers == {"X-Page": "1"}
+    assert first.etag == make_etag(b"body-1") != second.etag
+    assert metrics.counter("test.cache.hits") == 1
+    assert metrics.counter("test.cache.misses") == 2
+
+
+def test_response_built_from_stale_data_is_not_served_as_current():
+    """Test an entry is stored under the generation its data came from."""
+    updates = PriceUpdates()
+    updates.publish([1])
+    cache = ResponseCache("test.cache", updates=updates)
+    stale = cache.get_or_build("a", lambda: (b"old", {}, 0))
+
+    fresh = cache.get_or_build("a", lambda: (b"new", {}, 1))
+
+    assert stale.generation == 0
+    assert fresh.body == b"new"
+    assert cache.get_or_build("a", lambda: (b"unused", {}, 1)) is fresh
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test the cache stays bounded and keeps recently read entries."""
+    metrics.reset()
+    updates = PriceUpdates()
+    cache = ResponseCache("test.cache", max_entries=2, updates=updates)
+    for key in ("a", "b"):
+        cache.get_or_build(key, lambda key=key: (key.encode(), {}, 0))
+    cache.get_or_build("a", lambda: (b"unused", {}, 0))  # "b" is now the oldest
+
+    cache.get_or_build("c", lambda: (b"c", {}, 0))
+
+    assert len(cache) == 2
+    assert cache.get_or_build("a", lambda: (b"rebuilt", {}, 0)).body == b"a"
+    assert cache.get_or_build("b", lambda: (b"rebuilt", {}, 0)).body == b"rebuilt"
+    assert metrics.counter("test.cache.evictions") == 2
+    assert metrics.gauge("test.cache.entries") == 2
+
+
+def test_etag_matches_lists_wildcards_and_weak_tags():
+    """Test If-None-Match parsing."""
+    etag = make_etag(b"body")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
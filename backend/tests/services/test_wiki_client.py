@@ -45,13 +45,13 @@ class TestWikiAPIClientFetchMethods:
             {"id": 314, "name": "Feather", "members": False, "limit": 13000, "value": 2},
         ]
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_data
             mock_response.raise_for_status = MagicMock()
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await wiki_client.fetch_mapping()
 
@@ -64,7 +64,7 @@ class TestWikiAPIClientFetchMethods:
         """Test fetch_mapping handles 403 Forbidden error."""
         import httpx
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.status_code = 403
             mock_error = httpx.HTTPStatusError(
@@ -72,7 +72,7 @@ class TestWikiAPIClientFetchMethods:
             )
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(side_effect=mock_error)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             with pytest.raises(httpx.HTTPStatusError):
                 await wiki_client.fetch_mapping()
@@ -91,13 +91,13 @@ class TestWikiAPIClientFetchMethods:
             }
         }
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_data
             mock_response.raise_for_status = MagicMock()
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await wiki_client.fetch_latest_prices()
 
@@ -117,13 +117,13 @@ class TestWikiAPIClientFetchMethods:
             }
         }
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_data
             mock_response.raise_for_status = MagicMock()
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await wiki_client.fetch_24h_prices()
 
@@ -231,6 +231,42 @@ class TestWikiAPIClientSyncMethods:
             assert snapshot.high_volume == 5000  # From 24h data
             assert snapshot.low_volume == 4000  # From 24h data
 
+    @pytest.mark.asyncio
+    async def test_sync_prices_to_db_updates_item_denormalized_fields(
+        self, wiki_client, test_session
+    ):
+        """Test sync_prices_to_db keeps Item price columns in sync with snapshots."""
+        item = Item(id=4151, name="Abyssal whip", limit=70, value=2000000)
+        test_session.add(item)
+        test_session.commit()
+
+        mock_latest_prices = {
+            "data": {
+                "4151": {
+                    "high": 1500000,
+                    "low": 1400000,
+                    "highTime": 1700000000,
+                    "lowTime": 1700000001,
+                }
+            }
+        }
+
+        with (
+            patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as mock_latest,
+            patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as mock_24h,
+        ):
+            mock_latest.return_value = mock_latest_prices
+            mock_24h.return_value = {"data": {}}
+
+            await wiki_client.sync_prices_to_db(test_session)
+
+            updated_item = test_session.get(Item, 4151)
+            assert updated_item.high_price == 1500000
+            assert updated_item.low_price == 1400000
+            assert updated_item.high_time == 1700000000
+            assert updated_item.low_time == 1700000001
+            assert updated_item.buy_limit == 70
+
     @pytest.mark.asyncio
     async def test_sync_prices_to_db_updates_existing_snapshot(self, wiki_client, test_session):
         """Test sync_prices_to_db updates existing price snapshots."""
@@ -364,3 +400,160 @@ class TestWikiAPIClientSyncMethods:
             # Volume will be 0 since 24h data is empty and code doesn't use realtime volume
             assert snapshot.high_volume == 0
             assert snapshot.low_volume == 0
+
+    @pytest.mark.asyncio
+    async def test_sync_prices_to_db_applies_latest_when_24h_fails(self, wiki_client, test_session):
+        """Test that a /24h failure still applies /latest and keeps stored volumes."""
+        test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+        test_session.add(
+            PriceSnapshot(
+                item_id=4151, high_price=1000000, low_price=900000, high_volume=50, low_volume=40
+            )
+        )
+        test_session.commit()
+
+        mock_latest_prices = {"data": {"4151": {"high": 1500000, "low": 1400000}}}
+
+        with (
+            patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as mock_latest,
+            patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as mock_24h,
+        ):
+            mock_latest.return_value = mock_latest_prices
+            mock_24h.side_effect = TimeoutError("24h timed out")
+
+            await wiki_client.sync_prices_to_db(test_session)
+
+            snapshot = test_session.exec(
+                select(PriceSnapshot).where(PriceSnapshot.item_id == 4151)
+            ).first()
+            assert snapshot.high_price == 1500000
+            assert snapshot.high_volume == 50
+            assert snapshot.low_volume == 40
+
+    @pytest.mark.asyncio
+    async def test_sync_prices_to_db_raises_when_latest_fails(self, wiki_client, test_session):
+        """Test that a /latest failure aborts the sync."""
+        with (
+            patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as mock_latest,
+            patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as mock_24h,
+        ):
+            mock_latest.side_effect = RuntimeError("latest down")
+            mock_24h.return_value = {"data": {}}
+
+            with pytest.raises(RuntimeError, match="latest down"):
+                await wiki_client.sync_prices_to_db(test_session)
+
+    @pytest.mark.asyncio
+    async def test_sync_uses_prefetched_data(self, wiki_client, test_session):
+        """Test that cold start can pass one concurrent fetch to both sync methods."""
+        mock_mapping = [{"id": 4151, "name": "Abyssal whip", "limit": 70, "value": 2000000}]
+
+        with (
+            patch.object(wiki_client, "fetch_mapping", new_callable=AsyncMock) as mock_mapping_fn,
+            patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as mock_latest,
+            patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as mock_24h,
+        ):
+            mock_mapping_fn.return_value = mock_mapping
+            mock_latest.return_value = {"data": {"4151": {"high": 1500000, "low": 1400000}}}
+            mock_24h.return_value = {"data": {}}
+
+            fetched = await wiki_client.fetch_price_data(include_mapping=True)
+            await wiki_client.sync_items_to_db(test_session, mapping=fetched.require("mapping"))
+            await wiki_client.sync_prices_to_db(test_session, fetched=fetched)
+
+            assert mock_mapping_fn.await_count == 1
+            assert mock_latest.await_count == 1
+            assert test_session.get(Item, 4151).high_price == 1500000
+
+    @pytest.mark.asyncio
+    async def test_sync_prices_to_db_skips_when_all_unchanged(self, wiki_client, test_session):
+        """Test that the scheduled sync skips the write when /latest and /24h are unchanged."""
+        from backend.services.metrics import metrics
+        from backend.services.wiki.fetch import PayloadUnchanged
+
+        metrics.reset()
+        test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+        test_session.commit()
+
+        with (
+            patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as mock_latest,
+            patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as mock_24h,
+        ):
+            mock_latest.side_effect = PayloadUnchanged("latest", {"data": {"4151": {"high": 1}}})
+            mock_24h.side_effect = PayloadUnchanged("24h", {"data": {}})
+
+            await wiki_client.sync_prices_to_db(test_session)
+
+            mock_latest.assert_awaited_once_with(skip_unchanged=True)
+            assert test_session.exec(select(PriceSnapshot)).all() == []
+            assert metrics.counter("wiki.sync.skipped_unchanged") == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_prices_to_db_applies_cached_latest_when_24h_changed(
+        self, wiki_client, test_session
+    ):
+        """Test that an unchanged /latest is still applied from cache when /24h changed."""
+        from backend.services.wiki.fetch import PayloadUnchanged
+
+        test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+        test_session.commit()
+
+        with (
+            patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as mock_latest,
+            patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as mock_24h,
+        ):
+            mock_latest.side_effect = PayloadUnchanged(
+                "latest", {"data": {"4151": {"high": 1500000, "low": 1400000}}}
+            )
+            mock_24h.return_value = {"data": {"4151": {"highPriceVolume": 7}}}
+
+            await wiki_client.sync_prices_to_db(test_session)
+
+            snapshot = test_session.exec(select(PriceSnapshot)).first()
+            assert snapshot.high_price == 1500000
+            assert snapshot.high_volume == 7
+
+    @pytest.mark.asyncio
+    async def test_sync_prices_to_db_writes_only_changed_items(self, wiki_client, test_session):
+        """Test that a second tick only writes and publishes items whose values changed."""
+        from backend.services.price_events import price_updates
+
+        test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+        test_session.add(Item(id=314, name="Feather", limit=13000, value=2))
+        test_session.commit()
+
+        ticks = []
+        unsubscribe = price_updates.subscribe(ticks.append)
+        try:
+            for whip_time in (100, 200):
+                latest = {
+                    "data": {
+                        "4151": {"high": 1500000 + whip_time, "low": 1, "highTime": whip_time},
+                        "314": {"high": 5, "low": 4, "highTime": 100},
+                    }
+                }
+                with (
+                    patch.object(wiki_client, "fetch_latest_prices", new_callable=AsyncMock) as m,
+                    patch.object(wiki_client, "fetch_24h_prices", new_callable=AsyncMock) as m24,
+                ):
+                    m.return_value = latest
+                    m24.return_value = {"data": {}}
+                    await wiki_client.sync_prices_to_db(test_session)
+        finally:
+            unsubscribe()
+
+        assert [tick.changed_ids for tick in ticks] == [frozenset({4151, 314}), frozenset({4151})]
+        assert test_session.get(Item, 4151).high_price == 1500200
+        assert test_session.get(Item, 314).high_price == 5
+
+    @pytest.mark.asyncio
+    async def test_sync_items_to_db_keeps_denormalized_prices(self, wiki_client, test_session):
+        """Test that re-syncing the mapping does not clear prices on existing items."""
+        test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+        test_session.add(PriceSnapshot(item_id=4151, high_price=1500000, low_price=1400000))
+        test_session.commit()
+
+        mapping = [{"id": 4151, "name": "Abyssal whip", "limit": 70, "value": 2000000}]
+        await wiki_client.sync_items_to_db(test_session, mapping=mapping)
+
+        assert test_session.get(Item, 4151).high_price == 1500000
@@ -0,0 +1,121 @@
+"""Tests for bulk price write helpers."""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlalchemy.pool import StaticPool
+
+from backend.models import Item, PriceSnapshot
+from backend.services.wiki.bulk import (
+    refresh_item_prices,
+    update_snapshot_volumes,
+    upsert_price_snapshots,
+)
+
+
+@pytest.fixture
+def test_engine():
+    """Create a test database engine."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def test_session(test_engine):
+    """Create a test database session."""
+    with Session(test_engine) as session:
+        yield session
+
+
+def _row(item_id: int, high: int, low: int) -> dict:
+    return {
+        "item_id": item_id,
+        "high_price": high,
+        "low_price": low,
+        "high_volume": 10,
+        "low_volume": 20,
+        "high_time": 1700000000,
+        "low_time": 1700000001,
+    }
+
+
+def test_upsert_inserts_then_updates_in_place(test_session):
+    """Test that a second upsert overwrites the existing row instead of adding one."""
+    upsert_price_snapshots(test_session, [_row(4151, 100, 90), _row(314, 3, 2)])
+    test_session.commit()
+
+    upsert_price_snapshots(test_session, [_row(4151, 150, 140)])
+    test_session.commit()
+
+    snapshots = test_session.exec(select(PriceSnapshot).order_by(PriceSnapshot.item_id)).all()
+    assert [(s.item_id, s.high_price, s.low_price) for s in snapshots] == [
+        (314, 3, 2),
+        (4151, 150, 140),
+    ]
+    assert all(s.created_at is not None for s in snapshots)
+
+
+def test_upsert_chunks_large_batches(test_session):
+    """Test that rows spanning several chunks are all written."""
+    rows = [_row(item_id, item_id + 10, item_id) for item_id in range(1, 1201)]
+
+    assert upsert_price_snapshots(test_session, rows, chunk_size=500) == 1200
+    test_session.commit()
+
+    assert len(test_session.exec(select(PriceSnapshot.item_id)).all()) == 1200
+
+
+def test_pricesnapshot_item_id_is_unique(test_session):
+    """Test that the schema rejects a second snapshot for the same item."""
+    test_session.add(PriceSnapshot(item_id=4151, high_price=1))
+    test_session.add(PriceSnapshot(item_id=4151, high_price=2))
+    with pytest.raises(IntegrityError):
+        test_session.commit()
+
+
+def test_refresh_item_prices_copies_snapshot_columns(test_session):
+    """Test that the joined UPDATE copies prices and buy_limit onto Item."""
+    test_session.add(Item(id=4151, name="Abyssal whip", limit=70))
+    test_session.add(Item(id=314, name="Feather", limit=13000, high_price=5))
+    test_session.commit()
+
+    upsert_price_snapshots(test_session, [_row(4151, 1500000, 1400000)])
+    refresh_item_prices(test_session)
+    test_session.commit()
+
+    whip = test_session.get(Item, 4151)
+    assert whip.high_price == 1500000
+    assert whip.low_price == 1400000
+    assert whip.high_time == 1700000000
+    assert whip.low_time == 1700000001
+    assert whip.buy_limit == 70
+
+    # Items without a snapshot are untouched
+    feather = test_session.get(Item, 314)
+    assert feather.high_price == 5
+    assert feather.buy_limit is None
+
+
+def test_update_snapshot_volumes(test_session):
+    """Test that 24h volumes are written onto existing snapshots only."""
+    upsert_price_snapshots(test_session, [_row(4151, 100, 90)])
+    test_session.commit()
+
+    update_snapshot_volumes(
+        test_session,
+        [
+            {"item_id": 4151, "buy_volume_24h": 500, "sell_volume_24h": 400},
+            {"item_id": 999, "buy_volume_24h": 1, "sell_volume_24h": 1},
+        ],
+    )
+    test_session.commit()
+
+    snapshots = test_session.exec(select(PriceSnapshot)).all()
+    assert len(snapshots) == 1
+    assert snapshots[0].buy_volume_24h == 500
+    assert snapshots[0].sell_volume_24h == 400
@@ -29,13 +29,13 @@ class TestWikiAPIClient:
             {"id": 314, "name": "Feather", "members": False, "limit": 13000, "value": 2},
         ]
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_data
             mock_response.raise_for_status = MagicMock()
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await wiki_client.fetch_mapping()
 
@@ -51,7 +51,7 @@ class TestWikiAPIClient:
         """Test fetch_mapping handles 403 Forbidden error."""
         import httpx
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.status_code = 403
             mock_error = httpx.HTTPStatusError(
@@ -59,7 +59,7 @@ class TestWikiAPIClient:
             )
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(side_effect=mock_error)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             with pytest.raises(httpx.HTTPStatusError):
                 await wiki_client.fetch_mapping()
@@ -67,10 +67,10 @@ class TestWikiAPIClient:
     @pytest.mark.asyncio
     async def test_fetch_mapping_generic_error(self, wiki_client):
         """Test fetch_mapping handles generic errors."""
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(side_effect=Exception("Network error"))
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             with pytest.raises(Exception, match="Network error"):
                 await wiki_client.fetch_mapping()
@@ -89,13 +89,13 @@ class TestWikiAPIClient:
             }
         }
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.json.return_value = mock_data
             mock_response.raise_for_status = MagicMock()
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await wiki_client.fetch_latest_prices()
 
@@ -110,7 +110,7 @@ class TestWikiAPIClient:
         """Test fetch_latest_prices handles HTTP errors."""
         import httpx
 
-        with patch("httpx.AsyncClient") as mock_client_class:
+        with patch("backend.services.wiki.client.get_http_client") as mock_get_client:
             mock_response = MagicMock()
             mock_response.status_code = 500
             mock_error = httpx.HTTPStatusError(
@@ -118,7 +118,118 @@ class TestWikiAPIClient:
             )
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(side_effect=mock_error)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             with pytest.raises(httpx.HTTPStatusError):
                 await wiki_client.fetch_latest_prices()
+
+
+def _response(body: bytes, status_code: int = 200, headers=None):
+    """Build a real httpx.Response for conditional fetch tests."""
+    import httpx
+
+    return httpx.Response(
+        status_code,
+        content=body,
+        headers=headers or {},
+        request=httpx.Request("GET", "https://prices.runescape.wiki/api/v1/osrs/latest"),
+    )
+
+
+class TestConditionalFetch:
+    """Test ETag/Last-Modified validators and payload fingerprinting."""
+
+    @pytest.mark.asyncio
+    async def test_sends_validators_and_raises_on_304(self, wiki_client):
+        """Test that a 304 raises PayloadUnchanged carrying the previous payload."""
+        from backend.services.wiki.fetch import PayloadUnchanged
+
+        first = _response(
+            b'{"data": {"4151": {"high": 1}}}',
+            headers={"ETag": '"abc"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"},
+        )
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[first, _response(b"", status_code=304)])
+
+        with patch("backend.services.wiki.client.get_http_client", return_value=mock_client):
+            data = await wiki_client.fetch_latest_prices(skip_unchanged=True)
+            with pytest.raises(PayloadUnchanged) as exc_info:
+                await wiki_client.fetch_latest_prices(skip_unchanged=True)
+
+        assert exc_info.value.payload == data
+        headers = mock_client.get.call_args_list[1][1]["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Sat, 17 Oct 2026 10:00:00 GMT"
+        assert "If-None-Match" not in mock_client.get.call_args_list[0][1]["headers"]
+
+    @pytest.mark.asyncio
+    async def test_identical_body_skips_decoding(self, wiki_client):
+        """Test that a byte-identical body raises PayloadUnchanged without decoding."""
+        from backend.services.wiki.fetch import PayloadUnchanged
+
+        body = b'{"data": {"4151": {"high": 1}}}'
+        second = MagicMock(status_code=200, content=body)
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[_response(body), second])
+
+        with patch("backend.services.wiki.client.get_http_client", return_value=mock_client):
+            await wiki_client.fetch_latest_prices(skip_unchanged=True)
+            with pytest.raises(PayloadUnchanged):
+                await wiki_client.fetch_latest_prices(skip_unchanged=True)
+
+        second.json.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changed_body_and_invalidate_refetch(self, wiki_client):
+        """Test that changed or invalidated payloads are decoded again."""
+        body = b'{"data": {"4151": {"high": 1}}}'
+        changed = b'{"data": {"4151": {"high": 2}}}'
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(
+            side_effect=[_response(body), _response(changed), _response(changed)]
+        )
+
+        with patch("backend.services.wiki.client.get_http_client", return_value=mock_client):
+            await wiki_client.fetch_latest_prices(skip_unchanged=True)
+            second = await wiki_client.fetch_latest_prices(skip_unchanged=True)
+            wiki_client.invalidate("latest")
+            third = await wiki_client.fetch_latest_prices(skip_unchanged=True)
+
+        assert second["data"]["4151"]["high"] == 2
+        assert third == second
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_flags_unchanged_endpoints(self, wiki_client):
+        """Test that fetch_many records unchanged endpoints with their previous payload."""
+        body = b'{"data": {}}'
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=[_response(body), _response(body)])
+
+        with patch("backend.services.wiki.client.get_http_client", return_value=mock_client):
+            first = await wiki_client.fetch_many(["latest"], skip_unchanged=True)
+            second = await wiki_client.fetch_many(["latest"], skip_unchanged=True)
+
+        assert not first.unchanged("latest")
+        assert second.unchanged("latest")
+        assert second.all_unchanged
+        assert second.require("latest") == {"data": {}}
+
+    @pytest.mark.asyncio
+    async def test_fetch_bucket_sends_timestamp_unconditionally(self, wiki_client):
+        """Test that a timestamped /5m fetch passes the parameter and no validators."""
+        body = b'{"data": {}, "timestamp": 1700000100}'
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(
+            side_effect=[_response(body, headers={"ETag": '"abc"'}), _response(body)]
+        )
+
+        with patch("backend.services.wiki.client.get_http_client", return_value=mock_client):
+            await wiki_client.fetch_5m_prices(skip_unchanged=True)
+            data = await wiki_client.fetch_5m_prices(timestamp=1700000100, skip_unchanged=True)
+
+        assert data["timestamp"] == 1700000100
+        first, second = mock_client.get.call_args_list
+        assert "5m" in first[0][0]
+        assert first[1]["params"] is None
+        assert second[1]["params"] == {"timestamp": 1700000100}
+        assert "If-None-Match" not in second[1]["headers"]
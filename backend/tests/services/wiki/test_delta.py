@@ -0,0 +1,71 @@
+"""Tests for price change detection."""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.models import PriceSnapshot
+from backend.services.wiki.delta import PriceDeltaTracker
+
+
+@pytest.fixture
+def test_engine():
+    """Create a test database engine."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def test_session(test_engine):
+    """Create a test database session."""
+    with Session(test_engine) as session:
+        yield session
+
+
+def _row(item_id: int, high: int, high_time: int = 100) -> dict:
+    return {"item_id": item_id, "high_price": high, "low_price": 1, "high_time": high_time}
+
+
+def test_diff_reports_new_and_changed_rows_only(test_session):
+    """Test that only new items or items with a changed column are returned."""
+    tracker = PriceDeltaTracker()
+    first = [_row(1, 10), _row(2, 20)]
+    assert tracker.diff(test_session, first) == first
+    tracker.commit(first)
+
+    changed = tracker.diff(test_session, [_row(1, 10), _row(2, 20, high_time=200), _row(3, 30)])
+    assert [row["item_id"] for row in changed] == [2, 3]
+
+
+def test_diff_does_not_record_until_commit(test_session):
+    """Test that an uncommitted diff is reported again on the next tick."""
+    tracker = PriceDeltaTracker()
+    tracker.diff(test_session, [_row(1, 10)])
+    assert len(tracker.diff(test_session, [_row(1, 10)])) == 1
+
+
+def test_diff_ignores_columns_missing_from_row(test_session):
+    """Test that rows without volume columns are compared on the columns they carry."""
+    tracker = PriceDeltaTracker()
+    tracker.commit([{**_row(1, 10), "high_volume": 5}])
+    tracker._primed = True
+
+    assert tracker.diff(test_session, [_row(1, 10)]) == []
+
+
+def test_prime_loads_existing_snapshots(test_session):
+    """Test that a fresh tracker diffs against rows already in the database."""
+    test_session.add(PriceSnapshot(item_id=1, high_price=10, low_price=1, high_time=100))
+    test_session.commit()
+
+    tracker = PriceDeltaTracker()
+    assert tracker.diff(test_session, [_row(1, 10)]) == []
+    assert len(tracker) == 1
+
+    tracker.reset()
+    assert len(tracker) == 0
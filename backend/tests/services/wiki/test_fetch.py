@@ -0,0 +1,83 @@
+"""Tests for the concurrent wiki fetch stage."""
+
+import asyncio
+
+import pytest
+
+from backend.services.metrics import metrics
+from backend.services.wiki.fetch import run_fetch_stage
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start each test with empty metrics."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _delayed(value, seconds):
+    async def fetch():
+        await asyncio.sleep(seconds)
+        return value
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_fetches_run_concurrently():
+    """Test that stage wall time is close to the slowest fetch, not the sum."""
+    stage = await run_fetch_stage(
+        {"latest": _delayed({"data": 1}, 0.1), "24h": _delayed({"data": 2}, 0.1)},
+        {"latest": 1.0, "24h": 1.0},
+    )
+
+    assert stage.get("latest") == {"data": 1}
+    assert stage.get("24h") == {"data": 2}
+    assert stage.wall_time < 0.19
+    assert stage.sequential_time >= 0.2
+    assert stage.saved_time > 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_only_fails_slow_endpoint():
+    """Test that a timed-out endpoint does not prevent others from succeeding."""
+    stage = await run_fetch_stage(
+        {"latest": _delayed({"data": 1}, 0.01), "24h": _delayed({"data": 2}, 1.0)},
+        {"latest": 1.0, "24h": 0.05},
+    )
+
+    assert stage.ok("latest")
+    assert not stage.ok("24h")
+    assert stage.get("24h", {}) == {}
+    with pytest.raises(asyncio.TimeoutError):
+        stage.require("24h")
+    assert metrics.counter("wiki.fetch.24h.timeouts") == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_recorded_per_endpoint():
+    """Test that fetch errors are captured and re-raised by require()."""
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    stage = await run_fetch_stage(
+        {"mapping": failing, "latest": _delayed({"data": 1}, 0)},
+        {"mapping": 1.0, "latest": 1.0},
+    )
+
+    assert stage.require("latest") == {"data": 1}
+    with pytest.raises(RuntimeError, match="boom"):
+        stage.require("mapping")
+    assert metrics.counter("wiki.fetch.mapping.errors") == 1
+
+
+@pytest.mark.asyncio
+async def test_stage_records_timing_metrics():
+    """Test that per-endpoint and stage timings are exposed as metrics."""
+    await run_fetch_stage({"latest": _delayed({}, 0)}, {"latest": 1.0})
+
+    assert metrics.timing("wiki.fetch.latest.seconds").count == 1
+    assert metrics.timing("wiki.fetch.stage.seconds").count == 1
+    assert metrics.timing("wiki.fetch.stage.saved_seconds").count == 1
@@ -0,0 +1,98 @@
+"""Tests for the shared wiki HTTP client."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from backend.services.wiki import http as wiki_http
+from backend.services.wiki.client import WikiAPIClient, endpoint_timeout
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_client():
+    """Ensure each test starts and ends without a shared client."""
+    wiki_http._client = None
+    yield
+    wiki_http._client = None
+
+
+def test_create_http_client_applies_limits_from_settings():
+    """Test that connection limits come from settings."""
+    with (
+        patch.object(wiki_http.settings, "wiki_http_max_connections", 7),
+        patch.object(wiki_http.settings, "wiki_http_max_keepalive_connections", 3),
+        patch.object(wiki_http.httpx, "AsyncClient") as mock_client_class,
+    ):
+        wiki_http.create_http_client()
+
+    limits = mock_client_class.call_args.kwargs["limits"]
+    assert limits.max_connections == 7
+    assert limits.max_keepalive_connections == 3
+
+
+def test_create_http_client_disables_http2_without_h2():
+    """Test that HTTP/2 is only requested when the h2 package is installed."""
+    with (
+        patch.object(wiki_http, "http2_available", return_value=False),
+        patch.object(wiki_http.httpx, "AsyncClient") as mock_client_class,
+    ):
+        wiki_http.create_http_client()
+
+    assert mock_client_class.call_args.kwargs["http2"] is False
+
+
+def test_get_http_client_returns_same_instance():
+    """Test that repeated calls share one client."""
+    assert wiki_http.get_http_client() is wiki_http.get_http_client()
+
+
+@pytest.mark.asyncio
+async def test_close_http_client_resets_shared_client():
+    """Test that closing the client lets the next call create a fresh one."""
+    first = await wiki_http.open_http_client()
+    await wiki_http.close_http_client()
+
+    assert first.is_closed
+    second = wiki_http.get_http_client()
+    assert second is not first
+    await wiki_http.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_wiki_calls_reuse_shared_client():
+    """Test that every fetch goes through the one shared client."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"data": {}}
+    shared = MagicMock(spec=httpx.AsyncClient)
+    shared.get = AsyncMock(return_value=mock_response)
+    wiki_http._client = shared
+    shared.is_closed = False
+
+    client = WikiAPIClient()
+    await client.fetch_latest_prices()
+    await client.fetch_24h_prices()
+
+    assert shared.get.await_count == 2
+    timeouts = [call.kwargs["timeout"] for call in shared.get.await_args_list]
+    assert timeouts == [endpoint_timeout("latest"), endpoint_timeout("24h")]
+
+
+@pytest.mark.asyncio
+async def test_injected_client_takes_precedence():
+    """Test that an explicitly injected client is used instead of the shared one."""
+    mock_response = MagicMock()
+    mock_response.json.return_value = []
+    injected = MagicMock(spec=httpx.AsyncClient)
+    injected.get = AsyncMock(return_value=mock_response)
+
+    await WikiAPIClient(http_client=injected).fetch_mapping()
+
+    injected.get.assert_awaited_once()
+    assert wiki_http._client is None
+
+
+def test_endpoint_timeout_falls_back_to_default():
+    """Test that unknown endpoints use the default timeout."""
+    assert endpoint_timeout("mapping") == wiki_http.settings.wiki_timeout_mapping
+    assert endpoint_timeout("unknown") == wiki_http.settings.wiki_timeout_default
@@ -0,0 +1,246 @@
+"""Tests for the staged Wiki ingestion pipeline."""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlalchemy.pool import StaticPool
+
+from backend.models import FlipMetric, Item, PriceBucket, PriceSnapshot
+from backend.services.metrics import metrics
+from backend.services.price_history import item_price_history
+from backend.services.wiki.client import WikiAPIClient
+from backend.services.wiki.fetch import PayloadUnchanged
+from backend.services.wiki.pipeline import (
+    PIPELINE_STAGES,
+    IngestionPipeline,
+    decode_item_data,
+    normalize_bucket_rows,
+    normalize_price_rows,
+)
+
+MAPPING = [{"id": 4151, "name": "Abyssal whip", "members": True, "limit": 70, "value": 2000000}]
+
+
+@pytest.fixture
+def test_session():
+    """Create an in-memory database session."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def wiki_client():
+    """Create a mock WikiAPIClient serving one item."""
+    client = MagicMock(spec=WikiAPIClient)
+    client.fetch_mapping = AsyncMock(return_value=MAPPING)
+    client.fetch_latest_prices = AsyncMock(
+        return_value={"data": {"4151": {"high": 1500000, "low": 1400000, "highTime": 1}}}
+    )
+    client.fetch_24h_prices = AsyncMock(
+        return_value={"data": {"4151": {"highPriceVolume": 300, "lowPriceVolume": 200}}}
+    )
+    return client
+
+
+def test_decode_item_data_keys_by_int_and_drops_invalid_entries():
+    """Test that decode keeps numeric ids with object values only."""
+    payload = {"data": {"4151": {"high": 1}, "abc": {"high": 2}, "314": None}}
+
+    assert decode_item_data(payload, "latest") == {4151: {"high": 1}}
+    assert decode_item_data([], "latest") == {}
+
+
+def test_normalize_price_rows_maps_24h_volumes():
+    """Test that /24h price volumes fill high/low and buy/sell columns consistently."""
+    latest = {4151: {"high": 10, "low": 9}, 314: {"high": 3, "low": 2}}
+    daily = {4151: {"highPriceVolume": 30, "lowPriceVolume": 20}}
+
+    rows = {row["item_id"]: row for row in normalize_price_rows(latest, daily)}
+
+    assert rows[4151]["high_volume"] == rows[4151]["sell_volume_24h"] == 30
+    assert rows[4151]["low_volume"] == rows[4151]["buy_volume_24h"] == 20
+    assert rows[314]["high_volume"] == 0
+
+
+def test_normalize_price_rows_without_24h_omits_volumes():
+    """Test that rows carry no volume columns when /24h is unavailable."""
+    rows = normalize_price_rows({4151: {"high": 10}}, None)
+
+    assert not any("volume" in column for column in rows[0])
+
+
+@pytest.mark.asyncio
+async def test_run_syncs_items_and_prices_from_one_fetch(test_session, wiki_client):
+    """Test that a cold-start run writes items, snapshots and Item prices."""
+    metrics.reset()
+    pipeline = IngestionPipeline(wiki_client)
+
+    run = await pipeline.run(test_session, include_mapping=True)
+
+    wiki_client.fetch_mapping.assert_awaited_once_with(skip_unchanged=True)
+    item = test_session.get(Item, 4151)
+    assert item.name == "Abyssal whip"
+    assert item.high_price == 1500000
+    snapshot = test_session.exec(select(PriceSnapshot)).one()
+    assert snapshot.buy_volume_24h == 200
+    assert run.changed_ids == {4151}
+    assert tuple(run.stages) == PIPELINE_STAGES
+    assert run.stages["normalize"].batch_size == 1
+    assert metrics.snapshot()["gauges"]["wiki.pipeline.prices.write.batch_size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_second_tick_writes_nothing_when_values_match(test_session, wiki_client):
+    """Test that an identical second tick stops after the diff stage."""
+    test_session.add(Item(id=4151, name="Abyssal whip", limit=70))
+    test_session.commit()
+    pipeline = IngestionPipeline(wiki_client)
+
+    await pipeline.sync_prices(test_session)
+    run = await pipeline.sync_prices(test_session)
+
+    assert run.changed_ids == set()
+    assert "write" not in run.stages
+    assert run.stages["diff"].batch_size == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_skips_when_all_unchanged(test_session, wiki_client):
+    """Test that unchanged payloads skip every stage after fetch."""
+    wiki_client.fetch_latest_prices.side_effect = PayloadUnchanged("latest", {"data": {}})
+    wiki_client.fetch_24h_prices.side_effect = PayloadUnchanged("24h", {"data": {}})
+
+    run = await IngestionPipeline(wiki_client).sync_prices(test_session)
+
+    assert run.skipped is True
+    assert list(run.stages) == ["fetch"]
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_invalidates_cache_on_write_failure(test_session, wiki_client):
+    """Test that a failed write forgets the price validators so the next tick retries."""
+    pipeline = IngestionPipeline(wiki_client)
+    pipeline.tracker.diff = MagicMock(side_effect=RuntimeError("db down"))
+
+    with pytest.raises(RuntimeError, match="db down"):
+        await pipeline.sync_prices(test_session)
+
+    wiki_client.invalidate.assert_called_once_with("latest", "24h")
+
+
+def test_normalize_bucket_rows_keeps_missing_prices_as_null():
+    """Test that bucket rows carry the interval width and default volumes to 0."""
+    rows = normalize_bucket_rows(
+        {4151: {"avgHighPrice": 1500000, "highPriceVolume": 5, "avgLowPrice": None}},
+        "1h",
+        1700000000,
+    )
+
+    assert rows == [
+        {
+            "item_id": 4151,
+            "interval": 3600,
+            "timestamp": 1700000000,
+            "avg_high_price": 1500000,
+            "high_price_volume": 5,
+            "avg_low_price": None,
+            "low_price_volume": 0,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_buckets_writes_rows_and_prunes_expired(test_session, wiki_client):
+    """Test that a /5m sync stores the bucket and drops buckets past retention."""
+    test_session.add(PriceBucket(item_id=4151, interval=300, timestamp=0, high_price_volume=1))
+    test_session.commit()
+    bucket_start = (int(time.time()) // 300 - 1) * 300
+    wiki_client.fetch_5m_prices = AsyncMock(
+        return_value={
+            "data": {"4151": {"avgHighPrice": 1500000, "highPriceVolume": 7}},
+            "timestamp": bucket_start,
+        }
+    )
+
+    run = await IngestionPipeline(wiki_client).sync_buckets(test_session, "5m")
+
+    wiki_client.fetch_5m_prices.assert_awaited_once_with(timestamp=None, skip_unchanged=True)
+    bucket = test_session.exec(select(PriceBucket)).one()
+    assert (bucket.timestamp, bucket.high_price_volume) == (bucket_start, 7)
+    assert run.name == "buckets_5m"
+    assert run.rows == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_buckets_skips_unchanged_payload(test_session, wiki_client):
+    """Test that an unchanged latest bucket is not written again."""
+    wiki_client.fetch_1h_prices = AsyncMock(side_effect=PayloadUnchanged("1h", {"data": {}}))
+
+    run = await IngestionPipeline(wiki_client).sync_buckets(test_session, "1h")
+
+    assert run.skipped is True
+    assert test_session.exec(select(PriceBucket)).all() == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_buckets_fetches_only_missing_buckets(test_session, wiki_client):
+    """Test that backfill requests each missing bucket by timestamp, newest first."""
+    newest = (int(time.time()) // 300 - 1) * 300
+    test_session.add(PriceBucket(item_id=4151, interval=300, timestamp=newest - 300))
+    test_session.commit()
+
+    async def fetch_5m(timestamp=None, skip_unchanged=False):
+        return {"data": {"4151": {"highPriceVolume": 1}}, "timestamp": timestamp}
+
+    wiki_client.fetch_5m_prices = AsyncMock(side_effect=fetch_5m)
+
+    fetched = await IngestionPipeline(wiki_client).backfill_buckets(
+        test_session, "5m", since=newest - 900
+    )
+
+    assert fetched == [newest, newest - 600, newest - 900]
+    stored = test_session.exec(select(PriceBucket.timestamp)).all()
+    assert sorted(stored) == [newest - 900, newest - 600, newest - 300, newest]
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_appends_changed_rows_to_history(test_session, wiki_client):
+    """Test that the write stage records the tick in the price history."""
+    test_session.add(Item(id=4151, name="Abyssal whip", limit=70))
+    test_session.commit()
+    pipeline = IngestionPipeline(wiki_client)
+
+    await pipeline.sync_prices(test_session)
+    await pipeline.sync_prices(test_session)
+
+    history = item_price_history(test_session, 4151)
+    assert len(history) == 1
+    assert history[0]["high_price"] == 1500000
+    assert history[0]["high_volume"] == 300
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_refreshes_flip_metrics_of_changed_items(test_session, wiki_client):
+    """Test that the write stage keeps flip_metrics in step with the new prices."""
+    pipeline = IngestionPipeline(wiki_client)
+    await pipeline.run(test_session, include_mapping=True)
+
+    metric = test_session.get(FlipMetric, 4151)
+    assert metric.margin_post_tax == 1500000 - 30000 - 1400000
+    assert metric.total_volume_24h == 500
+
+    wiki_client.fetch_latest_prices.return_value = {
+        "data": {"4151": {"high": 1600000, "low": 1400000, "highTime": 2}}
+    }
+    await pipeline.sync_prices(test_session)
+
+    test_session.refresh(metric)
+    assert metric.sell_price == 1600000
+    assert metric.margin_post_tax == 1600000 - 32000 - 1400000
@@ -0,0 +1,208 @@
+"""Tests for wiki retry, circuit-breaker and hedging primitives."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from backend.services.metrics import metrics
+from backend.services.wiki.client import WikiAPIClient
+from backend.services.wiki.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyWindow,
+    RetryBudget,
+    RetryPolicy,
+    hedged,
+    is_retryable,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start each test with empty metrics."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _status_error(status_code):
+    return httpx.HTTPStatusError(
+        f"{status_code}", request=MagicMock(), response=MagicMock(status_code=status_code)
+    )
+
+
+def _ok_response():
+    return httpx.Response(
+        200, content=b"{}", request=httpx.Request("GET", "https://wiki.test/latest")
+    )
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_is_retryable_classifies_errors():
+    """Test that only transport errors, 429 and 5xx are retried."""
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(_status_error(503))
+    assert is_retryable(_status_error(429))
+    assert not is_retryable(_status_error(404))
+    assert not is_retryable(ValueError("bad json"))
+
+
+def test_retry_delay_is_jittered_and_capped():
+    """Test that backoff stays within the doubled, capped ceiling."""
+    policy = RetryPolicy(attempts=5, backoff_base=1.0, backoff_max=3.0)
+
+    for _ in range(50):
+        assert 0 <= policy.delay(1) <= 1.0
+        assert 0 <= policy.delay(4) <= 3.0
+
+
+def test_retry_budget_limits_retries_to_a_fraction_of_requests():
+    """Test that the budget refills by ratio per request."""
+    budget = RetryBudget(ratio=0.5, initial=1.0)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_breaker_opens_half_opens_and_closes():
+    """Test the closed -> open -> half-open -> closed cycle."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert metrics.gauge("wiki.breaker.wiki.state") == "open"
+
+    clock.now = 31
+    assert breaker.allow()  # Trial request
+    assert not breaker.allow()  # Only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert metrics.counter("wiki.breaker.wiki.opened") == 1
+
+
+def test_breaker_reopens_after_failed_trial():
+    """Test that a failed half-open trial re-opens the breaker."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 11
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.retry_in() == 10
+
+
+def test_latency_window_p95_needs_min_samples():
+    """Test that p95 is unavailable until enough samples are seen."""
+    window = LatencyWindow(min_samples=20)
+    for i in range(19):
+        window.observe("latest", i / 100)
+    assert window.p95("latest") is None
+
+    for i in range(19, 100):
+        window.observe("latest", i / 100)
+    assert window.p95("latest") == 0.95
+
+
+@pytest.mark.asyncio
+async def test_hedged_returns_the_faster_copy():
+    """Test that a slow first request is hedged and the second copy wins."""
+    delays = [1.0, 0.01]
+    hedges = []
+
+    async def call():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    result = await asyncio.wait_for(
+        hedged(call, 0.02, on_hedge=lambda: hedges.append(1)), timeout=0.5
+    )
+
+    assert result == 0.01
+    assert hedges == [1]
+
+
+@pytest.mark.asyncio
+async def test_hedged_does_not_hedge_fast_requests():
+    """Test that a request finishing before the delay is sent once."""
+    call = AsyncMock(return_value="ok")
+
+    assert await hedged(call, 0.5) == "ok"
+    call.assert_awaited_once()
+
+
+class TestClientResilience:
+    """Test retries and the breaker through WikiAPIClient."""
+
+    def _client(self, responses):
+        http = MagicMock()
+        http.get = AsyncMock(side_effect=responses)
+        client = WikiAPIClient(http_client=http)
+        client.retry_policy = RetryPolicy(attempts=2, backoff_base=0)
+        return client, http
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        """Test that a 503 followed by success returns the successful payload."""
+        client, http = self._client([_status_error(503), _ok_response()])
+
+        assert await client.fetch_latest_prices() == {}
+        assert http.get.await_count == 2
+        assert metrics.counter("wiki.fetch.latest.retries") == 1
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self):
+        """Test that a 404 is raised without retrying."""
+        client, http = self._client([_status_error(404)])
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.fetch_latest_prices()
+        assert http.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self):
+        """Test that repeated failures open the breaker and skip the request."""
+        client, http = self._client(httpx.ConnectError("refused"))
+        client.retry_policy = RetryPolicy(attempts=0)
+        client.breaker = CircuitBreaker(failure_threshold=2)
+
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await client.fetch_latest_prices()
+        with pytest.raises(CircuitOpenError):
+            await client.fetch_latest_prices()
+
+        assert http.get.await_count == 2
+        assert metrics.counter("wiki.fetch.latest.short_circuited") == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_exhaustion_stops_retrying(self):
+        """Test that an empty budget raises the first error."""
+        client, http = self._client(_status_error(500))
+        client.retry_budget = RetryBudget(ratio=0, initial=0)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.fetch_latest_prices()
+        assert http.get.await_count == 1
+        assert metrics.counter("wiki.fetch.retry_budget_exhausted") == 1
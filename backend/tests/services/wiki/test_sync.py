@@ -5,7 +5,11 @@ from unittest.mock import AsyncMock, MagicMock
 from sqlmodel import Session, SQLModel, create_engine, select
 from sqlalchemy.pool import StaticPool
 
-from backend.services.wiki.sync import sync_items_to_db, sync_prices_to_db
+from backend.services.wiki.sync import (
+    sync_24h_volume_to_db,
+    sync_items_to_db,
+    sync_prices_to_db,
+)
 from backend.services.wiki.client import WikiAPIClient
 from backend.models import Item, PriceSnapshot
 
@@ -33,6 +37,7 @@ def test_session(test_engine):
 def mock_wiki_client():
     """Create a mock WikiAPIClient."""
     client = MagicMock(spec=WikiAPIClient)
+    client.fetch_24h_prices = AsyncMock(return_value={"data": {}})
     return client
 
 
@@ -106,12 +111,13 @@ async def test_sync_prices_to_db_creates_snapshots(test_session, mock_wiki_clien
                     "low": 1400000,
                     "highTime": 1700000000,
                     "lowTime": 1700000000,
-                    "highVolume": 5000,
-                    "lowVolume": 4000,
                 }
             }
         }
     )
+    mock_wiki_client.fetch_24h_prices = AsyncMock(
+        return_value={"data": {"4151": {"highPriceVolume": 5000, "lowPriceVolume": 4000}}}
+    )
 
     await sync_prices_to_db(mock_wiki_client, test_session)
 
@@ -123,6 +129,8 @@ async def test_sync_prices_to_db_creates_snapshots(test_session, mock_wiki_clien
     assert snapshot.low_price == 1400000
     assert snapshot.high_volume == 5000
     assert snapshot.low_volume == 4000
+    assert snapshot.buy_volume_24h == 4000
+    assert snapshot.sell_volume_24h == 5000
 
     # Verify item denormalized fields were updated
     updated_item = test_session.get(Item, 4151)
@@ -151,12 +159,13 @@ async def test_sync_prices_to_db_updates_existing_snapshot(test_session, mock_wi
                     "low": 1400000,
                     "highTime": 1700000000,
                     "lowTime": 1700000000,
-                    "highVolume": 5000,
-                    "lowVolume": 4000,
                 }
             }
         }
     )
+    mock_wiki_client.fetch_24h_prices = AsyncMock(
+        return_value={"data": {"4151": {"highPriceVolume": 5000, "lowPriceVolume": 4000}}}
+    )
 
     await sync_prices_to_db(mock_wiki_client, test_session)
 
@@ -245,3 +254,100 @@ async def test_sync_prices_to_db_updates_item_denormalized_fields(test_session,
     assert updated_item.high_time == 1700000000
     assert updated_item.low_time == 1700000000
     assert updated_item.buy_limit == 70  # Should sync with limit
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_to_db_repeated_sync_keeps_one_snapshot(test_session, mock_wiki_client):
+    """Test that repeated syncs upsert in place rather than adding snapshots."""
+    test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+    test_session.commit()
+
+    for high in (1500000, 1600000):
+        mock_wiki_client.fetch_latest_prices = AsyncMock(
+            return_value={"data": {"4151": {"high": high, "low": 1400000}}}
+        )
+        await sync_prices_to_db(mock_wiki_client, test_session)
+
+    snapshots = test_session.exec(select(PriceSnapshot)).all()
+    assert len(snapshots) == 1
+    assert snapshots[0].high_price == 1600000
+    assert test_session.get(Item, 4151).high_price == 1600000
+
+
+@pytest.mark.asyncio
+async def test_sync_24h_volume_to_db_writes_unified_volumes(test_session, mock_wiki_client):
+    """Test that /24h price volumes fill both the high/low and buy/sell volume columns."""
+    test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+    test_session.commit()
+
+    mock_wiki_client.fetch_latest_prices = AsyncMock(
+        return_value={"data": {"4151": {"high": 1500000, "low": 1400000}}}
+    )
+    mock_wiki_client.fetch_24h_prices = AsyncMock(
+        return_value={
+            "data": {
+                "4151": {"highPriceVolume": 400, "lowPriceVolume": 500},
+                "invalid": {"highPriceVolume": 1},
+            }
+        }
+    )
+
+    await sync_24h_volume_to_db(mock_wiki_client, test_session)
+
+    snapshots = test_session.exec(select(PriceSnapshot)).all()
+    assert len(snapshots) == 1
+    assert (snapshots[0].high_volume, snapshots[0].low_volume) == (400, 500)
+    assert snapshots[0].buy_volume_24h == 500
+    assert snapshots[0].sell_volume_24h == 400
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_to_db_keeps_volumes_when_24h_fails(test_session, mock_wiki_client):
+    """Test that a failed /24h fetch applies prices and leaves stored volumes alone."""
+    test_session.add(Item(id=4151, name="Abyssal whip", limit=70, value=2000000))
+    test_session.add(PriceSnapshot(item_id=4151, high_volume=50, buy_volume_24h=40))
+    test_session.commit()
+
+    mock_wiki_client.fetch_latest_prices = AsyncMock(
+        return_value={"data": {"4151": {"high": 1500000, "low": 1400000}}}
+    )
+    mock_wiki_client.fetch_24h_prices = AsyncMock(side_effect=TimeoutError("24h timed out"))
+
+    run = await sync_prices_to_db(mock_wiki_client, test_session)
+
+    snapshot = test_session.exec(select(PriceSnapshot)).first()
+    assert snapshot.high_price == 1500000
+    assert (snapshot.high_volume, snapshot.buy_volume_24h) == (50, 40)
+    assert run.changed_ids == {4151}
+    assert set(run.stages) == {"fetch", "decode", "normalize", "diff", "write", "publish"}
+
+
+@pytest.mark.asyncio
+async def test_sync_prices_to_db_skips_unchanged_payload(test_session, mock_wiki_client):
+    """Test that an unchanged /latest skips the write phase and is counted."""
+    from backend.services.metrics import metrics
+    from backend.services.wiki.fetch import PayloadUnchanged
+
+    metrics.reset()
+    mock_wiki_client.fetch_latest_prices = AsyncMock(
+        side_effect=PayloadUnchanged("latest", {"data": {}})
+    )
+    mock_wiki_client.fetch_24h_prices = AsyncMock(side_effect=PayloadUnchanged("24h", {"data": {}}))
+
+    await sync_prices_to_db(mock_wiki_client, test_session)
+
+    assert test_session.exec(select(PriceSnapshot)).all() == []
+    mock_wiki_client.fetch_latest_prices.assert_awaited_once_with(skip_unchanged=True)
+    assert metrics.counter("wiki.sync.skipped_unchanged") == 1
+    assert metrics.counter("wiki.sync.prices.skipped_unchanged") == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_items_to_db_invalidates_cache_on_write_failure(test_session, mock_wiki_client):
+    """Test that a failed write forgets the mapping validators so the next sync retries."""
+    mock_wiki_client.fetch_mapping = AsyncMock(return_value=[{"name": "No id"}])
+
+    with pytest.raises(KeyError):
+        await sync_items_to_db(mock_wiki_client, test_session)
+
+    mock_wiki_client.invalidate.assert_called_once_with("mapping")
@@ -1,7 +1,9 @@
-from sqlmodel import Session, SQLModel, create_engine
+import random
+
+from sqlmodel import Session, SQLModel, create_engine, select
 from sqlalchemy.pool import StaticPool
 from backend.models import Item, PriceSnapshot
-from backend.services.flipping import FlippingService
+from backend.services.flipping import FlippingService, calculate_tax
 import pytest
 
 # Use StaticPool to share the same in-memory database
@@ -181,3 +183,43 @@ def test_invalid_sell_price_filtered(session: Session):
     assert "Invalid Sell 1" not in item_names
     assert "Invalid Sell 2" not in item_names
     assert "Valid Item" in item_names
+
+
+def test_vectorized_scoring_matches_scalar_formulas(session: Session):
+    """Test the NumPy scoring path against calculate_tax and a full Python sort."""
+    rng = random.Random(3)
+    for item_id in range(1, 201):
+        low = rng.randint(1, 3_000_000)
+        session.add(Item(id=item_id, name=f"Item {item_id}", limit=rng.choice([None, 10, 500])))
+        session.add(
+            PriceSnapshot(
+                item_id=item_id,
+                high_price=int(low * rng.uniform(0.95, 1.15)),
+                low_price=low,
+                high_volume=rng.randint(0, 300),
+                low_volume=rng.randint(0, 300),
+                buy_volume_24h=rng.choice([None, rng.randint(0, 5_000)]),
+                sell_volume_24h=rng.choice([None, rng.randint(0, 5_000)]),
+            )
+        )
+    session.commit()
+
+    expected = []
+    for item_id in range(1, 201):
+        price = session.exec(select(PriceSnapshot).where(PriceSnapshot.item_id == item_id)).one()
+        item = session.get(Item, item_id)
+        margin = price.high_price - calculate_tax(price.high_price) - price.low_price
+        volume = price.high_volume + price.low_volume
+        if margin / price.low_price * 100 < 1.0 or volume < 10:
+            continue
+        known = price.buy_volume_24h is not None or price.sell_volume_24h is not None
+        total = (price.buy_volume_24h or 0) + (price.sell_volume_24h or 0)
+        potential = margin * min(item.limit or 0, volume)
+        expected.append((margin * total if known else 0, potential, item_id))
+    expected.sort(key=lambda key: (-key[0], -key[1], key[2]))
+
+    flips = FlippingService(session).get_flip_opportunities(limit=20)
+
+    assert [flip["item_id"] for flip in flips] == [key[2] for key in expected[:20]]
+    assert [flip["potential_profit"] for flip in flips] == [key[1] for key in expected[:20]]
+    assert all(isinstance(flip["margin"], int) for flip in flips)